@@ -0,0 +1,258 @@
+"""Fan-out of admin events to websocket subscribers."""
+
+import asyncio
+import json
+import time
+import uuid
+
+from collections import deque
+from typing import Sequence, Set
+
+
+class EventSubscriber:
+    """
+    A bounded buffer of serialized events for one subscriber.
+
+    When the buffer is full, the `drop` overflow policy discards the oldest
+    buffered event to make room for the new one, while the `disconnect` policy
+    closes the subscriber so that the client can reconnect and resynchronize.
+    """
+
+    OVERFLOW_DROP = "drop"
+    OVERFLOW_DISCONNECT = "disconnect"
+
+    # topics which are delivered to unauthenticated subscribers
+    PUBLIC_TOPICS = ("ping", "settings")
+
+    def __init__(
+        self,
+        subscriber_id: str,
+        max_size: int = 1000,
+        overflow: str = OVERFLOW_DROP,
+        topics: Sequence[str] = None,
+        authenticated: bool = False,
+    ):
+        """
+        Initialize an `EventSubscriber` instance.
+
+        Args:
+            subscriber_id: the subscriber identifier
+            max_size: the maximum number of buffered events
+            overflow: the overflow policy, `drop` or `disconnect`
+            topics: the topics to receive, or None for all topics
+            authenticated: whether the subscriber may receive all topics
+
+        """
+        self.subscriber_id = subscriber_id
+        self.max_size = max_size
+        self.overflow = overflow
+        self.authenticated = authenticated
+        self._topics = None
+        self.topics = topics  # call setter
+        # (publish time, serialized event) in the order published
+        self.buffer = deque()
+        self.closed = False
+        self.close_reason: str = None
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_lag = 0
+        self._ready = asyncio.Event()
+
+    @property
+    def topics(self) -> Set[str]:
+        """Accessor for the subscriber's topic filter."""
+        return self._topics
+
+    @topics.setter
+    def topics(self, val: Sequence[str]):
+        """Setter for the subscriber's topic filter."""
+        topics = set(val) if val else None
+        if topics and "*" in topics:
+            topics = None
+        self._topics = topics
+
+    @property
+    def lag(self) -> int:
+        """Accessor for the number of events waiting to be delivered."""
+        return len(self.buffer)
+
+    def accepts(self, topic: str) -> bool:
+        """Check whether the subscriber should receive events for a topic."""
+        if topic in self.PUBLIC_TOPICS:
+            return True
+        return self.authenticated and (not self._topics or topic in self._topics)
+
+    def put(self, event: str, published: float = None) -> bool:
+        """
+        Add a serialized event to the buffer.
+
+        Args:
+            event: the serialized event
+            published: the time the event was published
+
+        Returns: False if the subscriber is closed
+
+        """
+        if self.closed:
+            return False
+        if len(self.buffer) >= self.max_size:
+            if self.overflow == self.OVERFLOW_DISCONNECT:
+                self.close("Subscriber fell too far behind")
+                return False
+            self.buffer.popleft()
+            self.dropped += 1
+        self.buffer.append((published or time.perf_counter(), event))
+        self.received += 1
+        if len(self.buffer) > self.max_lag:
+            self.max_lag = len(self.buffer)
+        self._ready.set()
+        return True
+
+    async def get(self, timeout: float = None) -> Sequence[str]:
+        """
+        Wait for events and remove all buffered events.
+
+        Args:
+            timeout: the maximum number of seconds to wait for an event
+
+        Returns: the serialized events, which are empty if the timeout is
+            reached or the subscriber has been closed
+
+        """
+        if not self.buffer and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        if self.closed:
+            return []
+        events = [event for (_, event) in self.buffer]
+        self.buffer.clear()
+        self.delivered += len(events)
+        return events
+
+    def close(self, reason: str = None):
+        """Close the subscriber, discarding any buffered events."""
+        if not self.closed:
+            self.closed = True
+            self.close_reason = reason
+            self.buffer.clear()
+            self._ready.set()
+
+    def stats(self, now: float = None) -> dict:
+        """Get the delivery statistics for the subscriber."""
+        lag_seconds = 0.0
+        if self.buffer:
+            lag_seconds = round((now or time.perf_counter()) - self.buffer[0][0], 3)
+        return {
+            "authenticated": self.authenticated,
+            "topics": sorted(self._topics) if self._topics else None,
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "lag": len(self.buffer),
+            "max_lag": self.max_lag,
+            "lag_seconds": lag_seconds,
+        }
+
+
+class AdminEventBus:
+    """
+    Publish admin events to websocket subscribers.
+
+    Each event is serialized once, and only if some subscriber accepts its
+    topic. Publishing never waits on a subscriber: a slow reader only fills
+    its own buffer, and is handled according to its overflow policy.
+    """
+
+    def __init__(
+        self, max_size: int = 1000, overflow: str = EventSubscriber.OVERFLOW_DROP
+    ):
+        """
+        Initialize an `AdminEventBus` instance.
+
+        Args:
+            max_size: the maximum number of buffered events for each subscriber
+            overflow: the overflow policy for subscribers, `drop` or `disconnect`
+
+        """
+        self.max_size = max_size
+        self.overflow = overflow
+        self.subscribers = {}
+        self.published = 0
+        self.disconnected = 0
+
+    def subscribe(
+        self, topics: Sequence[str] = None, authenticated: bool = False
+    ) -> EventSubscriber:
+        """
+        Add a subscriber.
+
+        Args:
+            topics: the topics to receive, or None for all topics
+            authenticated: whether the subscriber may receive all topics
+
+        Returns: the new subscriber
+
+        """
+        subscriber = EventSubscriber(
+            str(uuid.uuid4()),
+            max_size=self.max_size,
+            overflow=self.overflow,
+            topics=topics,
+            authenticated=authenticated,
+        )
+        self.subscribers[subscriber.subscriber_id] = subscriber
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber):
+        """Remove a subscriber and close it."""
+        subscriber.close()
+        self.subscribers.pop(subscriber.subscriber_id, None)
+
+    def publish(self, topic: str, payload: dict) -> int:
+        """
+        Publish an event to each subscriber accepting its topic.
+
+        Args:
+            topic: the event topic
+            payload: the event payload
+
+        Returns: the number of subscribers the event was added to
+
+        """
+        self.published += 1
+        event = None
+        published = None
+        count = 0
+        for subscriber in self.subscribers.values():
+            if subscriber.closed or not subscriber.accepts(topic):
+                continue
+            if event is None:
+                event = json.dumps({"topic": topic, "payload": payload})
+                published = time.perf_counter()
+            if subscriber.put(event, published):
+                count += 1
+            else:
+                self.disconnected += 1
+        return count
+
+    def close(self, reason: str = None):
+        """Close all subscribers."""
+        for subscriber in self.subscribers.values():
+            subscriber.close(reason)
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the event and subscriber statistics."""
+        now = time.perf_counter()
+        return {
+            "published": self.published,
+            "disconnected": self.disconnected,
+            "subscribers": {
+                subscriber_id: subscriber.stats(now)
+                for subscriber_id, subscriber in self.subscribers.items()
+            },
+        }
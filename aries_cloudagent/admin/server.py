@@ -1,11 +1,11 @@
 """Admin server classes."""
 
 import asyncio
+import json
 import logging
 from typing import Callable, Coroutine, Sequence, Set
-import uuid
 
-from aiohttp import web
+from aiohttp import web, WSCloseCode
 from aiohttp_apispec import (
     docs,
     response_schema,
@@ -20,7 +20,6 @@ from ..config.injection_context import InjectionContext
 from ..core.plugin_registry import PluginRegistry
 from ..ledger.error import LedgerConfigError, LedgerTransactionError
 from ..messaging.responder import BaseResponder
-from ..transport.queue.basic import BasicMessageQueue
 from ..transport.outbound.message import OutboundMessage
 from ..utils.stats import Collector
 from ..utils.task_queue import TaskQueue
@@ -28,6 +27,7 @@ from ..version import __version__
 
 from .base_server import BaseAdminServer
 from .error import AdminSetupError
+from .event_bus import AdminEventBus, EventSubscriber
 
 
 LOGGER = logging.getLogger(__name__)
@@ -45,6 +45,30 @@ class AdminStatusSchema(Schema):
     """Schema for the status endpoint."""
 
 
+class AdminEndpointStatusSchema(Schema):
+    """Schema for the outbound endpoint status endpoint."""
+
+    results = fields.Dict(
+        keys=fields.Str(description="Endpoint scheme and host"),
+        values=fields.Dict(description="Delivery statistics for the endpoint"),
+        description="Outbound delivery statistics by endpoint",
+    )
+
+
+class AdminWebsocketStatusSchema(Schema):
+    """Schema for the websocket subscriber status endpoint."""
+
+    published = fields.Int(description="Number of events published")
+    disconnected = fields.Int(
+        description="Number of subscribers disconnected for falling behind"
+    )
+    subscribers = fields.Dict(
+        keys=fields.Str(description="Subscriber identifier"),
+        values=fields.Dict(description="Delivery statistics for the subscriber"),
+        description="Event delivery statistics by websocket subscriber",
+    )
+
+
 class AdminStatusLivelinessSchema(Schema):
     """Schema for the liveliness endpoint."""
 
@@ -180,6 +204,9 @@ async def debug_middleware(request: web.BaseRequest, handler: Coroutine):
 class AdminServer(BaseAdminServer):
     """Admin HTTP server class."""
 
+    WEBSOCKET_BUFFER_SIZE = 1000
+    WEBSOCKET_PING_INTERVAL = 5.0
+
     def __init__(
         self,
         host: str,
@@ -190,6 +217,7 @@ class AdminServer(BaseAdminServer):
         conductor_stop: Coroutine,
         task_queue: TaskQueue = None,
         conductor_stats: Coroutine = None,
+        endpoint_stats: Coroutine = None,
     ):
         """
         Initialize an AdminServer instance.
@@ -202,6 +230,8 @@ class AdminServer(BaseAdminServer):
             webhook_router: Callable for delivering webhooks
             conductor_stop: Conductor (graceful) stop for shutdown API call
             task_queue: An optional task queue for handlers
+            conductor_stats: Conductor statistics for the status API call
+            endpoint_stats: Outbound endpoint statistics for the status API call
         """
         self.app = None
         self.admin_api_key = context.settings.get("admin.admin_api_key")
@@ -212,11 +242,17 @@ class AdminServer(BaseAdminServer):
         self.port = port
         self.conductor_stop = conductor_stop
         self.conductor_stats = conductor_stats
+        self.endpoint_stats = endpoint_stats
         self.loaded_modules = []
         self.task_queue = task_queue
         self.webhook_router = webhook_router
         self.webhook_targets = {}
-        self.websocket_queues = {}
+        self.event_bus = AdminEventBus(
+            max_size=context.settings.get("admin.websocket_buffer_size")
+            or self.WEBSOCKET_BUFFER_SIZE,
+            overflow=context.settings.get("admin.websocket_overflow")
+            or EventSubscriber.OVERFLOW_DROP,
+        )
         self.site = None
 
         self.context = context.start_scope("admin")
@@ -295,7 +331,18 @@ class AdminServer(BaseAdminServer):
                 web.get("/plugins", self.plugins_handler, allow_head=False),
                 web.get("/status", self.status_handler, allow_head=False),
                 web.post("/status/reset", self.status_reset_handler),
+                web.get(
+                    "/status/endpoints",
+                    self.endpoint_status_handler,
+                    allow_head=False,
+                ),
+                web.get(
+                    "/status/websockets",
+                    self.websocket_status_handler,
+                    allow_head=False,
+                ),
                 web.get("/status/live", self.liveliness_handler, allow_head=False),
+                web.get("/metrics", self.metrics_handler, allow_head=False),
                 web.get("/status/ready", self.readiness_handler, allow_head=False),
                 web.get("/shutdown", self.shutdown_handler, allow_head=False),
                 web.get("/ws", self.websocket_handler, allow_head=False),
@@ -389,8 +436,7 @@ class AdminServer(BaseAdminServer):
     async def stop(self) -> None:
         """Stop the webserver."""
         self.app._state["ready"] = False  # in case call does not come through OpenAPI
-        for queue in self.websocket_queues.values():
-            queue.stop()
+        self.event_bus.close("Server shutting down")
         if self.site:
             await self.site.stop()
             self.site = None
@@ -445,6 +491,62 @@ class AdminServer(BaseAdminServer):
             status["conductor"] = await self.conductor_stats()
         return web.json_response(status)
 
+    @docs(tags=["server"], summary="Fetch outbound delivery status by endpoint")
+    @response_schema(AdminEndpointStatusSchema(), 200)
+    async def endpoint_status_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the outbound endpoint health information.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        results = await self.endpoint_stats() if self.endpoint_stats else {}
+        return web.json_response({"results": results})
+
+    @docs(tags=["server"], summary="Fetch event delivery status by websocket")
+    @response_schema(AdminWebsocketStatusSchema(), 200)
+    async def websocket_status_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the websocket event subscriber information.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        return web.json_response(self.event_bus.stats)
+
+    @docs(
+        tags=["server"],
+        summary="Fetch timing statistics and queue depths in Prometheus format",
+    )
+    async def metrics_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the metrics in Prometheus text format.
+
+        Metrics are only collected when timing is enabled.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        collector: Collector = await self.context.inject(Collector, required=False)
+        if not collector:
+            raise web.HTTPNotFound(reason="Timing statistics are not enabled")
+        return web.Response(
+            body=collector.render_metrics().encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
     @docs(tags=["server"], summary="Reset statistics")
     @response_schema(AdminStatusSchema(), 200)
     async def status_reset_handler(self, request: web.BaseRequest):
@@ -530,42 +632,53 @@ class AdminServer(BaseAdminServer):
         self.app._state["alive"] = False
 
     async def websocket_handler(self, request):
-        """Send notifications to admin client over websocket."""
+        """
+        Send notifications to admin client over websocket.
+
+        The client may restrict the topics it receives with a comma-separated
+        `topics` query parameter, or by sending a message with a `topics` list
+        of strings. A message with any other `topics` value is ignored.
+        """
 
         ws = web.WebSocketResponse()
         await ws.prepare(request)
-        socket_id = str(uuid.uuid4())
-        queue = BasicMessageQueue()
         loop = asyncio.get_event_loop()
 
         if self.admin_insecure_mode:
             # open to send websocket messages without api key auth
-            queue.authenticated = True
+            authenticated = True
         else:
             header_admin_api_key = request.headers.get("x-api-key")
             # authenticated via http header?
-            queue.authenticated = header_admin_api_key == self.admin_api_key
+            authenticated = header_admin_api_key == self.admin_api_key
+        topics = request.query.get("topics")
+        if topics:
+            topics = [topic.strip() for topic in topics.split(",") if topic.strip()]
+        subscriber = self.event_bus.subscribe(
+            topics=topics or None, authenticated=authenticated
+        )
 
         try:
-            self.websocket_queues[socket_id] = queue
-            await queue.enqueue(
-                {
-                    "topic": "settings",
-                    "payload": {
-                        "authenticated": queue.authenticated,
-                        "label": self.context.settings.get("default_label"),
-                        "endpoint": self.context.settings.get("default_endpoint"),
-                        "no_receive_invites": self.context.settings.get(
-                            "admin.no_receive_invites", False
-                        ),
-                        "help_link": self.context.settings.get("admin.help_link"),
-                    },
-                }
+            subscriber.put(
+                json.dumps(
+                    {
+                        "topic": "settings",
+                        "payload": {
+                            "authenticated": subscriber.authenticated,
+                            "label": self.context.settings.get("default_label"),
+                            "endpoint": self.context.settings.get("default_endpoint"),
+                            "no_receive_invites": self.context.settings.get(
+                                "admin.no_receive_invites", False
+                            ),
+                            "help_link": self.context.settings.get("admin.help_link"),
+                        },
+                    }
+                )
             )
 
             closed = False
             receive = loop.create_task(ws.receive_json())
-            send = loop.create_task(queue.dequeue(timeout=5.0))
+            send = loop.create_task(subscriber.get(self.WEBSOCKET_PING_INTERVAL))
 
             while not closed:
                 try:
@@ -589,27 +702,50 @@ class AdminServer(BaseAdminServer):
                                 )
                             if self.admin_api_key and self.admin_api_key == msg_api_key:
                                 # authenticated via websocket message
-                                queue.authenticated = True
+                                subscriber.authenticated = True
+                            if isinstance(msg_received, dict) and (
+                                "topics" in msg_received
+                            ):
+                                topics = msg_received["topics"]
+                                if isinstance(topics, list) and all(
+                                    isinstance(topic, str) for topic in topics
+                                ):
+                                    subscriber.topics = topics
+                                else:
+                                    LOGGER.warning(
+                                        "Ignoring invalid websocket topics: %r",
+                                        topics,
+                                    )
 
                             receive = loop.create_task(ws.receive_json())
 
                     if send.done():
-                        try:
-                            msg = send.result()
-                        except asyncio.TimeoutError:
-                            msg = None
-
-                        if msg is None:
-                            # we send fake pings because the JS client
-                            # can't detect real ones
-                            msg = {
-                                "topic": "ping",
-                                "authenticated": queue.authenticated,
-                            }
-                        if not closed:
-                            if msg:
-                                await ws.send_json(msg)
-                            send = loop.create_task(queue.dequeue(timeout=5.0))
+                        events = send.result()
+                        if subscriber.closed:
+                            # disconnected for falling behind, or shutting down
+                            if not closed:
+                                await ws.close(
+                                    code=WSCloseCode.TRY_AGAIN_LATER,
+                                    message=(subscriber.close_reason or "").encode(),
+                                )
+                            closed = True
+                        elif not closed:
+                            if not events:
+                                # we send fake pings because the JS client
+                                # can't detect real ones
+                                events = [
+                                    json.dumps(
+                                        {
+                                            "topic": "ping",
+                                            "authenticated": subscriber.authenticated,
+                                        }
+                                    )
+                                ]
+                            for event in events:
+                                await ws.send_str(event)
+                            send = loop.create_task(
+                                subscriber.get(self.WEBSOCKET_PING_INTERVAL)
+                            )
 
                 except asyncio.CancelledError:
                     closed = True
@@ -620,7 +756,7 @@ class AdminServer(BaseAdminServer):
                 send.cancel()
 
         finally:
-            del self.websocket_queues[socket_id]
+            self.event_bus.unsubscribe(subscriber)
 
         return ws
 
@@ -649,6 +785,4 @@ class AdminServer(BaseAdminServer):
                         topic, payload, target.endpoint, target.max_attempts
                     )
 
-        for queue in self.websocket_queues.values():
-            if queue.authenticated or topic in ("ping", "settings"):
-                await queue.enqueue({"topic": topic, "payload": payload})
+        self.event_bus.publish(topic, payload)
@@ -161,13 +161,9 @@ class TestAdminServer(AsyncTestCase):
         }
         server = self.get_admin_server(settings)
         await server.start()
-        with async_mock.patch.object(
-            server, "websocket_queues", async_mock.MagicMock()
-        ) as mock_wsq:
-            mock_wsq.values = async_mock.MagicMock(
-                return_value=[async_mock.MagicMock(stop=async_mock.MagicMock())]
-            )
-            await server.stop()
+        subscriber = server.event_bus.subscribe()
+        await server.stop()
+        assert subscriber.closed
 
         with async_mock.patch.object(
             web.TCPSite, "start", async_mock.CoroutineMock()
@@ -194,21 +190,14 @@ class TestAdminServer(AsyncTestCase):
         test_topic = "test_topic"
         test_payload = {"test": "TEST"}
 
-        with async_mock.patch.object(
-            server, "websocket_queues", async_mock.MagicMock()
-        ) as mock_wsq:
-            mock_wsq.values = async_mock.MagicMock(
-                return_value=[
-                    async_mock.MagicMock(
-                        authenticated=True, enqueue=async_mock.CoroutineMock()
-                    )
-                ]
-            )
-
-            await server.responder.send_webhook(test_topic, test_payload)
-            assert self.webhook_results == [
-                (test_topic, test_payload, test_url, test_attempts)
-            ]
+        subscriber = server.event_bus.subscribe(authenticated=True)
+        await server.responder.send_webhook(test_topic, test_payload)
+        assert self.webhook_results == [
+            (test_topic, test_payload, test_url, test_attempts)
+        ]
+        assert [json.loads(event) for event in await subscriber.get()] == [
+            {"topic": test_topic, "payload": test_payload}
+        ]
 
         server.remove_webhook_target(target_url=test_url)
         assert test_url not in server.webhook_targets
@@ -251,6 +240,7 @@ class TestAdminServer(AsyncTestCase):
             "",
             "plugins",
             "status",
+            "status/endpoints",
             "status/live",
             "status/ready",
             "shutdown",  # mock conductor has magic-mock stop()
@@ -289,6 +279,118 @@ class TestAdminServer(AsyncTestCase):
 
         await server.stop()
 
+    async def test_visit_websocket_events(self):
+        settings = {"admin.admin_insecure_mode": True}
+        server = self.get_admin_server(settings)
+        await server.start()
+
+        async with self.client_session.ws_connect(
+            f"http://127.0.0.1:{self.port}/ws?topics=connections"
+        ) as ws:
+            result = await ws.receive_json()
+            assert result["topic"] == "settings"
+            assert result["payload"]["authenticated"]
+
+            await server.send_webhook("other", {"skip": True})
+            await server.send_webhook("connections", {"state": "active"})
+            result = await ws.receive_json()
+            assert result == {"topic": "connections", "payload": {"state": "active"}}
+
+            await ws.send_json({"topics": ["other"]})
+            async with self.client_session.get(
+                f"http://127.0.0.1:{self.port}/status/websockets"
+            ) as response:
+                status = await response.json()
+            assert status["published"] == 2
+            (subscriber,) = status["subscribers"].values()
+            assert subscriber["topics"] == ["other"]
+            assert subscriber["delivered"] == 2
+            assert subscriber["lag"] == 0
+
+            await server.send_webhook("connections", {"skip": True})
+            await server.send_webhook("other", {"state": "done"})
+            result = await ws.receive_json()
+            assert result == {"topic": "other", "payload": {"state": "done"}}
+
+        await server.stop()
+        assert not server.event_bus.subscribers
+
+    async def test_visit_websocket_invalid_topics(self):
+        settings = {"admin.admin_insecure_mode": True}
+        server = self.get_admin_server(settings)
+        await server.start()
+
+        async with self.client_session.ws_connect(
+            f"http://127.0.0.1:{self.port}/ws?topics=connections,%20other,"
+        ) as ws:
+            result = await ws.receive_json()
+            assert result["topic"] == "settings"
+
+            for topics in ("connections", 5, ["connections", 5]):
+                await ws.send_json({"topics": topics})
+            await ws.send_json(["topics"])
+            async with self.client_session.get(
+                f"http://127.0.0.1:{self.port}/status/websockets"
+            ) as response:
+                status = await response.json()
+            (subscriber,) = status["subscribers"].values()
+            assert subscriber["topics"] == ["connections", "other"]
+
+            await server.send_webhook("connections", {"state": "active"})
+            result = await ws.receive_json()
+            assert result == {"topic": "connections", "payload": {"state": "active"}}
+
+        await server.stop()
+        assert not server.event_bus.subscribers
+
+    async def test_visit_websocket_overflow(self):
+        settings = {
+            "admin.admin_insecure_mode": True,
+            "admin.websocket_buffer_size": 2,
+            "admin.websocket_overflow": "disconnect",
+        }
+        server = self.get_admin_server(settings)
+        await server.start()
+
+        async with self.client_session.ws_connect(
+            f"http://127.0.0.1:{self.port}/ws"
+        ) as ws:
+            result = await ws.receive_json()
+            assert result["topic"] == "settings"
+            for i in range(3):
+                await server.send_webhook("connections", {"i": i})
+            message = await ws.receive()
+            assert message.type == test_module.web.WSMsgType.CLOSE
+            assert ws.close_code == test_module.WSCloseCode.TRY_AGAIN_LATER
+        assert server.event_bus.disconnected == 1
+
+        await server.stop()
+
+    async def test_visit_metrics(self):
+        settings = {"admin.admin_insecure_mode": True}
+        server = self.get_admin_server(settings)
+        collector = await server.context.inject(Collector)
+        collector.log("test", 0.5)
+        collector.add_gauges("test", lambda: {"out_new": 3})
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/metrics"
+        ) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith("text/plain")
+            text = await response.text()
+        assert 'acapy_duration_seconds_count{name="test"} 1' in text
+        assert "acapy_out_new 3" in text
+
+        server.context.injector.clear_binding(Collector)
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/metrics"
+        ) as response:
+            assert response.status == 404
+
+        await server.stop()
+
     async def test_visit_shutting_down(self):
         settings = {
             "admin.admin_insecure_mode": True,
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from .. import event_bus as test_module
+from ..event_bus import AdminEventBus, EventSubscriber
+
+
+class TestAdminEventBus(AsyncTestCase):
+    async def test_publish_serialize_once(self):
+        bus = AdminEventBus()
+        subscribers = [bus.subscribe(authenticated=True) for _ in range(3)]
+        with async_mock.patch.object(
+            test_module.json, "dumps", async_mock.MagicMock(wraps=json.dumps)
+        ) as mock_dumps:
+            assert bus.publish("topic", {"test": 1}) == 3
+            mock_dumps.assert_called_once()
+        for subscriber in subscribers:
+            assert await subscriber.get() == [
+                json.dumps({"topic": "topic", "payload": {"test": 1}})
+            ]
+        assert bus.published == 1
+
+    async def test_publish_filter(self):
+        bus = AdminEventBus()
+        anonymous = bus.subscribe()
+        filtered = bus.subscribe(topics=["connections"], authenticated=True)
+        everything = bus.subscribe(topics=["*"], authenticated=True)
+        assert everything.topics is None
+
+        with async_mock.patch.object(
+            test_module.json, "dumps", async_mock.MagicMock(wraps=json.dumps)
+        ) as mock_dumps:
+            assert bus.publish("connections", {}) == 2
+            assert bus.publish("issue_credential", {}) == 1
+            assert bus.publish("settings", {}) == 3
+            assert mock_dumps.call_count == 3
+            filtered.topics = None
+            everything.authenticated = False
+            assert bus.publish("issue_credential", {}) == 1
+            anonymous.close()
+            assert bus.publish("ping", {}) == 2
+
+        def topics(subscriber):
+            return [json.loads(event)["topic"] for (_, event) in subscriber.buffer]
+
+        assert topics(anonymous) == []
+        assert topics(filtered) == [
+            "connections",
+            "settings",
+            "issue_credential",
+            "ping",
+        ]
+        assert topics(everything) == [
+            "connections",
+            "issue_credential",
+            "settings",
+            "ping",
+        ]
+
+    async def test_overflow_drop(self):
+        bus = AdminEventBus(max_size=2)
+        subscriber = bus.subscribe(authenticated=True)
+        for i in range(5):
+            bus.publish("topic", {"i": i})
+        assert subscriber.lag == 2
+        assert subscriber.dropped == 3
+        events = await subscriber.get()
+        assert [json.loads(event)["payload"]["i"] for event in events] == [3, 4]
+        stats = bus.stats["subscribers"][subscriber.subscriber_id]
+        assert stats["received"] == 5
+        assert stats["delivered"] == 2
+        assert stats["dropped"] == 3
+        assert stats["lag"] == 0
+        assert stats["max_lag"] == 2
+
+    async def test_overflow_disconnect(self):
+        bus = AdminEventBus(max_size=2, overflow=EventSubscriber.OVERFLOW_DISCONNECT)
+        slow = bus.subscribe(authenticated=True)
+        fast = bus.subscribe(authenticated=True)
+        bus.publish("topic", {"i": 0})
+        bus.publish("topic", {"i": 1})
+        assert len(await fast.get()) == 2
+        assert bus.publish("topic", {"i": 2}) == 1
+        assert slow.closed
+        assert slow.close_reason
+        assert await slow.get() == []
+        assert bus.disconnected == 1
+        assert bus.publish("topic", {"i": 3}) == 1
+        assert len(await fast.get()) == 2
+
+        bus.unsubscribe(slow)
+        assert list(bus.subscribers) == [fast.subscriber_id]
+
+    async def test_get_wait(self):
+        bus = AdminEventBus()
+        subscriber = bus.subscribe(authenticated=True)
+        assert await subscriber.get(0.01) == []
+
+        waiting = asyncio.ensure_future(subscriber.get(1.0))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        bus.publish("topic", {})
+        bus.publish("topic", {})
+        assert len(await waiting) == 2
+
+        waiting = asyncio.ensure_future(subscriber.get())
+        await asyncio.sleep(0)
+        bus.close("shutdown")
+        assert await waiting == []
+        assert subscriber.close_reason == "shutdown"
+
+    async def test_stats_lag(self):
+        bus = AdminEventBus()
+        subscriber = bus.subscribe(topics=["b", "a"], authenticated=True)
+        bus.publish("a", {})
+        stats = subscriber.stats(subscriber.buffer[0][0] + 1.5)
+        assert stats["lag_seconds"] == 1.5
+        assert stats["topics"] == ["a", "b"]
+        await subscriber.get()
+        assert subscriber.stats()["lag_seconds"] == 0.0
@@ -70,6 +70,9 @@ class BaseCache(ABC):
         if key in self._key_locks:
             del self._key_locks[key]
 
+    def close(self):
+        """Release any resources held by the cache."""
+
     def __repr__(self) -> str:
         """Human readable representation of `BaseStorageRecordSearch`."""
         return "<{}>".format(self.__class__.__name__)
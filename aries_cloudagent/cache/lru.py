@@ -0,0 +1,155 @@
+"""In-memory cache with LRU eviction and an indexed expiry queue."""
+
+import heapq
+import time
+from collections import OrderedDict
+from typing import Any, Sequence, Text, Union
+
+from .base import BaseCache
+
+
+class LRUCache(BaseCache):
+    """
+    In-memory cache class with bounded size.
+
+    Expiry times are tracked in a min-heap so that expired entries are located
+    without scanning the whole cache, and the least recently used entry is
+    evicted whenever the maximum size is exceeded.
+    """
+
+    DEFAULT_MAX_SIZE = 10000
+
+    def __init__(self, max_size: int = None):
+        """
+        Initialize an `LRUCache` instance.
+
+        Args:
+            max_size: the maximum number of entries to retain, or 0 for unbounded
+
+        """
+        super().__init__()
+        self._max_size = self.DEFAULT_MAX_SIZE if max_size is None else max_size
+        # looks like { "key": (<epoch timestamp or None>, <val>) }, oldest first
+        self._cache = OrderedDict()
+        # looks like [ (<epoch timestamp>, <sequence>, "key"), ... ]
+        self._expiry = []
+        self._expiry_seq = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def max_size(self) -> int:
+        """Accessor for the maximum number of cache entries."""
+        return self._max_size
+
+    @property
+    def stats(self) -> dict:
+        """Fetch the current cache counters."""
+        return {
+            "size": len(self._cache),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        """Return the number of entries currently held in the cache."""
+        return len(self._cache)
+
+    def _remove_expired_cache_items(self, now: float = None):
+        """Remove expired items from the head of the expiry queue."""
+        if now is None:
+            now = time.perf_counter()
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires, _, key = heapq.heappop(expiry)
+            entry = self._cache.get(key)
+            # stale queue entries are left behind when keys are overwritten
+            if entry and entry[0] == expires:
+                del self._cache[key]
+                self.expirations += 1
+        if len(expiry) > 2 * len(self._cache) + 64:
+            self._compact_expiry()
+
+    def _compact_expiry(self):
+        """Rebuild the expiry queue, dropping entries for replaced keys."""
+        self._expiry = [
+            item
+            for item in self._expiry
+            if item[2] in self._cache and self._cache[item[2]][0] == item[0]
+        ]
+        heapq.heapify(self._expiry)
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        now = time.perf_counter()
+        self._remove_expired_cache_items(now)
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        now = time.perf_counter()
+        self._remove_expired_cache_items(now)
+        expires_ts = now + ttl if ttl else None
+        for key in [keys] if isinstance(keys, Text) else keys:
+            self._cache[key] = (expires_ts, value)
+            self._cache.move_to_end(key)
+            if expires_ts is not None:
+                self._expiry_seq += 1
+                heapq.heappush(self._expiry, (expires_ts, self._expiry_seq, key))
+        if self._max_size:
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        if key in self._cache:
+            del self._cache[key]
+
+    async def flush(self):
+        """Remove all items from the cache."""
+
+        self._cache = OrderedDict()
+        self._expiry = []
+
+    def __repr__(self) -> str:
+        """Human readable representation of `LRUCache`."""
+        return "<{}(size={}, max_size={})>".format(
+            self.__class__.__name__, len(self._cache), self._max_size
+        )
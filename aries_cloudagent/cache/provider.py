@@ -0,0 +1,39 @@
+"""Default cache provider classes."""
+
+import logging
+
+from ..config.base import BaseProvider, BaseInjector, BaseSettings
+from ..utils.classloader import ClassLoader
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CacheProvider(BaseProvider):
+    """Provider for the default configurable cache classes."""
+
+    CACHE_TYPES = {
+        "basic": "aries_cloudagent.cache.basic.BasicCache",
+        "lru": "aries_cloudagent.cache.lru.LRUCache",
+        "redis": "aries_cloudagent.cache.redis.RedisCache",
+    }
+
+    async def provide(self, settings: BaseSettings, injector: BaseInjector):
+        """Create and return the cache instance."""
+        cache_type = settings.get_value("cache.type", default="basic").lower()
+        cache_class = ClassLoader.load_class(
+            self.CACHE_TYPES.get(cache_type, cache_type)
+        )
+        LOGGER.debug("Using cache class: %s", cache_class.__name__)
+
+        kwargs = {}
+        if cache_type == "redis":
+            kwargs["url"] = settings.get_value("cache.url")
+            key_prefix = settings.get_value("cache.key_prefix")
+            if key_prefix:
+                kwargs["key_prefix"] = key_prefix
+        elif cache_type != "basic":
+            # the basic cache is unbounded and accepts no options
+            max_size = settings.get_value("cache.max_size")
+            if max_size is not None:
+                kwargs["max_size"] = int(max_size)
+        return cache_class(**kwargs)
@@ -0,0 +1,327 @@
+"""Shared cache implementation backed by a Redis-protocol key-value store."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Sequence, Text, Tuple, Union
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from .base import BaseCache, CacheError, CacheKeyLock
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RespConnection:
+    """A single connection speaking the Redis serialization protocol (RESP)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Initialize the connection."""
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "RespConnection":
+        """Open a new connection to the server."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    @property
+    def closed(self) -> bool:
+        """Accessor for the closed state of the connection."""
+        return self._writer.is_closing()
+
+    @staticmethod
+    def encode_command(*args) -> bytes:
+        """Encode a command as a RESP array of bulk strings."""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif isinstance(arg, int):
+                arg = str(arg).encode("ascii")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def read_reply(self):
+        """Read a single reply from the server."""
+        line = await self._reader.readline()
+        if not line:
+            raise CacheError("Connection closed by cache server")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode("utf-8")
+        if prefix == b"-":
+            return CacheError(body.decode("utf-8"))
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            size = int(body)
+            if size < 0:
+                return None
+            data = await self._reader.readexactly(size + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(body)
+            if count < 0:
+                return None
+            return [await self.read_reply() for _ in range(count)]
+        raise CacheError(f"Unexpected reply from cache server: {line!r}")
+
+    async def execute_many(self, commands: Sequence[Sequence]) -> list:
+        """Send a pipeline of commands and collect their replies in order."""
+        self._writer.write(b"".join(self.encode_command(*cmd) for cmd in commands))
+        await self._writer.drain()
+        return [await self.read_reply() for _ in commands]
+
+    def close(self):
+        """Close the connection."""
+        self._writer.close()
+
+
+class RedisCache(BaseCache):
+    """
+    Cache class backed by an external Redis-protocol server.
+
+    Entries are shared between all agent instances using the same server and key
+    prefix, expiry is handled by the server, and `acquire` additionally takes a
+    short-lived lock in the store so that only one instance fills a missing entry.
+    """
+
+    DEFAULT_URL = "redis://localhost:6379/0"
+
+    # delete the lock only while it is held by the given token, in one step
+    RELEASE_SCRIPT = (
+        'if redis.call("GET", KEYS[1]) == ARGV[1] then '
+        'return redis.call("DEL", KEYS[1]) else return 0 end'
+    )
+
+    def __init__(
+        self,
+        url: str = None,
+        *,
+        key_prefix: str = "acapy::",
+        pool_size: int = 8,
+        lock_ttl: float = 30.0,
+        lock_poll_interval: float = 0.05,
+    ):
+        """
+        Initialize a `RedisCache` instance.
+
+        Args:
+            url: the server address, in the form redis://[:password@]host:port/db
+            key_prefix: a prefix applied to every key held in the store
+            pool_size: the maximum number of idle connections to keep open
+            lock_ttl: number of seconds before an abandoned fill lock expires
+            lock_poll_interval: seconds between checks while another instance
+                holds the fill lock for a key
+
+        """
+        super().__init__()
+        parsed = urlparse(url or self.DEFAULT_URL)
+        if parsed.scheme != "redis":
+            raise CacheError(f"Unsupported cache URL scheme: {parsed.scheme}")
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = unquote(parsed.password) if parsed.password else None
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._key_prefix = key_prefix
+        self._pool_size = pool_size
+        self._idle = []
+        self.lock_ttl = lock_ttl
+        self.lock_poll_interval = lock_poll_interval
+
+    async def _connect(self) -> RespConnection:
+        """Open and prepare a new server connection."""
+        try:
+            conn = await RespConnection.open(self._host, self._port)
+        except OSError as err:
+            raise CacheError("Error connecting to cache server") from err
+        setup = []
+        if self._password:
+            setup.append(("AUTH", self._password))
+        if self._db:
+            setup.append(("SELECT", self._db))
+        if setup:
+            for reply in await conn.execute_many(setup):
+                if isinstance(reply, CacheError):
+                    conn.close()
+                    raise reply
+        return conn
+
+    async def execute(self, *commands: Sequence) -> list:
+        """
+        Execute one or more commands as a single pipeline.
+
+        Returns:
+            The list of replies, in command order
+
+        """
+        conn = None
+        while self._idle and not conn:
+            conn = self._idle.pop()
+            if conn.closed:
+                conn = None
+        if not conn:
+            conn = await self._connect()
+        try:
+            replies = await conn.execute_many(commands)
+        except (OSError, asyncio.IncompleteReadError, CacheError) as err:
+            conn.close()
+            if isinstance(err, CacheError):
+                raise
+            raise CacheError("Error communicating with cache server") from err
+        if len(self._idle) < self._pool_size:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        for reply in replies:
+            if isinstance(reply, CacheError):
+                raise reply
+        return replies
+
+    def _full_key(self, key: Text) -> str:
+        return self._key_prefix + key
+
+    def _lock_key(self, key: Text) -> str:
+        return self._key_prefix + "lock::" + key
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        (value,) = await self.execute(("GET", self._full_key(key)))
+        return None if value is None else json.loads(value)
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        encoded = json.dumps(value)
+        expiry = ("PX", max(int(ttl * 1000), 1)) if ttl else ()
+        await self.execute(
+            *(
+                ("SET", self._full_key(key), encoded) + expiry
+                for key in ([keys] if isinstance(keys, Text) else keys)
+            )
+        )
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        await self.execute(("DEL", self._full_key(key)))
+
+    async def flush(self):
+        """Remove all items with this cache's key prefix from the store."""
+        cursor = b"0"
+        while True:
+            ((cursor, keys),) = await self.execute(
+                ("SCAN", cursor, "MATCH", self._key_prefix + "*", "COUNT", 500)
+            )
+            if keys:
+                await self.execute(("DEL", *keys))
+            if cursor in (b"0", "0"):
+                break
+
+    def acquire(self, key: Text):
+        """Acquire a lock on a given cache key, shared across agent instances."""
+        result = RedisKeyLock(self, key)
+        first = self._key_locks.setdefault(key, result)
+        if first is not result:
+            result.parent = first
+        return result
+
+    async def acquire_remote(self, key: Text) -> Tuple[str, Any]:
+        """
+        Wait for either the fill lock or a cached value for a key.
+
+        Returns:
+            A tuple of the lock token, if the lock was obtained, and the cached value
+
+        """
+        token = uuid4().hex
+        lock_key = self._lock_key(key)
+        lock_ms = max(int(self.lock_ttl * 1000), 1)
+        deadline = time.perf_counter() + self.lock_ttl
+        while True:
+            locked, value = await self.execute(
+                ("SET", lock_key, token, "NX", "PX", lock_ms),
+                ("GET", self._full_key(key)),
+            )
+            if value is not None:
+                if locked:
+                    await self.release_remote(key, token)
+                return None, json.loads(value)
+            if locked:
+                return token, None
+            if time.perf_counter() >= deadline:
+                LOGGER.warning("Timed out waiting for cache lock: %s", key)
+                return None, None
+            await asyncio.sleep(self.lock_poll_interval)
+
+    async def release_remote(self, key: Text, token: str):
+        """Release the fill lock for a key, if it is still held by this token."""
+        # an expired lock may have been taken over by another instance
+        await self.execute(
+            ("EVAL", self.RELEASE_SCRIPT, 1, self._lock_key(key), token)
+        )
+
+    def close(self):
+        """Close all idle server connections."""
+        for conn in self._idle:
+            conn.close()
+        self._idle = []
+
+    def __repr__(self) -> str:
+        """Human readable representation of `RedisCache`."""
+        return "<{}(host={}, port={}, db={})>".format(
+            self.__class__.__name__, self._host, self._port, self._db
+        )
+
+
+class RedisKeyLock(CacheKeyLock):
+    """A cache key lock which also excludes other agent instances."""
+
+    def __init__(self, cache: RedisCache, key: Text):
+        """Initialize the key lock."""
+        super().__init__(cache, key)
+        self._token: str = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await super().__aenter__()
+        if not self.done and not self.parent:
+            self._token, found = await self.cache.acquire_remote(self.key)
+            if found:
+                self._future.set_result(found)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit, releasing the shared lock if held."""
+        try:
+            await super().__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            if self._token:
+                token, self._token = self._token, None
+                await self.cache.release_remote(self.key, token)
@@ -0,0 +1,149 @@
+from asyncio import sleep, wait_for
+import pytest
+
+from ...config.injection_context import InjectionContext
+
+from ..base import CacheError
+from ..basic import BasicCache
+from ..lru import LRUCache
+from ..provider import CacheProvider
+
+
+@pytest.fixture()
+async def cache():
+    cache = LRUCache(max_size=4)
+    await cache.set("valid key", "value")
+    return cache
+
+
+class TestLRUCache:
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        item = await cache.get("doesn't exist")
+        assert item is None
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_get_valid(self, cache):
+        item = await cache.get("valid key")
+        assert item == "value"
+        assert cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_set_multi(self, cache):
+        await cache.set([f"key{i}" for i in range(3)], {"dictkey": "dval"})
+        for key in [f"key{i}" for i in range(3)]:
+            assert await cache.get(key) == {"dictkey": "dval"}
+        assert len(cache) == 4
+
+    @pytest.mark.asyncio
+    async def test_set_expires(self, cache):
+        await cache.set("key", {"dictkey": "dval"}, 0.05)
+        assert await cache.get("key") == {"dictkey": "dval"}
+
+        await sleep(0.05)
+
+        assert await cache.get("key") is None
+        assert cache.expirations == 1
+        assert not cache._expiry
+
+    @pytest.mark.asyncio
+    async def test_set_expires_overwrite(self, cache):
+        await cache.set("key", "short", 0.05)
+        await cache.set("key", "long")
+        await sleep(0.05)
+        assert await cache.get("key") == "long"
+        assert cache.expirations == 0
+
+    @pytest.mark.asyncio
+    async def test_evict_lru(self, cache):
+        await cache.set(["key1", "key2", "key3"], "value")
+        assert await cache.get("valid key") == "value"  # now most recently used
+        await cache.set("key4", "value")
+        assert len(cache) == 4
+        assert cache.evictions == 1
+        assert await cache.get("key1") is None
+        assert await cache.get("valid key") == "value"
+
+    @pytest.mark.asyncio
+    async def test_unbounded(self):
+        cache = LRUCache(max_size=0)
+        await cache.set([f"key{i}" for i in range(100)], "value")
+        assert len(cache) == 100
+        assert cache.evictions == 0
+
+    @pytest.mark.asyncio
+    async def test_compact_expiry(self, cache):
+        for _ in range(100):
+            await cache.set("key", "value", 60)
+        assert len(cache._expiry) <= 2 * len(cache) + 64
+
+    @pytest.mark.asyncio
+    async def test_flush(self, cache):
+        await cache.flush()
+        assert len(cache) == 0
+        assert await cache.get("valid key") is None
+
+    @pytest.mark.asyncio
+    async def test_clear(self, cache):
+        await cache.set("key", "value")
+        await cache.clear("key")
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_stats(self, cache):
+        await cache.get("valid key")
+        await cache.get("missing")
+        assert cache.stats == {
+            "size": 1,
+            "max_size": 4,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_acquire_release_with_waiter(self, cache):
+        test_key = "test_key"
+        test_result = "test_result"
+        lock = cache.acquire(test_key)
+        await lock.__aenter__()
+
+        lock2 = cache.acquire(test_key)
+        assert lock2.parent is lock
+        await lock.set_result(test_result)
+        await lock.__aexit__(None, None, None)
+
+        assert await cache.get(test_key) == test_result
+        assert await wait_for(lock2, 1) == test_result
+
+    @pytest.mark.asyncio
+    async def test_duplicate_set(self, cache):
+        test_key = "test_key"
+        lock = cache.acquire(test_key)
+        async with lock:
+            await lock.set_result("test_result")
+            with pytest.raises(CacheError):
+                await lock.set_result("test_result")
+        assert test_key not in cache._key_locks
+
+    @pytest.mark.asyncio
+    async def test_repr(self, cache):
+        assert isinstance(repr(cache), str)
+
+
+class TestCacheProvider:
+    @pytest.mark.asyncio
+    async def test_provide(self):
+        context = InjectionContext(enforce_typing=False)
+        provider = CacheProvider()
+
+        result = await provider.provide(context.settings, context.injector)
+        assert isinstance(result, BasicCache)
+
+        context.settings["cache.type"] = "lru"
+        context.settings["cache.max_size"] = 5
+        result = await provider.provide(context.settings, context.injector)
+        assert isinstance(result, LRUCache)
+        assert result.max_size == 5
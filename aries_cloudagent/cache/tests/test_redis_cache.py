@@ -0,0 +1,269 @@
+import asyncio
+import fnmatch
+import time
+
+from asyncio import ensure_future, sleep, wait_for
+import pytest
+
+from ...config.injection_context import InjectionContext
+
+from ..base import CacheError
+from ..provider import CacheProvider
+from ..redis import RedisCache, RespConnection
+
+
+class FakeRedisServer:
+    """In-process server implementing the subset of commands used by RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.commands = []
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            size = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    def lookup(self, key):
+        if key in self.expires and self.expires[key] <= time.perf_counter():
+            del self.data[key]
+            del self.expires[key]
+        return self.data.get(key)
+
+    def reply(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(self.reply(v) for v in value)
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def run(self, cmd, args):
+        if cmd == b"PING":
+            return b"+PONG\r\n"
+        if cmd == b"GET":
+            return self.reply(self.lookup(args[0]))
+        if cmd == b"SET":
+            key, value, opts = args[0], args[1], [a.upper() for a in args[2:]]
+            if b"NX" in opts and self.lookup(key) is not None:
+                return self.reply(None)
+            self.data[key] = value
+            self.expires.pop(key, None)
+            if b"PX" in opts:
+                millis = int(args[2 + opts.index(b"PX") + 1])
+                self.expires[key] = time.perf_counter() + millis / 1000
+            return b"+OK\r\n"
+        if cmd == b"DEL":
+            count = 0
+            for key in args:
+                if self.lookup(key) is not None:
+                    del self.data[key]
+                    self.expires.pop(key, None)
+                    count += 1
+            return self.reply(count)
+        if cmd == b"EVAL" and args[0] == RedisCache.RELEASE_SCRIPT.encode():
+            key, token = args[2], args[3]
+            if self.lookup(key) != token:
+                return self.reply(0)
+            return self.run(b"DEL", [key])
+        if cmd == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            keys = [
+                k
+                for k in list(self.data)
+                if self.lookup(k) is not None
+                and fnmatch.fnmatchcase(k.decode(), pattern)
+            ]
+            return self.reply([b"0", keys])
+        return b"-ERR unknown command\r\n"
+
+    async def handle(self, reader, writer):
+        while True:
+            args = await self.read_command(reader)
+            if args is None:
+                break
+            self.commands.append(args)
+            writer.write(self.run(args[0].upper(), args[1:]))
+            await writer.drain()
+        writer.close()
+
+
+@pytest.fixture()
+async def server():
+    server = FakeRedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture()
+async def cache(server):
+    cache = RedisCache(f"redis://127.0.0.1:{server.port}/0", lock_poll_interval=0.01)
+    await cache.set("valid key", "value")
+    yield cache
+    cache.close()
+
+
+class TestRedisCache:
+    def test_encode_command(self):
+        assert (
+            RespConnection.encode_command("SET", "k", b"v", 5)
+            == b"*4\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$1\r\n5\r\n"
+        )
+
+    def test_bad_url(self):
+        with pytest.raises(CacheError):
+            RedisCache("http://localhost")
+
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        assert await cache.get("doesn't exist") is None
+
+    @pytest.mark.asyncio
+    async def test_get_valid(self, cache, server):
+        assert await cache.get("valid key") == "value"
+        assert b"acapy::valid key" in server.data
+
+    @pytest.mark.asyncio
+    async def test_set_multi_pipelined(self, cache):
+        await cache.set([f"key{i}" for i in range(4)], {"dictkey": "dval"})
+        for key in [f"key{i}" for i in range(4)]:
+            assert await cache.get(key) == {"dictkey": "dval"}
+
+    @pytest.mark.asyncio
+    async def test_set_expires(self, cache, server):
+        await cache.set("key", {"dictkey": "dval"}, 0.05)
+        assert server.expires[b"acapy::key"]
+        assert await cache.get("key") == {"dictkey": "dval"}
+
+        await sleep(0.05)
+
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_clear(self, cache):
+        await cache.set("key", "value")
+        await cache.clear("key")
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_flush(self, cache, server):
+        server.data[b"other::key"] = b"1"
+        await cache.flush()
+        assert await cache.get("valid key") is None
+        assert server.data == {b"other::key": b"1"}
+
+    @pytest.mark.asyncio
+    async def test_error_reply(self, cache):
+        with pytest.raises(CacheError):
+            await cache.execute(("BADCOMMAND",))
+
+    @pytest.mark.asyncio
+    async def test_connect_error(self, server):
+        port = server.port
+        await server.stop()
+        cache = RedisCache(f"redis://127.0.0.1:{port}")
+        with pytest.raises(CacheError):
+            await cache.get("key")
+
+    @pytest.mark.asyncio
+    async def test_acquire_fill(self, cache, server):
+        test_key = "test_key"
+        async with cache.acquire(test_key) as entry:
+            assert not entry.done
+            assert server.data.get(b"acapy::lock::test_key")
+            await entry.set_result("test_result")
+        assert b"acapy::lock::test_key" not in server.data
+        assert test_key not in cache._key_locks
+        assert await cache.get(test_key) == "test_result"
+
+    @pytest.mark.asyncio
+    async def test_acquire_populated(self, cache):
+        async with cache.acquire("valid key") as entry:
+            assert entry.done
+            assert entry.result == "value"
+
+    @pytest.mark.asyncio
+    async def test_acquire_distributed(self, server, cache):
+        other = RedisCache(f"redis://127.0.0.1:{server.port}", lock_poll_interval=0.01)
+        test_key = "test_key"
+        lock = cache.acquire(test_key)
+        await lock.__aenter__()
+
+        async def wait_other():
+            async with other.acquire(test_key) as entry:
+                return entry.result
+
+        waiter = ensure_future(wait_other())
+        await sleep(0.05)
+        assert not waiter.done()  # blocked by first instance
+        await lock.set_result("test_result")
+        await lock.__aexit__(None, None, None)
+        assert await wait_for(waiter, 1) == "test_result"
+        other.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_distributed_abandoned(self, server, cache):
+        other = RedisCache(f"redis://127.0.0.1:{server.port}", lock_poll_interval=0.01)
+        lock = cache.acquire("test_key")
+        await lock.__aenter__()
+
+        async def wait_other():
+            async with other.acquire("test_key") as entry:
+                assert not entry.done
+                await entry.set_result("other_result")
+
+        waiter = ensure_future(wait_other())
+        await sleep(0.05)
+        await lock.__aexit__(None, None, None)  # no result produced
+        await wait_for(waiter, 1)
+        assert await cache.get("test_key") == "other_result"
+        other.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_release_stale_token(self, cache, server):
+        await cache.release_remote("test_key", "token")
+        server.data[b"acapy::lock::test_key"] = b"other"
+        await cache.release_remote("test_key", "token")
+        assert server.data[b"acapy::lock::test_key"] == b"other"
+        await cache.release_remote("test_key", "other")
+        assert b"acapy::lock::test_key" not in server.data
+        # the token is compared and the lock removed in a single command
+        assert [cmd[0] for cmd in server.commands[-3:]] == [b"EVAL"] * 3
+
+    @pytest.mark.asyncio
+    async def test_repr(self, cache):
+        assert isinstance(repr(cache), str)
+
+
+class TestRedisCacheProvider:
+    @pytest.mark.asyncio
+    async def test_provide(self):
+        context = InjectionContext(enforce_typing=False)
+        context.settings["cache.type"] = "redis"
+        context.settings["cache.url"] = "redis://:pass@cachehost:6380/2"
+        context.settings["cache.key_prefix"] = "agent::"
+        result = await CacheProvider().provide(context.settings, context.injector)
+        assert isinstance(result, RedisCache)
+        assert result._host == "cachehost"
+        assert result._port == 6380
+        assert result._db == 2
+        assert result._password == "pass"
+        assert result._key_prefix == "agent::"
@@ -137,6 +137,25 @@ class AdminGroup(ArgumentGroup):
             help="A URL to an administrative interface help web page that a controller\
             user interface can get from the agent and provide as a link to users.",
         )
+        parser.add_argument(
+            "--admin-websocket-buffer",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_ADMIN_WEBSOCKET_BUFFER",
+            help="The maximum number of events buffered for each admin websocket\
+            client which has not yet received them. Default: 1000.",
+        )
+        parser.add_argument(
+            "--admin-websocket-overflow",
+            type=str,
+            choices=["drop", "disconnect"],
+            metavar="<policy>",
+            env_var="ACAPY_ADMIN_WEBSOCKET_OVERFLOW",
+            help="The action taken when the event buffer of an admin websocket\
+            client is full: 'drop' discards the oldest buffered event, while\
+            'disconnect' closes the websocket so that the client can reconnect\
+            and resynchronize. Default: drop.",
+        )
         parser.add_argument(
             "--webhook-url",
             action="append",
@@ -147,6 +166,44 @@ class AdminGroup(ArgumentGroup):
             to those events using the admin API. If not specified, webhooks are not\
             published by the agent.",
         )
+        parser.add_argument(
+            "--webhook-batch-size",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_WEBHOOK_BATCH_SIZE",
+            help="Deliver webhooks in batches of up to <count> events for each\
+            webhook target, posted as a JSON list of objects with 'topic' and\
+            'payload' properties to the '/batch/' path of the target URL. The\
+            events for each target are delivered in order. If not specified,\
+            each webhook is posted separately.",
+        )
+        parser.add_argument(
+            "--webhook-batch-delay",
+            type=float,
+            metavar="<seconds>",
+            env_var="ACAPY_WEBHOOK_BATCH_DELAY",
+            help="The maximum number of seconds a webhook event waits for its\
+            batch to fill before the batch is sent. Only used with\
+            '--webhook-batch-size'. Default: 0.1.",
+        )
+        parser.add_argument(
+            "--webhook-coalesce",
+            action="store_true",
+            env_var="ACAPY_WEBHOOK_COALESCE",
+            help="When batching webhooks, replace a record state update which\
+            is still waiting to be sent with any later update for the same\
+            record, so that only the latest state is delivered. Only used with\
+            '--webhook-batch-size'. Default: false.",
+        )
+        parser.add_argument(
+            "--webhook-concurrency",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_WEBHOOK_CONCURRENCY",
+            help="The maximum number of webhook batches being delivered at the\
+            same time, across all webhook targets. Only used with\
+            '--webhook-batch-size'. Default: 10.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract admin settings."""
@@ -173,11 +230,23 @@ class AdminGroup(ArgumentGroup):
                 settings["admin.help_link"] = args.help_link
             if args.no_receive_invites:
                 settings["admin.no_receive_invites"] = True
+            if args.admin_websocket_buffer:
+                settings["admin.websocket_buffer_size"] = args.admin_websocket_buffer
+            if args.admin_websocket_overflow:
+                settings["admin.websocket_overflow"] = args.admin_websocket_overflow
             hook_urls = list(args.webhook_url) if args.webhook_url else []
             hook_url = environ.get("WEBHOOK_URL")
             if hook_url:
                 hook_urls.append(hook_url)
             settings["admin.webhook_urls"] = hook_urls
+            if args.webhook_batch_size:
+                settings["admin.webhook_batch_size"] = args.webhook_batch_size
+                if args.webhook_batch_delay is not None:
+                    settings["admin.webhook_batch_delay"] = args.webhook_batch_delay
+                if args.webhook_coalesce:
+                    settings["admin.webhook_coalesce"] = True
+                if args.webhook_concurrency:
+                    settings["admin.webhook_concurrency"] = args.webhook_concurrency
         return settings
 
 
@@ -424,6 +493,44 @@ class GeneralGroup(ArgumentGroup):
             and 'indy'.  The default (if not specified) is 'indy' if the wallet type\
             is set to 'indy', otherwise 'basic'.",
         )
+        parser.add_argument(
+            "--cache-type",
+            type=str,
+            metavar="<cache-type>",
+            env_var="ACAPY_CACHE_TYPE",
+            help="Specifies the type of cache used for ledger artifacts, connection\
+            targets and cached records. Supported cache types are 'basic'\
+            (unbounded memory), 'lru' (bounded memory with least recently used\
+            eviction) and 'redis' (shared between agent instances through a\
+            Redis-protocol server, see --cache-url). A custom cache class may be\
+            given as a module path. Default: 'basic'.",
+        )
+        parser.add_argument(
+            "--cache-max-size",
+            type=int,
+            metavar="<entries>",
+            env_var="ACAPY_CACHE_MAX_SIZE",
+            help="Sets the maximum number of entries held by a bounded cache type\
+            such as 'lru'. A value of 0 disables the limit. Default: 10000.",
+        )
+        parser.add_argument(
+            "--cache-url",
+            type=str,
+            metavar="<cache-url>",
+            env_var="ACAPY_CACHE_URL",
+            help="Specifies the address of the shared cache server used by the\
+            'redis' cache type, in the form redis://[:password@]host:port/db.\
+            Default: 'redis://localhost:6379/0'.",
+        )
+        parser.add_argument(
+            "--cache-key-prefix",
+            type=str,
+            metavar="<prefix>",
+            env_var="ACAPY_CACHE_KEY_PREFIX",
+            help="Specifies a prefix for all keys written to a shared cache server.\
+            Agent instances sharing cached entries must use the same prefix.\
+            Default: 'acapy::'.",
+        )
         parser.add_argument(
             "-e",
             "--endpoint",
@@ -462,6 +569,43 @@ class GeneralGroup(ArgumentGroup):
             env_var="ACAPY_TAILS_SERVER_BASE_URL",
             help="Sets the base url of the tails server in use.",
         )
+        parser.add_argument(
+            "--revocation-publish-interval",
+            type=float,
+            metavar="<seconds>",
+            env_var="ACAPY_REVOCATION_PUBLISH_INTERVAL",
+            help="Publish revocations left pending publication in the background,\
+            in batches collected for up to this many seconds after the first\
+            revocation in each batch. Default: revocations are only published\
+            on request.",
+        )
+        parser.add_argument(
+            "--revocation-publish-max-pending",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_REVOCATION_PUBLISH_MAX_PENDING",
+            help="Publish a batch of pending revocations in the background as soon\
+            as this many are pending, without waiting for the publish interval.\
+            Default: 100.",
+        )
+        parser.add_argument(
+            "--revocation-publish-concurrency",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_REVOCATION_PUBLISH_CONCURRENCY",
+            help="Sets the maximum number of revocation registry entries written to\
+            the ledger at once by the background revocation publisher.\
+            Default: 4.",
+        )
+        parser.add_argument(
+            "--revocation-publish-attempts",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_REVOCATION_PUBLISH_ATTEMPTS",
+            help="Sets the number of attempts made by the background revocation\
+            publisher to write each revocation registry entry to the ledger,\
+            retrying transient ledger failures. Default: 3.",
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract general settings."""
@@ -470,6 +614,14 @@ class GeneralGroup(ArgumentGroup):
             settings["external_plugins"] = args.external_plugins
         if args.storage_type:
             settings["storage_type"] = args.storage_type
+        if args.cache_type:
+            settings["cache.type"] = args.cache_type
+        if args.cache_max_size is not None:
+            settings["cache.max_size"] = args.cache_max_size
+        if args.cache_url:
+            settings["cache.url"] = args.cache_url
+        if args.cache_key_prefix:
+            settings["cache.key_prefix"] = args.cache_key_prefix
 
         if args.endpoint:
             settings["default_endpoint"] = args.endpoint[0]
@@ -483,6 +635,18 @@ class GeneralGroup(ArgumentGroup):
             settings["read_only_ledger"] = True
         if args.tails_server_base_url:
             settings["tails_server_base_url"] = args.tails_server_base_url
+        if args.revocation_publish_interval:
+            settings["revocation.publish_interval"] = args.revocation_publish_interval
+        if args.revocation_publish_max_pending:
+            settings[
+                "revocation.publish_max_pending"
+            ] = args.revocation_publish_max_pending
+        if args.revocation_publish_concurrency:
+            settings[
+                "revocation.publish_concurrency"
+            ] = args.revocation_publish_concurrency
+        if args.revocation_publish_attempts:
+            settings["revocation.publish_attempts"] = args.revocation_publish_attempts
         return settings
 
 
@@ -539,6 +703,26 @@ class LedgerGroup(ArgumentGroup):
             This must be set if running in no-ledger mode.  Overrides any\
             specified ledger or genesis configurations.  Default: false.",
         )
+        parser.add_argument(
+            "--revocation-cache-ttl",
+            type=int,
+            metavar="<seconds>",
+            env_var="ACAPY_REVOCATION_CACHE_TTL",
+            help="Specifies the number of seconds for which revocation registry\
+            definitions, and registry entries and deltas at settled times, are kept\
+            in the cache. These never change on the ledger, but an unbounded cache\
+            type would otherwise hold them indefinitely. Default: 86400.",
+        )
+        parser.add_argument(
+            "--revocation-delta-tolerance",
+            type=int,
+            metavar="<seconds>",
+            env_var="ACAPY_REVOCATION_DELTA_TOLERANCE",
+            help="Specifies the number of seconds by which a cached revocation\
+            registry delta for a recent interval may be behind the end of a\
+            requested interval. Set to 0 to always fetch recent deltas from the\
+            ledger. Default: 10.",
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract ledger settings."""
@@ -558,6 +742,12 @@ class LedgerGroup(ArgumentGroup):
                 )
             if args.ledger_pool_name:
                 settings["ledger.pool_name"] = args.ledger_pool_name
+            if args.revocation_cache_ttl is not None:
+                settings["ledger.revocation_cache_ttl"] = args.revocation_cache_ttl
+            if args.revocation_delta_tolerance is not None:
+                settings[
+                    "ledger.revocation_delta_tolerance"
+                ] = args.revocation_delta_tolerance
         return settings
 
 
@@ -651,7 +841,9 @@ class ProtocolGroup(ArgumentGroup):
             "--timing",
             action="store_true",
             env_var="ACAPY_TIMING",
-            help="Include timing information in response messages.",
+            help="Include timing information in response messages, and collect\
+            timing statistics and queue depths for the '/status' and '/metrics'\
+            admin endpoints.",
         )
         parser.add_argument(
             "--timing-log",
@@ -826,6 +1018,17 @@ class TransportGroup(ArgumentGroup):
             to hold messages for delivery to agents without an endpoint. This\
             option will require additional memory to store messages in the queue.",
         )
+        parser.add_argument(
+            "--inbound-workers",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_INBOUND_WORKERS",
+            help="Parse and dispatch inbound messages in the specified number of\
+            worker processes, while inbound transports and sessions remain in\
+            the main process. Each worker opens the agent wallet, which must\
+            support access from multiple processes: a wallet of type 'basic'\
+            cannot be used. Default: messages are handled in the main process.",
+        )
         parser.add_argument(
             "--max-outbound-retry",
             default=4,
@@ -835,6 +1038,52 @@ class TransportGroup(ArgumentGroup):
             messages. Increasing this number might cause to increase the\
             accumulated messages in message queue. Default value is 4.",
         )
+        parser.add_argument(
+            "--outbound-concurrency",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_CONCURRENCY",
+            help="Set the maximum number of outbound deliveries in progress at\
+            once, across all endpoints. Default: 200.",
+        )
+        parser.add_argument(
+            "--outbound-endpoint-concurrency",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_ENDPOINT_CONCURRENCY",
+            help="Set the maximum number of outbound deliveries in progress at\
+            once to a single endpoint host. Endpoints with messages waiting are\
+            served in turn, so one slow endpoint cannot occupy every delivery\
+            slot. Default: 20.",
+        )
+        parser.add_argument(
+            "--outbound-failure-threshold",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_FAILURE_THRESHOLD",
+            help="Set the number of consecutive delivery failures after which\
+            deliveries to an endpoint are suspended for a backoff period.\
+            Default: 5.",
+        )
+        parser.add_argument(
+            "--outbound-backoff",
+            type=float,
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_BACKOFF",
+            help="Set the initial number of seconds for which deliveries to a\
+            failing endpoint are suspended. The period doubles each time a trial\
+            delivery fails, up to 300 seconds. Default: 10.",
+        )
+        parser.add_argument(
+            "--outbound-queue-path",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_OUTBOUND_QUEUE_PATH",
+            help="Keep a log of outbound messages awaiting delivery in the given\
+            file. Messages not yet delivered when the agent stops are delivered\
+            again after a restart, so a message may be received more than once.\
+            Default: undelivered messages are held in memory only.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract transport settings."""
@@ -848,6 +1097,8 @@ class TransportGroup(ArgumentGroup):
         else:
             raise ArgsParseError("-ot/--outbound-transport is required")
         settings["transport.enable_undelivered_queue"] = args.enable_undelivered_queue
+        if args.inbound_workers:
+            settings["transport.inbound_workers"] = args.inbound_workers
 
         if args.label:
             settings["default_label"] = args.label
@@ -855,6 +1106,20 @@ class TransportGroup(ArgumentGroup):
             settings["transport.max_message_size"] = args.max_message_size
         if args.max_outbound_retry:
             settings["transport.max_outbound_retry"] = args.max_outbound_retry
+        if args.outbound_concurrency:
+            settings["transport.outbound_concurrency"] = args.outbound_concurrency
+        if args.outbound_endpoint_concurrency:
+            settings[
+                "transport.outbound_endpoint_concurrency"
+            ] = args.outbound_endpoint_concurrency
+        if args.outbound_failure_threshold:
+            settings[
+                "transport.outbound_failure_threshold"
+            ] = args.outbound_failure_threshold
+        if args.outbound_backoff:
+            settings["transport.outbound_backoff"] = args.outbound_backoff
+        if args.outbound_queue_path:
+            settings["transport.outbound_queue_path"] = args.outbound_queue_path
 
         return settings
 
@@ -955,6 +1220,35 @@ class WalletGroup(ArgumentGroup):
             admin_user must have the CREATEDB role or else initialization\
             will fail.',
         )
+        parser.add_argument(
+            "--wallet-crypto-workers",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_WALLET_CRYPTO_WORKERS",
+            help="Specifies the number of workers in a dedicated pool for packing\
+            and unpacking messages with the 'basic' wallet. By default the\
+            shared thread pool of the event loop is used.",
+        )
+        parser.add_argument(
+            "--wallet-crypto-executor",
+            type=str,
+            choices=["thread", "process"],
+            metavar="<executor-type>",
+            env_var="ACAPY_WALLET_CRYPTO_EXECUTOR",
+            help="Specifies whether the '--wallet-crypto-workers' pool is a pool\
+            of threads ('thread') or processes ('process'). Default: 'thread'.",
+        )
+        parser.add_argument(
+            "--wallet-pack-key-cache",
+            type=int,
+            metavar="<entries>",
+            env_var="ACAPY_WALLET_PACK_KEY_CACHE",
+            help="Enables a cache of the keys derived for packing and unpacking\
+            messages between the same sender and recipient keys with the\
+            'basic' wallet, holding up to this many entries. Cached keys are\
+            wiped when a DID key is rotated. Not used with a process pool.\
+            Default: disabled.",
+        )
         parser.add_argument(
             "--replace-public-did",
             action="store_true",
@@ -985,6 +1279,12 @@ class WalletGroup(ArgumentGroup):
             settings["wallet.storage_config"] = args.wallet_storage_config
         if args.wallet_storage_creds:
             settings["wallet.storage_creds"] = args.wallet_storage_creds
+        if args.wallet_crypto_workers:
+            settings["wallet.crypto_workers"] = args.wallet_crypto_workers
+        if args.wallet_crypto_executor:
+            settings["wallet.crypto_executor"] = args.wallet_crypto_executor
+        if args.wallet_pack_key_cache:
+            settings["wallet.pack_key_cache"] = args.wallet_pack_key_cache
         if args.replace_public_did:
             settings["wallet.replace_public_did"] = True
         # check required settings for 'indy' wallets
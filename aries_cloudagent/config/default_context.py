@@ -5,7 +5,7 @@ from .injection_context import InjectionContext
 from .provider import CachedProvider, ClassProvider, StatsProvider
 
 from ..cache.base import BaseCache
-from ..cache.basic import BasicCache
+from ..cache.provider import CacheProvider
 from ..core.plugin_registry import PluginRegistry
 from ..core.protocol_registry import ProtocolRegistry
 from ..ledger.base import BaseLedger
@@ -20,6 +20,7 @@ from ..protocols.actionmenu.v1_0.driver_service import DriverMenuService
 from ..protocols.didcomm_prefix import DIDCommPrefix
 from ..protocols.introduction.v0_1.base_service import BaseIntroductionService
 from ..protocols.introduction.v0_1.demo_service import DemoIntroductionService
+from ..protocols.routing.v1_0.routing_table import RoutingTable
 
 from ..storage.base import BaseStorage
 from ..storage.provider import StorageProvider
@@ -42,12 +43,17 @@ class DefaultContextBuilder(ContextBuilder):
             collector = Collector(log_path=timing_log)
             context.injector.bind_instance(Collector, collector)
 
-        # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, BasicCache())
+        # Shared cache
+        context.injector.bind_provider(BaseCache, CachedProvider(CacheProvider()))
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
 
+        # Shared table of forward routes: each inbound worker process would hold
+        # its own copy, not updated with the routes changed by the others
+        if not context.settings.get("transport.inbound_workers"):
+            context.injector.bind_instance(RoutingTable, RoutingTable())
+
         await self.bind_providers(context)
         await self.load_plugins(context)
 
@@ -42,6 +42,14 @@ class TestArgParse(AsyncTestCase):
                 "http",
                 "--max-outbound-retry",
                 "5",
+                "--outbound-endpoint-concurrency",
+                "4",
+                "--outbound-backoff",
+                "2.5",
+                "--outbound-queue-path",
+                "/tmp/outbound.log",
+                "--inbound-workers",
+                "4",
             ]
         )
 
@@ -53,6 +61,75 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
+        assert settings.get("transport.outbound_endpoint_concurrency") == 4
+        assert settings.get("transport.outbound_backoff") == 2.5
+        assert settings.get("transport.outbound_queue_path") == "/tmp/outbound.log"
+        assert settings.get("transport.inbound_workers") == 4
+        assert "transport.outbound_concurrency" not in settings
+
+    async def test_ledger_revocation_cache_settings(self):
+        """Test revocation cache argument parsing."""
+
+        parser = argparse.create_argument_parser()
+        group = argparse.LedgerGroup()
+        group.add_arguments(parser)
+
+        args = ["--genesis-url", "http://localhost:9000/genesis"]
+        settings = group.get_settings(parser.parse_args(args))
+        assert "ledger.revocation_cache_ttl" not in settings
+        assert "ledger.revocation_delta_tolerance" not in settings
+
+        result = parser.parse_args(
+            args
+            + [
+                "--revocation-cache-ttl",
+                "3600",
+                "--revocation-delta-tolerance",
+                "0",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("ledger.revocation_cache_ttl") == 3600
+        assert settings.get("ledger.revocation_delta_tolerance") == 0
+
+    async def test_admin_event_settings(self):
+        """Test webhook and websocket event argument parsing."""
+
+        parser = argparse.create_argument_parser()
+        group = argparse.AdminGroup()
+        group.add_arguments(parser)
+
+        args = ["--admin", "0.0.0.0", "8080", "--admin-insecure-mode"]
+        result = parser.parse_args(args + ["--webhook-coalesce"])
+        settings = group.get_settings(result)
+        assert "admin.webhook_batch_size" not in settings
+        assert "admin.webhook_coalesce" not in settings
+
+        result = parser.parse_args(
+            args
+            + [
+                "--webhook-url",
+                "http://localhost:8022/webhooks",
+                "--webhook-batch-size",
+                "50",
+                "--webhook-batch-delay",
+                "0.5",
+                "--webhook-coalesce",
+                "--webhook-concurrency",
+                "3",
+                "--admin-websocket-buffer",
+                "200",
+                "--admin-websocket-overflow",
+                "disconnect",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("admin.webhook_batch_size") == 50
+        assert settings.get("admin.webhook_batch_delay") == 0.5
+        assert settings.get("admin.webhook_coalesce") is True
+        assert settings.get("admin.webhook_concurrency") == 3
+        assert settings.get("admin.websocket_buffer_size") == 200
+        assert settings.get("admin.websocket_overflow") == "disconnect"
 
     async def test_general_settings_file(self):
         """Test file argument parsing."""
@@ -74,11 +151,18 @@ class TestArgParse(AsyncTestCase):
 
         assert result.external_plugins == ["foo"]
         assert result.storage_type == "bar"
+        assert result.cache_type == "lru"
+        assert result.cache_max_size == 100
 
         settings = group.get_settings(result)
 
         assert settings.get("external_plugins") == ["foo"]
         assert settings.get("storage_type") == "bar"
+        assert settings.get("cache.type") == "lru"
+        assert settings.get("cache.max_size") == 100
+        assert settings.get("revocation.publish_interval") == 2.5
+        assert settings.get("revocation.publish_concurrency") == 2
+        assert "revocation.publish_max_pending" not in settings
 
     async def test_transport_settings_file(self):
         """Test file argument parsing."""
@@ -3,6 +3,7 @@ from tempfile import NamedTemporaryFile
 from asynctest import TestCase as AsyncTestCase
 
 from ...core.protocol_registry import ProtocolRegistry
+from ...protocols.routing.v1_0.routing_table import RoutingTable
 from ...storage.base import BaseStorage
 from ...transport.wire_format import BaseWireFormat
 from ...wallet.base import BaseWallet
@@ -24,9 +25,15 @@ class TestDefaultContext(AsyncTestCase):
             ProtocolRegistry,
             BaseWallet,
             BaseStorage,
+            RoutingTable,
         ):
             assert isinstance(await result.inject(cls), cls)
 
+        # routes are looked up in storage when handled by inbound workers
+        builder = DefaultContextBuilder(settings={"transport.inbound_workers": 2})
+        result = await builder.build()
+        assert await result.inject(RoutingTable, required=False) is None
+
         builder = DefaultContextBuilder(
             settings={
                 "timing.enabled": True,
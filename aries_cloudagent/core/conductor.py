@@ -8,11 +8,15 @@ wallet.
 
 """
 
+import asyncio
+import functools
 import hashlib
 import logging
 
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminServer
+from ..cache.base import BaseCache
+from ..config.base import ConfigError
 from ..config.default_context import ContextBuilder
 from ..config.injection_context import InjectionContext
 from ..config.ledger import ledger_config
@@ -24,16 +28,23 @@ from ..protocols.connections.v1_0.manager import (
     ConnectionManager,
     ConnectionManagerError,
 )
+from ..protocols.didcomm_prefix import DIDCommPrefix
+from ..protocols.routing.v1_0.manager import RoutingManager, RoutingManagerError
+from ..protocols.routing.v1_0.message_types import FORWARD
+from ..revocation.publisher import RevocationPublisher
 from ..transport.inbound.manager import InboundTransportManager
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.base import OutboundDeliveryError
-from ..transport.outbound.manager import OutboundTransportManager, QueuedOutboundMessage
+from ..transport.outbound.manager import OutboundTransportManager
 from ..transport.outbound.message import OutboundMessage
 from ..transport.wire_format import BaseWireFormat
 from ..utils.task_queue import CompletedTask, TaskQueue
 from ..utils.stats import Collector
+from ..utils.tracing import TRACE_EXPORTER
 
 from .dispatcher import Dispatcher
+from .protocol_registry import ProtocolRegistry
+from .worker_pool import InboundWorkerPool
 
 LOGGER = logging.getLogger(__name__)
 
@@ -61,6 +72,7 @@ class Conductor:
         self.context_builder = context_builder
         self.dispatcher: Dispatcher = None
         self.inbound_transport_manager: InboundTransportManager = None
+        self.inbound_worker_pool: InboundWorkerPool = None
         self.outbound_transport_manager: OutboundTransportManager = None
 
     async def setup(self):
@@ -94,6 +106,23 @@ class Conductor:
         if not await ledger_config(context, public_did):
             LOGGER.warning("No ledger configured")
 
+        # Parse and dispatch inbound messages in worker processes
+        inbound_workers = context.settings.get("transport.inbound_workers")
+        if inbound_workers:
+            if (context.settings.get("wallet.type") or "basic").lower() == "basic":
+                raise ConfigError(
+                    "Inbound workers require a wallet which can be opened by "
+                    "multiple processes"
+                )
+            self.inbound_worker_pool = InboundWorkerPool(
+                context.settings,
+                inbound_workers,
+                functools.partial(self.outbound_message_router, context),
+                self.send_worker_webhook,
+                self.worker_dispatch_complete,
+            )
+            self.inbound_transport_manager.worker_pool = self.inbound_worker_pool
+
         # Admin API
         if context.settings.get("admin.enabled"):
             try:
@@ -108,6 +137,7 @@ class Conductor:
                     self.stop,
                     self.dispatcher.task_queue,
                     self.get_stats,
+                    self.get_endpoint_stats,
                 )
                 webhook_urls = context.settings.get("admin.webhook_urls")
                 if webhook_urls:
@@ -120,9 +150,25 @@ class Conductor:
                 LOGGER.exception("Unable to register admin server")
                 raise
 
+        # Background publisher of pending revocations
+        publish_interval = context.settings.get("revocation.publish_interval")
+        if publish_interval:
+            publisher = RevocationPublisher(
+                context,
+                interval=publish_interval,
+                max_pending=context.settings.get("revocation.publish_max_pending", 100),
+                max_concurrent=context.settings.get(
+                    "revocation.publish_concurrency", 4
+                ),
+                max_attempts=context.settings.get("revocation.publish_attempts", 3),
+            )
+            context.injector.bind_instance(RevocationPublisher, publisher)
+
         # Fetch stats collector, if any
         collector = await context.inject(Collector, required=False)
         if collector:
+            # queue depths are read when metrics are requested
+            collector.add_gauges("conductor", self.queue_stats)
             # add stats to our own methods
             collector.wrap(
                 self,
@@ -149,6 +195,10 @@ class Conductor:
 
         context = self.context
 
+        # Start up inbound workers before the transports which feed them
+        if self.inbound_worker_pool:
+            self.inbound_worker_pool.start()
+
         # Start up transports
         try:
             await self.inbound_transport_manager.start()
@@ -172,6 +222,11 @@ class Conductor:
             # for example
             context.injector.bind_instance(BaseResponder, self.admin_server.responder)
 
+        # Start publishing pending revocations
+        publisher = await context.inject(RevocationPublisher, required=False)
+        if publisher:
+            publisher.start()
+
         # Get agent label
         default_label = context.settings.get("default_label")
 
@@ -231,9 +286,30 @@ class Conductor:
             shutdown.run(self.admin_server.stop())
         if self.inbound_transport_manager:
             shutdown.run(self.inbound_transport_manager.stop())
+        if self.inbound_worker_pool:
+            shutdown.run(self.inbound_worker_pool.stop(timeout))
         if self.outbound_transport_manager:
             shutdown.run(self.outbound_transport_manager.stop())
+        publisher = self.context and await self.context.inject(
+            RevocationPublisher, required=False
+        )
+        if publisher:
+            # pending revocations remain in storage, to publish on next start
+            shutdown.run(publisher.stop(flush=False))
         await shutdown.complete(timeout)
+        cache = self.context and await self.context.inject(BaseCache, required=False)
+        if cache:
+            cache.close()
+        wire_format = self.context and await self.context.inject(
+            BaseWireFormat, required=False
+        )
+        if wire_format:
+            wire_format.close()
+        # send any trace events still buffered
+        try:
+            await asyncio.wait_for(TRACE_EXPORTER.close(), timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning("Timed out sending buffered trace events")
 
     def inbound_message_router(
         self, message: InboundMessage, can_respond: bool = False
@@ -253,22 +329,80 @@ class Conductor:
                 message.transport_type,
             )
 
-        # Note: at this point we could send the message to a shared queue
-        # if this pod is too busy to process it
+        # Note: with inbound workers enabled, messages are parsed and
+        # dispatched by the worker processes and are not routed here
 
         try:
-            self.dispatcher.queue_message(
-                message,
-                self.outbound_message_router,
-                self.admin_server and self.admin_server.send_webhook,
-                lambda completed: self.dispatch_complete(message, completed),
-            )
+            if self.is_relay_forward(message):
+                self.dispatcher.put_task(
+                    self.relay_forward(message),
+                    lambda completed: self.dispatch_complete(message, completed),
+                    "Conductor.relay_forward",
+                )
+            else:
+                self.dispatcher.queue_message(
+                    message,
+                    self.outbound_message_router,
+                    self.admin_server and self.admin_server.send_webhook,
+                    lambda completed: self.dispatch_complete(message, completed),
+                )
         except (LedgerConfigError, LedgerTransactionError) as e:
             LOGGER.error("Shutdown on ledger error %s", str(e))
             if self.admin_server:
                 self.admin_server.notify_fatal_error()
             raise
 
+    def is_relay_forward(self, message: InboundMessage) -> bool:
+        """
+        Determine if an inbound message is a forward to relay as-is.
+
+        The wire format leaves the message inside a packed forward message
+        serialized, in which case it is relayed without being dispatched.
+        """
+        payload = message.payload
+        return (
+            isinstance(payload, dict)
+            and isinstance(payload.get("msg"), str)
+            and bool(message.receipt.recipient_verkey)
+            and DIDCommPrefix.unqualify(payload.get("@type")) == FORWARD
+        )
+
+    async def relay_forward(self, message: InboundMessage):
+        """
+        Relay a forward message to the connection registered for its recipient.
+
+        This is equivalent to the forward message handler, without the overhead of
+        deserializing the message and setting up a request context.
+
+        Args:
+            message: The inbound forward message, with the forwarded message
+                serialized
+
+        """
+        forward = message.payload
+        LOGGER.info("Received forward for: %s", message.receipt.recipient_verkey)
+
+        try:
+            recipient = await RoutingManager(self.context).get_recipient(
+                forward["to"]
+            )
+            connection_targets = await ConnectionManager(
+                self.context
+            ).get_connection_targets(connection_id=recipient.connection_id)
+        except (ConnectionManagerError, RoutingManagerError):
+            LOGGER.exception("Error resolving recipient for forwarded message")
+            return
+
+        LOGGER.info("Forwarding message to connection: %s", recipient.connection_id)
+        outbound = OutboundMessage(
+            connection_id=recipient.connection_id,
+            enc_payload=forward["msg"].encode("utf-8"),
+            payload=None,
+            reply_to_verkey=connection_targets[0].recipient_keys[0],
+            target_list=connection_targets,
+        )
+        await self.outbound_message_router(self.context, outbound, message)
+
     def dispatch_complete(self, message: InboundMessage, completed: CompletedTask):
         """Handle completion of message dispatch."""
         if completed.exc_info:
@@ -293,24 +427,51 @@ class Conductor:
                 )
         self.inbound_transport_manager.dispatch_complete(message, completed)
 
+    def worker_dispatch_complete(self, message: InboundMessage, fatal: bool = False):
+        """Handle completion of message dispatch by an inbound worker."""
+        if fatal:
+            LOGGER.error("Inbound worker reported a ledger error")
+            if self.admin_server:
+                self.admin_server.notify_fatal_error()
+        self.inbound_transport_manager.dispatch_complete(message, None)
+
+    async def send_worker_webhook(self, topic: str, payload: dict):
+        """Dispatch a webhook produced by an inbound worker."""
+        if self.admin_server:
+            await self.admin_server.send_webhook(topic, payload)
+
+    def queue_stats(self) -> dict:
+        """Get the current depth of the inbound, dispatch and outbound queues."""
+        stats = self.inbound_transport_manager.queue_stats
+        stats.update(
+            {
+                "task_active": self.dispatcher.task_queue.current_active,
+                "task_done": self.dispatcher.task_queue.total_done,
+                "task_failed": self.dispatcher.task_queue.total_failed,
+                "task_pending": self.dispatcher.task_queue.current_pending,
+            }
+        )
+        stats.update(self.outbound_transport_manager.queue_stats)
+        if self.inbound_worker_pool:
+            stats.update(self.inbound_worker_pool.queue_stats)
+        return stats
+
     async def get_stats(self) -> dict:
         """Get the current stats tracked by the conductor."""
-        stats = {
-            "in_sessions": len(self.inbound_transport_manager.sessions),
-            "out_encode": 0,
-            "out_deliver": 0,
-            "task_active": self.dispatcher.task_queue.current_active,
-            "task_done": self.dispatcher.task_queue.total_done,
-            "task_failed": self.dispatcher.task_queue.total_failed,
-            "task_pending": self.dispatcher.task_queue.current_pending,
-        }
-        for m in self.outbound_transport_manager.outbound_buffer:
-            if m.state == QueuedOutboundMessage.STATE_ENCODE:
-                stats["out_encode"] += 1
-            if m.state == QueuedOutboundMessage.STATE_DELIVER:
-                stats["out_deliver"] += 1
+        stats = self.queue_stats()
+        registry: ProtocolRegistry = await self.context.inject(
+            ProtocolRegistry, required=False
+        )
+        if registry:
+            stats["message_types"] = registry.resolution_stats
+        if self.inbound_worker_pool:
+            stats["inbound_workers"] = self.inbound_worker_pool.worker_stats
         return stats
 
+    async def get_endpoint_stats(self) -> dict:
+        """Get the outbound delivery statistics for each known endpoint."""
+        return self.outbound_transport_manager.endpoint_stats
+
     async def outbound_message_router(
         self,
         context: InjectionContext,
@@ -2,7 +2,7 @@
 
 import logging
 
-from typing import Mapping, Sequence
+from typing import Mapping, Sequence, Tuple
 
 from ..config.injection_context import InjectionContext
 from ..utils.classloader import ClassLoader
@@ -15,11 +15,20 @@ LOGGER = logging.getLogger(__name__)
 class ProtocolRegistry:
     """Protocol registry for indexing message families."""
 
+    # upper bound on cached resolutions, as unknown types are cached too
+    RESOLVED_CACHE_SIZE = 4096
+
     def __init__(self):
         """Initialize a `ProtocolRegistry` instance."""
         self._controllers = {}
         self._typemap = {}
         self._versionmap = {}
+        # message type -> (message class, registered type), or unsupported
+        # version error
+        self._resolved = {}
+        # registered type -> count, bounded by the types registered
+        self._resolve_counts = {}
+        self._unresolved_count = 0
 
     @property
     def protocols(self) -> Sequence[str]:
@@ -37,6 +46,14 @@ class ProtocolRegistry:
         """Accessor for a list of all message types."""
         return tuple(self._typemap.keys())
 
+    @property
+    def resolution_stats(self) -> Mapping[str, int]:
+        """Accessor for the number of resolutions by registered message type."""
+        stats = self._resolve_counts.copy()
+        if self._unresolved_count:
+            stats["unresolved"] = self._unresolved_count
+        return stats
+
     @property
     def controllers(self) -> Mapping[str, str]:
         """Accessor for a list of all protocol controller functions."""
@@ -84,6 +101,8 @@ class ProtocolRegistry:
 
         """
 
+        self._resolved.clear()
+
         # Maintain support for versionless protocol modules
         for typeset in typesets:
             self._typemap.update(typeset)
@@ -99,6 +118,7 @@ class ProtocolRegistry:
 
                     self._versionmap[version_definition["major_version"]].append(
                         {
+                            "message_type": message_type_string,
                             "parsed_type_string": parsed_type_string,
                             "version_definition": version_definition,
                             "message_module": module_path,
@@ -122,6 +142,8 @@ class ProtocolRegistry:
 
         Given a message type identifier, this method
         returns the corresponding registered message class.
+        Results, including unknown types, are cached until
+        more message types are registered.
 
         Args:
             message_type: Message type to resolve
@@ -129,16 +151,54 @@ class ProtocolRegistry:
         Returns:
             The resolved message class
 
+        Raises:
+            ProtocolMinorVersionNotSupported: If the minor version is below the
+                minimum supported
+
+        """
+        try:
+            resolved = self._resolved[message_type]
+        except KeyError:
+            try:
+                resolved = self._resolve_message_class(message_type)
+            except ProtocolMinorVersionNotSupported as err:
+                resolved = err
+            if len(self._resolved) >= self.RESOLVED_CACHE_SIZE:
+                self._resolved.clear()
+            self._resolved[message_type] = resolved
+
+        if isinstance(resolved, ProtocolMinorVersionNotSupported):
+            self._unresolved_count += 1
+            raise ProtocolMinorVersionNotSupported(*resolved.args)
+        (msg_cls, registered_type) = resolved
+        if msg_cls is None:
+            self._unresolved_count += 1
+        else:
+            # counted by the registered type, as any later minor version of a
+            # registered type resolves to it
+            self._resolve_counts[registered_type] = (
+                self._resolve_counts.get(registered_type, 0) + 1
+            )
+        return msg_cls
+
+    def _resolve_message_class(self, message_type: str) -> Tuple[type, str]:
+        """
+        Resolve a message type to a message class without caching.
+
+        Returns:
+            A tuple of the message class and the registered message type it
+            was resolved by, or of None and None
+
         """
 
         # Try and retrieve from direct mapping
         msg_cls = self._typemap.get(message_type)
         if isinstance(msg_cls, str):
-            return ClassLoader.load_class(msg_cls)
+            return (ClassLoader.load_class(msg_cls), message_type)
 
         # Support registered modules (not path as string)
         elif msg_cls:
-            return msg_cls
+            return (msg_cls, message_type)
 
         # Try and route via min/maj version matching
         if not msg_cls:
@@ -147,7 +207,7 @@ class ProtocolRegistry:
 
             version_supported_protos = self._versionmap.get(major_version)
             if not version_supported_protos:
-                return None
+                return (None, None)
 
             for proto in version_supported_protos:
                 if (
@@ -167,11 +227,13 @@ class ProtocolRegistry:
                         )
 
                     if isinstance(proto["message_module"], str):
-                        return ClassLoader.load_class(msg_cls)
-                    elif proto["message_module"]:
-                        return proto["message_module"]
+                        msg_cls = ClassLoader.load_class(proto["message_module"])
+                    else:
+                        msg_cls = proto["message_module"]
+                    if msg_cls:
+                        return (msg_cls, proto["message_type"])
 
-        return None
+        return (None, None)
 
     async def prepare_disclosed(
         self, context: InjectionContext, protocols: Sequence[str]
@@ -5,6 +5,7 @@ from asynctest import mock as async_mock
 
 from .. import conductor as test_module
 from ...admin.base_server import BaseAdminServer
+from ...cache.base import BaseCache
 from ...config.base_context import ContextBuilder
 from ...config.injection_context import InjectionContext
 from ...connections.models.connection_record import ConnectionRecord
@@ -18,13 +19,14 @@ from ...connections.models.diddoc import (
 from ...core.protocol_registry import ProtocolRegistry
 
 from ...protocols.connections.v1_0.manager import ConnectionManager
+from ...protocols.didcomm_prefix import DIDCommPrefix
+from ...protocols.routing.v1_0.message_types import FORWARD
 from ...storage.base import BaseStorage
 from ...storage.basic import BasicStorage
 from ...transport.inbound.base import InboundTransportConfiguration
 from ...transport.inbound.message import InboundMessage
 from ...transport.inbound.receipt import MessageReceipt
 from ...transport.outbound.base import OutboundDeliveryError
-from ...transport.outbound.manager import QueuedOutboundMessage
 from ...transport.outbound.message import OutboundMessage
 from ...transport.wire_format import BaseWireFormat
 from ...transport.pack_format import PackWireFormat
@@ -122,10 +124,16 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
 
             mock_logger.print_banner.assert_called_once()
 
+            mock_cache = async_mock.MagicMock(BaseCache)
+            conductor.context.injector.bind_instance(BaseCache, mock_cache)
+            mock_wire_format = async_mock.MagicMock(BaseWireFormat)
+            conductor.context.injector.bind_instance(BaseWireFormat, mock_wire_format)
             await conductor.stop()
 
             mock_inbound_mgr.return_value.stop.assert_awaited_once_with()
             mock_outbound_mgr.return_value.stop.assert_awaited_once_with()
+            mock_cache.close.assert_called_once_with()
+            mock_wire_format.close.assert_called_once_with()
 
     async def test_startup_no_public_did(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -172,11 +180,20 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             test_module, "LoggingConfigurator", autospec=True
         ) as mock_logger:
 
-            mock_inbound_mgr.return_value.sessions = ["dummy"]
-            mock_outbound_mgr.return_value.outbound_buffer = [
-                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
-                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
-            ]
+            mock_inbound_mgr.return_value.queue_stats = {
+                "in_sessions": 1,
+                "in_task_active": 0,
+            }
+            mock_outbound_mgr.return_value.queue_stats = {
+                "out_new": 0,
+                "out_encode": 1,
+                "out_ready": 0,
+                "out_deliver": 1,
+                "out_retry": 2,
+            }
+            mock_outbound_mgr.return_value.endpoint_stats = {
+                "http://localhost": {"circuit": "closed"}
+            }
 
             await conductor.setup()
 
@@ -193,6 +210,16 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                     "task_pending",
                 ]
             )
+            assert stats["out_retry"] == 2
+            assert stats["message_types"] == {}
+
+            registry = await conductor.context.inject(ProtocolRegistry)
+            registry.resolve_message_class("unknown/1.0/message")
+            stats = await conductor.get_stats()
+            assert stats["message_types"] == {"unresolved": 1}
+
+            endpoint_stats = await conductor.get_endpoint_stats()
+            assert endpoint_stats["http://localhost"]["circuit"] == "closed"
 
     async def test_setup_x(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -240,6 +267,90 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             assert mock_dispatch_q.call_args[0][2] is None  # admin webhook router
             assert callable(mock_dispatch_q.call_args[0][3])
 
+    async def test_inbound_message_handler_relay(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+
+        await conductor.setup()
+
+        with async_mock.patch.object(
+            conductor.dispatcher, "queue_message", autospec=True
+        ) as mock_dispatch_q, async_mock.patch.object(
+            conductor.dispatcher, "put_task", autospec=True
+        ) as mock_put_task, async_mock.patch.object(
+            conductor, "relay_forward", async_mock.MagicMock()
+        ) as mock_relay:
+            message_body = {
+                "@type": DIDCommPrefix.qualify_current(FORWARD),
+                "to": self.test_target_verkey,
+                "msg": "{}",
+            }
+            receipt = MessageReceipt(recipient_verkey=self.test_verkey)
+            message = InboundMessage(message_body, receipt)
+
+            conductor.inbound_message_router(message, can_respond=False)
+
+            mock_dispatch_q.assert_not_called()
+            mock_put_task.assert_called_once()
+            mock_relay.assert_called_once_with(message)
+
+            # forwards which were not unpacked are dispatched
+            message = InboundMessage(message_body, MessageReceipt())
+            conductor.inbound_message_router(message, can_respond=False)
+            mock_dispatch_q.assert_called_once()
+
+    async def test_relay_forward(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+
+        await conductor.setup()
+
+        target = ConnectionTarget(
+            endpoint="endpoint",
+            recipient_keys=[self.test_target_verkey],
+            routing_keys=(),
+            sender_key="",
+        )
+        message = InboundMessage(
+            {
+                "@type": DIDCommPrefix.qualify_current(FORWARD),
+                "to": self.test_target_verkey,
+                "msg": '{"protected": "abc"}',
+            },
+            MessageReceipt(recipient_verkey=self.test_verkey),
+        )
+
+        with async_mock.patch.object(
+            test_module, "RoutingManager", autospec=True
+        ) as mock_rt_mgr, async_mock.patch.object(
+            test_module, "ConnectionManager", autospec=True
+        ) as mock_conn_mgr, async_mock.patch.object(
+            conductor, "outbound_message_router", async_mock.CoroutineMock()
+        ) as mock_router:
+            mock_rt_mgr.return_value.get_recipient.return_value = (
+                async_mock.MagicMock(connection_id="conn-id")
+            )
+            mock_conn_mgr.return_value.get_connection_targets.return_value = [target]
+
+            await conductor.relay_forward(message)
+
+            mock_rt_mgr.return_value.get_recipient.assert_awaited_once_with(
+                self.test_target_verkey
+            )
+            outbound = mock_router.call_args[0][1]
+            assert outbound.enc_payload == b'{"protected": "abc"}'
+            assert outbound.connection_id == "conn-id"
+            assert outbound.target_list == [target]
+            assert outbound.reply_to_verkey == self.test_target_verkey
+            assert mock_router.call_args[0][2] is message
+
+            mock_router.reset_mock()
+            mock_rt_mgr.return_value.get_recipient.side_effect = (
+                test_module.RoutingManagerError()
+            )
+            await conductor.relay_forward(message)
+            mock_router.assert_not_called()
+
     async def test_inbound_message_handler_ledger_x(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings_admin)
         conductor = test_module.Conductor(builder)
@@ -534,9 +645,124 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
         ) as mock_outbound_mgr, async_mock.patch.object(
             test_module, "LoggingConfigurator", autospec=True
         ) as mock_logger:
+            mock_inbound_mgr.return_value.queue_stats = {"in_sessions": 2}
+            mock_outbound_mgr.return_value.queue_stats = {"out_new": 3}
+
+            await conductor.setup()
+
+            collector = await conductor.context.inject(Collector)
+            gauges = collector.gauges
+            assert gauges["in_sessions"] == 2
+            assert gauges["out_new"] == 3
+            assert gauges["task_pending"] == 0
+
+    async def test_revocation_publisher(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        builder.update_settings(
+            {
+                "revocation.publish_interval": 2.5,
+                "revocation.publish_max_pending": 20,
+            }
+        )
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            test_module, "LoggingConfigurator", autospec=True
+        ) as mock_logger:
+            await conductor.setup()
+
+            publisher = await conductor.context.inject(test_module.RevocationPublisher)
+            assert publisher.interval == 2.5
+            assert publisher.max_pending == 20
+            assert publisher.max_concurrent == 4
+
+            mock_inbound_mgr.return_value.registered_transports = {}
+            mock_outbound_mgr.return_value.registered_transports = {}
+            with async_mock.patch.object(
+                publisher, "start", async_mock.MagicMock()
+            ) as mock_start, async_mock.patch.object(
+                publisher, "stop", async_mock.CoroutineMock()
+            ) as mock_stop:
+                await conductor.start()
+                mock_start.assert_called_once_with()
+                await conductor.stop()
+                mock_stop.assert_awaited_once_with(flush=False)
+
+    async def test_inbound_workers(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        builder.update_settings({"transport.inbound_workers": 2, "wallet.type": "indy"})
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            test_module, "InboundWorkerPool", autospec=True
+        ) as mock_pool, async_mock.patch.object(
+            test_module, "LoggingConfigurator", autospec=True
+        ) as mock_logger:
+            mock_inbound_mgr.return_value.queue_stats = {"in_sessions": 1}
+            mock_outbound_mgr.return_value.queue_stats = {"out_new": 0}
+            mock_pool.return_value.queue_stats = {"in_worker_pending": 3}
+            mock_pool.return_value.worker_stats = {0: {"received": 5}}
 
             await conductor.setup()
 
+            assert mock_pool.call_args[0][1] == 2
+            pool = mock_pool.return_value
+            assert mock_inbound_mgr.return_value.worker_pool is pool
+
+            stats = await conductor.get_stats()
+            assert stats["in_worker_pending"] == 3
+            assert stats["inbound_workers"][0]["received"] == 5
+
+            mock_inbound_mgr.return_value.registered_transports = {}
+            mock_outbound_mgr.return_value.registered_transports = {}
+            await conductor.start()
+            pool.start.assert_called_once_with()
+
+            await conductor.send_worker_webhook("topic", {"test": 1})
+            conductor.admin_server = async_mock.MagicMock(
+                send_webhook=async_mock.CoroutineMock(),
+                stop=async_mock.CoroutineMock(),
+            )
+            await conductor.send_worker_webhook("topic", {"test": 1})
+            conductor.admin_server.send_webhook.assert_awaited_once_with(
+                "topic", {"test": 1}
+            )
+
+            message = async_mock.MagicMock()
+            conductor.worker_dispatch_complete(message)
+            conductor.admin_server.notify_fatal_error.assert_not_called()
+            conductor.worker_dispatch_complete(message, True)
+            conductor.admin_server.notify_fatal_error.assert_called_once_with()
+            mock_inbound_mgr.return_value.dispatch_complete.assert_called_with(
+                message, None
+            )
+
+            await conductor.stop()
+            pool.stop.assert_awaited_once_with(1.0)
+
+    async def test_inbound_workers_basic_wallet_x(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        builder.update_settings({"transport.inbound_workers": 2})
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            test_module, "LoggingConfigurator", autospec=True
+        ) as mock_logger:
+            with self.assertRaises(test_module.ConfigError):
+                await conductor.setup()
+
     async def test_start_static(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
         builder.update_settings({"debug.test_suite_endpoint": True})
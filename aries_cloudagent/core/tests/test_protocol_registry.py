@@ -4,6 +4,7 @@ from ...config.injection_context import InjectionContext
 from ...messaging.error import MessageParseError
 from ...utils.classloader import ClassLoader
 
+from ..error import ProtocolMinorVersionNotSupported
 from ..protocol_registry import ProtocolRegistry
 
 
@@ -140,5 +141,71 @@ class TestProtocolRegistry(AsyncTestCase):
             result = self.registry.resolve_message_class("proto/1.2/bbb")
             assert result is None
 
+    def test_resolve_message_class_cached(self):
+        self.registry.register_message_types(
+            {self.test_message_type: self.test_message_handler}
+        )
+        mock_class = async_mock.MagicMock()
+        with async_mock.patch.object(
+            ClassLoader, "load_class", async_mock.MagicMock()
+        ) as load_class:
+            load_class.return_value = mock_class
+            for _ in range(3):
+                assert (
+                    self.registry.resolve_message_class(self.test_message_type)
+                    == mock_class
+                )
+                assert self.registry.resolve_message_class("proto/1.0/none") is None
+            load_class.assert_called_once_with(self.test_message_handler)
+
+            # registering message types invalidates the cache
+            self.registry.register_message_types({"proto/1.0/none": mock_class})
+            assert self.registry.resolve_message_class("proto/1.0/none") == mock_class
+            assert self.registry.resolve_message_class(self.test_message_type)
+            assert load_class.call_count == 2
+
+        assert self.registry.resolution_stats == {
+            self.test_message_type: 4,
+            "proto/1.0/none": 1,
+            "unresolved": 3,
+        }
+
+    def test_resolve_message_class_minor_version_cached(self):
+        self.registry.register_message_types(
+            {"proto/1.2/aaa": self.test_message_handler},
+            version_definition={
+                "major_version": 1,
+                "minimum_minor_version": 2,
+                "current_minor_version": 2,
+                "path": "v1_2",
+            },
+        )
+        for _ in range(2):
+            with self.assertRaises(ProtocolMinorVersionNotSupported):
+                self.registry.resolve_message_class("proto/1.1/aaa")
+        assert self.registry.resolution_stats == {"unresolved": 2}
+
+    def test_resolve_message_class_stats_by_registered_type(self):
+        self.registry.register_message_types(
+            {"proto/1.2/aaa": self.test_message_handler},
+            version_definition={
+                "major_version": 1,
+                "minimum_minor_version": 0,
+                "current_minor_version": 2,
+                "path": "v1_2",
+            },
+        )
+        mock_class = async_mock.MagicMock()
+        with async_mock.patch.object(
+            ClassLoader, "load_class", async_mock.MagicMock()
+        ) as load_class:
+            load_class.return_value = mock_class
+            for minor in range(2, 100):
+                assert (
+                    self.registry.resolve_message_class(f"proto/1.{minor}/aaa")
+                    == mock_class
+                )
+        assert self.registry.resolution_stats == {"proto/1.2/aaa": 98}
+
     def test_repr(self):
         assert type(repr(self.registry)) is str
@@ -0,0 +1,350 @@
+import asyncio
+import itertools
+import json
+import os
+import queue
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from .. import worker_pool as test_module
+from ..protocol_registry import ProtocolRegistry
+from ..worker_pool import InboundWorker, InboundWorkerPool
+from ...config.base_context import ContextBuilder
+from ...config.injection_context import InjectionContext
+from ...messaging.error import MessageParseError
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+from ...transport.inbound.receipt import MessageReceipt
+from ...transport.inbound.session import InboundSession
+from ...transport.outbound.message import OutboundMessage
+from ...transport.pack_format import PackWireFormat
+from ...transport.wire_format import BaseWireFormat
+from ...wallet.base import BaseWallet
+from ...wallet.basic import BasicWallet
+
+
+class StubContextBuilder(ContextBuilder):
+    async def build(self) -> InjectionContext:
+        context = InjectionContext(settings=self.settings)
+        context.injector.enforce_typing = False
+        context.injector.bind_instance(BaseStorage, BasicStorage())
+        context.injector.bind_instance(BaseWallet, BasicWallet())
+        context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
+        context.injector.bind_instance(BaseWireFormat, PackWireFormat())
+        return context
+
+
+class StubQueue(queue.Queue):
+    def cancel_join_thread(self):
+        pass
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def drain(results: queue.Queue) -> list:
+    items = []
+    while not results.empty():
+        items.append(results.get())
+    return items
+
+
+class TestInboundWorker(AsyncTestCase):
+    async def run_worker(self, *payloads):
+        inbound = queue.Queue()
+        results = queue.Queue()
+        for request_id, payload in enumerate(payloads, 1):
+            inbound.put((request_id, "session-id", "http", payload))
+        inbound.put(None)
+        worker = InboundWorker(3, {}, inbound, results)
+        with async_mock.patch.object(
+            test_module, "DefaultContextBuilder", StubContextBuilder
+        ):
+            await worker.run()
+        return drain(results)
+
+    async def test_dispatch(self):
+        payload = json.dumps(
+            {
+                "@type": "unknown/1.0/message",
+                "@id": "message-id",
+                "~transport": {"return_route": "all"},
+            }
+        )
+        results = await self.run_worker(payload)
+        kinds = [result[0] for result in results]
+        assert kinds == ["ready", "received", "outbound", "complete", "stats"]
+        assert all(result[1] == 3 for result in results)
+
+        request_id, receipt = results[1][2:]
+        assert request_id == 1
+        assert receipt.direct_response_mode == MessageReceipt.REPLY_MODE_ALL
+        assert receipt.thread_id == "message-id"
+        assert receipt.raw_message is None
+
+        # problem report for the unrecognized message type
+        request_id, outbound = results[2][2:]
+        assert request_id == 1
+        assert isinstance(outbound, OutboundMessage)
+        assert outbound.reply_session_id == "session-id"
+        assert "problem-report" in outbound.payload
+
+        assert results[3][2:] == (1, False, False)
+        assert results[4][2]["task_done"] == 2
+        assert results[4][2]["message_types"] == {"unresolved": 1}
+
+    async def test_parse_error(self):
+        results = await self.run_worker("not json", b"")
+        parse_errors = [result[2:] for result in results if result[0] == "parse_error"]
+        assert [request_id for (request_id, _) in parse_errors] == [1, 2]
+
+    async def test_dispatch_complete_fatal(self):
+        worker = InboundWorker(0, {}, None, queue.Queue())
+        completed = async_mock.MagicMock(
+            exc_info=(
+                test_module.LedgerTransactionError,
+                test_module.LedgerTransactionError("Ledger error"),
+                None,
+            )
+        )
+        worker.dispatch_complete(5, completed)
+        assert drain(worker.results) == [("complete", 0, 5, True, True)]
+
+    async def test_send(self):
+        worker = InboundWorker(1, {}, None, queue.Queue())
+        outbound = OutboundMessage(payload="{}")
+        await worker.send_outbound(None, outbound, request_id=4)
+        await worker.send_webhook("topic", {"test": 1})
+        assert drain(worker.results) == [
+            ("outbound", 1, 4, outbound),
+            ("webhook", 1, "topic", {"test": 1}),
+        ]
+
+
+class TestInboundWorkerPool(AsyncTestCase):
+    def setUp(self):
+        self.pipes = []
+
+    def tearDown(self):
+        for fd in itertools.chain.from_iterable(self.pipes):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def make_process(self, **kwargs):
+        # the process has exited once the write end of the pipe is closed
+        read_fd, write_fd = os.pipe()
+        self.pipes.append((read_fd, write_fd))
+        process = async_mock.MagicMock(
+            pid=100 + len(self.pipes), sentinel=read_fd, exitcode=None, **kwargs
+        )
+        process.exit = lambda: os.close(write_fd)
+        process.join.side_effect = lambda timeout: process.exit()
+        return process
+
+    def make_pool(self, count: int = 2) -> InboundWorkerPool:
+        self.send_outbound = async_mock.CoroutineMock()
+        self.send_webhook = async_mock.CoroutineMock()
+        self.dispatch_complete = async_mock.MagicMock()
+        pool = InboundWorkerPool(
+            {"wallet.type": "indy"},
+            count,
+            self.send_outbound,
+            self.send_webhook,
+            self.dispatch_complete,
+        )
+        pool._mp_context = async_mock.MagicMock(
+            Queue=StubQueue, Process=async_mock.MagicMock(side_effect=self.make_process)
+        )
+        return pool
+
+    def make_session(self, can_respond: bool = True) -> InboundSession:
+        return InboundSession(
+            context=InjectionContext(),
+            inbound_handler=None,
+            session_id="session-id",
+            wire_format=None,
+            can_respond=can_respond,
+            transport_type="http",
+        )
+
+    async def start_pool(self, count: int = 2, capacity: int = 2) -> InboundWorkerPool:
+        pool = self.make_pool(count)
+        pool.start()
+        for index, worker in pool.processes.items():
+            worker.results.put(("ready", index, 200 + index, capacity))
+        await wait_until(lambda: all(stats["ready"] for stats in pool.workers.values()))
+        return pool
+
+    async def test_start_stop(self):
+        pool = self.make_pool()
+        pool.start()
+        assert pool._mp_context.Process.call_count == 2
+        kwargs = pool._mp_context.Process.call_args[1]
+        worker = pool.processes[1]
+        assert kwargs["target"] is test_module.run_inbound_worker
+        assert kwargs["args"] == (1, pool.settings, worker.inbound, worker.results)
+        assert pool.workers[1]["pid"] == 102
+        assert pool.queue_stats == {
+            "in_worker_pending": 0,
+            "in_worker_assigned": 0,
+            "in_worker_ready": 0,
+        }
+
+        # not assigned until a worker is ready
+        receiving = asyncio.ensure_future(pool.receive(self.make_session(), "x"))
+        await asyncio.sleep(0)
+        assert pool.queue_stats["in_worker_pending"] == 1
+
+        worker.results.put(("ready", 1, 201, 5))
+        worker.results.put(("stats", 1, {"task_active": 1}))
+        await wait_until(lambda: pool.workers[1]["ready"])
+        assert worker.capacity == 5
+        assert worker.inbound.get_nowait() == (1, "session-id", "http", "x")
+        assert pool.queue_stats == {
+            "in_worker_pending": 0,
+            "in_worker_assigned": 1,
+            "in_worker_ready": 1,
+        }
+
+        workers = list(pool.processes.values())
+        await pool.stop()
+        for worker in workers:
+            worker.process.join.assert_called_once()
+            worker.process.terminate.assert_not_called()
+            assert worker.inbound.get_nowait() is None
+            assert not worker.reader.is_alive()
+        assert pool.workers[1]["pid"] == 201
+        assert pool.workers[1]["task_active"] == 1
+        assert receiving.cancelled()
+
+    async def test_receive(self):
+        pool = await self.start_pool()
+        session = self.make_session()
+        receiving = asyncio.ensure_future(pool.receive(session, "payload"))
+        await asyncio.sleep(0)
+        worker = pool.processes[0]
+        assert worker.inbound.get_nowait() == (1, "session-id", "http", "payload")
+
+        receipt = MessageReceipt(
+            direct_response_mode=MessageReceipt.REPLY_MODE_ALL, sender_verkey="verkey"
+        )
+        pool.handle_results(worker, [("received", 0, 1, receipt)])
+        message = await receiving
+        assert message.receipt is receipt
+        assert message.session_id == "session-id"
+        assert session.reply_mode == MessageReceipt.REPLY_MODE_ALL
+        assert session.reply_verkeys == {"verkey"}
+        assert pool.worker_stats[0]["assigned"] == 1
+
+        outbound = OutboundMessage(payload="{}")
+        pool.handle_results(
+            worker,
+            [
+                ("outbound", 0, 1, outbound),
+                ("webhook", 0, "topic", {"test": 1}),
+                ("complete", 0, 1, False, False),
+                ("outbound", 0, 1, outbound),
+            ],
+        )
+        await pool.task_queue.complete()
+        self.send_outbound.assert_has_awaits(
+            [async_mock.call(outbound, message), async_mock.call(outbound, None)]
+        )
+        self.send_webhook.assert_awaited_once_with("topic", {"test": 1})
+        self.dispatch_complete.assert_called_once_with(message, False)
+        assert pool.worker_stats[0]["assigned"] == 0
+        assert pool.worker_stats[0]["received"] == 1
+        assert pool.worker_stats[0]["completed"] == 1
+        await pool.stop()
+
+    async def test_receive_parse_error(self):
+        pool = await self.start_pool(1)
+        worker = pool.processes[0]
+        receiving = asyncio.ensure_future(pool.receive(self.make_session(), b"x"))
+        await asyncio.sleep(0)
+        pool.handle_results(
+            worker, [("parse_error", 0, 1, "Message JSON parsing failed")]
+        )
+        with self.assertRaises(MessageParseError):
+            await receiving
+        assert pool.worker_stats[0]["parse_errors"] == 1
+        assert pool.worker_stats[0]["assigned"] == 0
+        await pool.stop()
+
+    async def test_assign_capacity(self):
+        pool = await self.start_pool(2, capacity=2)
+        session = self.make_session()
+        for _ in range(5):
+            asyncio.ensure_future(pool.receive(session, "x"))
+        await asyncio.sleep(0)
+        assert [len(pool.processes[i].assigned) for i in (0, 1)] == [2, 2]
+        assert pool.queue_stats["in_worker_pending"] == 1
+
+        # capacity is returned when parsing fails or dispatch completes
+        request_id = next(iter(pool.processes[1].assigned))
+        pool.handle_results(
+            pool.processes[1], [("parse_error", 1, request_id, "error")]
+        )
+        assert pool.queue_stats["in_worker_pending"] == 0
+        assert len(pool.processes[1].assigned) == 2
+        await pool.stop()
+
+    async def test_worker_exited(self):
+        pool = await self.start_pool(2, capacity=1)
+        session = self.make_session()
+        received = asyncio.ensure_future(pool.receive(session, "first"))
+        requeued = asyncio.ensure_future(pool.receive(session, "second"))
+        await asyncio.sleep(0)
+        first, second = pool.processes[0], pool.processes[1]
+        assert first.inbound.get_nowait()[3] == "first"
+        assert second.inbound.get_nowait()[3] == "second"
+        pool.handle_results(first, [("received", 0, 1, MessageReceipt())])
+        message = await received
+
+        for worker in (first, second):
+            worker.process.exitcode = -9
+            worker.process.exit()
+        await wait_until(
+            lambda: pool.workers[0]["restarts"] + pool.workers[1]["restarts"] == 2
+        )
+
+        assert pool.processes[0] is not first
+        assert pool.workers[0]["failed"] == 1
+        self.dispatch_complete.assert_called_once_with(message, False)
+
+        # assigned again once a worker is ready
+        assert pool.queue_stats["in_worker_pending"] == 1
+        worker = pool.processes[1]
+        pool.handle_results(worker, [("ready", 1, 301, 1)])
+        assert worker.inbound.get_nowait()[3] == "second"
+        pool.handle_results(worker, [("received", 1, 2, MessageReceipt())])
+        await requeued
+        await pool.stop()
+
+    async def test_worker_exited_max_attempts(self):
+        pool = await self.start_pool(1, capacity=1)
+        receiving = asyncio.ensure_future(pool.receive(self.make_session(), "x"))
+        await asyncio.sleep(0)
+        for attempt in range(1, pool.MAX_ATTEMPTS + 1):
+            worker = pool.processes[0]
+            if attempt > 1:
+                pool.handle_results(worker, [("ready", 0, 300 + attempt, 1)])
+            assert worker.inbound.get_nowait()[3] == "x"
+            worker.process.exitcode = -11
+            worker.process.exit()
+            await wait_until(lambda: pool.workers[0]["restarts"] == attempt)
+
+        # the payload is not assigned again to a worker once restarted
+        with self.assertRaises(MessageParseError):
+            await receiving
+        assert pool.queue_stats["in_worker_pending"] == 0
+        assert pool.workers[0]["parse_errors"] == 1
+        assert not pool._attempts
+        await pool.stop()
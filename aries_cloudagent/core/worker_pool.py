@@ -0,0 +1,580 @@
+"""
+Inbound worker processes.
+
+Inbound transports and sessions remain in the main process, which holds the raw
+payload of each inbound message in a dispatch queue shared by a pool of worker
+processes. Each worker unpacks and dispatches messages with its own
+`Dispatcher`, and reports the message receipt back to the main process so that
+the originating session can accept direct responses. Outbound messages and
+webhooks produced by the workers are returned to the main process for
+delivery.
+"""
+
+import asyncio
+import copy
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Callable, Coroutine, Mapping, Union
+
+from ..admin.server import AdminResponder
+from ..config.default_context import DefaultContextBuilder
+from ..config.injection_context import InjectionContext
+from ..config.util import common_config
+from ..ledger.error import LedgerConfigError, LedgerTransactionError
+from ..messaging.error import MessageParseError
+from ..messaging.responder import BaseResponder
+from ..transport.error import WireFormatError
+from ..transport.inbound.message import InboundMessage
+from ..transport.inbound.receipt import MessageReceipt
+from ..transport.inbound.session import InboundSession
+from ..transport.outbound.message import OutboundMessage
+from ..transport.wire_format import BaseWireFormat
+from ..utils.task_queue import CompletedTask, TaskQueue
+
+from .dispatcher import Dispatcher
+from .protocol_registry import ProtocolRegistry
+
+LOGGER = logging.getLogger(__name__)
+
+
+class InboundWorker:
+    """Parse and dispatch inbound messages within a worker process."""
+
+    def __init__(
+        self,
+        index: int,
+        settings: Mapping[str, object],
+        inbound: multiprocessing.Queue,
+        results: multiprocessing.Queue,
+        stats_interval: float = 1.0,
+    ):
+        """
+        Initialize an `InboundWorker` instance.
+
+        Args:
+            index: the index of the worker in the pool
+            settings: the agent settings
+            inbound: the queue of raw inbound payloads assigned to the worker
+            results: the queue of results returned to the main process
+            stats_interval: the number of seconds between stats reports
+
+        """
+        self.index = index
+        self.settings = settings
+        self.inbound = inbound
+        self.results = results
+        self.stats_interval = stats_interval
+        self.context: InjectionContext = None
+        self.dispatcher: Dispatcher = None
+        self.registry: ProtocolRegistry = None
+        self.wire_format: BaseWireFormat = None
+
+    async def setup(self):
+        """Build the worker context and dispatcher."""
+        self.context = await DefaultContextBuilder(self.settings).build()
+        self.dispatcher = Dispatcher(self.context)
+        await self.dispatcher.setup()
+        self.registry = await self.context.inject(ProtocolRegistry)
+
+        self.wire_format = await self.context.inject(BaseWireFormat)
+        if hasattr(self.wire_format, "task_queue"):
+            self.wire_format.task_queue = self.dispatcher.task_queue
+
+        # webhooks and messages sent outside of a handler go to the main process
+        self.context.injector.bind_instance(
+            BaseResponder,
+            AdminResponder(self.context, self.send_outbound, self.send_webhook),
+        )
+
+    def report(self, kind: str, *args):
+        """Return a result to the main process."""
+        self.results.put((kind, self.index) + args)
+
+    def report_stats(self):
+        """Report the state of the dispatcher task queue."""
+        task_queue = self.dispatcher.task_queue
+        self.report(
+            "stats",
+            {
+                "task_active": task_queue.current_active,
+                "task_done": task_queue.total_done,
+                "task_failed": task_queue.total_failed,
+                "task_pending": task_queue.current_pending,
+                "message_types": self.registry.resolution_stats,
+            },
+        )
+
+    async def run(self):
+        """Process inbound payloads until a stop signal is received."""
+        await self.setup()
+        # the main process assigns up to this many messages at once
+        self.report("ready", os.getpid(), self.dispatcher.task_queue.max_active or 50)
+        loop = asyncio.get_event_loop()
+        stats_task = loop.create_task(self._stats_loop())
+        try:
+            stopped = False
+            while not stopped:
+                items = [await loop.run_in_executor(None, self.inbound.get)]
+                # take any other waiting payloads without another thread hop
+                try:
+                    while True:
+                        items.append(self.inbound.get_nowait())
+                except queue.Empty:
+                    pass
+                for item in items:
+                    if item is None:
+                        stopped = True
+                        break
+                    self.dispatcher.run_task(self.receive(*item))
+            # finish the messages already assigned
+            await self.dispatcher.task_queue.flush()
+        finally:
+            stats_task.cancel()
+            self.wire_format.close()
+        self.report_stats()
+
+    async def _stats_loop(self):
+        """Report stats periodically."""
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            self.report_stats()
+
+    async def receive(
+        self,
+        request_id: int,
+        session_id: str,
+        transport_type: str,
+        payload_enc: Union[str, bytes],
+    ):
+        """
+        Parse an inbound payload and queue the message for dispatch.
+
+        Args:
+            request_id: the identifier assigned by the main process
+            session_id: the identifier of the originating inbound session
+            transport_type: the inbound transport identifier
+            payload_enc: the raw message payload
+
+        """
+        try:
+            payload, receipt = await self.wire_format.parse_message(
+                self.context, payload_enc
+            )
+        except Exception as e:
+            if isinstance(e, WireFormatError):
+                LOGGER.warning("Error parsing inbound message: %s", str(e))
+            else:
+                LOGGER.exception("Error parsing inbound message")
+            self.report("parse_error", request_id, str(e))
+            return
+
+        message = InboundMessage(
+            payload,
+            receipt,
+            session_id=session_id,
+            transport_type=transport_type,
+        )
+        # the main process only needs the receipt to select direct responses
+        reported = copy.copy(receipt)
+        reported.raw_message = None
+        self.report("received", request_id, reported)
+        self.dispatcher.queue_message(
+            message,
+            functools.partial(self.send_outbound, request_id=request_id),
+            self.send_webhook,
+            lambda completed: self.dispatch_complete(request_id, completed),
+        )
+
+    def dispatch_complete(self, request_id: int, completed: CompletedTask):
+        """Report the completion of message dispatch."""
+        exc = completed.exc_info and completed.exc_info[1]
+        fatal = isinstance(exc, (LedgerConfigError, LedgerTransactionError))
+        self.report("complete", request_id, bool(exc), fatal)
+
+    async def send_outbound(
+        self,
+        context: InjectionContext,
+        outbound: OutboundMessage,
+        inbound: InboundMessage = None,
+        *,
+        request_id: int = None,
+    ):
+        """Return an outbound message to the main process for delivery."""
+        self.report("outbound", request_id, outbound)
+
+    async def send_webhook(self, topic: str, payload: dict):
+        """Return a webhook to the main process for delivery."""
+        self.report("webhook", topic, payload)
+
+
+def run_inbound_worker(
+    index: int,
+    settings: Mapping[str, object],
+    inbound: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    stats_interval: float = 1.0,
+):
+    """Run an inbound worker process."""
+    # the main process stops the workers on shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    common_config(settings)
+    worker = InboundWorker(index, settings, inbound, results, stats_interval)
+    asyncio.get_event_loop().run_until_complete(worker.run())
+
+
+class InboundWorkerProcess:
+    """A worker process and the queues used to communicate with it."""
+
+    def __init__(
+        self,
+        index: int,
+        process: multiprocessing.Process,
+        inbound: multiprocessing.Queue,
+        results: multiprocessing.Queue,
+    ):
+        """Initialize an `InboundWorkerProcess` instance."""
+        self.index = index
+        self.process = process
+        self.inbound = inbound
+        self.results = results
+        # the number of messages which may be assigned, once ready
+        self.capacity = 0
+        # request IDs assigned to the worker and not yet complete
+        self.assigned = set()
+        self.reader: threading.Thread = None
+
+    @property
+    def available(self) -> int:
+        """Accessor for the number of messages which may be assigned now."""
+        return self.capacity - len(self.assigned)
+
+    @property
+    def exited(self) -> bool:
+        """Check whether the process has exited, without reaping it."""
+        return bool(wait([self.process.sentinel], 0))
+
+
+class InboundWorkerPool:
+    """
+    Manage a pool of inbound worker processes.
+
+    Payloads wait in a single dispatch queue in the main process, and are
+    assigned to the worker with the most capacity available, so that a busy
+    worker leaves messages for the others. Each worker has its own queues, so
+    that a worker which exits unexpectedly cannot leave a queue shared with the
+    others in an unusable state; it is restarted, and any messages it had not
+    yet parsed are assigned again, up to `MAX_ATTEMPTS` times each.
+
+    Sessions cannot be shared between processes, so each worker must be able to
+    open the same wallet as the main process.
+    """
+
+    READ_TIMEOUT = 0.1
+    MAX_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        settings: Mapping[str, object],
+        count: int,
+        send_outbound: Coroutine,
+        send_webhook: Coroutine = None,
+        dispatch_complete: Callable = None,
+        stats_interval: float = 1.0,
+    ):
+        """
+        Initialize an `InboundWorkerPool` instance.
+
+        Args:
+            settings: the agent settings passed to each worker
+            count: the number of worker processes
+            send_outbound: async function to route an outbound message, given
+                the outbound message and the inbound message that produced it
+            send_webhook: async function to dispatch a webhook
+            dispatch_complete: function to call when a worker has finished
+                handling an inbound message, given the message and whether
+                the handler failed with a fatal ledger error
+            stats_interval: the number of seconds between worker stats reports
+
+        """
+        self.settings = dict(settings)
+        self.count = count
+        self.send_outbound = send_outbound
+        self.send_webhook = send_webhook
+        self.dispatch_complete = dispatch_complete
+        self.stats_interval = stats_interval
+        self.processes = {}
+        self.task_queue = TaskQueue()
+        self.workers = {}
+        self._loop: asyncio.AbstractEventLoop = None
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._pending = deque()
+        self._request_ids = itertools.count(1)
+        # request ID -> (session, future, payload) until the receipt is reported
+        self._requests = {}
+        # request ID -> number of times assigned to a worker
+        self._attempts = {}
+        # request ID -> message until dispatch is complete
+        self._dispatched = {}
+        self._stopping = False
+
+    def start(self):
+        """Start the worker processes."""
+        self._loop = asyncio.get_event_loop()
+        self._stopping = False
+        for index in range(self.count):
+            self.start_worker(index)
+
+    def start_worker(self, index: int):
+        """Start or restart a worker process."""
+        inbound = self._mp_context.Queue()
+        results = self._mp_context.Queue()
+        process = self._mp_context.Process(
+            target=run_inbound_worker,
+            args=(index, self.settings, inbound, results),
+            kwargs={"stats_interval": self.stats_interval},
+            name=f"InboundWorker-{index}",
+            daemon=True,
+        )
+        process.start()
+        worker = InboundWorkerProcess(index, process, inbound, results)
+        worker.reader = threading.Thread(
+            target=self._read_results,
+            args=(worker,),
+            name=f"InboundWorkerReader-{index}",
+            daemon=True,
+        )
+        worker.reader.start()
+        self.processes[index] = worker
+
+        stats = self.workers.get(index)
+        if stats:
+            stats["restarts"] += 1
+        else:
+            stats = self.workers[index] = {
+                "received": 0,
+                "parse_errors": 0,
+                "completed": 0,
+                "failed": 0,
+                "restarts": 0,
+            }
+        stats["pid"] = process.pid
+        stats["ready"] = False
+
+    async def stop(self, timeout: float = 1.0):
+        """Stop the worker processes, waiting for assigned messages."""
+        if not self.processes:
+            return
+        self._stopping = True
+        workers = list(self.processes.values())
+        for worker in workers:
+            worker.inbound.put(None)
+        deadline = self._loop.time() + timeout
+        for worker in workers:
+            await self._loop.run_in_executor(
+                None, worker.process.join, max(deadline - self._loop.time(), 0)
+            )
+            if not worker.exited:
+                LOGGER.warning("Terminating inbound worker %s", worker.process.name)
+                worker.process.terminate()
+        # the readers finish once the remaining results have been handed over
+        for worker in workers:
+            await self._loop.run_in_executor(None, worker.reader.join)
+        await asyncio.sleep(0)
+        self.processes = {}
+        self._pending.clear()
+        for session, future, _ in self._requests.values():
+            future.cancel()
+        self._requests = {}
+        self._attempts = {}
+        await self.task_queue.complete(max(deadline - self._loop.time(), 0))
+
+    def _read_results(self, worker: InboundWorkerProcess):
+        """Hand results from a worker to the event loop until it has exited."""
+        while True:
+            results = []
+            try:
+                results.append(worker.results.get(timeout=self.READ_TIMEOUT))
+                # hand over any other waiting results together
+                while True:
+                    results.append(worker.results.get_nowait())
+            except queue.Empty:
+                pass
+            except (EOFError, OSError):
+                break
+            if results:
+                self._loop.call_soon_threadsafe(self.handle_results, worker, results)
+            elif worker.exited:
+                break
+        self._loop.call_soon_threadsafe(self.worker_exited, worker)
+
+    def worker_exited(self, worker: InboundWorkerProcess):
+        """Handle a worker process which has exited."""
+        if self._stopping or self.processes.get(worker.index) is not worker:
+            return
+        LOGGER.error(
+            "Inbound worker %s exited with code %s, restarting",
+            worker.process.name,
+            worker.process.exitcode,
+        )
+        stats = self.workers[worker.index]
+        requeue = []
+        for request_id in sorted(worker.assigned):
+            message = self._dispatched.pop(request_id, None)
+            if message:
+                stats["failed"] += 1
+                if self.dispatch_complete:
+                    self.dispatch_complete(message, False)
+            elif request_id not in self._requests:
+                continue
+            elif self._attempts.get(request_id, 0) >= self.MAX_ATTEMPTS:
+                # the payload may be what makes the workers exit
+                stats["parse_errors"] += 1
+                self._fail_request(
+                    request_id,
+                    f"Inbound worker exited while parsing message, "
+                    f"after {self.MAX_ATTEMPTS} attempts",
+                )
+            else:
+                requeue.append(request_id)
+        # not yet parsed, so assign to another worker
+        self._pending.extendleft(reversed(requeue))
+        worker.inbound.cancel_join_thread()
+        self.start_worker(worker.index)
+        self._assign()
+
+    async def receive(
+        self, session: InboundSession, payload_enc: Union[str, bytes]
+    ) -> InboundMessage:
+        """
+        Hand an inbound payload to the workers.
+
+        Args:
+            session: the session the payload was received on
+            payload_enc: the raw message payload
+
+        Returns:
+            The inbound message, once a worker has parsed it. The payload is not
+            returned from the worker.
+
+        Raises:
+            MessageParseError: if the worker could not parse the payload
+
+        """
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._requests[request_id] = (
+            session,
+            future,
+            (request_id, session.session_id, session.transport_type, payload_enc),
+        )
+        self._pending.append(request_id)
+        self._assign()
+        return await future
+
+    def _assign(self):
+        """Assign pending payloads to the workers with capacity available."""
+        while self._pending and self.processes:
+            worker = max(self.processes.values(), key=lambda w: w.available)
+            if worker.available <= 0:
+                break
+            request_id = self._pending.popleft()
+            worker.assigned.add(request_id)
+            self._attempts[request_id] = self._attempts.get(request_id, 0) + 1
+            worker.inbound.put(self._requests[request_id][2])
+
+    def _fail_request(self, request_id: int, error: str):
+        """Report a payload which could not be parsed to the originating session."""
+        self._attempts.pop(request_id, None)
+        session, future, _ = self._requests.pop(request_id)
+        if not future.done():
+            future.set_exception(MessageParseError(error))
+
+    def handle_results(self, worker: InboundWorkerProcess, results: list):
+        """Handle a batch of results returned by a worker."""
+        stats = self.workers[worker.index]
+        for kind, _index, *args in results:
+            if kind == "received":
+                self.received(worker, *args)
+            elif kind == "parse_error":
+                request_id, error = args
+                stats["parse_errors"] += 1
+                worker.assigned.discard(request_id)
+                self._fail_request(request_id, error)
+            elif kind == "outbound":
+                request_id, outbound = args
+                self.task_queue.run(
+                    self.send_outbound(outbound, self._dispatched.get(request_id))
+                )
+            elif kind == "webhook":
+                if self.send_webhook:
+                    self.task_queue.run(self.send_webhook(*args))
+            elif kind == "complete":
+                request_id, failed, fatal = args
+                stats["failed" if failed else "completed"] += 1
+                worker.assigned.discard(request_id)
+                message = self._dispatched.pop(request_id, None)
+                if message and self.dispatch_complete:
+                    self.dispatch_complete(message, fatal)
+            elif kind == "stats":
+                stats.update(args[0])
+            elif kind == "ready":
+                stats["pid"], worker.capacity = args
+                stats["ready"] = True
+        self._assign()
+
+    def received(
+        self, worker: InboundWorkerProcess, request_id: int, receipt: MessageReceipt
+    ):
+        """Update the originating session with the receipt of a parsed message."""
+        self.workers[worker.index]["received"] += 1
+        self._attempts.pop(request_id, None)
+        session, future, _ = self._requests.pop(request_id)
+        message = InboundMessage(
+            None,
+            receipt,
+            session_id=session.session_id,
+            transport_type=session.transport_type,
+        )
+        if receipt.direct_response_requested and not session.can_respond:
+            LOGGER.warning(
+                "Direct response requested, but not supported by transport: %s",
+                session.transport_type,
+            )
+        # before any response from the worker is handled
+        session.process_inbound(message)
+        self._dispatched[request_id] = message
+        if not future.done():
+            future.set_result(message)
+
+    @property
+    def queue_stats(self) -> dict:
+        """Accessor for the number of messages waiting for or held by workers."""
+        return {
+            "in_worker_pending": len(self._pending),
+            "in_worker_assigned": sum(
+                len(worker.assigned) for worker in self.processes.values()
+            ),
+            "in_worker_ready": sum(
+                1 for stats in self.workers.values() if stats["ready"]
+            ),
+        }
+
+    @property
+    def worker_stats(self) -> dict:
+        """Accessor for the statistics of each worker."""
+        assigned = {
+            index: len(worker.assigned) for index, worker in self.processes.items()
+        }
+        return {
+            index: dict(stats, assigned=assigned.get(index, 0))
+            for index, stats in self.workers.items()
+        }
@@ -145,6 +145,7 @@ class BaseHolder(ABC, metaclass=ABCMeta):
         rev_reg_delta: dict,
         timestamp: int,
         tails_file_path: str,
+        ledger: BaseLedger = None,
     ) -> str:
         """
         Create current revocation state for a received credential.
@@ -154,6 +155,8 @@ class BaseHolder(ABC, metaclass=ABCMeta):
             rev_reg_def: revocation registry definition
             rev_reg_delta: revocation delta
             timestamp: delta timestamp
+            tails_file_path: path to the local tails file
+            ledger: optional open ledger, to fetch the delta since a stored state
 
         Returns:
             the revocation state
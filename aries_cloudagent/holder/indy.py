@@ -12,8 +12,13 @@ from indy.error import ErrorCode, IndyError
 from ..indy import create_tails_reader
 from ..indy.error import IndyErrorHandler
 from ..ledger.base import BaseLedger
+from ..ledger.error import LedgerError
 from ..storage.indy import IndyStorage
-from ..storage.error import StorageError, StorageNotFoundError
+from ..storage.error import (
+    StorageDuplicateError,
+    StorageError,
+    StorageNotFoundError,
+)
 from ..storage.record import StorageRecord
 from ..wallet.error import WalletNotFoundError
 
@@ -24,6 +29,8 @@ class IndyHolder(BaseHolder):
     """Indy holder class."""
 
     RECORD_TYPE_MIME_TYPES = "attribute-mime-types"
+    RECORD_TYPE_REVOCATION_STATE = "revocation-state"
+    REVOCATION_STATES_KEPT = 3
     CHUNK = 256
 
     def __init__(self, wallet):
@@ -408,29 +415,102 @@ class IndyHolder(BaseHolder):
         rev_reg_delta: dict,
         timestamp: int,
         tails_file_path: str,
+        ledger: BaseLedger = None,
     ) -> str:
         """
         Create current revocation state for a received credential.
 
+        Revocation states are stored in the wallet by revocation registry,
+        credential revocation id and timestamp, and a stored state is returned
+        when one exists for the timestamp. Otherwise, given a ledger, the latest
+        stored state for an earlier timestamp is updated with the delta since
+        that timestamp, which is much cheaper than creating the state from the
+        full revocation delta.
+
         Args:
             cred_rev_id: credential revocation id in revocation registry
             rev_reg_def: revocation registry definition
             rev_reg_delta: revocation delta
             timestamp: delta timestamp
+            tails_file_path: path to the local tails file
+            ledger: optional open ledger, to fetch the delta since a stored state
 
         Returns:
             the revocation state
 
         """
+        rev_reg_id = rev_reg_def["id"]
+        storage = IndyStorage(self.wallet)
+        try:
+            record = await storage.get_record(
+                IndyHolder.RECORD_TYPE_REVOCATION_STATE,
+                f"{IndyHolder.RECORD_TYPE_REVOCATION_STATE}::{rev_reg_id}::"
+                f"{cred_rev_id}::{timestamp}",
+            )
+            return record.value
+        except StorageNotFoundError:
+            pass
+
+        tag_query = {"rev_reg_id": rev_reg_id, "cred_rev_id": str(cred_rev_id)}
+        stored = await storage.search_records(
+            IndyHolder.RECORD_TYPE_REVOCATION_STATE, tag_query
+        ).fetch_all()
+        stored.sort(key=lambda record: int(record.tags["timestamp"]))
+        previous = [
+            record for record in stored if int(record.tags["timestamp"]) < timestamp
+        ]
 
         with IndyErrorHandler("Error when constructing revocation state", HolderError):
             tails_file_reader = await create_tails_reader(tails_file_path)
-            rev_state_json = await indy.anoncreds.create_revocation_state(
-                tails_file_reader,
-                rev_reg_def_json=json.dumps(rev_reg_def),
-                cred_rev_id=cred_rev_id,
-                rev_reg_delta_json=json.dumps(rev_reg_delta),
-                timestamp=timestamp,
-            )
+            rev_state_json = None
+            if previous and ledger:
+                from_timestamp = int(previous[-1].tags["timestamp"])
+                try:
+                    (update_delta, _) = await ledger.get_revoc_reg_delta(
+                        rev_reg_id, from_timestamp, timestamp
+                    )
+                    rev_state_json = await indy.anoncreds.update_revocation_state(
+                        tails_file_reader,
+                        rev_state_json=previous[-1].value,
+                        rev_reg_def_json=json.dumps(rev_reg_def),
+                        rev_reg_delta_json=json.dumps(update_delta),
+                        timestamp=timestamp,
+                        cred_rev_id=cred_rev_id,
+                    )
+                except (IndyError, LedgerError) as err:
+                    self.logger.warning(
+                        "Failed to update revocation state from %s: %s",
+                        from_timestamp,
+                        err,
+                    )
+            if not rev_state_json:
+                rev_state_json = await indy.anoncreds.create_revocation_state(
+                    tails_file_reader,
+                    rev_reg_def_json=json.dumps(rev_reg_def),
+                    cred_rev_id=cred_rev_id,
+                    rev_reg_delta_json=json.dumps(rev_reg_delta),
+                    timestamp=timestamp,
+                )
+
+        record = StorageRecord(
+            type=IndyHolder.RECORD_TYPE_REVOCATION_STATE,
+            value=rev_state_json,
+            tags={**tag_query, "timestamp": str(timestamp)},
+            id=f"{IndyHolder.RECORD_TYPE_REVOCATION_STATE}::{rev_reg_id}::"
+            f"{cred_rev_id}::{timestamp}",
+        )
+        try:
+            await storage.add_record(record)
+        except StorageDuplicateError:
+            pass  # stored by a concurrent request
+        else:
+            # keep only the latest states for the credential
+            stored.append(record)
+            stored.sort(key=lambda record: int(record.tags["timestamp"]))
+            for expired in stored[: -IndyHolder.REVOCATION_STATES_KEPT]:
+                try:
+                    await storage.delete_record(expired)
+                except StorageNotFoundError:
+                    pass
 
         return rev_state_json
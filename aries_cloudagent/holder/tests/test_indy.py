@@ -520,11 +520,24 @@ class TestIndyHolder(AsyncTestCase):
             test_module, "create_tails_reader", async_mock.CoroutineMock()
         ) as mock_create_tails_reader, async_mock.patch.object(
             indy.anoncreds, "create_revocation_state", async_mock.CoroutineMock()
-        ) as mock_create_rr_state:
+        ) as mock_create_rr_state, async_mock.patch.object(
+            test_module, "IndyStorage", async_mock.MagicMock()
+        ) as mock_storage:
             mock_create_rr_state.return_value = json.dumps(rr_state)
+            mock_storage.return_value = async_mock.MagicMock(
+                get_record=async_mock.CoroutineMock(
+                    side_effect=test_module.StorageNotFoundError()
+                ),
+                search_records=async_mock.MagicMock(
+                    return_value=async_mock.MagicMock(
+                        fetch_all=async_mock.CoroutineMock(return_value=[])
+                    )
+                ),
+                add_record=async_mock.CoroutineMock(),
+            )
 
             cred_rev_id = "1"
-            rev_reg_def = {"def": 1}
+            rev_reg_def = {"id": "rr-id"}
             rev_reg_delta = {"delta": 1}
             timestamp = 1234567890
             tails_path = "/tmp/some.tails"
@@ -541,3 +554,102 @@ class TestIndyHolder(AsyncTestCase):
                 rev_reg_delta_json=json.dumps(rev_reg_delta),
                 timestamp=timestamp,
             )
+            record = mock_storage.return_value.add_record.call_args[0][0]
+            assert record.value == result
+            assert record.tags == {
+                "rev_reg_id": "rr-id",
+                "cred_rev_id": "1",
+                "timestamp": str(timestamp),
+            }
+
+    async def test_create_revocation_state_stored(self):
+        holder = test_module.IndyHolder("wallet")
+
+        with async_mock.patch.object(
+            indy.anoncreds, "create_revocation_state", async_mock.CoroutineMock()
+        ) as mock_create_rr_state, async_mock.patch.object(
+            test_module, "IndyStorage", async_mock.MagicMock()
+        ) as mock_storage:
+            mock_storage.return_value = async_mock.MagicMock(
+                get_record=async_mock.CoroutineMock(
+                    return_value=StorageRecord(
+                        type=test_module.IndyHolder.RECORD_TYPE_REVOCATION_STATE,
+                        value="stored-state",
+                    )
+                )
+            )
+
+            result = await holder.create_revocation_state(
+                "1", {"id": "rr-id"}, {"delta": 1}, 1234567890, "/tmp/some.tails"
+            )
+            assert result == "stored-state"
+            mock_create_rr_state.assert_not_awaited()
+
+    async def test_create_revocation_state_update(self):
+        holder = test_module.IndyHolder("wallet")
+        ledger = async_mock.MagicMock(
+            get_revoc_reg_delta=async_mock.CoroutineMock(
+                return_value=({"delta": 2}, 1234567890)
+            )
+        )
+        stored = [
+            StorageRecord(
+                type=test_module.IndyHolder.RECORD_TYPE_REVOCATION_STATE,
+                value=f"state-{timestamp}",
+                tags={
+                    "rev_reg_id": "rr-id",
+                    "cred_rev_id": "1",
+                    "timestamp": str(timestamp),
+                },
+            )
+            for timestamp in (1234567800, 1234567700, 1234567600, 1234567999)
+        ]
+
+        with async_mock.patch.object(
+            test_module, "create_tails_reader", async_mock.CoroutineMock()
+        ) as mock_create_tails_reader, async_mock.patch.object(
+            indy.anoncreds, "update_revocation_state", async_mock.CoroutineMock()
+        ) as mock_update_rr_state, async_mock.patch.object(
+            test_module, "IndyStorage", async_mock.MagicMock()
+        ) as mock_storage:
+            mock_update_rr_state.return_value = "updated-state"
+            mock_storage.return_value = async_mock.MagicMock(
+                get_record=async_mock.CoroutineMock(
+                    side_effect=test_module.StorageNotFoundError()
+                ),
+                search_records=async_mock.MagicMock(
+                    return_value=async_mock.MagicMock(
+                        fetch_all=async_mock.CoroutineMock(return_value=stored)
+                    )
+                ),
+                add_record=async_mock.CoroutineMock(),
+                delete_record=async_mock.CoroutineMock(),
+            )
+
+            result = await holder.create_revocation_state(
+                "1",
+                {"id": "rr-id"},
+                {"delta": 1},
+                1234567890,
+                "/tmp/some.tails",
+                ledger=ledger,
+            )
+            assert result == "updated-state"
+
+            ledger.get_revoc_reg_delta.assert_awaited_once_with(
+                "rr-id", 1234567800, 1234567890
+            )
+            mock_update_rr_state.assert_awaited_once_with(
+                mock_create_tails_reader.return_value,
+                rev_state_json="state-1234567800",
+                rev_reg_def_json=json.dumps({"id": "rr-id"}),
+                rev_reg_delta_json=json.dumps({"delta": 2}),
+                timestamp=1234567890,
+                cred_rev_id="1",
+            )
+            # only the latest states are kept
+            deleted = [
+                call[0][0].value
+                for call in mock_storage.return_value.delete_record.call_args_list
+            ]
+            assert deleted == ["state-1234567600", "state-1234567700"]
@@ -2,25 +2,42 @@
 
 import json
 
+from collections import OrderedDict
 from pathlib import Path
 
 import indy.blob_storage
 
+TAILS_READER_POOL_SIZE = 64
+
+# blob_storage reader handles by tails file path, in order of last use; the
+# python wrapper cannot close a reader, so handles are reused rather than
+# opened for each use
+_TAILS_READERS = OrderedDict()
+
 
 async def create_tails_reader(tails_file_path: str) -> int:
-    """Get a handle for the blob_storage file reader."""
+    """Get a handle for the blob_storage file reader, reusing an open handle."""
     tails_file_path = Path(tails_file_path)
 
     if not tails_file_path.exists():
         raise FileNotFoundError("Tails file does not exist.")
 
+    key = str(tails_file_path.absolute())
+    if key in _TAILS_READERS:
+        _TAILS_READERS.move_to_end(key)
+        return _TAILS_READERS[key]
+
     tails_reader_config = json.dumps(
         {
             "base_dir": str(tails_file_path.parent.absolute()),
             "file": str(tails_file_path.name),
         }
     )
-    return await indy.blob_storage.open_reader("default", tails_reader_config)
+    handle = await indy.blob_storage.open_reader("default", tails_reader_config)
+    _TAILS_READERS[key] = handle
+    while len(_TAILS_READERS) > TAILS_READER_POOL_SIZE:
+        _TAILS_READERS.popitem(last=False)
+    return handle
 
 
 async def create_tails_writer(tails_base_dir: str) -> int:
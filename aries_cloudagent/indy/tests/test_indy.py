@@ -8,6 +8,7 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 import indy.blob_storage
 
+from ... import indy as indy_module
 from .. import create_tails_reader, create_tails_writer
 from .. import util as test_module
 
@@ -29,14 +30,44 @@ class TestIndyUtils(AsyncTestCase):
 
         with async_mock.patch.object(
             indy.blob_storage, "open_reader", async_mock.CoroutineMock()
-        ) as mock_blob_open_reader:
+        ) as mock_blob_open_reader, async_mock.patch.dict(
+            indy_module._TAILS_READERS, clear=True
+        ):
             result = await create_tails_reader(tails_local)
             assert result == mock_blob_open_reader.return_value
 
+            # open handles are reused
+            assert await create_tails_reader(tails_local) == result
+            mock_blob_open_reader.assert_awaited_once()
+
         rmtree(tails_dir, ignore_errors=True)
         with self.assertRaises(FileNotFoundError):
             await create_tails_reader(tails_local)
 
+    async def test_tails_reader_pool_size(self):
+        tails_dir = test_module.indy_client_dir("tails", create=True)
+        paths = []
+        for i in range(3):
+            paths.append(f"{tails_dir}/tails-{i}")
+            with open(paths[-1], "a") as f:
+                print("1234123412431234", file=f)
+
+        with async_mock.patch.object(
+            indy.blob_storage,
+            "open_reader",
+            async_mock.CoroutineMock(side_effect=[1, 2, 3, 4]),
+        ), async_mock.patch.object(
+            indy_module, "TAILS_READER_POOL_SIZE", 2
+        ), async_mock.patch.dict(
+            indy_module._TAILS_READERS, clear=True
+        ):
+            assert [await create_tails_reader(path) for path in paths] == [1, 2, 3]
+            assert len(indy_module._TAILS_READERS) == 2
+            # the least recently used handle was evicted
+            assert await create_tails_reader(paths[0]) == 4
+
+        rmtree(tails_dir, ignore_errors=True)
+
     async def test_tails_writer(self):
         tails_dir = test_module.indy_client_dir("tails", create=True)
         assert await create_tails_writer(tails_dir)
@@ -1,5 +1,6 @@
 """Indy issuer implementation."""
 
+import asyncio
 import json
 import logging
 from typing import Sequence, Tuple
@@ -29,6 +30,8 @@ from .base import (
 class IndyIssuer(BaseIssuer):
     """Indy issuer class."""
 
+    REVOKE_CHUNK_SIZE = 256
+
     def __init__(self, wallet):
         """
         Initialize an IndyIssuer instance.
@@ -279,6 +282,11 @@ class IndyIssuer(BaseIssuer):
         """
         Revoke a set of credentials in a revocation registry.
 
+        Credentials are revoked in chunks of `REVOKE_CHUNK_SIZE`: the revocations
+        in each chunk are submitted together and their issuer cred rev records
+        are updated together. The resulting deltas are merged pairwise, as a tree,
+        rather than each into the running total.
+
         Args:
             rev_reg_id: ID of the revocation registry
             tails_file_path: path to the local tails file
@@ -291,65 +299,155 @@ class IndyIssuer(BaseIssuer):
         failed_crids = []
         tails_reader_handle = await create_tails_reader(tails_file_path)
 
-        result_json = None
-        for cred_rev_id in cred_rev_ids:
-            with IndyErrorHandler("Exception when revoking credential", IssuerError):
-                try:
-                    delta_json = await indy.anoncreds.issuer_revoke_credential(
-                        self.wallet.handle,
-                        tails_reader_handle,
-                        rev_reg_id,
-                        cred_rev_id,
-                    )
-                    issuer_cr_rec = await IssuerCredRevRecord.retrieve_by_ids(
-                        self.context,
-                        rev_reg_id,
-                        cred_rev_id,
-                    )
-                    await issuer_cr_rec.set_state(
-                        self.context, IssuerCredRevRecord.STATE_REVOKED
-                    )
-
-                except IndyError as err:
-                    if err.error_code == ErrorCode.AnoncredsInvalidUserRevocId:
-                        self.logger.error(
-                            (
-                                "Abstaining from revoking credential on "
-                                "rev reg id %s, cred rev id=%s: "
-                                "already revoked or not yet issued"
-                            ),
-                            rev_reg_id,
-                            cred_rev_id,
-                        )
-                    else:
-                        self.logger.error(
-                            IndyErrorHandler.wrap_error(
-                                err, "Revocation error", IssuerError
-                            ).roll_up
-                        )
-                    failed_crids.append(cred_rev_id)
-                    continue
-                except StorageError as err:
-                    self.logger.warning(
-                        (
-                            "Revoked credential on rev reg id %s, cred rev id %s "
-                            "without corresponding issuer cred rev record: %s"
-                        ),
-                        rev_reg_id,
-                        cred_rev_id,
-                        err.roll_up,
-                    )
-                    # carry on with delta merge; record is best-effort
-
-                if result_json:
-                    result_json = await self.merge_revocation_registry_deltas(
-                        result_json, delta_json
-                    )
+        deltas = []
+        total = len(cred_rev_ids)
+        for start in range(0, total, self.REVOKE_CHUNK_SIZE):
+            end = start + self.REVOKE_CHUNK_SIZE
+            chunk = cred_rev_ids[start:end]
+            results = await asyncio.gather(
+                *(
+                    self._revoke_credential(rev_reg_id, tails_reader_handle, crid)
+                    for crid in chunk
+                )
+            )
+            revoked = []
+            for cred_rev_id, delta_json in zip(chunk, results):
+                if delta_json:
+                    deltas.append(delta_json)
+                    revoked.append(cred_rev_id)
                 else:
-                    result_json = delta_json
+                    failed_crids.append(cred_rev_id)
+            if revoked:
+                await self._mark_revoked(rev_reg_id, revoked)
+            if total > self.REVOKE_CHUNK_SIZE:
+                self.logger.info(
+                    "Revoked %s of %s credentials on rev reg id %s (%s failed)",
+                    len(deltas),
+                    total,
+                    rev_reg_id,
+                    len(failed_crids),
+                )
 
+        result_json = await self._merge_delta_tree(deltas)
         return (result_json, failed_crids)
 
+    async def _revoke_credential(
+        self, rev_reg_id: str, tails_reader_handle: int, cred_rev_id: str
+    ) -> str:
+        """Revoke a single credential, returning its delta or None on failure."""
+        try:
+            return await indy.anoncreds.issuer_revoke_credential(
+                self.wallet.handle,
+                tails_reader_handle,
+                rev_reg_id,
+                cred_rev_id,
+            )
+        except IndyError as err:
+            if err.error_code == ErrorCode.AnoncredsInvalidUserRevocId:
+                self.logger.error(
+                    (
+                        "Abstaining from revoking credential on "
+                        "rev reg id %s, cred rev id=%s: "
+                        "already revoked or not yet issued"
+                    ),
+                    rev_reg_id,
+                    cred_rev_id,
+                )
+            else:
+                self.logger.error(
+                    IndyErrorHandler.wrap_error(
+                        err, "Revocation error", IssuerError
+                    ).roll_up
+                )
+        return None
+
+    async def _mark_revoked(self, rev_reg_id: str, cred_rev_ids: Sequence[str]):
+        """Mark the issuer cred rev records for revoked credentials as revoked."""
+        try:
+            records = await IssuerCredRevRecord.query_by_cred_rev_ids(
+                self.context, rev_reg_id, cred_rev_ids
+            )
+        except StorageError as err:
+            self.logger.warning(
+                "Could not retrieve issuer cred rev records on rev reg id %s: %s",
+                rev_reg_id,
+                err.roll_up,
+            )
+            return
+
+        found = {record.cred_rev_id for record in records}
+        missing = [crid for crid in cred_rev_ids if crid not in found]
+        if missing:
+            self.logger.warning(
+                (
+                    "Revoked credentials on rev reg id %s, cred rev ids %s "
+                    "without corresponding issuer cred rev records"
+                ),
+                rev_reg_id,
+                ", ".join(missing),
+            )
+
+        results = await asyncio.gather(
+            *(
+                record.set_state(self.context, IssuerCredRevRecord.STATE_REVOKED)
+                for record in records
+            ),
+            return_exceptions=True,
+        )
+        for record, result in zip(records, results):
+            if isinstance(result, StorageError):
+                self.logger.warning(
+                    (
+                        "Revoked credential on rev reg id %s, cred rev id %s "
+                        "without updating issuer cred rev record: %s"
+                    ),
+                    rev_reg_id,
+                    record.cred_rev_id,
+                    result.roll_up,
+                )
+            elif isinstance(result, Exception):
+                raise result
+
+    async def _merge_delta_tree(self, deltas: Sequence[str]) -> str:
+        """Merge a sequence of revocation registry deltas pairwise."""
+        deltas = self._order_deltas(deltas)
+        while len(deltas) > 1:
+            merged = await asyncio.gather(
+                *(
+                    self.merge_revocation_registry_deltas(fro_delta, to_delta)
+                    for (fro_delta, to_delta) in zip(deltas[::2], deltas[1::2])
+                )
+            )
+            if len(deltas) % 2:
+                merged.append(deltas[-1])
+            deltas = merged
+        return deltas[0] if deltas else None
+
+    @staticmethod
+    def _order_deltas(deltas: Sequence[str]) -> Sequence[str]:
+        """
+        Order revocation registry deltas by their accumulator chain.
+
+        Deltas can only be merged with those adjacent in the chain, from each
+        previous accumulator value to the next. Deltas which do not form a
+        single chain are left in the order given.
+        """
+        by_prev = {}
+        accums = set()
+        for delta_json in deltas:
+            value = json.loads(delta_json).get("value", {})
+            by_prev[value.get("prevAccum")] = (value.get("accum"), delta_json)
+            accums.add(value.get("accum"))
+        starts = [prev for prev in by_prev if prev not in accums]
+        if len(by_prev) != len(deltas) or len(starts) != 1:
+            return list(deltas)
+        ordered = []
+        accum = starts[0]
+        while accum in by_prev:
+            accum, delta_json = by_prev.pop(accum)
+            ordered.append(delta_json)
+        return ordered if len(ordered) == len(deltas) else list(deltas)
+
     async def merge_revocation_registry_deltas(
         self, fro_delta: str, to_delta: str
     ) -> str:
@@ -168,10 +168,14 @@ class TestIndyIssuer(AsyncTestCase):
             test_module, "IssuerCredRevRecord", async_mock.MagicMock()
         ) as mock_issuer_cr_rec:
             mock_issuer_cr_rec.return_value.save = async_mock.CoroutineMock()
-            mock_issuer_cr_rec.retrieve_by_ids = async_mock.CoroutineMock(
-                return_value=async_mock.MagicMock(
-                    set_state=async_mock.CoroutineMock(),
-                )
+            mock_issuer_cr_rec.query_by_cred_rev_ids = async_mock.CoroutineMock(
+                return_value=[
+                    async_mock.MagicMock(
+                        cred_rev_id=cr_id,
+                        set_state=async_mock.CoroutineMock(),
+                    )
+                    for cr_id in test_cred_rev_ids
+                ]
             )
 
             with self.assertRaises(test_module.IssuerError):  # missing attribute
@@ -275,14 +279,17 @@ class TestIndyIssuer(AsyncTestCase):
                     "could not store"  # not fatal; maximize coverage
                 )
             )
-            mock_issuer_cr_rec.retrieve_by_ids = async_mock.CoroutineMock(
-                return_value=async_mock.MagicMock(
-                    set_state=async_mock.CoroutineMock(
-                        side_effect=test_module.StorageError(
-                            "could not store"  # not fatal; maximize coverage
-                        )
-                    ),
-                )
+            mock_issuer_cr_rec.query_by_cred_rev_ids = async_mock.CoroutineMock(
+                return_value=[
+                    async_mock.MagicMock(
+                        cred_rev_id="42",
+                        set_state=async_mock.CoroutineMock(
+                            side_effect=test_module.StorageError(
+                                "could not store"  # not fatal; maximize coverage
+                            )
+                        ),
+                    )
+                ]
             )
 
             (cred_json, cred_rev_id) = await self.issuer.create_credential(  # main line
@@ -329,6 +336,70 @@ class TestIndyIssuer(AsyncTestCase):
             assert mock_indy_revoke_credential.call_count == 3
             mock_indy_merge_rr_deltas.assert_not_called()
 
+    @async_mock.patch("aries_cloudagent.issuer.indy.create_tails_reader")
+    @async_mock.patch("indy.anoncreds.issuer_revoke_credential")
+    @async_mock.patch("indy.anoncreds.issuer_merge_revocation_registry_deltas")
+    async def test_revoke_credentials_chunked(
+        self,
+        mock_indy_merge_rr_deltas,
+        mock_indy_revoke_credential,
+        mock_tails_reader,
+    ):
+        test_cred_rev_ids = [str(i) for i in range(1, 6)]
+        # revocations complete out of accumulator order
+        test_deltas = [
+            {
+                "ver": "1.0",
+                "value": {
+                    "prevAccum": f"{i - 1} ...",
+                    "accum": f"{i} ...",
+                    "revoked": [i],
+                },
+            }
+            for i in (3, 1, 5, 2, 4)
+        ]
+
+        def merge(fro_delta, to_delta):
+            fro_value = json.loads(fro_delta)["value"]
+            to_value = json.loads(to_delta)["value"]
+            assert fro_value["accum"] == to_value["prevAccum"]
+            return json.dumps(
+                {
+                    "ver": "1.0",
+                    "value": {
+                        "prevAccum": fro_value["prevAccum"],
+                        "accum": to_value["accum"],
+                        "revoked": fro_value["revoked"] + to_value["revoked"],
+                    },
+                }
+            )
+
+        mock_indy_revoke_credential.side_effect = [
+            json.dumps(delta) for delta in test_deltas
+        ]
+        mock_indy_merge_rr_deltas.side_effect = merge
+
+        with async_mock.patch.object(
+            test_module, "IssuerCredRevRecord", async_mock.MagicMock()
+        ) as mock_issuer_cr_rec, async_mock.patch.object(
+            self.issuer, "REVOKE_CHUNK_SIZE", 2
+        ):
+            mock_issuer_cr_rec.query_by_cred_rev_ids = async_mock.CoroutineMock(
+                return_value=[]
+            )
+            (result, failed) = await self.issuer.revoke_credentials(
+                REV_REG_ID, tails_file_path="dummy", cred_rev_ids=test_cred_rev_ids
+            )
+            assert json.loads(result)["value"] == {
+                "prevAccum": "0 ...",
+                "accum": "5 ...",
+                "revoked": [1, 2, 3, 4, 5],
+            }
+            assert not failed
+            assert mock_indy_revoke_credential.call_count == 5
+            assert mock_indy_merge_rr_deltas.call_count == 4
+            assert mock_issuer_cr_rec.query_by_cred_rev_ids.call_count == 3
+
     @async_mock.patch("indy.anoncreds.issuer_create_credential")
     @async_mock.patch("aries_cloudagent.issuer.indy.create_tails_reader")
     async def test_create_credential_rr_full(
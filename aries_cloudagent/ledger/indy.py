@@ -99,6 +99,9 @@ class IndyLedger(BaseLedger):
 
     LEDGER_TYPE = "indy"
 
+    # seconds after which ledger state at a past timestamp is treated as final
+    REVOC_SETTLE_TIME = 60
+
     def __init__(
         self,
         pool_name: str,
@@ -107,6 +110,8 @@ class IndyLedger(BaseLedger):
         keepalive: int = 0,
         cache: BaseCache = None,
         cache_duration: int = 600,
+        revoc_cache_duration: int = 86400,
+        revoc_delta_tolerance: int = 10,
         read_only: bool = False,
     ):
         """
@@ -118,6 +123,11 @@ class IndyLedger(BaseLedger):
             keepalive: How many seconds to keep the ledger open
             cache: The cache instance to use
             cache_duration: The TTL for ledger cache entries
+            revoc_cache_duration: The TTL for cached revocation registry
+                definitions, and for entries and deltas at settled times
+            revoc_delta_tolerance: The number of seconds by which a cached
+                revocation registry delta for a recent interval may be behind
+                the end of a requested interval
         """
         self.opened = False
         self.ref_count = 0
@@ -126,6 +136,9 @@ class IndyLedger(BaseLedger):
         self.close_task: asyncio.Future = None
         self.cache = cache
         self.cache_duration = cache_duration
+        self.revoc_cache_duration = revoc_cache_duration
+        self.revoc_delta_tolerance = revoc_delta_tolerance
+        self.revoc_cache_counts = {}
         self.wallet = wallet
         self.pool_handle = None
         self.pool_name = pool_name
@@ -141,6 +154,23 @@ class IndyLedger(BaseLedger):
         """Accessor for the ledger type."""
         return IndyLedger.LEDGER_TYPE
 
+    @property
+    def revoc_cache_stats(self) -> dict:
+        """Accessor for the revocation registry cache hits, misses and hit rates."""
+        stats = {}
+        for kind, counts in self.revoc_cache_counts.items():
+            total = counts["hits"] + counts["misses"]
+            stats[kind] = {
+                **counts,
+                "hit_rate": round(counts["hits"] / total, 4) if total else None,
+            }
+        return stats
+
+    def _count_revoc_cache(self, kind: str, hit: bool):
+        """Count a revocation registry cache lookup."""
+        counts = self.revoc_cache_counts.setdefault(kind, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
     async def create_pool_config(
         self, genesis_transactions: str, recreate: bool = False
     ):
@@ -1044,7 +1074,19 @@ class IndyLedger(BaseLedger):
         return acceptance
 
     async def get_revoc_reg_def(self, revoc_reg_id: str) -> dict:
-        """Get revocation registry definition by ID."""
+        """
+        Get revocation registry definition by ID.
+
+        Definitions never change once published, so they are cached for the
+        long `revoc_cache_duration`, which bounds the cache size over time.
+        """
+        cache_key = f"revoc_reg_def::{revoc_reg_id}"
+        if self.cache:
+            result = await self.cache.get(cache_key)
+            self._count_revoc_cache("revoc_reg_def", bool(result))
+            if result:
+                return result
+
         public_info = await self.wallet.get_public_did()
         try:
             fetch_req = await indy.ledger.build_get_revoc_reg_def_request(
@@ -1063,10 +1105,26 @@ class IndyLedger(BaseLedger):
             raise e
 
         assert found_id == revoc_reg_id
-        return json.loads(found_def_json)
+        result = json.loads(found_def_json)
+        if self.cache:
+            await self.cache.set(cache_key, result, self.revoc_cache_duration)
+        return result
 
     async def get_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
-        """Get revocation registry entry by revocation registry ID and timestamp."""
+        """
+        Get revocation registry entry by revocation registry ID and timestamp.
+
+        Entries for timestamps which have settled are cached for the
+        `revoc_cache_duration`.
+        """
+        cache_key = f"revoc_reg_entry::{revoc_reg_id}::{timestamp}"
+        settled = timestamp <= int(time()) - self.REVOC_SETTLE_TIME
+        if self.cache and settled:
+            result = await self.cache.get(cache_key)
+            self._count_revoc_cache("revoc_reg_entry", bool(result))
+            if result:
+                return result["entry"], result["timestamp"]
+
         public_info = await self.wallet.get_public_did()
         with IndyErrorHandler("Exception fetching rev reg entry", LedgerError):
             try:
@@ -1086,7 +1144,14 @@ class IndyLedger(BaseLedger):
                 )
                 raise e
         assert found_id == revoc_reg_id
-        return json.loads(found_reg_json), ledger_timestamp
+        entry = json.loads(found_reg_json)
+        if self.cache and settled:
+            await self.cache.set(
+                cache_key,
+                {"entry": entry, "timestamp": ledger_timestamp},
+                self.revoc_cache_duration,
+            )
+        return entry, ledger_timestamp
 
     async def get_revoc_reg_delta(
         self, revoc_reg_id: str, timestamp_from=0, timestamp_to=None
@@ -1099,9 +1164,33 @@ class IndyLedger(BaseLedger):
         :param timestamp_to latest EPOCH time of interest
 
         :returns delta response, delta timestamp
+
+        Deltas for intervals ending at a settled time never change and are cached
+        for the `revoc_cache_duration`. The latest delta for an interval ending at
+        a recent time is cached briefly and reused for requests whose interval
+        ends between the delta timestamp and `revoc_delta_tolerance` seconds after
+        the end of the cached interval.
         """
+        now = int(time())
         if timestamp_to is None:
-            timestamp_to = int(time())
+            timestamp_to = now
+        settled = timestamp_to <= now - self.REVOC_SETTLE_TIME
+        cache_key = "revoc_reg_delta::{}::{}::{}".format(
+            revoc_reg_id, timestamp_from, timestamp_to if settled else "recent"
+        )
+        cache_recent = self.cache and self.revoc_delta_tolerance > 0
+        if self.cache and (settled or cache_recent):
+            result = await self.cache.get(cache_key)
+            hit = bool(result) and (
+                settled
+                or result["timestamp"]
+                <= timestamp_to
+                <= result["to"] + self.revoc_delta_tolerance
+            )
+            self._count_revoc_cache("revoc_reg_delta", hit)
+            if hit:
+                return result["delta"], result["timestamp"]
+
         public_info = await self.wallet.get_public_did()
         with IndyErrorHandler("Exception building rev reg delta request", LedgerError):
             fetch_req = await indy.ledger.build_get_revoc_reg_delta_request(
@@ -1124,7 +1213,14 @@ class IndyLedger(BaseLedger):
                 delta_timestamp,
             ) = await indy.ledger.parse_get_revoc_reg_delta_response(response_json)
             assert found_id == revoc_reg_id
-        return json.loads(found_delta_json), delta_timestamp
+        delta = json.loads(found_delta_json)
+        if self.cache and (settled or cache_recent):
+            await self.cache.set(
+                cache_key,
+                {"to": timestamp_to, "delta": delta, "timestamp": delta_timestamp},
+                self.revoc_cache_duration if settled else self.revoc_delta_tolerance,
+            )
+        return delta, delta_timestamp
 
     async def send_revoc_reg_def(self, revoc_reg_def: dict, issuer_did: str = None):
         """Publish a revocation registry definition to the ledger."""
@@ -0,0 +1,80 @@
+"""Concurrent retrieval of ledger artifacts."""
+
+import asyncio
+
+from typing import Mapping, Sequence, Tuple
+
+from .base import BaseLedger
+
+
+class LedgerPrefetch:
+    """
+    Resolve a batch of ledger lookups concurrently.
+
+    Lookups are collected with `request` and resolved together by `gather`, with
+    at most `max_concurrent` in progress at once. Requesting a lookup which has
+    already been requested, or is in progress, returns the existing request.
+    """
+
+    def __init__(self, ledger: BaseLedger, *, max_concurrent: int = 8):
+        """
+        Initialize a `LedgerPrefetch` instance.
+
+        Args:
+            ledger: the ledger to query, which should be opened by the caller
+            max_concurrent: the maximum number of lookups in progress
+
+        """
+        self.ledger = ledger
+        self.max_concurrent = max_concurrent
+        self.requests = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def request(self, method: str, *args) -> asyncio.Future:
+        """
+        Request a ledger lookup.
+
+        Args:
+            method: the name of the `BaseLedger` method to call
+            args: the arguments for the method
+
+        Returns:
+            A future for the result of the lookup
+
+        """
+        key = (method, *args)
+        future = self.requests.get(key)
+        if not future:
+            future = asyncio.ensure_future(self._fetch(method, args))
+            self.requests[key] = future
+        return future
+
+    async def gather(self) -> Mapping[Tuple, object]:
+        """
+        Wait for all requested lookups.
+
+        Returns:
+            A mapping of each request, as the method name followed by the
+            arguments, to its result
+
+        Raises:
+            The first error raised by a lookup, after cancelling the others
+
+        """
+        futures = list(self.requests.values())
+        try:
+            await asyncio.gather(*futures)
+        except Exception:
+            for future in futures:
+                future.cancel()
+            await asyncio.gather(*futures, return_exceptions=True)
+            raise
+        return {key: future.result() for key, future in self.requests.items()}
+
+    def result(self, method: str, *args):
+        """Fetch the result of a completed lookup."""
+        return self.requests[(method, *args)].result()
+
+    async def _fetch(self, method: str, args: Sequence):
+        async with self._semaphore:
+            return await getattr(self.ledger, method)(*args)
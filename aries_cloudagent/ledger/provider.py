@@ -29,8 +29,22 @@ class LedgerProvider(BaseProvider):
         if wallet.type == "indy":
             IndyLedger = ClassLoader.load_class(self.LEDGER_CLASSES["indy"])
             cache = await injector.inject(BaseCache, required=False)
+            revoc_args = {}
+            if settings.get("ledger.revocation_cache_ttl") is not None:
+                revoc_args["revoc_cache_duration"] = int(
+                    settings["ledger.revocation_cache_ttl"]
+                )
+            if settings.get("ledger.revocation_delta_tolerance") is not None:
+                revoc_args["revoc_delta_tolerance"] = int(
+                    settings["ledger.revocation_delta_tolerance"]
+                )
             ledger = IndyLedger(
-                pool_name, wallet, keepalive=keepalive, cache=cache, read_only=read_only
+                pool_name,
+                wallet,
+                keepalive=keepalive,
+                cache=cache,
+                read_only=read_only,
+                **revoc_args,
             )
 
             genesis_transactions = settings.get("ledger.genesis_transactions")
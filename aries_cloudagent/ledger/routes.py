@@ -62,6 +62,16 @@ class TAAAcceptSchema(OpenAPISchema):
     mechanism = fields.Str()
 
 
+class RevocationCacheStatsSchema(OpenAPISchema):
+    """Result schema for revocation registry cache statistics."""
+
+    results = fields.Dict(
+        keys=fields.Str(description="Cached artifact type"),
+        values=fields.Dict(description="Cache hits, misses and hit rate"),
+        description="Revocation registry cache statistics by artifact type",
+    )
+
+
 class RegisterLedgerNymQueryStringSchema(OpenAPISchema):
     """Query string parameters and validators for register ledger nym request."""
 
@@ -329,6 +339,30 @@ async def ledger_get_taa(request: web.BaseRequest):
     return web.json_response({"result": taa_info})
 
 
+@docs(tags=["ledger"], summary="Fetch revocation registry cache statistics")
+@response_schema(RevocationCacheStatsSchema, 200)
+async def ledger_revocation_cache_stats(request: web.BaseRequest):
+    """
+    Request handler for fetching revocation registry cache statistics.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        The cache hits, misses and hit rate for each cached artifact type
+
+    """
+    context = request.app["request_context"]
+    ledger: BaseLedger = await context.inject(BaseLedger, required=False)
+    if not ledger or ledger.type != "indy":
+        reason = "No indy ledger available"
+        if not context.settings.get_value("wallet.type"):
+            reason += ": missing wallet-type?"
+        raise web.HTTPForbidden(reason=reason)
+
+    return web.json_response({"results": ledger.revoc_cache_stats})
+
+
 @docs(tags=["ledger"], summary="Accept the transaction author agreement")
 @request_schema(TAAAcceptSchema)
 async def ledger_accept_taa(request: web.BaseRequest):
@@ -386,6 +420,11 @@ async def register(app: web.Application):
             web.get("/ledger/did-endpoint", get_did_endpoint, allow_head=False),
             web.get("/ledger/taa", ledger_get_taa, allow_head=False),
             web.post("/ledger/taa/accept", ledger_accept_taa),
+            web.get(
+                "/ledger/revocation-cache-stats",
+                ledger_revocation_cache_stats,
+                allow_head=False,
+            ),
         ]
     )
 
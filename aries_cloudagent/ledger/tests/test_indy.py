@@ -2,6 +2,8 @@ import asyncio
 import json
 import pytest
 
+from time import perf_counter, time
+
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
@@ -2601,6 +2603,131 @@ class TestIndyLedger(AsyncTestCase):
             (result, _) = await ledger.get_revoc_reg_delta("rr-id")
             assert result == {"hello": "world"}
 
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_revoc_reg_def_request")
+    @async_mock.patch("indy.ledger.parse_get_revoc_reg_def_response")
+    async def test_get_revoc_reg_def_cached(
+        self,
+        mock_indy_parse_get_rrdef_resp,
+        mock_indy_build_get_rrdef_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+        mock_indy_parse_get_rrdef_resp.return_value = ("rr-id", '{"hello": "world"}')
+
+        cache = BasicCache()
+        ledger = IndyLedger(
+            "name", mock_wallet, cache=cache, revoc_cache_duration=3600
+        )
+
+        async with ledger:
+            for _ in range(3):
+                result = await ledger.get_revoc_reg_def("rr-id")
+                assert result == {"hello": "world"}
+        mock_submit.assert_called_once()
+        # definitions are capped by the revocation cache TTL
+        (entry,) = cache._cache.values()
+        assert entry["expires"] is not None
+        assert entry["expires"] - perf_counter() == pytest.approx(3600, abs=5)
+        assert ledger.revoc_cache_stats == {
+            "revoc_reg_def": {"hits": 2, "misses": 1, "hit_rate": 0.6667}
+        }
+
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_revoc_reg_request")
+    @async_mock.patch("indy.ledger.parse_get_revoc_reg_response")
+    async def test_get_revoc_reg_entry_cached(
+        self,
+        mock_indy_parse_get_rr_resp,
+        mock_indy_build_get_rr_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+        mock_indy_parse_get_rr_resp.return_value = (
+            "rr-id",
+            '{"hello": "world"}',
+            1234567890,
+        )
+
+        ledger = IndyLedger("name", mock_wallet, cache=BasicCache())
+
+        async with ledger:
+            for _ in range(2):
+                result = await ledger.get_revoc_reg_entry("rr-id", 1234567890)
+                assert result == ({"hello": "world"}, 1234567890)
+            assert mock_submit.call_count == 1
+
+            # entries at unsettled timestamps are not cached
+            for _ in range(2):
+                await ledger.get_revoc_reg_entry("rr-id", int(time()))
+            assert mock_submit.call_count == 3
+
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_revoc_reg_delta_request")
+    @async_mock.patch("indy.ledger.parse_get_revoc_reg_delta_response")
+    async def test_get_revoc_reg_delta_cached(
+        self,
+        mock_indy_parse_get_rrd_resp,
+        mock_indy_build_get_rrd_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+        now = int(time())
+        mock_indy_parse_get_rrd_resp.return_value = (
+            "rr-id",
+            '{"hello": "world"}',
+            now - 100,
+        )
+
+        ledger = IndyLedger(
+            "name", mock_wallet, cache=BasicCache(), revoc_delta_tolerance=10
+        )
+
+        async with ledger:
+            # settled intervals are cached by their exact bounds
+            for _ in range(2):
+                result = await ledger.get_revoc_reg_delta("rr-id", 0, now - 100)
+                assert result == ({"hello": "world"}, now - 100)
+            assert mock_submit.call_count == 1
+            await ledger.get_revoc_reg_delta("rr-id", 0, now - 90)
+            assert mock_submit.call_count == 2
+
+            # recent intervals reuse the latest delta within the tolerance
+            await ledger.get_revoc_reg_delta("rr-id", 0, now)
+            await ledger.get_revoc_reg_delta("rr-id", 0, now + 5)
+            await ledger.get_revoc_reg_delta("rr-id", 0, now - 50)
+            assert mock_submit.call_count == 3
+            await ledger.get_revoc_reg_delta("rr-id", 0, now + 20)
+            assert mock_submit.call_count == 4
+            await ledger.get_revoc_reg_delta("rr-id", 10, now)
+            assert mock_submit.call_count == 5
+
+        assert ledger.revoc_cache_stats["revoc_reg_delta"]["hits"] == 3
+
     @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_open")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._context_close")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndyLedger._submit")
@@ -0,0 +1,47 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ..base import BaseLedger
+from ..error import LedgerError
+from ..prefetch import LedgerPrefetch
+
+
+class TestLedgerPrefetch(AsyncTestCase):
+    def setUp(self):
+        self.active = 0
+        self.max_active = 0
+
+        async def get_schema(schema_id):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            if schema_id == "bad":
+                raise LedgerError("not found")
+            return {"id": schema_id}
+
+        self.ledger = async_mock.MagicMock(BaseLedger, autospec=True)
+        self.ledger.get_schema = async_mock.CoroutineMock(side_effect=get_schema)
+
+    async def test_gather(self):
+        prefetch = LedgerPrefetch(self.ledger, max_concurrent=2)
+        for schema_id in ("a", "b", "a", "c", "d"):
+            prefetch.request("get_schema", schema_id)
+        results = await prefetch.gather()
+
+        assert results == {
+            ("get_schema", schema_id): {"id": schema_id}
+            for schema_id in ("a", "b", "c", "d")
+        }
+        assert prefetch.result("get_schema", "c") == {"id": "c"}
+        assert self.ledger.get_schema.call_count == 4
+        assert self.max_active == 2
+
+    async def test_gather_x(self):
+        prefetch = LedgerPrefetch(self.ledger, max_concurrent=1)
+        prefetch.request("get_schema", "bad")
+        pending = prefetch.request("get_schema", "a")
+        with self.assertRaises(LedgerError):
+            await prefetch.gather()
+        assert pending.cancelled()
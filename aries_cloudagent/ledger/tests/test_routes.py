@@ -280,6 +280,22 @@ class TestLedgerRoutes(AsyncTestCase):
             )
             assert result is json_response.return_value
 
+    async def test_revocation_cache_stats(self):
+        request = async_mock.MagicMock()
+        request.app = self.app
+        with self.assertRaises(test_module.web.HTTPForbidden):
+            await test_module.ledger_revocation_cache_stats(request)
+
+        stats = {"revoc_reg_def": {"hits": 1, "misses": 1, "hit_rate": 0.5}}
+        with async_mock.patch.object(
+            test_module.web, "json_response", async_mock.Mock()
+        ) as json_response:
+            self.ledger.type = "indy"
+            self.ledger.revoc_cache_stats = stats
+            result = await test_module.ledger_revocation_cache_stats(request)
+            json_response.assert_called_once_with({"results": stats})
+            assert result is json_response.return_value
+
     async def test_get_taa_required(self):
         request = async_mock.MagicMock()
         request.app = self.app
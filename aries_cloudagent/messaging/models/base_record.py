@@ -5,7 +5,7 @@ import sys
 import uuid
 
 from datetime import datetime
-from typing import Any, Mapping, Sequence, Union
+from typing import Any, AsyncIterator, Mapping, Sequence, Tuple, Union
 
 from marshmallow import fields
 
@@ -258,36 +258,204 @@ class BaseRecord(BaseModel):
         return found
 
     @classmethod
-    async def query(
+    def push_down_post_filters(
+        cls,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+    ) -> Tuple[dict, dict, dict]:
+        """Move post-filter clauses on tagged values into the tag filter.
+
+        Positive clauses on tag names with string values become equality tag
+        clauses. A negative post-filter is moved as a whole into a `$not` tag
+        clause when every one of its clauses can be expressed as a tag query.
+
+        Args:
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+
+        Returns:
+            A tuple of the tag filter and the remaining positive and negative
+            post-filters
+
+        """
+        tag_map = cls.get_tag_map()
+        tag_filter = dict(tag_filter or {})
+
+        positive = {}
+        for k, v in (post_filter_positive or {}).items():
+            if k in tag_map and isinstance(v, str) and tag_filter.get(k, v) == v:
+                tag_filter[k] = v
+            else:
+                positive[k] = v
+
+        negative = dict(post_filter_negative or {})
+        if (
+            negative
+            and "$not" not in tag_filter
+            and all(k in tag_map and isinstance(v, str) for k, v in negative.items())
+        ):
+            tag_filter["$not"] = negative
+            negative = {}
+
+        return tag_filter or None, positive or None, negative or None
+
+    @classmethod
+    async def query_iter(
         cls,
         context: InjectionContext,
         tag_filter: dict = None,
         post_filter_positive: dict = None,
         post_filter_negative: dict = None,
-    ) -> Sequence["BaseRecord"]:
-        """Query stored records.
+        *,
+        page_size: int = None,
+        offset: int = 0,
+        limit: int = None,
+        after_id: str = None,
+    ) -> AsyncIterator["BaseRecord"]:
+        """Iterate over stored records, fetching and decoding one page at a time.
 
         Args:
             context: The injection context to use
             tag_filter: An optional dictionary of tag filter clauses
             post_filter_positive: Additional value filters to apply matching positively
             post_filter_negative: Additional value filters to apply matching negatively
+            page_size: The number of records to fetch from storage at a time
+            offset: The number of matching records to skip, if `after_id` is not
+                given or no longer matches the query
+            limit: The maximum number of records to produce
+            after_id: The ID of a record after which to resume the search
         """
+        if limit is not None and limit <= 0:
+            return
+        query = (tag_filter, post_filter_positive, post_filter_negative)
+        (
+            tag_filter,
+            post_filter_positive,
+            post_filter_negative,
+        ) = cls.push_down_post_filters(*query)
+        options = {"retrieveTags": False}
+        if after_id:
+            # storage supporting this option starts the search at the record,
+            # otherwise the records before it are skipped without decoding
+            options["fromId"] = after_id
         storage: BaseStorage = await context.inject(BaseStorage)
-        query = storage.search_records(
+        search = storage.search_records(
             cls.RECORD_TYPE,
             cls.prefix_tag_filter(tag_filter),
-            None,
+            page_size,
+            options,
+        )
+        post_filter = post_filter_positive or post_filter_negative
+        seeking = after_id
+        skip = 0 if after_id else offset or 0
+        count = 0
+        complete = False
+        try:
+            async for record in search:
+                if seeking:
+                    if record.id == seeking:
+                        seeking = None
+                    continue
+                # values are only decoded to apply a post-filter or build a record
+                vals = None
+                if post_filter:
+                    vals = json.loads(record.value)
+                    if not (
+                        match_post_filter(vals, post_filter_positive, True)
+                        and match_post_filter(vals, post_filter_negative, False)
+                    ):
+                        continue
+                if skip:
+                    skip -= 1
+                    continue
+                if vals is None:
+                    vals = json.loads(record.value)
+                yield cls.from_storage(record.id, vals)
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+            else:
+                complete = True
+        finally:
+            # an exhausted search is closed by the storage iterator
+            if not complete:
+                await search.close()
+        if seeking:
+            # the record to resume after is no longer matched, skip by offset
+            async for record in cls.query_iter(
+                context, *query, page_size=page_size, offset=offset, limit=limit
+            ):
+                yield record
+
+    @classmethod
+    async def query_count(
+        cls,
+        context: InjectionContext,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        *,
+        page_size: int = None,
+    ) -> int:
+        """Count stored records matching a query without building record instances.
+
+        Args:
+            context: The injection context to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            page_size: The number of records to fetch from storage at a time
+        """
+        (
+            tag_filter,
+            post_filter_positive,
+            post_filter_negative,
+        ) = cls.push_down_post_filters(
+            tag_filter, post_filter_positive, post_filter_negative
+        )
+        storage: BaseStorage = await context.inject(BaseStorage)
+        search = storage.search_records(
+            cls.RECORD_TYPE,
+            cls.prefix_tag_filter(tag_filter),
+            page_size,
             {"retrieveTags": False},
         )
-        result = []
-        async for record in query:
-            vals = json.loads(record.value)
-            if match_post_filter(
-                vals, post_filter_positive, True
-            ) and match_post_filter(vals, post_filter_negative, False):
-                result.append(cls.from_storage(record.id, vals))
-        return result
+        count = 0
+        async for record in search:
+            if post_filter_positive or post_filter_negative:
+                vals = json.loads(record.value)
+                if not (
+                    match_post_filter(vals, post_filter_positive, True)
+                    and match_post_filter(vals, post_filter_negative, False)
+                ):
+                    continue
+            count += 1
+        return count
+
+    @classmethod
+    async def query(
+        cls,
+        context: InjectionContext,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+    ) -> Sequence["BaseRecord"]:
+        """Query stored records.
+
+        Args:
+            context: The injection context to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+        """
+        return [
+            record
+            async for record in cls.query_iter(
+                context, tag_filter, post_filter_positive, post_filter_negative
+            )
+        ]
 
     async def save(
         self,
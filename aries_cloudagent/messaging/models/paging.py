@@ -0,0 +1,281 @@
+"""Pagination support for admin record list endpoints."""
+
+import json
+import logging
+from hashlib import sha256
+from typing import Any, AsyncIterator, Callable, Mapping, Optional, Tuple, Type
+
+from aiohttp import web
+from marshmallow import fields, validate
+
+from ...wallet.util import b64_to_str, str_to_b64
+
+from .base_record import BaseRecord
+from .openapi import OpenAPISchema
+
+LOGGER = logging.getLogger(__name__)
+
+PAGE_LIMIT_MAX = 10000
+
+
+class PagingQueryStringSchema(OpenAPISchema):
+    """Parameters and validators for paginated list query strings."""
+
+    limit = fields.Int(
+        description="Maximum number of records to return",
+        required=False,
+        validate=validate.Range(min=1, max=PAGE_LIMIT_MAX),
+        example=100,
+    )
+    offset = fields.Int(
+        description="Number of matching records to skip",
+        required=False,
+        validate=validate.Range(min=0),
+        example=0,
+    )
+    cursor = fields.Str(
+        description="Opaque cursor returned as next_cursor by a previous page",
+        required=False,
+    )
+    count = fields.Bool(
+        description="Include the total number of matching records",
+        required=False,
+    )
+
+
+class PagingResultSchema(OpenAPISchema):
+    """Result schema fields for paginated lists."""
+
+    next_cursor = fields.Str(
+        description="Cursor for the next page, if more records may be available",
+        required=False,
+    )
+    total = fields.Int(
+        description="Total number of matching records, if requested",
+        required=False,
+    )
+
+
+def _filter_digest(filters: Mapping) -> str:
+    """Get a short digest identifying a set of query filters."""
+    encoded = json.dumps(filters, sort_keys=True).encode("utf-8")
+    return sha256(encoded).hexdigest()[:16]
+
+
+def encode_cursor(offset: int, filters: Mapping = None, after_id: str = None) -> str:
+    """
+    Create an opaque cursor for the page following a given record.
+
+    Args:
+        offset: the number of matching records before the page
+        filters: the query filters, used to bind the cursor to a query
+        after_id: the ID of the last record before the page
+
+    """
+    parsed = {"o": offset, "f": _filter_digest(filters or {})}
+    if after_id:
+        parsed["k"] = after_id
+    return str_to_b64(json.dumps(parsed), urlsafe=True, pad=False)
+
+
+def decode_cursor(cursor: str, filters: Mapping = None) -> Tuple[int, Optional[str]]:
+    """
+    Decode an opaque cursor produced by `encode_cursor`.
+
+    Returns:
+        A tuple of the offset of the page the cursor refers to, and the ID of the
+        last record before the page
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for other filters
+
+    """
+    try:
+        parsed = json.loads(b64_to_str(cursor, urlsafe=True))
+        offset = int(parsed["o"])
+        digest = parsed["f"]
+        after_id = parsed.get("k")
+    except (AttributeError, TypeError, ValueError, KeyError) as err:
+        raise ValueError("Malformed cursor") from err
+    if offset < 0 or digest != _filter_digest(filters or {}):
+        raise ValueError("Cursor does not match query")
+    if after_id is not None and not isinstance(after_id, str):
+        raise ValueError("Malformed cursor")
+    return offset, after_id
+
+
+def paging_requested(request: web.BaseRequest) -> bool:
+    """Determine whether a list request carries any paging parameters."""
+    return any(
+        request.query.get(name, "") != ""
+        for name in ("limit", "offset", "cursor", "count")
+    )
+
+
+class PagingParams:
+    """Pagination parameters extracted from a list request."""
+
+    def __init__(
+        self,
+        limit: int = None,
+        offset: int = 0,
+        count: bool = False,
+        filters=None,
+        after_id: str = None,
+    ):
+        """Initialize the paging parameters."""
+        self.limit = limit
+        self.offset = offset
+        self.count = count
+        self.filters = filters or {}
+        self.after_id = after_id
+
+    @property
+    def paged(self) -> bool:
+        """Accessor for whether the request asked for a bounded page."""
+        return self.limit is not None
+
+    @classmethod
+    def from_request(
+        cls, request: web.BaseRequest, filters: Mapping = None
+    ) -> "PagingParams":
+        """
+        Parse the paging parameters from a request query string.
+
+        Args:
+            request: aiohttp request object
+            filters: the query filters, used to bind cursors to a query
+
+        Raises:
+            HTTPBadRequest: If the parameters are invalid
+
+        """
+        query = request.query
+        after_id = None
+        try:
+            limit = int(query["limit"]) if query.get("limit", "") != "" else None
+            offset = int(query["offset"]) if query.get("offset", "") != "" else 0
+            if query.get("cursor", "") != "":
+                offset, after_id = decode_cursor(query["cursor"], filters)
+        except ValueError as err:
+            raise web.HTTPBadRequest(reason=str(err)) from err
+        if (limit is not None and not 0 < limit <= PAGE_LIMIT_MAX) or offset < 0:
+            raise web.HTTPBadRequest(reason="Invalid paging parameters")
+        count = query.get("count", "").lower() in ("1", "true")
+        return cls(limit, offset, count, filters, after_id)
+
+
+async def record_list_response(
+    request: web.BaseRequest,
+    record_cls: Type[BaseRecord],
+    tag_filter: dict = None,
+    post_filter_positive: dict = None,
+    post_filter_negative: dict = None,
+    *,
+    serialize: Callable[[BaseRecord], Any] = None,
+    results_key: str = "results",
+) -> web.StreamResponse:
+    """
+    Stream a JSON list of records matching a query as the response.
+
+    The response has the form `{"results": [...]}`, with `next_cursor` added
+    when a page limit was reached and `total` when a count was requested.
+    Records are fetched from storage and written one page at a time. A cursor
+    resumes the search after the last record of the previous page, or at its
+    offset if that record is no longer matched.
+
+    Args:
+        request: aiohttp request object
+        record_cls: the record class to query
+        tag_filter: An optional dictionary of tag filter clauses
+        post_filter_positive: Additional value filters to apply matching positively
+        post_filter_negative: Additional value filters to apply matching negatively
+        serialize: An optional callable producing the JSON value of a record
+        results_key: The name of the results list in the response
+
+    Raises:
+        StorageError: If the first page of results could not be retrieved
+
+    """
+    context = request.app["request_context"]
+    filters = {
+        "tag": tag_filter,
+        "positive": post_filter_positive,
+        "negative": post_filter_negative,
+    }
+    paging = PagingParams.from_request(request, filters)
+    serialize = serialize or (lambda record: record.serialize())
+
+    total = None
+    if paging.count:
+        total = await record_cls.query_count(
+            context, tag_filter, post_filter_positive, post_filter_negative
+        )
+
+    # fetch one extra record to determine whether another page follows
+    records = record_cls.query_iter(
+        context,
+        tag_filter,
+        post_filter_positive,
+        post_filter_negative,
+        page_size=min(paging.limit + 1, PAGE_LIMIT_MAX) if paging.paged else None,
+        offset=paging.offset,
+        limit=paging.limit + 1 if paging.paged else None,
+        after_id=paging.after_id,
+    )
+    try:
+        # retrieve the first result before the response is started, so that
+        # storage errors can still be reported to the client
+        first = None
+        async for first in records:
+            break
+
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        try:
+            await _write_records(
+                response, records, first, paging, filters, total, serialize, results_key
+            )
+        except Exception:
+            # the response has started, so the error can no longer be reported
+            # to the client: the truncated response is ended on return
+            LOGGER.exception("Error streaming %s records", record_cls.__name__)
+            response.force_close()
+    finally:
+        await records.aclose()
+    return response
+
+
+async def _write_records(
+    response: web.StreamResponse,
+    records: AsyncIterator[BaseRecord],
+    first: Optional[BaseRecord],
+    paging: PagingParams,
+    filters: dict,
+    total: Optional[int],
+    serialize: Callable[[BaseRecord], Any],
+    results_key: str,
+):
+    """Write the JSON list of records to a started response."""
+    await response.write(f"{{{json.dumps(results_key)}: [".encode("utf-8"))
+    returned = 0
+    more = False
+    if first is not None:
+        await response.write(json.dumps(serialize(first)).encode("utf-8"))
+        returned = 1
+        last = first
+        async for record in records:
+            if paging.paged and returned >= paging.limit:
+                more = True
+                break
+            await response.write(b", " + json.dumps(serialize(record)).encode("utf-8"))
+            returned += 1
+            last = record
+    await response.write(b"]")
+    if more:
+        next_cursor = encode_cursor(paging.offset + returned, filters, last._id)
+        await response.write(f', "next_cursor": "{next_cursor}"'.encode("utf-8"))
+    if total is not None:
+        await response.write(f', "total": {total}'.encode("utf-8"))
+    await response.write(b"}")
+    await response.write_eof()
@@ -229,6 +229,128 @@ class TestBaseRecord(AsyncTestCase):
         assert result[0]._id == record_id
         assert result[0].value == record_value
 
+    def test_push_down_post_filters(self):
+        assert ARecordImpl.push_down_post_filters() == (None, None, None)
+
+        tag_filter, positive, negative = ARecordImpl.push_down_post_filters(
+            {"state": "active"},
+            {"a": "x", "code": "one"},
+            {"code": "two"},
+        )
+        assert tag_filter == {"state": "active", "code": "one", "$not": {"code": "two"}}
+        assert positive == {"a": "x"}
+        assert negative is None
+
+        # conflicting, non-string or untagged clauses stay in the post-filter
+        tag_filter, positive, negative = ARecordImpl.push_down_post_filters(
+            {"code": "one"},
+            {"code": "two", "state": "active"},
+            {"code": "x", "b": "y"},
+        )
+        assert tag_filter == {"code": "one"}
+        assert positive == {"code": "two", "state": "active"}
+        assert negative == {"code": "x", "b": "y"}
+
+    async def test_query_iter(self):
+        context = InjectionContext(enforce_typing=False)
+        basic_storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, basic_storage)
+        for i in range(10):
+            record = ARecordImpl(
+                a=str(i % 2), b="b", code="even" if i % 2 == 0 else "odd"
+            )
+            await record.save(context)
+
+        result = [
+            rec
+            async for rec in ARecordImpl.query_iter(
+                context, post_filter_positive={"code": "even"}, page_size=3
+            )
+        ]
+        assert len(result) == 5
+        assert all(rec.code == "even" for rec in result)
+
+        result = [
+            rec
+            async for rec in ARecordImpl.query_iter(
+                context,
+                post_filter_positive={"a": "1"},
+                post_filter_negative={"code": "even"},
+                offset=1,
+                limit=2,
+            )
+        ]
+        assert len(result) == 2
+        assert all(rec.a == "1" for rec in result)
+
+        assert [rec async for rec in ARecordImpl.query_iter(context, limit=0)] == []
+
+    async def test_query_iter_close(self):
+        context = InjectionContext(enforce_typing=False)
+        mock_storage = async_mock.MagicMock(BaseStorage, autospec=True)
+        context.injector.bind_instance(BaseStorage, mock_storage)
+        stored = [
+            StorageRecord(
+                BaseRecordImpl.RECORD_TYPE,
+                json.dumps({"created_at": time_now(), "updated_at": time_now()}),
+                {},
+                f"record_{i}",
+            )
+            for i in range(3)
+        ]
+        mock_search = mock_storage.search_records.return_value
+        mock_search.__aiter__.return_value = stored
+        mock_search.close = async_mock.CoroutineMock()
+
+        result = [rec async for rec in BaseRecordImpl.query_iter(context, limit=2)]
+        assert [rec._id for rec in result] == ["record_0", "record_1"]
+        mock_search.close.assert_awaited_once()
+
+    async def test_query_iter_skip_not_decoded(self):
+        context = InjectionContext(enforce_typing=False)
+        mock_storage = async_mock.MagicMock(BaseStorage, autospec=True)
+        context.injector.bind_instance(BaseStorage, mock_storage)
+        value = json.dumps({"created_at": time_now(), "updated_at": time_now()})
+        stored = [
+            StorageRecord(BaseRecordImpl.RECORD_TYPE, "not json", {}, "record_0"),
+            StorageRecord(BaseRecordImpl.RECORD_TYPE, value, {}, "record_1"),
+        ]
+        mock_search = mock_storage.search_records.return_value
+        mock_search.__aiter__.return_value = stored
+
+        result = [rec async for rec in BaseRecordImpl.query_iter(context, offset=1)]
+        assert [rec._id for rec in result] == ["record_1"]
+
+    async def test_query_iter_after_id(self):
+        context = InjectionContext(enforce_typing=False)
+        mock_storage = async_mock.MagicMock(BaseStorage, autospec=True)
+        context.injector.bind_instance(BaseStorage, mock_storage)
+        value = json.dumps({"created_at": time_now(), "updated_at": time_now()})
+        stored = [
+            StorageRecord(BaseRecordImpl.RECORD_TYPE, value, {}, f"record_{i}")
+            for i in range(4)
+        ]
+        # a storage ignoring the fromId option returns the earlier records too
+        mock_search = mock_storage.search_records.return_value
+        mock_search.__aiter__.return_value = stored
+
+        result = [
+            rec
+            async for rec in BaseRecordImpl.query_iter(
+                context, offset=3, after_id="record_1"
+            )
+        ]
+        assert [rec._id for rec in result] == ["record_2", "record_3"]
+        assert mock_storage.search_records.call_args[0][3]["fromId"] == "record_1"
+
+        result = [
+            rec
+            async for rec in BaseRecordImpl.query_iter(
+                context, offset=3, after_id="missing"
+            )
+        ]
+        assert [rec._id for rec in result] == ["record_3"]
+
     @async_mock.patch("builtins.print")
     def test_log_state(self, mock_print):
         test_param = "test.log"
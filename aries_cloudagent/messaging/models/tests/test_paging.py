@@ -0,0 +1,208 @@
+import json
+
+from aiohttp import web
+from marshmallow import fields
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ....config.injection_context import InjectionContext
+from ....storage.base import BaseStorage
+from ....storage.basic import BasicStorage
+
+from ..base_record import BaseRecord, BaseRecordSchema
+from .. import paging as test_module
+
+
+class PagedRecord(BaseRecord):
+    class Meta:
+        schema_class = "PagedRecordSchema"
+
+    RECORD_TYPE = "paged-record"
+    TAG_NAMES = {"state"}
+
+
+class PagedRecordSchema(BaseRecordSchema):
+    class Meta:
+        model_class = PagedRecord
+
+    id = fields.Str(attribute="_id")
+
+
+class MockStreamResponse:
+    def __init__(self, *args, **kwargs):
+        self.body = b""
+        self.prepare = async_mock.CoroutineMock()
+        self.write_eof = async_mock.CoroutineMock()
+        self.force_close = async_mock.MagicMock()
+
+    async def write(self, data: bytes):
+        self.body += data
+
+
+class TestPaging(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        for i in range(5):
+            await PagedRecord(state="active" if i % 2 == 0 else "done").save(
+                self.context
+            )
+
+    def make_request(self, **query):
+        return async_mock.MagicMock(
+            app={"request_context": self.context},
+            query={k: str(v) for k, v in query.items()},
+        )
+
+    async def fetch(self, request, *args):
+        with async_mock.patch.object(
+            test_module.web, "StreamResponse", MockStreamResponse
+        ):
+            response = await test_module.record_list_response(
+                request, PagedRecord, *args
+            )
+        return json.loads(response.body)
+
+    def test_cursor(self):
+        filters = {"tag": {"state": "active"}}
+        cursor = test_module.encode_cursor(10, filters)
+        assert test_module.decode_cursor(cursor, filters) == (10, None)
+        cursor = test_module.encode_cursor(10, filters, "record-id")
+        assert test_module.decode_cursor(cursor, filters) == (10, "record-id")
+        with self.assertRaises(ValueError):
+            test_module.decode_cursor(cursor, {"tag": {"state": "done"}})
+        with self.assertRaises(ValueError):
+            test_module.decode_cursor("not-a-cursor", filters)
+
+    def test_paging_requested(self):
+        assert not test_module.paging_requested(self.make_request(state="active"))
+        assert test_module.paging_requested(self.make_request(limit=10))
+        assert test_module.paging_requested(self.make_request(count="true"))
+
+    def test_params_x(self):
+        for query in ({"limit": 0}, {"limit": "a"}, {"offset": -1}, {"cursor": "x"}):
+            with self.assertRaises(web.HTTPBadRequest):
+                test_module.PagingParams.from_request(self.make_request(**query))
+
+    async def test_unbounded(self):
+        result = await self.fetch(self.make_request(offset=1))
+        assert len(result["results"]) == 4
+        assert "next_cursor" not in result
+        assert "total" not in result
+
+    async def test_pages(self):
+        result = await self.fetch(self.make_request(limit=2, count="true"))
+        assert len(result["results"]) == 2
+        assert result["total"] == 5
+        seen = [row["id"] for row in result["results"]]
+
+        while "next_cursor" in result:
+            result = await self.fetch(
+                self.make_request(limit=2, cursor=result["next_cursor"])
+            )
+            seen.extend(row["id"] for row in result["results"])
+        assert len(seen) == len(set(seen)) == 5
+
+    async def test_pages_resume(self):
+        result = await self.fetch(self.make_request(limit=2))
+        cursor = result["next_cursor"]
+        first_page = [row["id"] for row in result["results"]]
+
+        # the next page starts after the last record of the previous page
+        storage = await self.context.inject(BaseStorage)
+        with async_mock.patch.object(
+            storage, "search_records", wraps=storage.search_records
+        ) as mock_search:
+            result = await self.fetch(self.make_request(limit=2, cursor=cursor))
+        assert mock_search.call_args[0][3]["fromId"] == first_page[-1]
+        second_page = [row["id"] for row in result["results"]]
+        assert len(second_page) == 2
+        assert not set(first_page) & set(second_page)
+
+        # a record added before the cursor position does not shift the page
+        await PagedRecord(state="done").save(self.context)
+        result = await self.fetch(self.make_request(limit=2, cursor=cursor))
+        assert [row["id"] for row in result["results"]] == second_page
+
+        # the offset is used once the last record of the page is no longer matched
+        record = await PagedRecord.retrieve_by_id(self.context, first_page[-1])
+        await record.delete_record(self.context)
+        result = await self.fetch(self.make_request(limit=2, cursor=cursor))
+        assert [row["id"] for row in result["results"]][0] == second_page[1]
+
+    async def test_results_key(self):
+        with async_mock.patch.object(
+            test_module.web, "StreamResponse", MockStreamResponse
+        ):
+            response = await test_module.record_list_response(
+                self.make_request(limit=10),
+                PagedRecord,
+                serialize=lambda record: record._id,
+                results_key="ids",
+            )
+        result = json.loads(response.body)
+        assert len(result["ids"]) == 5
+
+    async def test_filtered(self):
+        result = await self.fetch(
+            self.make_request(limit=10, count=1), None, {"state": "active"}
+        )
+        assert len(result["results"]) == 3
+        assert result["total"] == 3
+        assert all(row["state"] == "active" for row in result["results"])
+
+    async def test_empty(self):
+        result = await self.fetch(
+            self.make_request(limit=10), None, {"state": "missing"}
+        )
+        assert result == {"results": []}
+
+    async def test_write_x(self):
+        closed = []
+        records = await PagedRecord.query(self.context)
+
+        async def query_iter(*args, **kwargs):
+            try:
+                for record in records:
+                    yield record
+            finally:
+                closed.append(True)
+
+        with async_mock.patch.object(
+            PagedRecord, "query_iter", query_iter
+        ), async_mock.patch.object(
+            test_module.web, "StreamResponse", MockStreamResponse
+        ), async_mock.patch.object(
+            MockStreamResponse, "write", async_mock.CoroutineMock()
+        ) as mock_write:
+            mock_write.side_effect = [None, None, ConnectionResetError()]
+            response = await test_module.record_list_response(
+                self.make_request(limit=10), PagedRecord
+            )
+        response.force_close.assert_called_once_with()
+        response.write_eof.assert_not_called()
+        assert closed
+
+    async def test_serialize_x(self):
+        closed = []
+        records = await PagedRecord.query(self.context)
+
+        async def query_iter(*args, **kwargs):
+            try:
+                for record in records:
+                    yield record
+            finally:
+                closed.append(True)
+
+        with async_mock.patch.object(
+            PagedRecord, "query_iter", query_iter
+        ), async_mock.patch.object(
+            test_module.web, "StreamResponse", MockStreamResponse
+        ):
+            response = await test_module.record_list_response(
+                self.make_request(limit=10),
+                PagedRecord,
+                serialize=async_mock.MagicMock(side_effect=[{}, ValueError()]),
+            )
+        assert response.body == b'{"results": [{}'
+        response.force_close.assert_called_once_with()
+        assert closed
@@ -19,6 +19,12 @@ from ....connections.models.connection_record import (
 )
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paging import (
+    PagingQueryStringSchema,
+    PagingResultSchema,
+    paging_requested,
+    record_list_response,
+)
 from ....messaging.valid import (
     ENDPOINT,
     INDY_DID,
@@ -36,7 +42,7 @@ from .messages.connection_invitation import (
 )
 
 
-class ConnectionListSchema(OpenAPISchema):
+class ConnectionListSchema(PagingResultSchema):
     """Result schema for connection list."""
 
     results = fields.List(
@@ -105,7 +111,7 @@ class ConnectionStaticResultSchema(OpenAPISchema):
     record = fields.Nested(ConnectionRecordSchema, required=True)
 
 
-class ConnectionsListQueryStringSchema(OpenAPISchema):
+class ConnectionsListQueryStringSchema(PagingQueryStringSchema):
     """Parameters and validators for connections list request query string."""
 
     alias = fields.Str(
@@ -233,6 +239,9 @@ async def connections_list(request: web.BaseRequest):
     """
     Request handler for searching connection records.
 
+    Unpaged results are sorted by state and creation time; when any paging
+    parameter is given, results are streamed in storage order.
+
     Args:
         request: aiohttp request object
 
@@ -260,6 +269,10 @@ async def connections_list(request: web.BaseRequest):
         if param_name in request.query and request.query[param_name] != "":
             post_filter[param_name] = request.query[param_name]
     try:
+        if paging_requested(request):
+            return await record_list_response(
+                request, ConnectionRecord, tag_filter, post_filter
+            )
         records = await ConnectionRecord.query(context, tag_filter, post_filter)
         results = [record.serialize() for record in records]
         results.sort(key=connection_sort_key)
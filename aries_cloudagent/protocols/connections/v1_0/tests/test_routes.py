@@ -99,6 +99,29 @@ class TestConnectionRoutes(AsyncTestCase):
             with self.assertRaises(test_module.web.HTTPBadRequest):
                 await test_module.connections_list(mock_req)
 
+    async def test_connections_list_paged(self):
+        context = RequestContext(base_context=InjectionContext(enforce_typing=False))
+        mock_req = async_mock.MagicMock()
+        mock_req.app = {
+            "request_context": context,
+        }
+        mock_req.query = {
+            "initiator": ConnectionRecord.INITIATOR_SELF,
+            "limit": "10",
+        }
+
+        with async_mock.patch.object(
+            test_module, "record_list_response", async_mock.CoroutineMock()
+        ) as mock_list_response:
+            result = await test_module.connections_list(mock_req)
+            mock_list_response.assert_awaited_once_with(
+                mock_req,
+                test_module.ConnectionRecord,
+                {},
+                {"initiator": ConnectionRecord.INITIATOR_SELF},
+            )
+            assert result is mock_list_response.return_value
+
     async def test_connections_retrieve(self):
         context = RequestContext(base_context=InjectionContext(enforce_typing=False))
         mock_req = async_mock.MagicMock()
@@ -16,6 +16,12 @@ from ....issuer.base import IssuerError
 from ....ledger.error import LedgerError
 from ....messaging.credential_definitions.util import CRED_DEF_TAGS
 from ....messaging.models.base import BaseModelError, OpenAPISchema
+from ....messaging.models.paging import (
+    PagingQueryStringSchema,
+    PagingResultSchema,
+    paging_requested,
+    record_list_response,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_CRED_REV_ID,
@@ -50,7 +56,7 @@ from .models.credential_exchange import (
 )
 
 
-class V10CredentialExchangeListQueryStringSchema(OpenAPISchema):
+class V10CredentialExchangeListQueryStringSchema(PagingQueryStringSchema):
     """Parameters and validators for credential exchange list query."""
 
     connection_id = fields.UUID(
@@ -87,7 +93,7 @@ class V10CredentialExchangeListQueryStringSchema(OpenAPISchema):
     )
 
 
-class V10CredentialExchangeListResultSchema(OpenAPISchema):
+class V10CredentialExchangeListResultSchema(PagingResultSchema):
     """Result schema for Aries#0036 v1.0 credential exchange query."""
 
     results = fields.List(
@@ -350,6 +356,10 @@ async def credential_exchange_list(request: web.BaseRequest):
     }
 
     try:
+        if paging_requested(request):
+            return await record_list_response(
+                request, V10CredentialExchange, tag_filter, post_filter
+            )
         records = await V10CredentialExchange.query(context, tag_filter, post_filter)
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
@@ -1,5 +1,6 @@
 """Classes to manage presentations."""
 
+import asyncio
 import json
 import logging
 import time
@@ -9,8 +10,10 @@ from ....config.injection_context import InjectionContext
 from ....core.error import BaseError
 from ....holder.base import BaseHolder, HolderError
 from ....ledger.base import BaseLedger
+from ....ledger.prefetch import LedgerPrefetch
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.responder import BaseResponder
+from ....utils.stats import Collector
 from ....verifier.base import BaseVerifier
 
 from .models.presentation_exchange import V10PresentationExchange
@@ -299,33 +302,6 @@ class PresentationManager:
                     await holder.get_credential(credential_id)
                 )
 
-        # Get all schema, credential definition, and revocation registry in use
-        ledger: BaseLedger = await self.context.inject(BaseLedger)
-        schemas = {}
-        credential_definitions = {}
-        revocation_registries = {}
-
-        async with ledger:
-            for credential in credentials.values():
-                schema_id = credential["schema_id"]
-                if schema_id not in schemas:
-                    schemas[schema_id] = await ledger.get_schema(schema_id)
-
-                credential_definition_id = credential["cred_def_id"]
-                if credential_definition_id not in credential_definitions:
-                    credential_definitions[
-                        credential_definition_id
-                    ] = await ledger.get_credential_definition(credential_definition_id)
-
-                if credential.get("rev_reg_id"):
-                    revocation_registry_id = credential["rev_reg_id"]
-                    if revocation_registry_id not in revocation_registries:
-                        revocation_registries[
-                            revocation_registry_id
-                        ] = RevocationRegistry.from_definition(
-                            await ledger.get_revoc_reg_def(revocation_registry_id), True
-                        )
-
         # Get delta with non-revocation interval defined in "non_revoked"
         # of the presentation request or attributes
         epoch_now = int(time.time())
@@ -335,70 +311,129 @@ class PresentationManager:
             presentation_exchange_record.presentation_request.get("non_revoked") or {}
         )
 
-        revoc_reg_deltas = {}
-        async with ledger:
-            for precis in requested_referents.values():  # cred_id, non-revoc interval
-                credential_id = precis["cred_id"]
-                if not credentials[credential_id].get("rev_reg_id"):
-                    continue
-                if "timestamp" in precis:
-                    continue
-                rev_reg_id = credentials[credential_id]["rev_reg_id"]
-                referent_non_revoc_interval = precis.get(
-                    "non_revoked", non_revoc_interval
-                )
-
-                if referent_non_revoc_interval:
-                    key = (
-                        f"{rev_reg_id}_{referent_non_revoc_interval.get('from', 0)}_"
-                        f"{referent_non_revoc_interval.get('to', epoch_now)}"
+        # Fetch all schema, credential definition, revocation registry and
+        # revocation registry delta in use from the ledger concurrently
+        ledger: BaseLedger = await self.context.inject(BaseLedger)
+        collector: Collector = await self.context.inject(
+            Collector, required=False
+        ) or Collector(enabled=False)
+
+        with collector.timer("PresentationManager.create_presentation:ledger"):
+            async with ledger:
+                prefetch = LedgerPrefetch(ledger)
+                for credential in credentials.values():
+                    prefetch.request("get_schema", credential["schema_id"])
+                    prefetch.request(
+                        "get_credential_definition", credential["cred_def_id"]
                     )
-                    if key not in revoc_reg_deltas:
-                        (delta, delta_timestamp) = await ledger.get_revoc_reg_delta(
+                    if credential.get("rev_reg_id"):
+                        prefetch.request("get_revoc_reg_def", credential["rev_reg_id"])
+
+                delta_requests = []
+                stamped = set()
+                for precis in requested_referents.values():  # cred_id, interval
+                    credential_id = precis["cred_id"]
+                    rev_reg_id = credentials[credential_id].get("rev_reg_id")
+                    if not rev_reg_id or "timestamp" in precis:
+                        continue
+                    if credential_id in stamped:
+                        continue  # often one cred satisfies many requested attrs/preds
+                    referent_non_revoc_interval = precis.get(
+                        "non_revoked", non_revoc_interval
+                    )
+                    if referent_non_revoc_interval:
+                        delta_args = (
                             rev_reg_id,
                             referent_non_revoc_interval.get("from", 0),
                             referent_non_revoc_interval.get("to", epoch_now),
                         )
-                        revoc_reg_deltas[key] = (
-                            rev_reg_id,
-                            credential_id,
-                            delta,
-                            delta_timestamp,
-                        )
-                    for stamp_me in requested_referents.values():
-                        # often one cred satisfies many requested attrs/preds
-                        if stamp_me["cred_id"] == credential_id:
-                            stamp_me["timestamp"] = revoc_reg_deltas[key][3]
+                        prefetch.request("get_revoc_reg_delta", *delta_args)
+                        delta_requests.append((delta_args, credential_id))
+                        stamped.add(credential_id)
+
+                await prefetch.gather()
+
+        schemas = {}
+        credential_definitions = {}
+        revocation_registries = {}
+        for credential in credentials.values():
+            schema_id = credential["schema_id"]
+            schemas[schema_id] = prefetch.result("get_schema", schema_id)
+
+            credential_definition_id = credential["cred_def_id"]
+            credential_definitions[credential_definition_id] = prefetch.result(
+                "get_credential_definition", credential_definition_id
+            )
+
+            revocation_registry_id = credential.get("rev_reg_id")
+            if (
+                revocation_registry_id
+                and revocation_registry_id not in revocation_registries
+            ):
+                revocation_registries[
+                    revocation_registry_id
+                ] = RevocationRegistry.from_definition(
+                    prefetch.result("get_revoc_reg_def", revocation_registry_id), True
+                )
+
+        revoc_reg_deltas = {}
+        for (delta_args, credential_id) in delta_requests:
+            key = "_".join(str(arg) for arg in delta_args)
+            if key not in revoc_reg_deltas:
+                (delta, delta_timestamp) = prefetch.result(
+                    "get_revoc_reg_delta", *delta_args
+                )
+                revoc_reg_deltas[key] = (
+                    delta_args[0],
+                    credential_id,
+                    delta,
+                    delta_timestamp,
+                )
+            for stamp_me in requested_referents.values():
+                if stamp_me["cred_id"] == credential_id:
+                    stamp_me["timestamp"] = revoc_reg_deltas[key][3]
 
         # Get revocation states to prove non-revoked
         revocation_states = {}
-        for (
-            rev_reg_id,
-            credential_id,
-            delta,
-            delta_timestamp,
-        ) in revoc_reg_deltas.values():
-            if rev_reg_id not in revocation_states:
-                revocation_states[rev_reg_id] = {}
-
-            rev_reg = revocation_registries[rev_reg_id]
-            tails_local_path = await rev_reg.get_or_fetch_local_tails_path()
-
-            try:
-                revocation_states[rev_reg_id][delta_timestamp] = json.loads(
-                    await holder.create_revocation_state(
-                        credentials[credential_id]["cred_rev_id"],
-                        rev_reg.reg_def,
-                        delta,
-                        delta_timestamp,
-                        tails_local_path,
-                    )
-                )
-            except HolderError as e:
-                LOGGER.error(
-                    f"Failed to create revocation state: {e.error_code}, {e.message}"
+        with collector.timer("PresentationManager.create_presentation:revocation"):
+            # fetch the tails files in use concurrently
+            await asyncio.gather(
+                *(
+                    revocation_registries[rev_reg_id].get_or_fetch_local_tails_path()
+                    for rev_reg_id in {delta[0] for delta in revoc_reg_deltas.values()}
                 )
-                raise e
+            )
+            async with ledger:
+                for (
+                    rev_reg_id,
+                    credential_id,
+                    delta,
+                    delta_timestamp,
+                ) in revoc_reg_deltas.values():
+                    if rev_reg_id not in revocation_states:
+                        revocation_states[rev_reg_id] = {}
+
+                    rev_reg = revocation_registries[rev_reg_id]
+                    tails_local_path = await rev_reg.get_or_fetch_local_tails_path()
+
+                    try:
+                        revocation_states[rev_reg_id][delta_timestamp] = json.loads(
+                            await holder.create_revocation_state(
+                                credentials[credential_id]["cred_rev_id"],
+                                rev_reg.reg_def,
+                                delta,
+                                delta_timestamp,
+                                tails_local_path,
+                                ledger=ledger,
+                            )
+                        )
+                    except HolderError as e:
+                        LOGGER.error(
+                            "Failed to create revocation state: %s, %s",
+                            e.error_code,
+                            e.message,
+                        )
+                        raise e
 
         for (referent, precis) in requested_referents.items():
             if "timestamp" not in precis:
@@ -412,13 +447,14 @@ class PresentationManager:
                     "timestamp"
                 ] = precis["timestamp"]
 
-        indy_proof_json = await holder.create_presentation(
-            presentation_exchange_record.presentation_request,
-            requested_credentials,
-            schemas,
-            credential_definitions,
-            revocation_states,
-        )
+        with collector.timer("PresentationManager.create_presentation:anoncreds"):
+            indy_proof_json = await holder.create_presentation(
+                presentation_exchange_record.presentation_request,
+                requested_credentials,
+                schemas,
+                credential_definitions,
+                revocation_states,
+            )
         indy_proof = json.loads(indy_proof_json)
 
         presentation_message = Presentation(
@@ -520,60 +556,61 @@ class PresentationManager:
         indy_proof_request = presentation_exchange_record.presentation_request
         indy_proof = presentation_exchange_record.presentation
 
-        schema_ids = []
-        credential_definition_ids = []
+        identifiers = indy_proof["identifiers"]
+        ledger: BaseLedger = await self.context.inject(BaseLedger)
+        collector: Collector = await self.context.inject(
+            Collector, required=False
+        ) or Collector(enabled=False)
+
+        # Fetch all ledger artifacts in use concurrently
+        with collector.timer("PresentationManager.verify_presentation:ledger"):
+            async with ledger:
+                prefetch = LedgerPrefetch(ledger)
+                for identifier in identifiers:
+                    prefetch.request("get_schema", identifier["schema_id"])
+                    prefetch.request(
+                        "get_credential_definition", identifier["cred_def_id"]
+                    )
+                    if identifier.get("rev_reg_id"):
+                        prefetch.request("get_revoc_reg_def", identifier["rev_reg_id"])
+                        if identifier.get("timestamp"):
+                            prefetch.request(
+                                "get_revoc_reg_entry",
+                                identifier["rev_reg_id"],
+                                identifier["timestamp"],
+                            )
+                await prefetch.gather()
 
+        # Build schemas, credential definitions and revocation registries
+        # for anoncreds
         schemas = {}
         credential_definitions = {}
         rev_reg_defs = {}
         rev_reg_entries = {}
-
-        identifiers = indy_proof["identifiers"]
-        ledger: BaseLedger = await self.context.inject(BaseLedger)
-        async with ledger:
-            for identifier in identifiers:
-                schema_ids.append(identifier["schema_id"])
-                credential_definition_ids.append(identifier["cred_def_id"])
-
-                # Build schemas for anoncreds
-                if identifier["schema_id"] not in schemas:
-                    schemas[identifier["schema_id"]] = await ledger.get_schema(
-                        identifier["schema_id"]
-                    )
-
-                if identifier["cred_def_id"] not in credential_definitions:
-                    credential_definitions[
-                        identifier["cred_def_id"]
-                    ] = await ledger.get_credential_definition(
-                        identifier["cred_def_id"]
+        for identifier in identifiers:
+            schemas[identifier["schema_id"]] = prefetch.result(
+                "get_schema", identifier["schema_id"]
+            )
+            credential_definitions[identifier["cred_def_id"]] = prefetch.result(
+                "get_credential_definition", identifier["cred_def_id"]
+            )
+            if identifier.get("rev_reg_id"):
+                rev_reg_defs[identifier["rev_reg_id"]] = prefetch.result(
+                    "get_revoc_reg_def", identifier["rev_reg_id"]
+                )
+                if identifier.get("timestamp"):
+                    (found_rev_reg_entry, _found_timestamp) = prefetch.result(
+                        "get_revoc_reg_entry",
+                        identifier["rev_reg_id"],
+                        identifier["timestamp"],
                     )
-
-                if identifier.get("rev_reg_id"):
-                    if identifier["rev_reg_id"] not in rev_reg_defs:
-                        rev_reg_defs[
-                            identifier["rev_reg_id"]
-                        ] = await ledger.get_revoc_reg_def(identifier["rev_reg_id"])
-
-                    if identifier.get("timestamp"):
-                        rev_reg_entries.setdefault(identifier["rev_reg_id"], {})
-
-                        if (
-                            identifier["timestamp"]
-                            not in rev_reg_entries[identifier["rev_reg_id"]]
-                        ):
-                            (
-                                found_rev_reg_entry,
-                                _found_timestamp,
-                            ) = await ledger.get_revoc_reg_entry(
-                                identifier["rev_reg_id"], identifier["timestamp"]
-                            )
-                            rev_reg_entries[identifier["rev_reg_id"]][
-                                identifier["timestamp"]
-                            ] = found_rev_reg_entry
+                    rev_reg_entries.setdefault(identifier["rev_reg_id"], {})[
+                        identifier["timestamp"]
+                    ] = found_rev_reg_entry
 
         verifier: BaseVerifier = await self.context.inject(BaseVerifier)
-        presentation_exchange_record.verified = json.dumps(  # tag: needs string value
-            await verifier.verify_presentation(
+        with collector.timer("PresentationManager.verify_presentation:anoncreds"):
+            verified = await verifier.verify_presentation(
                 indy_proof_request,
                 indy_proof,
                 schemas,
@@ -581,6 +618,8 @@ class PresentationManager:
                 rev_reg_defs,
                 rev_reg_entries,
             )
+        presentation_exchange_record.verified = json.dumps(  # tag: needs string value
+            verified
         )
         presentation_exchange_record.state = V10PresentationExchange.STATE_VERIFIED
 
@@ -20,6 +20,12 @@ from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paging import (
+    PagingQueryStringSchema,
+    PagingResultSchema,
+    paging_requested,
+    record_list_response,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_DID,
@@ -53,7 +59,7 @@ from .models.presentation_exchange import (
 )
 
 
-class V10PresentationExchangeListQueryStringSchema(OpenAPISchema):
+class V10PresentationExchangeListQueryStringSchema(PagingQueryStringSchema):
     """Parameters and validators for presentation exchange list query."""
 
     connection_id = fields.UUID(
@@ -90,7 +96,7 @@ class V10PresentationExchangeListQueryStringSchema(OpenAPISchema):
     )
 
 
-class V10PresentationExchangeListSchema(OpenAPISchema):
+class V10PresentationExchangeListSchema(PagingResultSchema):
     """Result schema for an Aries RFC 37 v1.0 presentation exchange query."""
 
     results = fields.List(
@@ -458,6 +464,10 @@ async def presentation_exchange_list(request: web.BaseRequest):
     }
 
     try:
+        if paging_requested(request):
+            return await record_list_response(
+                request, V10PresentationExchange, tag_filter, post_filter
+            )
         records = await V10PresentationExchange.query(context, tag_filter, post_filter)
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
@@ -13,6 +13,7 @@ from .....ledger.base import BaseLedger
 from .....messaging.request_context import RequestContext
 from .....messaging.responder import BaseResponder, MockResponder
 from .....storage.error import StorageNotFoundError
+from .....utils.stats import Collector
 from .....verifier.base import BaseVerifier
 from .....verifier.indy import IndyVerifier
 
@@ -981,6 +982,9 @@ class TestPresentationManager(AsyncTestCase):
             ]
         }
 
+        collector = Collector()
+        self.context.injector.bind_instance(Collector, collector)
+
         with async_mock.patch.object(
             V10PresentationExchange, "save", autospec=True
         ) as save_ex:
@@ -989,6 +993,13 @@ class TestPresentationManager(AsyncTestCase):
 
             assert exchange_out.state == (V10PresentationExchange.STATE_VERIFIED)
 
+        self.ledger.get_revoc_reg_def.assert_awaited_once_with(RR_ID)
+        self.ledger.get_revoc_reg_entry.assert_awaited_once_with(RR_ID, NOW)
+        assert set(collector.results["count"]) == {
+            "PresentationManager.verify_presentation:ledger",
+            "PresentationManager.verify_presentation:anoncreds",
+        }
+
     async def test_send_presentation_ack(self):
         exchange = V10PresentationExchange()
         proposal = PresentationProposal()
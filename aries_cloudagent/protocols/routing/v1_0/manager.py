@@ -17,6 +17,7 @@ from .messages.route_update_request import RouteUpdateRequest
 from .models.route_record import RouteRecord
 from .models.route_update import RouteUpdate
 from .models.route_updated import RouteUpdated
+from .routing_table import RoutingTable
 
 
 class RoutingManagerError(BaseError):
@@ -65,6 +66,19 @@ class RoutingManager:
             The `RouteRecord` associated with this verkey
 
         """
+        routing_table = await self.get_routing_table()
+        if routing_table:
+            routes = routing_table.lookup(recip_verkey)
+            if len(routes) > 1:
+                raise RouteNotFoundError(
+                    "Duplicate routes found for verkey: %s", recip_verkey
+                )
+            elif not routes:
+                raise RouteNotFoundError(
+                    "No route defined for verkey: %s", recip_verkey
+                )
+            return routes[0]
+
         storage: BaseStorage = await self._context.inject(BaseStorage)
         try:
             record = await storage.search_records(
@@ -76,6 +90,36 @@ class RoutingManager:
             )
         except StorageNotFoundError:
             raise RouteNotFoundError("No route defined for verkey: %s", recip_verkey)
+        return self._route_record(record)
+
+    async def get_routing_table(self) -> RoutingTable:
+        """
+        Fetch the shared routing table, loading it from storage if necessary.
+
+        Returns:
+            The loaded `RoutingTable`, or None if no routing table is configured
+
+        """
+        routing_table: RoutingTable = await self._context.inject(
+            RoutingTable, required=False
+        )
+        if routing_table and not routing_table.loaded:
+            async with routing_table.load_lock:
+                if not routing_table.loaded:
+                    storage: BaseStorage = await self._context.inject(BaseStorage)
+                    routing_table.load(
+                        [
+                            self._route_record(record)
+                            async for record in storage.search_records(
+                                RoutingManager.RECORD_TYPE
+                            )
+                        ]
+                    )
+        return routing_table
+
+    @staticmethod
+    def _route_record(record: StorageRecord) -> RouteRecord:
+        """Convert a storage record to a `RouteRecord`."""
         value = json.loads(record.value)
         return RouteRecord(
             record_id=record.id,
@@ -119,9 +163,7 @@ class RoutingManager:
         results = []
         storage: BaseStorage = await self._context.inject(BaseStorage)
         async for record in storage.search_records(RoutingManager.RECORD_TYPE, filters):
-            value = json.loads(record.value)
-            value.update(record.tags)
-            results.append(RouteRecord(**value))
+            results.append(self._route_record(record))
         return results
 
     async def create_route_record(
@@ -157,6 +199,9 @@ class RoutingManager:
             created_at=value["created_at"],
             updated_at=value["updated_at"],
         )
+        routing_table = await self.get_routing_table()
+        if routing_table:
+            routing_table.add(result)
         return result
 
     async def delete_route_record(self, route: RouteRecord):
@@ -166,6 +211,9 @@ class RoutingManager:
             await storage.delete_record(
                 StorageRecord(None, None, None, route.record_id)
             )
+            routing_table = await self.get_routing_table()
+            if routing_table:
+                routing_table.remove(route)
 
     async def update_routes(
         self, client_connection_id: str, updates: Sequence[RouteUpdate]
@@ -0,0 +1,68 @@
+"""In-memory table of forward routes."""
+
+import asyncio
+
+from typing import Iterable
+
+from .models.route_record import RouteRecord
+
+
+class RoutingTable:
+    """
+    Table of forward routes by recipient key, held in memory.
+
+    The table is loaded from storage on first use and kept current by the
+    `RoutingManager` as routes are created and deleted, so that forwarded
+    messages are resolved without a storage search. Routes changed by other
+    processes sharing the same storage are not seen until the table is
+    reloaded, so no table is used when messages are handled by inbound workers.
+    """
+
+    def __init__(self):
+        """Initialize an empty, unloaded `RoutingTable` instance."""
+        self.loaded = False
+        self._load_lock: asyncio.Lock = None
+        self._routes = {}
+
+    @property
+    def load_lock(self) -> asyncio.Lock:
+        """Accessor for the lock held while loading the table."""
+        if not self._load_lock:
+            self._load_lock = asyncio.Lock()
+        return self._load_lock
+
+    def load(self, routes: Iterable[RouteRecord]):
+        """Replace the contents of the table."""
+        self._routes = {}
+        for route in routes:
+            self.add(route)
+        self.loaded = True
+
+    def clear(self):
+        """Empty the table, so that it is loaded again on next use."""
+        self._routes = {}
+        self.loaded = False
+
+    def add(self, route: RouteRecord):
+        """Add a route to the table."""
+        self._routes.setdefault(route.recipient_key, {})[route.record_id] = route
+
+    def remove(self, route: RouteRecord):
+        """Remove a route from the table."""
+        if route.recipient_key:
+            keys = [route.recipient_key]
+        else:
+            keys = [
+                key for key, found in self._routes.items() if route.record_id in found
+            ]
+        for key in keys:
+            found = self._routes.get(key)
+            if found is not None:
+                found.pop(route.record_id, None)
+                if not found:
+                    del self._routes[key]
+
+    def lookup(self, recipient_key: str) -> Iterable[RouteRecord]:
+        """Find the routes for a recipient key."""
+        found = self._routes.get(recipient_key)
+        return list(found.values()) if found else []
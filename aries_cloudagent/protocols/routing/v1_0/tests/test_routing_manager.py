@@ -16,6 +16,7 @@ from ..manager import RoutingManager, RoutingManagerError, RouteNotFoundError
 from ..models.route_record import RouteRecord
 from ..models.route_update import RouteUpdate
 from ..models.route_updated import RouteUpdated
+from ..routing_table import RoutingTable
 
 TEST_CONN_ID = "conn-id"
 TEST_VERKEY = "3Dn1SJNPaCXcvvJvSbsFWP2xaCjMom3can8CQNhWrTRx"
@@ -278,3 +279,60 @@ class TestRoutingManager(AsyncTestCase):
             outbound_handler=mock_outbound_handler,
         )
         mock_outbound_handler.assert_called_once()
+
+
+class TestRoutingManagerTable(AsyncTestCase):
+    async def setUp(self):
+        self.context = RequestContext(
+            base_context=InjectionContext(enforce_typing=False)
+        )
+        self.context.message_receipt = MessageReceipt(sender_verkey=TEST_VERKEY)
+        self.storage = BasicStorage()
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+        self.routing_table = RoutingTable()
+        self.context.injector.bind_instance(RoutingTable, self.routing_table)
+        self.manager = RoutingManager(self.context)
+
+    async def test_create_retrieve_delete(self):
+        record = await self.manager.create_route_record(
+            TEST_CONN_ID, TEST_ROUTE_VERKEY
+        )
+        assert self.routing_table.loaded
+        assert self.routing_table.lookup(TEST_ROUTE_VERKEY) == [record]
+
+        with async_mock.patch.object(
+            self.storage, "search_records", autospec=True
+        ) as mock_search:
+            found = await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+            mock_search.assert_not_called()
+        assert found.record_id == record.record_id
+        assert found.connection_id == TEST_CONN_ID
+
+        await self.manager.delete_route_record(record)
+        assert self.routing_table.lookup(TEST_ROUTE_VERKEY) == []
+        with self.assertRaises(RouteNotFoundError):
+            await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+
+    async def test_load_existing(self):
+        record = await RoutingManager(self.context).create_route_record(
+            TEST_CONN_ID, TEST_ROUTE_VERKEY
+        )
+        self.routing_table.clear()
+
+        found = await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+        assert self.routing_table.loaded
+        assert found.record_id == record.record_id
+        assert found.recipient_key == TEST_ROUTE_VERKEY
+
+    async def test_retrieve_duplicate(self):
+        await self.manager.create_route_record(TEST_CONN_ID, TEST_ROUTE_VERKEY)
+        await self.manager.create_route_record(TEST_CONN_ID, TEST_ROUTE_VERKEY)
+        with self.assertRaises(RouteNotFoundError):
+            await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+
+    async def test_remove_by_record_id(self):
+        record = await self.manager.create_route_record(
+            TEST_CONN_ID, TEST_ROUTE_VERKEY
+        )
+        self.routing_table.remove(RouteRecord(record_id=record.record_id))
+        assert self.routing_table.lookup(TEST_ROUTE_VERKEY) == []
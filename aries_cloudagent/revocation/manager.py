@@ -1,6 +1,5 @@
 """Classes to manage credential revocation."""
 
-import json
 import logging
 from typing import Mapping, Sequence, Text
 
@@ -12,6 +11,7 @@ from ..storage.error import StorageNotFoundError
 from .indy import IndyRevocation
 from .models.issuer_rev_reg_record import IssuerRevRegRecord
 from .models.issuer_cred_rev_record import IssuerCredRevRecord
+from .publisher import RevocationPublisher
 
 
 class RevocationManagerError(BaseError):
@@ -85,34 +85,38 @@ class RevocationManager:
             rev_reg_id: revocation registry id
             cred_rev_id: credential revocation id
             publish: whether to publish the resulting revocation registry delta,
-                along with any revocations pending against it
+                along with any revocations pending against it, or to leave it
+                pending publication (by the revocation publisher, if running)
 
         """
         issuer: BaseIssuer = await self.context.inject(BaseIssuer)
 
         revoc = IndyRevocation(self.context)
-        issuer_rr_rec = await revoc.get_issuer_rev_reg_record(rev_reg_id)
-        if not issuer_rr_rec:
-            raise RevocationManagerError(
-                f"No revocation registry record found for id {rev_reg_id}"
-            )
+        async with IssuerRevRegRecord.registry_lock(rev_reg_id):
+            issuer_rr_rec = await revoc.get_issuer_rev_reg_record(rev_reg_id)
+            if not issuer_rr_rec:
+                raise RevocationManagerError(
+                    f"No revocation registry record found for id {rev_reg_id}"
+                )
 
-        if publish:
-            rev_reg = await revoc.get_ledger_registry(rev_reg_id)
-            await rev_reg.get_or_fetch_local_tails_path()
+            if publish:
+                rev_reg = await revoc.get_ledger_registry(rev_reg_id)
+                await rev_reg.get_or_fetch_local_tails_path()
 
-            # pick up pending revocations on input revocation registry
-            crids = list(set(issuer_rr_rec.pending_pub + [cred_rev_id]))
-            (delta_json, _) = await issuer.revoke_credentials(
-                issuer_rr_rec.revoc_reg_id, issuer_rr_rec.tails_local_path, crids
-            )
-            if delta_json:
-                issuer_rr_rec.revoc_reg_entry = json.loads(delta_json)
-                await issuer_rr_rec.send_entry(self.context)
-                await issuer_rr_rec.clear_pending(self.context)
+                # pick up pending revocations on input revocation registry
+                crids = list(set(issuer_rr_rec.pending_pub + [cred_rev_id]))
+                (delta_json, _) = await issuer.revoke_credentials(
+                    issuer_rr_rec.revoc_reg_id, issuer_rr_rec.tails_local_path, crids
+                )
+                if await issuer_rr_rec.stage_entry(self.context, delta_json, crids):
+                    await issuer_rr_rec.send_entry(self.context)
+            else:
+                await issuer_rr_rec.mark_pending(self.context, cred_rev_id)
 
-        else:
-            await issuer_rr_rec.mark_pending(self.context, cred_rev_id)
+        if not publish:
+            publisher = await self.context.inject(RevocationPublisher, required=False)
+            if publisher:
+                publisher.notify(rev_reg_id)
 
     async def publish_pending_revocations(
         self, rrid2crid: Mapping[Text, Sequence[Text]] = None
@@ -146,26 +150,36 @@ class RevocationManager:
         issuer_rr_recs = await IssuerRevRegRecord.query_by_pending(self.context)
         for issuer_rr_rec in issuer_rr_recs:
             rrid = issuer_rr_rec.revoc_reg_id
-            crids = []
-            if not rrid2crid:
-                crids = issuer_rr_rec.pending_pub
-            elif rrid in rrid2crid:
-                crids = [
-                    crid
-                    for crid in issuer_rr_rec.pending_pub
-                    if crid in (rrid2crid[rrid] or []) or not rrid2crid[rrid]
-                ]
-            if crids:
-                (delta_json, failed_crids) = await issuer.revoke_credentials(
-                    issuer_rr_rec.revoc_reg_id,
-                    issuer_rr_rec.tails_local_path,
-                    crids,
+            async with IssuerRevRegRecord.registry_lock(rrid):
+                issuer_rr_rec = await IssuerRevRegRecord.retrieve_by_id(
+                    self.context, issuer_rr_rec.record_id
                 )
-                issuer_rr_rec.revoc_reg_entry = json.loads(delta_json)
-                await issuer_rr_rec.send_entry(self.context)
-                published = [crid for crid in crids if crid not in failed_crids]
-                result[issuer_rr_rec.revoc_reg_id] = published
-                await issuer_rr_rec.clear_pending(self.context, published)
+                if rrid2crid and rrid not in rrid2crid:
+                    continue
+                crids = []
+                if not rrid2crid:
+                    crids = issuer_rr_rec.pending_pub
+                else:
+                    crids = [
+                        crid
+                        for crid in issuer_rr_rec.pending_pub
+                        if crid in (rrid2crid[rrid] or []) or not rrid2crid[rrid]
+                    ]
+                if crids:
+                    (delta_json, failed_crids) = await issuer.revoke_credentials(
+                        issuer_rr_rec.revoc_reg_id,
+                        issuer_rr_rec.tails_local_path,
+                        crids,
+                    )
+                elif issuer_rr_rec.pending_entry:
+                    # send the entry staged by an earlier attempt
+                    (delta_json, failed_crids) = (None, [])
+                else:
+                    continue
+                # cred rev ids which could not be revoked are no longer pending
+                if await issuer_rr_rec.stage_entry(self.context, delta_json, crids):
+                    await issuer_rr_rec.send_entry(self.context)
+                    result[rrid] = [crid for crid in crids if crid not in failed_crids]
 
         return result
 
@@ -203,7 +217,11 @@ class RevocationManager:
         issuer_rr_recs = await IssuerRevRegRecord.query_by_pending(self.context)
         for issuer_rr_rec in issuer_rr_recs:
             rrid = issuer_rr_rec.revoc_reg_id
-            await issuer_rr_rec.clear_pending(self.context, (purge or {}).get(rrid))
+            async with IssuerRevRegRecord.registry_lock(rrid):
+                issuer_rr_rec = await IssuerRevRegRecord.retrieve_by_id(
+                    self.context, issuer_rr_rec.record_id
+                )
+                await issuer_rr_rec.clear_pending(self.context, (purge or {}).get(rrid))
             if issuer_rr_rec.pending_pub:
                 result[rrid] = issuer_rr_rec.pending_pub
 
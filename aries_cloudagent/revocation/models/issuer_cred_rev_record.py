@@ -96,6 +96,19 @@ class IssuerCredRevRecord(BaseRecord):
             context, {"rev_reg_id": rev_reg_id}, {"cred_rev_id": cred_rev_id}
         )
 
+    @classmethod
+    async def query_by_cred_rev_ids(
+        cls,
+        context: InjectionContext,
+        rev_reg_id: str,
+        cred_rev_ids: Sequence[str],
+    ) -> Sequence["IssuerCredRevRecord"]:
+        """Retrieve issuer cred rev records by rev reg id and cred rev ids."""
+        return await cls.query(
+            context,
+            {"rev_reg_id": rev_reg_id, "cred_rev_id": {"$in": list(cred_rev_ids)}},
+        )
+
     @classmethod
     async def retrieve_by_cred_ex_id(
         cls,
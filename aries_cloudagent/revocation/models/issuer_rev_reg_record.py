@@ -3,8 +3,9 @@
 import json
 import logging
 import uuid
+import weakref
 
-from asyncio import shield
+from asyncio import Lock, shield
 from functools import total_ordering
 from os.path import join
 from shutil import move
@@ -66,6 +67,8 @@ class IssuerRevRegRecord(BaseRecord):
     STATE_ACTIVE = "active"  # initial entry published, possibly subsequent entries
     STATE_FULL = "full"  # includes corrupt
 
+    _registry_locks = weakref.WeakValueDictionary()
+
     def __init__(
         self,
         *,
@@ -84,6 +87,7 @@ class IssuerRevRegRecord(BaseRecord):
         tails_local_path: str = None,
         tails_public_uri: str = None,
         pending_pub: Sequence[str] = None,
+        pending_entry: dict = None,
         **kwargs,
     ):
         """Initialize the issuer revocation registry record."""
@@ -105,6 +109,7 @@ class IssuerRevRegRecord(BaseRecord):
         self.pending_pub = (
             sorted(list(set(pending_pub))) if pending_pub else []
         )  # order for eq comparison between instances
+        self.pending_entry = pending_entry
 
     @property
     def record_id(self) -> str:
@@ -126,9 +131,23 @@ class IssuerRevRegRecord(BaseRecord):
                 "tails_public_uri",
                 "tails_local_path",
                 "pending_pub",
+                "pending_entry",
             )
         }
 
+    @classmethod
+    def registry_lock(cls, revoc_reg_id: str) -> Lock:
+        """
+        Get the lock serializing changes to the pending revocations of a registry.
+
+        Holders of the lock should retrieve the record again after acquiring it.
+        """
+        lock = cls._registry_locks.get(revoc_reg_id)
+        if not lock:
+            lock = Lock()
+            cls._registry_locks[revoc_reg_id] = lock
+        return lock
+
     def _check_url(self, url) -> None:
         parsed = urlparse(url)
         if not (parsed.scheme and parsed.netloc and parsed.path):
@@ -281,9 +300,51 @@ class IssuerRevRegRecord(BaseRecord):
             )
         if self.state == IssuerRevRegRecord.STATE_POSTED:
             self.state = IssuerRevRegRecord.STATE_ACTIVE  # initial entry activates
+            self.pending_entry = None
             await self.save(
                 context, reason="Published initial revocation registry entry"
             )
+        elif self.pending_entry:
+            self.pending_entry = None
+            await self.save(context, reason="Published revocation registry entry")
+
+    async def stage_entry(
+        self,
+        context: InjectionContext,
+        delta_json: str = None,
+        cred_rev_ids: Sequence[str] = None,
+    ) -> bool:
+        """Stage a revocation registry delta as the entry to send, and save the record.
+
+        An entry staged earlier but not sent is merged into the delta, so that its
+        revocations are published along with the new ones. The entry remains
+        pending until `send_entry` succeeds.
+
+        Args:
+            context: The injection context to use
+            delta_json: The revocation registry delta for the latest revocations
+            cred_rev_ids: Credential revocation identifiers no longer pending,
+                whether or not their revocation succeeded
+
+        Returns:
+            Whether there is an entry to send
+
+        """
+        if self.pending_entry:
+            if delta_json:
+                issuer: BaseIssuer = await context.inject(BaseIssuer)
+                delta_json = await issuer.merge_revocation_registry_deltas(
+                    json.dumps(self.pending_entry), delta_json
+                )
+            else:
+                delta_json = json.dumps(self.pending_entry)
+        if delta_json:
+            self.revoc_reg_entry = json.loads(delta_json)
+            self.pending_entry = self.revoc_reg_entry
+        if cred_rev_ids:
+            self.pending_pub = [r for r in self.pending_pub if r not in cred_rev_ids]
+        await self.save(context, reason="Staged revocation registry entry")
+        return bool(delta_json)
 
     async def mark_pending(self, context: InjectionContext, cred_rev_id: str) -> None:
         """Mark a credential revocation id as revoked pending publication to ledger.
@@ -353,6 +414,9 @@ class IssuerRevRegRecord(BaseRecord):
     ) -> Sequence["IssuerRevRegRecord"]:
         """Retrieve issuer revocation records with revocations pending.
 
+        These are the records with credential revocation ids marked pending, or
+        with a registry entry staged but not yet sent to the ledger.
+
         Args:
             context: The injection context to use
         """
@@ -360,7 +424,7 @@ class IssuerRevRegRecord(BaseRecord):
             context=context,
             tag_filter=None,
             post_filter_positive=None,
-            post_filter_negative={"pending_pub": []},
+            post_filter_negative={"pending_pub": [], "pending_entry": None},
         )
 
     @classmethod
@@ -462,3 +526,7 @@ class IssuerRevRegRecordSchema(BaseRecordSchema):
         ),
         required=False,
     )
+    pending_entry = fields.Dict(
+        required=False,
+        description="Revocation registry entry staged but not yet sent to ledger",
+    )
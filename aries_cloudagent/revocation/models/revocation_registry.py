@@ -6,14 +6,10 @@ import re
 from os.path import join
 from pathlib import Path
 
-from requests import Session
-from requests.exceptions import RequestException
-
 from ...indy.util import indy_client_dir
 
 from ..error import RevocationError
-import hashlib
-import base58
+from ..tails import TAILS_DOWNLOADER
 
 LOGGER = logging.getLogger(__name__)
 
@@ -163,29 +159,11 @@ class RevocationRegistry:
             self.registry_id,
         )
 
-        tails_file_path = Path(self.get_receiving_tails_local_path())
-        tails_file_dir = tails_file_path.parent
-        if not tails_file_dir.exists():
-            tails_file_dir.mkdir(parents=True)
-
-        buffer_size = 65536  # should be multiple of 32 bytes for sha256
-        with open(tails_file_path, "wb", buffer_size) as tails_file:
-            file_hasher = hashlib.sha256()
-
-            with Session() as req_session:
-                try:
-                    resp = req_session.get(self._tails_public_uri, stream=True)
-                    for buf in resp.iter_content(chunk_size=buffer_size):
-                        tails_file.write(buf)
-                        file_hasher.update(buf)
-                except RequestException as rx:
-                    raise RevocationError(f"Error retrieving tails file: {rx}")
-
-            download_tails_hash = base58.b58encode(file_hasher.digest()).decode("utf-8")
-            if download_tails_hash != self.tails_hash:
-                raise RevocationError(
-                    "The hash of the downloaded tails file does not match."
-                )
+        tails_file_path = await TAILS_DOWNLOADER.download(
+            self._tails_public_uri,
+            self._tails_hash,
+            self.get_receiving_tails_local_path(),
+        )
 
         self.tails_local_path = tails_file_path
         return self.tails_local_path
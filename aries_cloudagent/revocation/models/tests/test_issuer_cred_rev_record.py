@@ -105,3 +105,24 @@ class TestRecord(AsyncTestCase):
             await IssuerCredRevRecord.retrieve_by_ids(
                 self.context, rev_reg_id=REV_REG_ID, cred_rev_id="2"
             )
+
+    async def test_query_by_cred_rev_ids(self):
+        recs = [
+            IssuerCredRevRecord(
+                state=IssuerCredRevRecord.STATE_ISSUED,
+                cred_ex_id=test_module.UUIDFour.EXAMPLE,
+                rev_reg_id=REV_REG_ID,
+                cred_rev_id=str(i + 1),
+            )
+            for i in range(3)
+        ]
+        for rec in recs:
+            await rec.save(self.context)
+
+        found = await IssuerCredRevRecord.query_by_cred_rev_ids(
+            self.context, REV_REG_ID, ["1", "3", "4"]
+        )
+        assert sorted(rec.cred_rev_id for rec in found) == ["1", "3"]
+        assert not await IssuerCredRevRecord.query_by_cred_rev_ids(
+            self.context, f"{REV_REG_ID}1", ["1"]
+        )
@@ -189,6 +189,47 @@ class TestRecord(AsyncTestCase):
         found = await IssuerRevRegRecord.query_by_pending(self.context)
         assert not found
 
+    async def test_stage_send_entry(self):
+        issuer = async_mock.MagicMock(BaseIssuer)
+        issuer.merge_revocation_registry_deltas = async_mock.CoroutineMock(
+            return_value=json.dumps({"revoked": [1, 2]})
+        )
+        self.context.injector.bind_instance(BaseIssuer, issuer)
+        rec = IssuerRevRegRecord(
+            issuer_did=TEST_DID,
+            revoc_reg_id=REV_REG_ID,
+            state=IssuerRevRegRecord.STATE_ACTIVE,
+            tails_public_uri="http://localhost/dummy/path",
+            pending_pub=["1", "2", "3"],
+        )
+        assert not await rec.stage_entry(self.context, None, ["3"])
+        assert rec.pending_pub == ["1", "2"]
+
+        assert await rec.stage_entry(self.context, json.dumps({"revoked": [1]}), ["1"])
+        assert rec.pending_entry == rec.revoc_reg_entry == {"revoked": [1]}
+        assert rec.pending_pub == ["2"]
+
+        # an entry not yet sent is merged into the next one
+        assert await rec.stage_entry(self.context, json.dumps({"revoked": [2]}), ["2"])
+        issuer.merge_revocation_registry_deltas.assert_awaited_once_with(
+            json.dumps({"revoked": [1]}), json.dumps({"revoked": [2]})
+        )
+        assert rec.pending_entry == {"revoked": [1, 2]}
+        stored = await IssuerRevRegRecord.retrieve_by_id(self.context, rec.record_id)
+        assert stored.pending_entry == {"revoked": [1, 2]}
+        assert stored.pending_pub == []
+        # a staged entry is still pending publication
+        found = await IssuerRevRegRecord.query_by_pending(self.context)
+        assert len(found) == 1 and found[0].record_id == rec.record_id
+
+        await rec.send_entry(self.context)
+        self.ledger.send_revoc_reg_entry.assert_awaited_once_with(
+            REV_REG_ID, "CL_ACCUM", {"revoked": [1, 2]}, TEST_DID
+        )
+        stored = await IssuerRevRegRecord.retrieve_by_id(self.context, rec.record_id)
+        assert stored.pending_entry is None
+        assert not await IssuerRevRegRecord.query_by_pending(self.context)
+
     async def test_set_tails_file_public_uri_rev_reg_undef(self):
         rec = IssuerRevRegRecord()
         with self.assertRaises(RevocationError):
@@ -7,8 +7,6 @@ from copy import deepcopy
 from pathlib import Path
 from shutil import rmtree
 
-import base58
-
 from ....config.injection_context import InjectionContext
 from ....indy.util import indy_client_dir
 from ....storage.base import BaseStorage
@@ -108,69 +106,25 @@ class TestRevocationRegistry(AsyncTestCase):
         rr_def_public["value"]["tailsLocation"] = "http://sample.ca:8088/path"
         rev_reg = RevocationRegistry.from_definition(rr_def_public, public_def=True)
 
-        more_magic = async_mock.MagicMock()
         with async_mock.patch.object(
-            test_module, "Session", autospec=True
-        ) as mock_session:
-            mock_session.return_value.__enter__ = async_mock.MagicMock(
-                return_value=more_magic
-            )
-            more_magic.get = async_mock.MagicMock(
-                side_effect=test_module.RequestException("Not this time")
-            )
+            test_module.TAILS_DOWNLOADER, "download", async_mock.CoroutineMock()
+        ) as mock_download:
+            mock_download.side_effect = RevocationError("Error retrieving tails file")
 
             with self.assertRaises(RevocationError) as x_retrieve:
                 await rev_reg.retrieve_tails()
                 assert x_retrieve.message.contains("Error retrieving tails file")
 
-            rmtree(TAILS_DIR, ignore_errors=True)
-
-        more_magic = async_mock.MagicMock()
         with async_mock.patch.object(
-            test_module, "Session", autospec=True
-        ) as mock_session:
-            mock_session.return_value.__enter__ = async_mock.MagicMock(
-                return_value=more_magic
-            )
-            more_magic.get = async_mock.MagicMock(
-                return_value=async_mock.MagicMock(
-                    iter_content=async_mock.MagicMock(
-                        side_effect=[(b"abcd1234",), (b"",)]
-                    )
-                )
-            )
-
-            with self.assertRaises(RevocationError) as x_retrieve:
-                await rev_reg.retrieve_tails()
-                assert x_retrieve.message.contains(
-                    "The hash of the downloaded tails file does not match."
-                )
-
-            rmtree(TAILS_DIR, ignore_errors=True)
-
-        more_magic = async_mock.MagicMock()
-        with async_mock.patch.object(
-            test_module, "Session", autospec=True
-        ) as mock_session, async_mock.patch.object(
-            base58, "b58encode", async_mock.MagicMock()
-        ) as mock_b58enc, async_mock.patch.object(
+            test_module.TAILS_DOWNLOADER, "download", async_mock.CoroutineMock()
+        ) as mock_download, async_mock.patch.object(
             Path, "is_file", autospec=True
         ) as mock_is_file:
-            mock_session.return_value.__enter__ = async_mock.MagicMock(
-                return_value=more_magic
-            )
-            more_magic.get = async_mock.MagicMock(
-                return_value=async_mock.MagicMock(
-                    iter_content=async_mock.MagicMock(
-                        side_effect=[(b"abcd1234",), (b"",)]
-                    )
-                )
-            )
+            mock_download.return_value = TAILS_LOCAL
             mock_is_file.return_value = False
 
-            mock_b58enc.return_value = async_mock.MagicMock(
-                decode=async_mock.MagicMock(return_value=TAILS_HASH)
+            assert await rev_reg.get_or_fetch_local_tails_path() == TAILS_LOCAL
+            mock_download.assert_awaited_once_with(
+                "http://sample.ca:8088/path", TAILS_HASH, TAILS_LOCAL
             )
-            await rev_reg.get_or_fetch_local_tails_path()
-
-            rmtree(TAILS_DIR, ignore_errors=True)
+            assert rev_reg.tails_local_path == TAILS_LOCAL
@@ -0,0 +1,273 @@
+"""Background publication of pending revocations."""
+
+import asyncio
+import logging
+import time
+
+from typing import Mapping, Sequence, Text
+
+from ..config.injection_context import InjectionContext
+from ..issuer.base import BaseIssuer
+from ..ledger.error import BadLedgerRequestError, LedgerConfigError, LedgerError
+from ..messaging.responder import BaseResponder
+
+from .error import RevocationError
+from .models.issuer_rev_reg_record import IssuerRevRegRecord
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RevocationPublisher:
+    """
+    Publish pending revocations to the ledger in the background.
+
+    Revocations marked pending publication are collected until `max_pending` of
+    them are waiting, or until `interval` seconds have passed since the first,
+    and are then published together: one registry entry per revocation registry,
+    with at most `max_concurrent` registries being published at once. Ledger
+    writes failing for a transient reason are retried up to `max_attempts`
+    times, with the delay between attempts doubling from `retry_delay` seconds.
+    An entry which could not be sent stays staged on its registry record, and is
+    sent again with the next batch, at most `interval` seconds later.
+
+    A webhook is sent for each registry published, giving the credential
+    revocation ids published, the number of attempts made and the latency of
+    the batch.
+    """
+
+    WEBHOOK_TOPIC = "revocation_published"
+
+    STATE_PUBLISHED = "published"
+    STATE_FAILED = "failed"
+
+    def __init__(
+        self,
+        context: InjectionContext,
+        *,
+        interval: float = 5.0,
+        max_pending: int = 100,
+        max_concurrent: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+    ):
+        """
+        Initialize a `RevocationPublisher` instance.
+
+        Args:
+            context: The injection context to use
+            interval: Seconds to wait for more revocations after the first
+            max_pending: Number of pending revocations to publish without waiting
+            max_concurrent: Maximum number of registries published at once
+            max_attempts: Maximum number of attempts to publish each registry entry
+            retry_delay: Seconds to wait before the first retry of a ledger write
+
+        """
+        self.context = context
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_concurrent = max_concurrent
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._pending_count = 0
+        self._window_start: float = None
+        self._flush_lock: asyncio.Lock = None
+        self._wakeup: asyncio.Event = None
+        self._task: asyncio.Task = None
+
+    @property
+    def running(self) -> bool:
+        """Accessor for the running state of the publisher."""
+        return bool(self._task and not self._task.done())
+
+    @property
+    def flush_lock(self) -> asyncio.Lock:
+        """Accessor for the lock held while publishing."""
+        if not self._flush_lock:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    def start(self):
+        """Start publishing in the background, including revocations already pending."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        if self._window_start is None:
+            self._window_start = time.perf_counter()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self, flush: bool = True):
+        """Stop publishing in the background, publishing any pending revocations."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if flush and self._window_start is not None:
+            await self.flush()
+
+    def notify(self, rev_reg_id: str, count: int = 1):
+        """
+        Note revocations newly marked pending publication.
+
+        Args:
+            rev_reg_id: The revocation registry of the pending revocations
+            count: The number of revocations marked pending
+
+        """
+        if self._window_start is None:
+            self._window_start = time.perf_counter()
+        self._pending_count += count
+        LOGGER.debug(
+            "%s revocation(s) pending on rev reg id %s, %s in batch",
+            count,
+            rev_reg_id,
+            self._pending_count,
+        )
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Wait for each batch of revocations to be ready and publish it."""
+        while True:
+            self._wakeup.clear()
+            if self._window_start is None:
+                await self._wakeup.wait()
+                continue
+            remaining = self._window_start + self.interval - time.perf_counter()
+            if remaining > 0 and self._pending_count < self.max_pending:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                LOGGER.exception("Error publishing pending revocations")
+
+    async def flush(self) -> Mapping[Text, Sequence[Text]]:
+        """
+        Publish all pending revocations now.
+
+        Returns: mapping from each revocation registry id to its cred rev ids published.
+        """
+        window_start = self._window_start or time.perf_counter()
+        self._window_start = None
+        self._pending_count = 0
+
+        async with self.flush_lock:
+            issuer_rr_recs = await IssuerRevRegRecord.query_by_pending(self.context)
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            results = await asyncio.gather(
+                *(
+                    self._publish_registry(issuer_rr_rec, semaphore, window_start)
+                    for issuer_rr_rec in issuer_rr_recs
+                ),
+                return_exceptions=True,
+            )
+
+        published = {}
+        for issuer_rr_rec, result in zip(issuer_rr_recs, results):
+            if isinstance(result, Exception):
+                LOGGER.error(
+                    "Error publishing pending revocations on rev reg id %s: %s",
+                    issuer_rr_rec.revoc_reg_id,
+                    result,
+                )
+                # staged entries are sent again after the interval
+                if self._window_start is None:
+                    self._window_start = time.perf_counter()
+            elif result:
+                published[issuer_rr_rec.revoc_reg_id] = result
+        return published
+
+    async def _publish_registry(
+        self,
+        issuer_rr_rec: IssuerRevRegRecord,
+        semaphore: asyncio.Semaphore,
+        window_start: float,
+    ) -> Sequence[Text]:
+        """Revoke and publish the pending revocations of one registry."""
+        rev_reg_id = issuer_rr_rec.revoc_reg_id
+        async with semaphore, IssuerRevRegRecord.registry_lock(rev_reg_id):
+            started = time.perf_counter()
+            # revocations may have been marked or published since the query
+            issuer_rr_rec = await IssuerRevRegRecord.retrieve_by_id(
+                self.context, issuer_rr_rec.record_id
+            )
+            crids = list(issuer_rr_rec.pending_pub)
+            if crids:
+                issuer: BaseIssuer = await self.context.inject(BaseIssuer)
+                (delta_json, failed_crids) = await issuer.revoke_credentials(
+                    rev_reg_id, issuer_rr_rec.tails_local_path, crids
+                )
+            elif issuer_rr_rec.pending_entry:
+                # send the entry staged by an earlier attempt
+                (delta_json, failed_crids) = (None, [])
+            else:
+                return []
+            published = [crid for crid in crids if crid not in failed_crids]
+            # the revocations are applied to the registry even if not sent: the
+            # staged entry remains pending, to be sent by the next flush
+            staged = await issuer_rr_rec.stage_entry(self.context, delta_json, crids)
+            if staged:
+                (attempts, error) = await self._send_entry(issuer_rr_rec)
+            else:
+                published = []
+                (attempts, error) = (0, None)
+
+        finished = time.perf_counter()
+        failed = bool(error or not staged)
+        await self._send_webhook(
+            {
+                "rev_reg_id": rev_reg_id,
+                "state": self.STATE_FAILED if failed else self.STATE_PUBLISHED,
+                "cred_rev_ids": published,
+                "failed_cred_rev_ids": [
+                    crid for crid in crids if crid not in published
+                ],
+                "attempts": attempts,
+                "latency": round(finished - window_start, 6),
+                "publish_time": round(finished - started, 6),
+                **({"error": error.roll_up} if error else {}),
+            }
+        )
+        if error:
+            raise error
+        if failed:
+            LOGGER.warning(
+                "Could not revoke credential(s) %s on rev reg id %s",
+                ", ".join(crids),
+                rev_reg_id,
+            )
+        return published
+
+    async def _send_entry(self, issuer_rr_rec: IssuerRevRegRecord):
+        """Send a registry entry to the ledger, retrying on transient failures."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await issuer_rr_rec.send_entry(self.context)
+                return (attempt, None)
+            except (BadLedgerRequestError, LedgerConfigError, RevocationError) as err:
+                return (attempt, err)
+            except LedgerError as err:
+                if attempt >= self.max_attempts:
+                    return (attempt, err)
+                LOGGER.warning(
+                    "Retrying registry entry for rev reg id %s after error: %s",
+                    issuer_rr_rec.revoc_reg_id,
+                    err.roll_up,
+                )
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    async def _send_webhook(self, payload: dict):
+        """Send a webhook for a published batch, if a responder is available."""
+        responder: BaseResponder = await self.context.inject(
+            BaseResponder, required=False
+        )
+        if responder:
+            await responder.send_webhook(self.WEBHOOK_TOPIC, payload)
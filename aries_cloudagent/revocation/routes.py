@@ -21,6 +21,12 @@ from ..issuer.base import IssuerError
 from ..ledger.error import LedgerError
 from ..messaging.credential_definitions.util import CRED_DEF_SENT_RECORD_TYPE
 from ..messaging.models.openapi import OpenAPISchema
+from ..messaging.models.paging import (
+    PagingQueryStringSchema,
+    PagingResultSchema,
+    paging_requested,
+    record_list_response,
+)
 from ..messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_CRED_REV_ID,
@@ -170,7 +176,7 @@ class RevRegIssuedResultSchema(OpenAPISchema):
     )
 
 
-class RevRegsCreatedSchema(OpenAPISchema):
+class RevRegsCreatedSchema(PagingResultSchema):
     """Result schema for request for revocation registries created."""
 
     rev_reg_ids = fields.List(
@@ -191,7 +197,7 @@ class RevRegUpdateTailsFileUriSchema(OpenAPISchema):
     )
 
 
-class RevRegsCreatedQueryStringSchema(OpenAPISchema):
+class RevRegsCreatedQueryStringSchema(PagingQueryStringSchema):
     """Query string parameters and validators for rev regs created request."""
 
     cred_def_id = fields.Str(
@@ -410,12 +416,18 @@ async def rev_regs_created(request: web.BaseRequest):
     """
     context = request.app["request_context"]
 
-    search_tags = [
-        tag for tag in vars(RevRegsCreatedQueryStringSchema)["_declared_fields"]
-    ]
+    search_tags = ("cred_def_id", "state")
     tag_filter = {
         tag: request.query[tag] for tag in search_tags if tag in request.query
     }
+    if paging_requested(request):
+        return await record_list_response(
+            request,
+            IssuerRevRegRecord,
+            tag_filter,
+            serialize=lambda record: record.revoc_reg_id,
+            results_key="rev_reg_ids",
+        )
     found = await IssuerRevRegRecord.query(context, tag_filter)
 
     return web.json_response({"rev_reg_ids": [record.revoc_reg_id for record in found]})
@@ -0,0 +1,255 @@
+"""Asynchronous download of revocation registry tails files."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+
+from pathlib import Path
+
+import base58
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+from ..utils.repeat import RepeatSequence
+
+from .error import RevocationError
+
+LOGGER = logging.getLogger(__name__)
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(?:\d+|\*)")
+
+
+class TailsDownloader:
+    """
+    Download tails files without blocking the event loop.
+
+    Tails files are streamed to a partial file next to their destination while
+    being hashed, and moved into place only once the hash has been verified. An
+    interrupted download is resumed from the partial file with an HTTP range
+    request. Concurrent requests for the same tails hash share one download, and
+    the number of downloads in progress is limited.
+    """
+
+    CHUNK_SIZE = 65536  # should be a multiple of 32 bytes for sha256
+    CHUNKS_PER_WRITE = 16
+    PARTIAL_SUFFIX = ".part"
+
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = 4,
+        max_attempts: int = 3,
+        interval: float = 1.0,
+        backoff: float = 0.5,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+    ):
+        """
+        Initialize a `TailsDownloader` instance.
+
+        Args:
+            max_concurrent: the maximum number of downloads in progress
+            max_attempts: the maximum number of attempts for each download
+            interval: the interval between attempts, in seconds
+            backoff: the backoff interval, in seconds
+            connect_timeout: the timeout for connecting to the server, in seconds
+            read_timeout: the timeout for reading each chunk, in seconds
+
+        """
+        self.max_concurrent = max_concurrent
+        self.max_attempts = max_attempts
+        self.interval = interval
+        self.backoff = backoff
+        self.timeout = ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.downloads = {}
+        self._semaphore: asyncio.Semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Accessor for the semaphore limiting concurrent downloads."""
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def download(self, url: str, tails_hash: str, path: str) -> str:
+        """
+        Download a tails file unless it is already present.
+
+        Args:
+            url: the public URI of the tails file
+            tails_hash: the expected base58-encoded sha256 hash of the file
+            path: the local path for the tails file
+
+        Returns:
+            The local path of the tails file
+
+        Raises:
+            RevocationError: if the download fails or the hash does not match
+
+        """
+        if Path(path).is_file():
+            return path
+
+        task = self.downloads.get(tails_hash)
+        if not task:
+            task = asyncio.ensure_future(self._download(url, tails_hash, path))
+            self.downloads[tails_hash] = task
+            task.add_done_callback(lambda _: self.downloads.pop(tails_hash, None))
+
+        # a cancelled caller must not cancel the download shared with others
+        downloaded = await asyncio.shield(task)
+        if downloaded != path and not Path(path).is_file():
+            # the same tails file was downloaded for another registry
+            await asyncio.get_event_loop().run_in_executor(
+                None, self._copy, downloaded, path
+            )
+        return path
+
+    async def _download(self, url: str, tails_hash: str, path: str) -> str:
+        """Download the tails file, resuming any partial download."""
+        async with self.semaphore:
+            LOGGER.info("Downloading tails file %s from %s", tails_hash, url)
+            loop = asyncio.get_event_loop()
+            partial = path + self.PARTIAL_SUFFIX
+            hasher, size = await loop.run_in_executor(None, self._resume, partial)
+
+            async with ClientSession(timeout=self.timeout) as session:
+                async for attempt in RepeatSequence(
+                    self.max_attempts, self.interval, self.backoff
+                ):
+                    try:
+                        hasher, size = await self._fetch(
+                            session, url, partial, hasher, size
+                        )
+                        break
+                    except (ClientError, asyncio.TimeoutError, OSError) as err:
+                        if attempt.final:
+                            raise RevocationError(
+                                f"Error retrieving tails file: {err}"
+                            ) from err
+                        LOGGER.warning("Tails file download interrupted: %s", err)
+                        hasher, size = await loop.run_in_executor(
+                            None, self._resume, partial
+                        )
+
+            download_hash = base58.b58encode(hasher.digest()).decode("utf-8")
+            if download_hash != tails_hash:
+                await loop.run_in_executor(None, os.remove, partial)
+                raise RevocationError(
+                    "The hash of the downloaded tails file does not match."
+                )
+            await loop.run_in_executor(None, os.replace, partial, path)
+            LOGGER.info("Downloaded tails file %s (%d bytes)", tails_hash, size)
+            return path
+
+    async def _fetch(
+        self, session: ClientSession, url: str, partial: str, hasher, size: int
+    ):
+        """Stream the remainder of the tails file into the partial file."""
+        loop = asyncio.get_event_loop()
+        headers = {"Range": f"bytes={size}-"} if size else None
+        async with session.get(url, headers=headers) as response:
+            if response.status == 416 and size:
+                # the partial file already holds the whole tails file
+                return hasher, size
+            if response.status == 200 and size:
+                # the server ignored the range request: start over
+                hasher, size = hashlib.sha256(), 0
+            elif response.status not in (200, 206):
+                raise RevocationError(
+                    "Error retrieving tails file: "
+                    f"{response.status} - {response.reason}"
+                )
+            restart = (
+                response.status == 206
+                and self._range_start(response.headers.get("Content-Range")) != size
+            )
+            if not restart:
+                tails_file = await loop.run_in_executor(
+                    None, self._open_partial, partial, size
+                )
+                pending = []
+                try:
+                    async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                        pending.append(chunk)
+                        if len(pending) >= self.CHUNKS_PER_WRITE:
+                            size = await loop.run_in_executor(
+                                None, self._write, tails_file, hasher, pending, size
+                            )
+                            pending = []
+                finally:
+                    # keep the bytes received and hashed so far for resuming
+                    await loop.run_in_executor(
+                        None, self._close_partial, tails_file, hasher, pending, size
+                    )
+                return hasher, size + sum(len(chunk) for chunk in pending)
+            content_range = response.headers.get("Content-Range")
+
+        if not size:
+            raise RevocationError(
+                f"Unexpected tails file content range: {content_range}"
+            )
+        # the response does not continue the partial file: start over
+        LOGGER.warning("Unexpected tails file content range: %s", content_range)
+        return await self._fetch(session, url, partial, hashlib.sha256(), 0)
+
+    @staticmethod
+    def _range_start(content_range: str) -> int:
+        """Get the first byte position of a Content-Range header, if valid."""
+        parsed = CONTENT_RANGE.fullmatch(content_range or "")
+        return int(parsed.group(1)) if parsed else None
+
+    @staticmethod
+    def _open_partial(partial: str, size: int):
+        """Open the partial file for writing after the given number of bytes."""
+        tails_file = open(partial, "r+b" if size else "wb")
+        tails_file.seek(size)
+        tails_file.truncate()
+        return tails_file
+
+    @staticmethod
+    def _write(tails_file, hasher, chunks: list, size: int) -> int:
+        """Write and hash downloaded chunks, returning the new size."""
+        for chunk in chunks:
+            tails_file.write(chunk)
+            hasher.update(chunk)
+            size += len(chunk)
+        return size
+
+    @classmethod
+    def _close_partial(cls, tails_file, hasher, chunks: list, size: int):
+        """Write any remaining chunks and close the partial file."""
+        try:
+            size = cls._write(tails_file, hasher, chunks, size)
+            tails_file.truncate(size)
+        finally:
+            tails_file.close()
+
+    def _resume(self, partial: str):
+        """Hash the content of an existing partial file."""
+        hasher = hashlib.sha256()
+        size = 0
+        if os.path.isfile(partial):
+            with open(partial, "rb") as tails_file:
+                for chunk in iter(lambda: tails_file.read(self.CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                    size += len(chunk)
+            LOGGER.debug("Resuming tails file download after %d bytes", size)
+        else:
+            Path(partial).parent.mkdir(parents=True, exist_ok=True)
+        return hasher, size
+
+    def _copy(self, source: str, path: str):
+        """Atomically copy a downloaded tails file to another path."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        partial = path + self.PARTIAL_SUFFIX
+        shutil.copyfile(source, partial)
+        os.replace(partial, path)
+
+
+TAILS_DOWNLOADER = TailsDownloader()
@@ -61,6 +61,7 @@ class TestRevocationManager(AsyncTestCase):
                 revoc_reg_id=REV_REG_ID,
                 tails_local_path=TAILS_LOCAL,
                 send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
                 clear_pending=async_mock.CoroutineMock(),
             )
             mock_rev_reg = async_mock.MagicMock(
@@ -92,6 +93,8 @@ class TestRevocationManager(AsyncTestCase):
             self.context.injector.bind_instance(BaseIssuer, issuer)
 
             await self.manager.revoke_credential_by_cred_ex_id(CRED_EX_ID, publish=True)
+            mock_issuer_rev_reg_record.stage_entry.assert_awaited_once()
+            mock_issuer_rev_reg_record.send_entry.assert_awaited_once_with(self.context)
 
     async def test_revoke_cred_by_cxid_not_found(self):
         CRED_EX_ID = "dummy-cxid"
@@ -156,6 +159,31 @@ class TestRevocationManager(AsyncTestCase):
                 self.context, CRED_REV_ID
             )
 
+    async def test_revoke_credential_pend_publisher(self):
+        CRED_REV_ID = "1"
+        with async_mock.patch.object(
+            test_module, "IndyRevocation", autospec=True
+        ) as revoc:
+            mock_issuer_rev_reg_record = async_mock.MagicMock(
+                mark_pending=async_mock.CoroutineMock()
+            )
+            revoc.return_value.get_issuer_rev_reg_record = async_mock.CoroutineMock(
+                return_value=mock_issuer_rev_reg_record
+            )
+
+            issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
+            self.context.injector.bind_instance(BaseIssuer, issuer)
+            publisher = async_mock.MagicMock(test_module.RevocationPublisher)
+            self.context.injector.bind_instance(
+                test_module.RevocationPublisher, publisher
+            )
+
+            await self.manager.revoke_credential(REV_REG_ID, CRED_REV_ID, False)
+            mock_issuer_rev_reg_record.mark_pending.assert_called_once_with(
+                self.context, CRED_REV_ID
+            )
+            publisher.notify.assert_called_once_with(REV_REG_ID)
+
     async def test_publish_pending_revocations(self):
         deltas = [
             {
@@ -177,13 +205,18 @@ class TestRevocationManager(AsyncTestCase):
             tails_local_path=TAILS_LOCAL,
             pending_pub=["1", "2"],
             send_entry=async_mock.CoroutineMock(),
+            stage_entry=async_mock.CoroutineMock(return_value=True),
             clear_pending=async_mock.CoroutineMock(),
         )
         with async_mock.patch.object(
             test_module.IssuerRevRegRecord,
             "query_by_pending",
             async_mock.CoroutineMock(return_value=[mock_issuer_rev_reg_record]),
-        ) as record_query:
+        ) as record_query, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=[mock_issuer_rev_reg_record]),
+        ):
             issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
             issuer.merge_revocation_registry_deltas = async_mock.CoroutineMock(
                 side_effect=deltas
@@ -196,7 +229,7 @@ class TestRevocationManager(AsyncTestCase):
 
             result = await self.manager.publish_pending_revocations()
             assert result == {REV_REG_ID: ["1", "2"]}
-            mock_issuer_rev_reg_record.clear_pending.assert_called_once()
+            mock_issuer_rev_reg_record.stage_entry.assert_called_once()
 
     async def test_publish_pending_revocations_1_rev_reg_all(self):
         deltas = [
@@ -220,6 +253,7 @@ class TestRevocationManager(AsyncTestCase):
                 tails_local_path=TAILS_LOCAL,
                 pending_pub=["1", "2"],
                 send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
                 clear_pending=async_mock.CoroutineMock(),
             ),
             async_mock.MagicMock(
@@ -227,6 +261,7 @@ class TestRevocationManager(AsyncTestCase):
                 tails_local_path=TAILS_LOCAL,
                 pending_pub=["9", "99"],
                 send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
                 clear_pending=async_mock.CoroutineMock(),
             ),
         ]
@@ -234,7 +269,11 @@ class TestRevocationManager(AsyncTestCase):
             test_module.IssuerRevRegRecord,
             "query_by_pending",
             async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
-        ) as record:
+        ) as record, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=mock_issuer_rev_reg_records),
+        ):
             issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
             issuer.merge_revocation_registry_deltas = async_mock.CoroutineMock(
                 side_effect=deltas
@@ -247,8 +286,8 @@ class TestRevocationManager(AsyncTestCase):
 
             result = await self.manager.publish_pending_revocations({REV_REG_ID: None})
             assert result == {REV_REG_ID: ["1", "2"]}
-            mock_issuer_rev_reg_records[0].clear_pending.assert_called_once()
-            mock_issuer_rev_reg_records[1].clear_pending.assert_not_called()
+            mock_issuer_rev_reg_records[0].stage_entry.assert_called_once()
+            mock_issuer_rev_reg_records[1].stage_entry.assert_not_called()
 
     async def test_publish_pending_revocations_1_rev_reg_some(self):
         deltas = [
@@ -272,6 +311,7 @@ class TestRevocationManager(AsyncTestCase):
                 tails_local_path=TAILS_LOCAL,
                 pending_pub=["1", "2"],
                 send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
                 clear_pending=async_mock.CoroutineMock(),
             ),
             async_mock.MagicMock(
@@ -279,6 +319,7 @@ class TestRevocationManager(AsyncTestCase):
                 tails_local_path=TAILS_LOCAL,
                 pending_pub=["9", "99"],
                 send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
                 clear_pending=async_mock.CoroutineMock(),
             ),
         ]
@@ -286,7 +327,11 @@ class TestRevocationManager(AsyncTestCase):
             test_module.IssuerRevRegRecord,
             "query_by_pending",
             async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
-        ) as record:
+        ) as record, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=mock_issuer_rev_reg_records),
+        ):
             issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
             issuer.merge_revocation_registry_deltas = async_mock.CoroutineMock(
                 side_effect=deltas
@@ -299,8 +344,51 @@ class TestRevocationManager(AsyncTestCase):
 
             result = await self.manager.publish_pending_revocations({REV_REG_ID: "2"})
             assert result == {REV_REG_ID: ["2"]}
-            mock_issuer_rev_reg_records[0].clear_pending.assert_called_once()
-            mock_issuer_rev_reg_records[1].clear_pending.assert_not_called()
+            mock_issuer_rev_reg_records[0].stage_entry.assert_called_once()
+            mock_issuer_rev_reg_records[1].stage_entry.assert_not_called()
+
+    async def test_publish_pending_revocations_staged(self):
+        mock_issuer_rev_reg_records = [
+            async_mock.MagicMock(
+                revoc_reg_id=REV_REG_ID,
+                tails_local_path=TAILS_LOCAL,
+                pending_pub=[],
+                pending_entry={"ver": "1.0", "value": {"revoked": [1]}},
+                send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
+            ),
+            async_mock.MagicMock(
+                revoc_reg_id=f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:tag2",
+                tails_local_path=TAILS_LOCAL,
+                pending_pub=[],
+                pending_entry={"ver": "1.0", "value": {"revoked": [9]}},
+                send_entry=async_mock.CoroutineMock(),
+                stage_entry=async_mock.CoroutineMock(return_value=True),
+            ),
+        ]
+        with async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "query_by_pending",
+            async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
+        ), async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=mock_issuer_rev_reg_records),
+        ):
+            issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
+            issuer.revoke_credentials = async_mock.CoroutineMock()
+            self.context.injector.bind_instance(BaseIssuer, issuer)
+
+            result = await self.manager.publish_pending_revocations({REV_REG_ID: []})
+            assert result == {REV_REG_ID: []}
+            issuer.revoke_credentials.assert_not_awaited()
+            mock_issuer_rev_reg_records[0].stage_entry.assert_awaited_once_with(
+                self.context, None, []
+            )
+            mock_issuer_rev_reg_records[0].send_entry.assert_awaited_once_with(
+                self.context
+            )
+            mock_issuer_rev_reg_records[1].send_entry.assert_not_awaited()
 
     async def test_clear_pending(self):
         mock_issuer_rev_reg_records = [
@@ -321,7 +409,11 @@ class TestRevocationManager(AsyncTestCase):
             test_module.IssuerRevRegRecord,
             "query_by_pending",
             async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
-        ) as record:
+        ) as record, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=mock_issuer_rev_reg_records),
+        ):
             result = await self.manager.clear_pending_revocations()
             assert result == {}
 
@@ -344,7 +436,11 @@ class TestRevocationManager(AsyncTestCase):
             test_module.IssuerRevRegRecord,
             "query_by_pending",
             async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
-        ) as record:
+        ) as record, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=mock_issuer_rev_reg_records),
+        ):
             result = await self.manager.clear_pending_revocations({REV_REG_ID: None})
             assert result == {
                 REV_REG_ID: ["1", "2"],
@@ -370,7 +466,11 @@ class TestRevocationManager(AsyncTestCase):
             test_module.IssuerRevRegRecord,
             "query_by_pending",
             async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
-        ) as record:
+        ) as record, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(side_effect=mock_issuer_rev_reg_records),
+        ):
             result = await self.manager.clear_pending_revocations({REV_REG_ID: ["9"]})
             assert result == {
                 REV_REG_ID: ["1", "2"],
@@ -0,0 +1,330 @@
+import asyncio
+import json
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ...issuer.base import BaseIssuer
+from ...ledger.error import BadLedgerRequestError, LedgerTransactionError
+from ...messaging.responder import BaseResponder, MockResponder
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+
+from ..models.issuer_rev_reg_record import IssuerRevRegRecord
+from ..publisher import RevocationPublisher
+
+from .. import publisher as test_module
+
+TEST_DID = "LjgpST2rjsoxYegQDRm7EL"
+CRED_DEF_ID = f"{TEST_DID}:3:CL:12:tag1"
+REV_REG_ID = f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:tag1"
+TAILS_LOCAL = "/tmp/indy/revocation/tails_files/dummy"
+
+
+class TestRevocationPublisher(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.responder = MockResponder()
+        self.context.injector.bind_instance(BaseResponder, self.responder)
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
+        self.issuer.revoke_credentials = async_mock.CoroutineMock(
+            side_effect=lambda rrid, tails_path, crids: (
+                json.dumps({"revoked": [int(crid) for crid in crids]}),
+                [],
+            )
+        )
+        self.context.injector.bind_instance(BaseIssuer, self.issuer)
+        self.publisher = RevocationPublisher(
+            self.context,
+            interval=0.05,
+            max_pending=3,
+            max_concurrent=2,
+            max_attempts=3,
+            retry_delay=0.001,
+        )
+
+    async def make_rev_reg_rec(self, rev_reg_id: str, pending):
+        rec = IssuerRevRegRecord(
+            state=IssuerRevRegRecord.STATE_ACTIVE,
+            revoc_reg_id=rev_reg_id,
+            tails_local_path=TAILS_LOCAL,
+            pending_pub=list(pending),
+        )
+        await rec.save(self.context)
+        return rec
+
+    def patch_send_entry(self, side_effects: dict = None):
+        """Patch send_entry, with an optional side effect per rev reg id."""
+        side_effects = {
+            rrid: iter(effects) for (rrid, effects) in (side_effects or {}).items()
+        }
+
+        async def send_entry(rec, context):
+            effect = next(side_effects.get(rec.revoc_reg_id, iter([None])), None)
+            if callable(effect):
+                await effect(rec)
+            elif effect:
+                raise effect
+            # clear the pending entry as the original would, without a ledger
+            rec.pending_entry = None
+            await rec.save(context)
+
+        return async_mock.patch.object(
+            IssuerRevRegRecord, "send_entry", autospec=True, side_effect=send_entry
+        )
+
+    def sent(self, mock_send_entry, rev_reg_id: str):
+        return [
+            call[0][0].revoc_reg_entry
+            for call in mock_send_entry.call_args_list
+            if call[0][0].revoc_reg_id == rev_reg_id
+        ]
+
+    @property
+    def published_webhooks(self):
+        return [
+            payload
+            for (topic, payload) in self.responder.webhooks
+            if topic == RevocationPublisher.WEBHOOK_TOPIC
+        ]
+
+    async def test_flush(self):
+        recs = [
+            await self.make_rev_reg_rec(f"{REV_REG_ID}{i}", [str(i), str(i + 10)])
+            for i in range(3)
+        ]
+        with self.patch_send_entry() as mock_send_entry:
+            result = await self.publisher.flush()
+
+        assert result == {rec.revoc_reg_id: rec.pending_pub for rec in recs}
+        for rec in recs:
+            entry = {"revoked": [int(crid) for crid in rec.pending_pub]}
+            assert self.sent(mock_send_entry, rec.revoc_reg_id) == [entry]
+            stored = await IssuerRevRegRecord.retrieve_by_id(
+                self.context, rec.record_id
+            )
+            assert stored.pending_pub == []
+            assert stored.pending_entry is None
+            assert stored.revoc_reg_entry == entry
+        assert len(self.published_webhooks) == 3
+        payload = self.published_webhooks[0]
+        assert payload["state"] == RevocationPublisher.STATE_PUBLISHED
+        assert payload["cred_rev_ids"] == ["0", "10"]
+        assert payload["attempts"] == 1
+        assert payload["latency"] >= payload["publish_time"] >= 0
+
+    async def test_flush_concurrency(self):
+        in_flight = []
+        most_in_flight = 0
+
+        async def send_entry(rec):
+            nonlocal most_in_flight
+            in_flight.append(rec)
+            most_in_flight = max(most_in_flight, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+
+        recs = [
+            await self.make_rev_reg_rec(f"{REV_REG_ID}{i}", [str(i)]) for i in range(5)
+        ]
+        with self.patch_send_entry({rec.revoc_reg_id: [send_entry] for rec in recs}):
+            result = await self.publisher.flush()
+
+        assert len(result) == 5
+        assert most_in_flight == 2
+
+    async def test_flush_mark_pending_while_publishing(self):
+        rec = await self.make_rev_reg_rec(REV_REG_ID, ["1"])
+        marked = None
+
+        async def send_entry(_):
+            nonlocal marked
+            # a revocation marked during publication waits for the registry lock
+            marked = asyncio.ensure_future(self.mark_pending(rec, "2"))
+            await asyncio.sleep(0.01)
+            assert not marked.done()
+
+        with self.patch_send_entry({REV_REG_ID: [send_entry]}):
+            result = await self.publisher.flush()
+            await marked
+
+        assert result == {REV_REG_ID: ["1"]}
+        stored = await IssuerRevRegRecord.retrieve_by_id(self.context, rec.record_id)
+        assert stored.pending_pub == ["2"]
+
+    async def mark_pending(self, rec, crid: str):
+        async with IssuerRevRegRecord.registry_lock(rec.revoc_reg_id):
+            rec = await IssuerRevRegRecord.retrieve_by_id(self.context, rec.record_id)
+            await rec.mark_pending(self.context, crid)
+
+    async def test_flush_retry(self):
+        recs = [
+            await self.make_rev_reg_rec(REV_REG_ID, ["1", "2"]),
+            await self.make_rev_reg_rec(f"{REV_REG_ID}x", ["3"]),
+            await self.make_rev_reg_rec(f"{REV_REG_ID}y", ["4"]),
+        ]
+        with self.patch_send_entry(
+            {
+                REV_REG_ID: [LedgerTransactionError("busy"), None],
+                f"{REV_REG_ID}x": [LedgerTransactionError("busy")] * 3,
+                f"{REV_REG_ID}y": [BadLedgerRequestError("bad")],
+            }
+        ) as mock_send_entry:
+            result = await self.publisher.flush()
+
+        assert result == {REV_REG_ID: ["1", "2"]}
+        assert [len(self.sent(mock_send_entry, rec.revoc_reg_id)) for rec in recs] == [
+            2,
+            3,
+            1,
+        ]
+        for rec in recs:
+            stored = await IssuerRevRegRecord.retrieve_by_id(
+                self.context, rec.record_id
+            )
+            assert stored.pending_pub == []
+        webhooks = {
+            payload["rev_reg_id"]: payload for payload in self.published_webhooks
+        }
+        assert webhooks[REV_REG_ID]["attempts"] == 2
+        assert webhooks[f"{REV_REG_ID}x"]["state"] == RevocationPublisher.STATE_FAILED
+        assert webhooks[f"{REV_REG_ID}x"]["attempts"] == 3
+        assert webhooks[f"{REV_REG_ID}y"]["error"] == "bad."
+
+    async def test_flush_merge_unsent(self):
+        self.issuer.merge_revocation_registry_deltas = async_mock.CoroutineMock(
+            side_effect=lambda fro, to: json.dumps(
+                {"revoked": json.loads(fro)["revoked"] + json.loads(to)["revoked"]}
+            )
+        )
+        rec = await self.make_rev_reg_rec(REV_REG_ID, ["1"])
+        with self.patch_send_entry(
+            {REV_REG_ID: [BadLedgerRequestError("bad")]}
+        ) as mock_send_entry:
+            assert await self.publisher.flush() == {}
+            stored = await IssuerRevRegRecord.retrieve_by_id(
+                self.context, rec.record_id
+            )
+            assert stored.pending_pub == []
+            assert stored.pending_entry == {"revoked": [1]}
+
+            await self.mark_pending(rec, "2")
+            assert await self.publisher.flush() == {REV_REG_ID: ["2"]}
+
+        assert self.sent(mock_send_entry, REV_REG_ID) == [
+            {"revoked": [1]},
+            {"revoked": [1, 2]},
+        ]
+        stored = await IssuerRevRegRecord.retrieve_by_id(self.context, rec.record_id)
+        assert stored.pending_entry is None
+
+    async def test_flush_send_staged(self):
+        rec = await self.make_rev_reg_rec(REV_REG_ID, ["1"])
+        with self.patch_send_entry(
+            {REV_REG_ID: [BadLedgerRequestError("bad")]}
+        ) as mock_send_entry:
+            assert await self.publisher.flush() == {}
+            # a flush is due again after the interval
+            assert self.publisher._window_start is not None
+
+            # the staged entry is sent without any further revocation
+            found = await IssuerRevRegRecord.query_by_pending(self.context)
+            assert [found_rec.record_id for found_rec in found] == [rec.record_id]
+            assert await self.publisher.flush() == {}
+
+        self.issuer.revoke_credentials.assert_awaited_once()
+        assert self.sent(mock_send_entry, REV_REG_ID) == [{"revoked": [1]}] * 2
+        stored = await IssuerRevRegRecord.retrieve_by_id(self.context, rec.record_id)
+        assert stored.pending_entry is None
+        assert not await IssuerRevRegRecord.query_by_pending(self.context)
+        payload = self.published_webhooks[-1]
+        assert payload["state"] == RevocationPublisher.STATE_PUBLISHED
+        assert payload["cred_rev_ids"] == []
+
+    async def test_flush_failed_crids(self):
+        self.issuer.revoke_credentials = async_mock.CoroutineMock(
+            side_effect=[(json.dumps({"revoked": [1]}), ["2"]), (None, ["3"])]
+        )
+        recs = [
+            await self.make_rev_reg_rec(REV_REG_ID, ["1", "2"]),
+            await self.make_rev_reg_rec(f"{REV_REG_ID}x", ["3"]),
+        ]
+        with self.patch_send_entry() as mock_send_entry:
+            result = await self.publisher.flush()
+
+        assert result == {REV_REG_ID: ["1"]}
+        assert self.sent(mock_send_entry, f"{REV_REG_ID}x") == []
+        # cred rev ids which could not be revoked are not retried
+        for rec in recs:
+            stored = await IssuerRevRegRecord.retrieve_by_id(
+                self.context, rec.record_id
+            )
+            assert stored.pending_pub == []
+        webhooks = {
+            payload["rev_reg_id"]: payload for payload in self.published_webhooks
+        }
+        assert webhooks[REV_REG_ID]["failed_cred_rev_ids"] == ["2"]
+        assert webhooks[f"{REV_REG_ID}x"]["state"] == RevocationPublisher.STATE_FAILED
+        assert webhooks[f"{REV_REG_ID}x"]["failed_cred_rev_ids"] == ["3"]
+
+    def reset_window(self):
+        self.publisher._window_start = None
+        self.publisher._pending_count = 0
+
+    async def test_run_interval(self):
+        with async_mock.patch.object(
+            self.publisher,
+            "flush",
+            async_mock.CoroutineMock(side_effect=lambda: self.reset_window()),
+        ) as mock_flush:
+            self.publisher.start()
+            assert self.publisher.running
+            self.publisher.start()  # no-op when running
+            await asyncio.sleep(0.01)
+            mock_flush.assert_not_awaited()
+            await asyncio.sleep(0.1)
+            mock_flush.assert_awaited_once()
+            await self.publisher.stop()
+            assert not self.publisher.running
+
+    async def test_run_max_pending(self):
+        self.publisher.interval = 60
+        with async_mock.patch.object(
+            self.publisher,
+            "flush",
+            async_mock.CoroutineMock(side_effect=lambda: self.reset_window()),
+        ) as mock_flush:
+            self.publisher.start()
+            self.reset_window()
+            self.publisher.notify(REV_REG_ID)
+            self.publisher.notify(REV_REG_ID)
+            await asyncio.sleep(0.01)
+            mock_flush.assert_not_awaited()
+            self.publisher.notify(REV_REG_ID)
+            await asyncio.sleep(0.01)
+            mock_flush.assert_awaited_once()
+
+            self.publisher.notify(REV_REG_ID)
+            await self.publisher.stop(flush=False)
+            assert mock_flush.await_count == 1
+            await self.publisher.stop()
+            assert mock_flush.await_count == 2
+
+    async def test_run_flush_x(self):
+        def flush():
+            self.reset_window()
+            raise ValueError("x")
+
+        with async_mock.patch.object(
+            self.publisher, "flush", async_mock.CoroutineMock(side_effect=flush)
+        ) as mock_flush, async_mock.patch.object(
+            test_module.LOGGER, "exception", async_mock.MagicMock()
+        ) as mock_log_exc:
+            self.publisher.start()
+            await asyncio.sleep(0.1)
+            mock_flush.assert_awaited_once()
+            mock_log_exc.assert_called()
+            assert self.publisher.running
+            await self.publisher.stop(flush=False)
@@ -366,6 +366,28 @@ class TestRevocationRoutes(AsyncTestCase):
             mock_json_response.assert_called_once_with({"rev_reg_ids": ["dummy"]})
             assert result is mock_json_response.return_value
 
+    async def test_rev_regs_created_paged(self):
+        request = async_mock.MagicMock()
+        request.app = self.app
+        request.query = {
+            "state": test_module.IssuerRevRegRecord.STATE_ACTIVE,
+            "limit": "10",
+        }
+
+        with async_mock.patch.object(
+            test_module, "record_list_response", async_mock.CoroutineMock()
+        ) as mock_list_response:
+            result = await test_module.rev_regs_created(request)
+            args, kwargs = mock_list_response.call_args
+            assert args == (
+                request,
+                test_module.IssuerRevRegRecord,
+                {"state": test_module.IssuerRevRegRecord.STATE_ACTIVE},
+            )
+            assert kwargs["results_key"] == "rev_reg_ids"
+            assert kwargs["serialize"](async_mock.MagicMock(revoc_reg_id="x")) == "x"
+            assert result is mock_list_response.return_value
+
     async def test_get_rev_reg(self):
         REV_REG_ID = "{}:4:{}:3:CL:1234:default:CL_ACCUM:default".format(
             self.test_did, self.test_did
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import os
+
+from tempfile import TemporaryDirectory
+
+import base58
+
+from aiohttp import web
+from asynctest import TestCase as AsyncTestCase
+
+from ..error import RevocationError
+from ..tails import TailsDownloader
+
+TAILS_CONTENT = bytes(range(256)) * 1024
+TAILS_HASH = base58.b58encode(hashlib.sha256(TAILS_CONTENT).digest()).decode()
+
+
+class TestTailsDownloader(AsyncTestCase):
+    async def setUp(self):
+        self.requests = []
+        self.range_shift = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+        async def tails(request):
+            self.requests.append(request.headers.get("Range"))
+            await self.release.wait()
+            content = TAILS_CONTENT
+            status = 200
+            headers = {}
+            if request.headers.get("Range"):
+                start = int(request.headers["Range"][6:-1])
+                if start >= len(content):
+                    return web.Response(status=416)
+                # a misbehaving server may return another range
+                start = max(start + self.range_shift, 0)
+                content = content[start:]
+                status = 206
+                headers["Content-Range"] = "bytes {}-{}/{}".format(
+                    start, len(TAILS_CONTENT) - 1, len(TAILS_CONTENT)
+                )
+            return web.Response(body=content, status=status, headers=headers)
+
+        app = web.Application()
+        app.add_routes([web.get("/tails", tails)])
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/tails"
+
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "registry", TAILS_HASH)
+
+    async def tearDown(self):
+        await self.runner.cleanup()
+        self.temp_dir.cleanup()
+
+    def read(self, path):
+        with open(path, "rb") as tails_file:
+            return tails_file.read()
+
+    async def test_download(self):
+        downloader = TailsDownloader()
+        assert await downloader.download(self.url, TAILS_HASH, self.path) == self.path
+        assert self.read(self.path) == TAILS_CONTENT
+        assert not os.path.exists(self.path + TailsDownloader.PARTIAL_SUFFIX)
+
+        # present files are not downloaded again
+        await downloader.download(self.url, TAILS_HASH, self.path)
+        assert self.requests == [None]
+
+    async def test_download_shared(self):
+        downloader = TailsDownloader()
+        other_path = os.path.join(self.temp_dir.name, "other", TAILS_HASH)
+        self.release.clear()
+        downloads = asyncio.gather(
+            downloader.download(self.url, TAILS_HASH, self.path),
+            downloader.download(self.url, TAILS_HASH, self.path),
+            downloader.download(self.url, TAILS_HASH, other_path),
+        )
+        await asyncio.sleep(0.1)
+        assert list(downloader.downloads) == [TAILS_HASH]
+        self.release.set()
+        assert await downloads == [self.path, self.path, other_path]
+        assert self.requests == [None]
+        assert self.read(other_path) == TAILS_CONTENT
+        assert not downloader.downloads
+
+    async def test_download_resume(self):
+        partial = self.path + TailsDownloader.PARTIAL_SUFFIX
+        os.makedirs(os.path.dirname(partial))
+        with open(partial, "wb") as tails_file:
+            tails_file.write(TAILS_CONTENT[:1000])
+
+        downloader = TailsDownloader()
+        downloader.CHUNKS_PER_WRITE = 1
+        await downloader.download(self.url, TAILS_HASH, self.path)
+        assert self.requests == ["bytes=1000-"]
+        assert self.read(self.path) == TAILS_CONTENT
+
+    async def test_download_resume_range_mismatch(self):
+        partial = self.path + TailsDownloader.PARTIAL_SUFFIX
+        os.makedirs(os.path.dirname(partial))
+        with open(partial, "wb") as tails_file:
+            tails_file.write(TAILS_CONTENT[:1000])
+
+        self.range_shift = -100
+        downloader = TailsDownloader()
+        await downloader.download(self.url, TAILS_HASH, self.path)
+        assert self.requests == ["bytes=1000-", None]
+        assert self.read(self.path) == TAILS_CONTENT
+
+    async def test_download_resume_complete(self):
+        partial = self.path + TailsDownloader.PARTIAL_SUFFIX
+        os.makedirs(os.path.dirname(partial))
+        with open(partial, "wb") as tails_file:
+            tails_file.write(TAILS_CONTENT)
+
+        downloader = TailsDownloader()
+        await downloader.download(self.url, TAILS_HASH, self.path)
+        assert self.requests == [f"bytes={len(TAILS_CONTENT)}-"]
+        assert self.read(self.path) == TAILS_CONTENT
+
+    async def test_download_hash_mismatch(self):
+        downloader = TailsDownloader()
+        with self.assertRaises(RevocationError) as context:
+            await downloader.download(self.url, "not-the-hash", self.path)
+        assert "does not match" in str(context.exception)
+        assert not os.path.exists(self.path)
+        assert not os.path.exists(self.path + TailsDownloader.PARTIAL_SUFFIX)
+
+    async def test_download_x(self):
+        downloader = TailsDownloader(max_attempts=2, interval=0.01)
+        with self.assertRaises(RevocationError) as context:
+            await downloader.download(self.url + "/missing", TAILS_HASH, self.path)
+        assert "404" in str(context.exception)
+        assert not os.path.exists(self.path)
@@ -1,7 +1,8 @@
 """Basic in-memory storage implementation (non-wallet)."""
 
-from collections import OrderedDict
-from typing import Mapping, Sequence
+from itertools import count
+from sys import intern
+from typing import Iterable, Mapping, Optional, Sequence, Set, Tuple
 
 from .base import BaseStorage, BaseStorageRecordSearch
 from .error import (
@@ -13,9 +14,22 @@ from .error import (
 from .record import StorageRecord
 from ..wallet.base import BaseWallet
 
+# stored record fields: (sequence number, id, type, value, flattened tags)
+_SEQ, _ID, _TYPE, _VALUE, _TAGS = range(5)
+
+QueryPlan = Tuple[Optional[Set[str]], bool]
+
 
 class BasicStorage(BaseStorage):
-    """Basic in-memory storage class."""
+    """
+    Basic in-memory storage class.
+
+    Records are indexed by type, and by tag value for each tag name within each
+    type, so that searches are resolved from the indexes (see `plan_query`)
+    rather than by matching every record in the store. Records are held as
+    compact tuples, with their type and tag strings interned, and are returned
+    as new `StorageRecord` instances.
+    """
 
     def __init__(self, _wallet: BaseWallet = None):
         """
@@ -25,7 +39,90 @@ class BasicStorage(BaseStorage):
             _wallet: The wallet implementation to use
 
         """
-        self._records = OrderedDict()
+        self._records = {}
+        # record type -> ids of the records of that type, in order of insertion
+        self._types = {}
+        # (record type, tag name) -> tag value -> ids of the records with that value
+        self._tags = {}
+        self._sequence = count()
+
+    @staticmethod
+    def _pack_tags(tags: Mapping) -> tuple:
+        """Flatten tags into a tuple of alternating names and values."""
+        return tuple(
+            intern(item) if type(item) is str else item
+            for pair in (tags or {}).items()
+            for item in pair
+        )
+
+    @staticmethod
+    def _to_record(stored: tuple) -> StorageRecord:
+        """Create a `StorageRecord` from a stored record."""
+        flat = stored[_TAGS]
+        return StorageRecord(
+            stored[_TYPE],
+            stored[_VALUE],
+            dict(zip(flat[::2], flat[1::2])),
+            stored[_ID],
+        )
+
+    def _index_tags(self, stored: tuple):
+        """Add a stored record to the tag indexes."""
+        flat = stored[_TAGS]
+        record_id = stored[_ID]
+        for pos in range(0, len(flat), 2):
+            value = flat[pos + 1]
+            if type(value) is str:
+                values = self._tags.setdefault((stored[_TYPE], flat[pos]), {})
+                ids = values.get(value)
+                # a tag value held by a single record maps to its id alone
+                if ids is None:
+                    values[value] = record_id
+                elif isinstance(ids, set):
+                    ids.add(record_id)
+                else:
+                    values[value] = {ids, record_id}
+
+    def _unindex_tags(self, stored: tuple):
+        """Remove a stored record from the tag indexes."""
+        flat = stored[_TAGS]
+        record_id = stored[_ID]
+        for pos in range(0, len(flat), 2):
+            value = flat[pos + 1]
+            if type(value) is str:
+                key = (stored[_TYPE], flat[pos])
+                values = self._tags[key]
+                ids = values[value]
+                if isinstance(ids, set):
+                    ids.discard(record_id)
+                    if len(ids) == 1:
+                        values[value] = ids.pop()
+                else:
+                    del values[value]
+                    if not values:
+                        del self._tags[key]
+
+    @staticmethod
+    def _lookup(values: Mapping, value: str) -> Set[str]:
+        """Find the ids of the records with a tag value in a tag index."""
+        ids = values.get(value)
+        if ids is None:
+            return set()
+        return ids if isinstance(ids, set) else {ids}
+
+    def _get_stored(self, record_id: str) -> tuple:
+        """Fetch a stored record by ID."""
+        stored = self._records.get(record_id)
+        if not stored:
+            raise StorageNotFoundError("Record not found: {}".format(record_id))
+        return stored
+
+    def _replace_tags(self, stored: tuple, tags: Mapping):
+        """Replace the tags of a stored record."""
+        self._unindex_tags(stored)
+        stored = stored[:_TAGS] + (self._pack_tags(tags),)
+        self._records[stored[_ID]] = stored
+        self._index_tags(stored)
 
     async def add_record(self, record: StorageRecord):
         """
@@ -45,7 +142,17 @@ class BasicStorage(BaseStorage):
             raise StorageError("Record has no ID")
         if record.id in self._records:
             raise StorageDuplicateError("Duplicate record")
-        self._records[record.id] = record
+        record_type = intern(record.type) if type(record.type) is str else record.type
+        stored = (
+            next(self._sequence),
+            record.id,
+            record_type,
+            record.value,
+            self._pack_tags(record.tags),
+        )
+        self._records[record.id] = stored
+        self._types.setdefault(record_type, {})[record.id] = None
+        self._index_tags(stored)
 
     async def get_record(
         self, record_type: str, record_id: str, options: Mapping = None
@@ -65,11 +172,10 @@ class BasicStorage(BaseStorage):
             StorageNotFoundError: If the record is not found
 
         """
-        row = self._records.get(record_id)
-        if row and row.type == record_type:
-            return row
-        if not row:
+        stored = self._records.get(record_id)
+        if not stored or stored[_TYPE] != record_type:
             raise StorageNotFoundError("Record not found: {}".format(record_id))
+        return self._to_record(stored)
 
     async def update_record_value(self, record: StorageRecord, value: str):
         """
@@ -83,10 +189,8 @@ class BasicStorage(BaseStorage):
             StorageNotFoundError: If record not found
 
         """
-        oldrec = self._records.get(record.id)
-        if not oldrec:
-            raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self._records[record.id] = oldrec._replace(value=value)
+        stored = self._get_stored(record.id)
+        self._records[record.id] = stored[:_VALUE] + (value,) + stored[_TAGS:]
 
     async def update_record_tags(self, record: StorageRecord, tags: Mapping):
         """
@@ -100,10 +204,7 @@ class BasicStorage(BaseStorage):
             StorageNotFoundError: If record not found
 
         """
-        oldrec = self._records.get(record.id)
-        if not oldrec:
-            raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self._records[record.id] = oldrec._replace(tags=dict(tags or {}))
+        self._replace_tags(self._get_stored(record.id), tags)
 
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
@@ -119,15 +220,13 @@ class BasicStorage(BaseStorage):
             StorageNotFoundError: If record not found
 
         """
-        oldrec = self._records.get(record.id)
-        if not oldrec:
-            raise StorageNotFoundError("Record not found: {}".format(record.id))
-        newtags = dict(oldrec.tags or {})
+        stored = self._get_stored(record.id)
+        newtags = self._to_record(stored).tags
         if tags:
             for tag in tags:
                 if tag in newtags:
                     del newtags[tag]
-        self._records[record.id] = oldrec._replace(tags=newtags)
+        self._replace_tags(stored, newtags)
 
     async def delete_record(self, record: StorageRecord):
         """
@@ -140,8 +239,12 @@ class BasicStorage(BaseStorage):
             StorageNotFoundError: If record not found
 
         """
-        if record.id not in self._records:
-            raise StorageNotFoundError("Record not found: {}".format(record.id))
+        stored = self._get_stored(record.id)
+        self._unindex_tags(stored)
+        type_ids = self._types[stored[_TYPE]]
+        del type_ids[record.id]
+        if not type_ids:
+            del self._types[stored[_TYPE]]
         del self._records[record.id]
 
     def search_records(
@@ -168,6 +271,91 @@ class BasicStorage(BaseStorage):
             self, type_filter, tag_query, page_size, options
         )
 
+    def plan_query(self, record_type: str, tag_query: Mapping) -> QueryPlan:
+        """
+        Find the candidate records for a tag query using the indexes.
+
+        Tag equality and `$in` clauses are resolved from the tag indexes, and
+        combined with `$and`, `$or` and `$not` by set operations. Other clauses
+        leave the candidates to be matched against the query.
+
+        Args:
+            record_type: The record type to search
+            tag_query: The tag query
+
+        Returns:
+            A tuple of the candidate record ids, or None for all records of the type,
+            and whether all the candidates are known to match the query
+
+        """
+        if not tag_query:
+            return (None, True)
+        if not isinstance(tag_query, dict):
+            return (None, False)
+        return self._intersect(
+            self._plan_clause(record_type, key, value)
+            for key, value in tag_query.items()
+        )
+
+    def _plan_clause(self, record_type: str, key: str, value) -> QueryPlan:
+        """Find the candidate records for a single tag query clause."""
+        if key in ("$and", "$or"):
+            if not isinstance(value, list):
+                return (None, False)
+            plans = (self.plan_query(record_type, clause) for clause in value)
+            return self._intersect(plans) if key == "$and" else self._union(plans)
+        if key == "$not":
+            if not isinstance(value, dict):
+                return (None, False)
+            (ids, exact) = self.plan_query(record_type, value)
+            if not exact:
+                return (None, False)
+            if ids is None:
+                return (set(), True)
+            return (set(self._types.get(record_type, ())).difference(ids), True)
+        if key.startswith("$"):
+            return (None, False)
+
+        index = self._tags.get((record_type, key), {})
+        if isinstance(value, str):
+            return (self._lookup(index, value), True)
+        if (
+            isinstance(value, dict)
+            and len(value) == 1
+            and isinstance(value.get("$in"), list)
+            and all(isinstance(option, str) for option in value["$in"])
+        ):
+            options = value["$in"]
+            return (set().union(*(self._lookup(index, opt) for opt in options)), True)
+        return (None, False)
+
+    @staticmethod
+    def _intersect(plans: Iterable[QueryPlan]) -> QueryPlan:
+        """Combine query plans for clauses which must all match."""
+        found = []
+        exact = True
+        for (ids, plan_exact) in plans:
+            exact = exact and plan_exact
+            if ids is not None:
+                found.append(ids)
+        if not found:
+            return (None, exact)
+        found.sort(key=len)
+        return (found[0].intersection(*found[1:]), exact)
+
+    @staticmethod
+    def _union(plans: Iterable[QueryPlan]) -> QueryPlan:
+        """Combine query plans for clauses of which any may match."""
+        plans = list(plans)
+        if any(ids is None for (ids, _) in plans):
+            # all records of the type are candidates, known to match if any
+            # clause matches all of them
+            return (None, any(ids is None and exact for (ids, exact) in plans))
+        return (
+            set().union(*(ids for (ids, _) in plans)),
+            all(exact for (_, exact) in plans),
+        )
+
 
 def basic_tag_value_match(value: str, match: dict) -> bool:
     """Match a single tag against a tag subquery.
@@ -199,7 +387,7 @@ def basic_tag_value_match(value: str, match: dict) -> bool:
             chk = float(value) <= float(cmp_val)
         # elif op == "$like":  NYI
         else:
-            raise StorageSearchError("Unsupported match operator: ".format(op))
+            raise StorageSearchError("Unsupported match operator: {}".format(op))
     return chk
 
 
@@ -218,6 +406,10 @@ def basic_tag_query_match(tags: dict, tag_query: dict) -> bool:
                     if basic_tag_query_match(tags, opt):
                         chk = True
                         break
+            elif k == "$and":
+                if not isinstance(v, list):
+                    raise StorageSearchError("Expected list for $and filter value")
+                chk = all(basic_tag_query_match(tags, opt) for opt in v)
             elif k == "$not":
                 if not isinstance(v, dict):
                     raise StorageSearchError("Expected dict for $not filter value")
@@ -262,6 +454,7 @@ class BasicStorageRecordSearch(BaseStorageRecordSearch):
         """
         super().__init__(store, type_filter, tag_query, page_size, options)
         self._cache = None
+        self._exact = False
         self._iter = None
 
     @property
@@ -292,24 +485,36 @@ class BasicStorageRecordSearch(BaseStorageRecordSearch):
         if not self.opened:
             raise StorageSearchError("Search query has not been opened")
         ret = []
-        check_type = self.type_filter
         i = max_count
         while i > 0:
             try:
-                id = next(self._iter)
+                stored = next(self._iter)
             except StopIteration:
                 break
-            record = self._cache[id]
-            if record.type == check_type and basic_tag_query_match(
-                record.tags, self.tag_query
-            ):
+            record = BasicStorage._to_record(stored)
+            if self._exact or basic_tag_query_match(record.tags, self.tag_query):
                 ret.append(record)
                 i -= 1
         return ret
 
     async def open(self):
         """Start the search query."""
-        self._cache = self._store._records.copy()
+        records = self._store._records
+        (ids, self._exact) = self._store.plan_query(self.type_filter, self.tag_query)
+        if ids is None:
+            ids = self._store._types.get(self.type_filter, ())
+        else:
+            ids = sorted(ids, key=lambda record_id: records[record_id][_SEQ])
+        from_id = self.option("fromId")
+        if from_id:
+            # resume a previous search at the given record, if still matched
+            ids = list(ids)
+            try:
+                start = ids.index(from_id)
+            except ValueError:
+                start = 0
+            ids = ids[start:]
+        self._cache = [records[record_id] for record_id in ids]
         self._iter = iter(self._cache)
 
     async def close(self):
@@ -126,6 +126,108 @@ class TestBasicStorage:
         with pytest.raises(StorageNotFoundError):
             await store.delete_record_tags(missing, {"a": "A"})
 
+    @pytest.mark.asyncio
+    async def test_retrieve_wrong_type(self, store):
+        record = test_record()
+        await store.add_record(record)
+        with pytest.raises(StorageNotFoundError):
+            await store.get_record("OTHER", record.id)
+
+    @pytest.mark.asyncio
+    async def test_search_indexed(self, store):
+        records = [
+            StorageRecord(
+                type="TYPE",
+                value=str(i),
+                tags={"a": str(i % 3), "b": str(i % 2), "z": str(i)},
+            )
+            for i in range(12)
+        ] + [StorageRecord(type="OTHER", value="x", tags={"a": "0", "b": "0"})]
+        for record in records:
+            await store.add_record(record)
+        await store.update_record_tags(records[0], {"a": "1", "b": "0"})
+        await store.delete_record_tags(records[1], ["a"])
+        await store.delete_record(records[2])
+        current = [
+            await store.get_record(record.type, record.id)
+            for record in records
+            if record is not records[2]
+        ]
+
+        async def search(tag_query):
+            found = await store.search_records("TYPE", tag_query).fetch_all()
+            expected = [
+                record.id
+                for record in current
+                if record.type == "TYPE"
+                and basic_tag_query_match(record.tags, tag_query)
+            ]
+            assert [record.id for record in found] == expected
+            return found
+
+        assert len(await search({})) == 11
+        assert len(await search({"a": "0"})) == 3
+        assert len(await search({"a": "1"})) == 4
+        assert len(await search({"a": {"$in": ["0", "2"]}})) == 6
+        assert len(await search({"a": "0", "b": "0"})) == 1
+        assert len(await search({"$and": [{"a": "1"}, {"b": "1"}]})) == 1
+        assert len(await search({"$or": [{"a": "0"}, {"b": "1"}]})) == 7
+        assert len(await search({"$or": [{"a": "0"}, {}]})) == 11
+        assert len(await search({"$or": []})) == 0
+        assert len(await search({"$not": {"a": "1"}})) == 7
+        assert len(await search({"$not": {}})) == 0
+        assert len(await search({"z": {"$gte": "6"}})) == 6
+        assert len(await search({"z": {"$gte": "6"}, "a": "0"})) == 2
+        assert len(await search({"$not": {"z": {"$lt": "6"}}})) == 7
+        assert len(await search({"$or": [{"a": "2"}, {"z": {"$lt": "2"}}]})) == 4
+        assert len(await search({"c": "0"})) == 0
+
+        with pytest.raises(StorageSearchError):
+            await search({"$or": {"a": "0"}})
+
+    @pytest.mark.asyncio
+    async def test_search_from_id(self, store):
+        records = [test_record({"a": str(i % 2)}) for i in range(6)]
+        for record in records:
+            await store.add_record(record)
+
+        async def search(tag_query, from_id):
+            found = await store.search_records(
+                "TYPE", tag_query, None, {"fromId": from_id}
+            ).fetch_all()
+            return [record.id for record in found]
+
+        assert await search({}, records[3].id) == [r.id for r in records[3:]]
+        assert await search({"a": "1"}, records[3].id) == [
+            records[3].id,
+            records[5].id,
+        ]
+        # a record not matched by the query is ignored
+        assert await search({"a": "1"}, records[2].id) == [
+            r.id for r in records[1::2]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_plan_query(self, store):
+        for i in range(4):
+            await store.add_record(test_record({"a": str(i % 2), "z": str(i)}))
+
+        assert store.plan_query("TYPE", None) == (None, True)
+        ids, exact = store.plan_query("TYPE", {"a": "0"})
+        assert len(ids) == 2 and exact
+        ids, exact = store.plan_query("TYPE", {"a": "0", "z": {"$neq": "0"}})
+        assert len(ids) == 2 and not exact
+        ids, exact = store.plan_query("TYPE", {"a": {"$in": ["0", "1"]}})
+        assert len(ids) == 4 and exact
+        assert store.plan_query("TYPE", {"a": {"$in": "0"}}) == (None, False)
+        assert store.plan_query("TYPE", {"$or": [{"a": "0"}, {"z": {"$gt": "1"}}]}) == (
+            None,
+            False,
+        )
+        assert store.plan_query("TYPE", {"$not": {"z": {"$gt": "1"}}}) == (None, False)
+        assert store.plan_query("TYPE", {"$near": {"z": "1"}}) == (None, False)
+        assert store.plan_query("TYPE", ["a"]) == (None, False)
+
     @pytest.mark.asyncio
     async def test_search(self, store):
         record = test_record()
@@ -247,6 +349,14 @@ class TestBasicStorage:
         )
         assert basic_tag_query_match(TAGS, {"$not": {"a": "alligator"}})
         assert basic_tag_query_match(TAGS, {"z": {"$gt": "-1"}})
+        assert basic_tag_query_match(TAGS, {"$and": [{"a": "aardvark"}, {"b": "bear"}]})
+        assert not basic_tag_query_match(
+            TAGS, {"$and": [{"a": "aardvark"}, {"b": "bison"}]}
+        )
+
+        with pytest.raises(StorageSearchError) as excinfo:
+            basic_tag_query_match(TAGS, {"$and": {"a": "aardvark"}})
+        assert "Expected list" in str(excinfo.value)
 
         with pytest.raises(StorageSearchError) as excinfo:
             basic_tag_query_match(TAGS, {"$or": "-1"})
@@ -46,6 +46,7 @@ class InboundTransportManager:
         self.session_limit: asyncio.Semaphore = None
         self.task_queue = TaskQueue()
         self.undelivered_queue: DeliveryQueue = None
+        self.worker_pool = None
 
     async def setup(self):
         """Perform setup operations."""
@@ -171,6 +172,7 @@ class InboundTransportManager:
             client_info=client_info,
             close_handler=self.closed_session,
             inbound_handler=self.receive_inbound,
+            remote_handler=self.worker_pool and self.worker_pool.receive,
             session_id=str(uuid.uuid4()),
             transport_type=transport_type,
             wire_format=wire_format,
@@ -178,6 +180,19 @@ class InboundTransportManager:
         self.sessions[session.session_id] = session
         return session
 
+    @property
+    def queue_stats(self) -> dict:
+        """Accessor for the current number of open sessions and queued messages."""
+        stats = {
+            "in_sessions": len(self.sessions),
+            "in_task_active": self.task_queue.current_active,
+        }
+        if self.undelivered_queue:
+            stats["in_undelivered"] = sum(
+                len(queued) for queued in self.undelivered_queue.queue_by_key.values()
+            )
+        return stats
+
     def dispatch_complete(self, message: InboundMessage, completed: CompletedTask):
         """Handle completion of message dispatch."""
         session: InboundSession = self.sessions.get(message.session_id)
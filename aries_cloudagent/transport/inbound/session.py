@@ -43,6 +43,7 @@ class InboundSession:
         can_respond: bool = False,
         client_info: dict = None,
         close_handler: Callable = None,
+        remote_handler: Callable = None,
         reply_mode: str = None,
         reply_thread_ids: Sequence[str] = None,
         reply_verkeys: Sequence[str] = None,
@@ -57,6 +58,7 @@ class InboundSession:
         self.accept_undelivered = accept_undelivered
         self.client_info = client_info
         self.close_handler = close_handler
+        self.remote_handler = remote_handler
         self.response_buffer: OutboundMessage = None
         self.response_event = asyncio.Event()
         self.transport_type = transport_type
@@ -176,6 +178,9 @@ class InboundSession:
 
     async def receive(self, payload_enc: Union[str, bytes]) -> InboundMessage:
         """Receive a new message payload and dispatch the message."""
+        if self.remote_handler:
+            # parsed and dispatched by an inbound worker process
+            return await self.remote_handler(self, payload_enc)
         message = await self.parse_inbound(payload_enc)
         self.receive_inbound(message)
         return message
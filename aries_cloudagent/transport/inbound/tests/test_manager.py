@@ -105,6 +105,18 @@ class TestInboundTransportManager(AsyncTestCase):
         session.close_handler(session)
         assert session.session_id not in mgr.sessions
 
+    async def test_create_session_worker_pool(self):
+        context = InjectionContext(enforce_typing=False)
+        context.injector.bind_instance(BaseWireFormat, async_mock.MagicMock())
+        mgr = InboundTransportManager(context, None)
+
+        session = await mgr.create_session("http")
+        assert session.remote_handler is None
+
+        mgr.worker_pool = async_mock.MagicMock(receive=async_mock.CoroutineMock())
+        session = await mgr.create_session("http")
+        assert session.remote_handler is mgr.worker_pool.receive
+
     async def test_return_to_session(self):
         context = InjectionContext()
         mgr = InboundTransportManager(context, None)
@@ -193,6 +205,19 @@ class TestInboundTransportManager(AsyncTestCase):
             mock_accept.assert_called_once_with(test_outbound)
         assert not mgr.undelivered_queue.has_message_for_key(test_verkey)
 
+    async def test_queue_stats(self):
+        context = InjectionContext()
+        mgr = InboundTransportManager(context, None)
+        await mgr.setup()
+        assert mgr.queue_stats == {"in_sessions": 0, "in_task_active": 0}
+
+        context.update_settings({"transport.enable_undelivered_queue": True})
+        await mgr.setup()
+        test_outbound = OutboundMessage(payload=None)
+        test_outbound.reply_to_verkey = "test-verkey"
+        mgr.return_undelivered(test_outbound)
+        assert mgr.queue_stats["in_undelivered"] == 1
+
     async def test_return_undelivered_false(self):
         context = InjectionContext()
         context.update_settings({"transport.enable_undelivered_queue": False})
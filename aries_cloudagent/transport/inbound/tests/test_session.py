@@ -120,6 +120,26 @@ class TestInboundSession(TestCase):
             receive.assert_called_once_with(encode.return_value)
             assert result is encode.return_value
 
+    async def test_receive_remote(self):
+        test_ctx = InjectionContext()
+        remote = async_mock.CoroutineMock()
+        sess = InboundSession(
+            context=test_ctx,
+            inbound_handler=None,
+            remote_handler=remote,
+            session_id=None,
+            wire_format=None,
+        )
+        test_msg = async_mock.MagicMock()
+
+        with async_mock.patch.object(
+            sess, "parse_inbound", async_mock.CoroutineMock()
+        ) as encode:
+            result = await sess.receive(test_msg)
+            encode.assert_not_awaited()
+            remote.assert_awaited_once_with(sess, test_msg)
+            assert result is remote.return_value
+
     def test_process_inbound(self):
         test_ctx = InjectionContext()
         test_session_id = "session-id"
@@ -18,6 +18,9 @@ class BaseOutboundTransport(ABC):
         """Initialize a `BaseOutboundTransport` instance."""
         self._collector = None
         self._wire_format = wire_format
+        # connection pool limits, for transports which maintain a pool
+        self.connection_limit: int = None
+        self.connection_limit_per_host: int = None
 
     @property
     def collector(self) -> Collector:
@@ -0,0 +1,137 @@
+"""Per-endpoint delivery state for the outbound transport manager."""
+
+from collections import deque
+from urllib.parse import urlparse
+
+
+def endpoint_key(endpoint: str) -> str:
+    """Get the key grouping deliveries to the same remote host."""
+    parsed = urlparse(endpoint or "")
+    if parsed.netloc:
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+    return endpoint or ""
+
+
+class EndpointState:
+    """
+    Delivery queue, concurrency accounting and circuit breaker for one endpoint.
+
+    The circuit is closed while deliveries succeed. After `failure_threshold`
+    consecutive failures it opens, and no deliveries are attempted until the
+    backoff period has passed. The circuit then becomes half-open and a single
+    delivery is attempted: success closes the circuit, while failure opens it
+    again with the backoff period doubled (up to `max_backoff`).
+    """
+
+    CIRCUIT_CLOSED = "closed"
+    CIRCUIT_OPEN = "open"
+    CIRCUIT_HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        key: str,
+        max_active: int = 10,
+        failure_threshold: int = 5,
+        backoff: float = 10.0,
+        max_backoff: float = 300.0,
+    ):
+        """
+        Initialize an `EndpointState` instance.
+
+        Args:
+            key: the endpoint key
+            max_active: the maximum number of concurrent deliveries
+            failure_threshold: consecutive failures before the circuit opens
+            backoff: initial number of seconds the circuit stays open
+            max_backoff: upper bound for the backoff period
+
+        """
+        self.key = key
+        self.max_active = max_active
+        self.failure_threshold = failure_threshold
+        self.initial_backoff = backoff
+        self.max_backoff = max_backoff
+        self.queue = deque()
+        self.scheduled = False
+        self.active = 0
+        self.circuit = self.CIRCUIT_CLOSED
+        self.backoff = backoff
+        self.open_until: float = None
+        self.consecutive_failures = 0
+        self.total_sent = 0
+        self.total_failed = 0
+        self.last_error: str = None
+        self.last_used = 0.0
+
+    def ready(self, now: float) -> bool:
+        """Check whether another delivery may be started to this endpoint."""
+        if self.circuit == self.CIRCUIT_OPEN:
+            if now < self.open_until:
+                return False
+            self.circuit = self.CIRCUIT_HALF_OPEN
+        if self.circuit == self.CIRCUIT_HALF_OPEN:
+            # a single probe delivery at a time
+            return not self.active
+        return self.active < self.max_active
+
+    @property
+    def parked(self) -> bool:
+        """Accessor for whether deliveries are suspended by the circuit breaker."""
+        return self.circuit == self.CIRCUIT_OPEN
+
+    def record_success(self):
+        """Record a successful delivery, closing the circuit."""
+        self.total_sent += 1
+        self.consecutive_failures = 0
+        self.circuit = self.CIRCUIT_CLOSED
+        self.backoff = self.initial_backoff
+        self.open_until = None
+
+    def record_failure(self, now: float, error: str = None):
+        """Record a failed delivery, opening the circuit if necessary."""
+        self.total_failed += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.circuit == self.CIRCUIT_HALF_OPEN:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        elif (
+            self.circuit == self.CIRCUIT_OPEN
+            or self.consecutive_failures < self.failure_threshold
+        ):
+            # already parked by an earlier failure, or still under the threshold
+            return
+        self.circuit = self.CIRCUIT_OPEN
+        self.open_until = now + self.backoff
+
+    @property
+    def idle(self) -> bool:
+        """Accessor for whether the endpoint has no queued or active deliveries."""
+        return not self.queue and not self.active
+
+    def expired(self, now: float, idle_timeout: float) -> bool:
+        """
+        Check whether the state of an unused endpoint may be discarded.
+
+        An endpoint expires once it has been idle for `idle_timeout` seconds, and
+        its circuit is closed or the backoff period of the open circuit has passed.
+        """
+        if not self.idle or now - self.last_used < idle_timeout:
+            return False
+        return self.circuit != self.CIRCUIT_OPEN or now >= self.open_until
+
+    def stats(self, now: float) -> dict:
+        """Get the current health statistics for the endpoint."""
+        return {
+            "circuit": self.circuit,
+            "active": self.active,
+            "queued": len(self.queue),
+            "sent": self.total_sent,
+            "failed": self.total_failed,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": (
+                round(max(self.open_until - now, 0), 3)
+                if self.circuit == self.CIRCUIT_OPEN
+                else None
+            ),
+            "last_error": self.last_error,
+        }
@@ -17,6 +17,9 @@ class HttpTransport(BaseOutboundTransport):
 
     schemes = ("http", "https")
 
+    DEFAULT_CONNECTION_LIMIT = 200
+    DEFAULT_CONNECTION_LIMIT_PER_HOST = 50
+
     def __init__(self) -> None:
         """Initialize an `HttpTransport` instance."""
         super().__init__()
@@ -27,7 +30,13 @@ class HttpTransport(BaseOutboundTransport):
     async def start(self):
         """Start the transport."""
         session_args = {}
-        self.connector = TCPConnector(limit=200, limit_per_host=50)
+        self.connector = TCPConnector(
+            limit=self.connection_limit or self.DEFAULT_CONNECTION_LIMIT,
+            limit_per_host=(
+                self.connection_limit_per_host
+                or self.DEFAULT_CONNECTION_LIMIT_PER_HOST
+            ),
+        )
         if self.collector:
             session_args["trace_configs"] = [
                 StatsTracer(self.collector, "outbound-http:")
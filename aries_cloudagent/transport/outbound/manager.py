@@ -1,10 +1,13 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
 import json
 import logging
 import time
 
+from collections import deque
+from itertools import count
 from typing import Callable, Type, Union
 from urllib.parse import urlparse
 
@@ -15,7 +18,9 @@ from ...utils.stats import Collector
 from ...utils.task_queue import CompletedTask, TaskQueue, task_exc_info
 
 from ...utils.tracing import trace_event, get_timer
+from ...wallet.util import b64_to_bytes, bytes_to_b64
 
+from ..queue.persistent import PersistentMessageQueue
 from ..wire_format import BaseWireFormat
 
 from .base import (
@@ -23,7 +28,9 @@ from .base import (
     OutboundDeliveryError,
     OutboundTransportRegistrationError,
 )
+from .endpoint import EndpointState, endpoint_key
 from .message import OutboundMessage
+from .webhook import WebhookBatcher
 
 LOGGER = logging.getLogger(__name__)
 MODULE_BASE_PATH = "aries_cloudagent.transport.outbound"
@@ -52,6 +59,7 @@ class QueuedOutboundMessage:
         self.error: Exception = None
         self.message = message
         self.payload: Union[str, bytes] = None
+        self.queue_id: str = None
         self.retries = None
         self.retry_at: float = None
         self.state = self.STATE_NEW
@@ -64,6 +72,14 @@ class OutboundTransportManager:
     """Outbound transport manager class."""
 
     MAX_RETRY_COUNT = 4
+    MAX_DELIVERING = 200
+    MAX_DELIVERING_PER_ENDPOINT = 20
+    ENDPOINT_FAILURE_THRESHOLD = 5
+    ENDPOINT_BACKOFF = 10.0
+    ENDPOINT_IDLE_TIMEOUT = 600.0
+    ENDPOINT_PRUNE_INTERVAL = 60.0
+    WEBHOOK_BATCH_DELAY = 0.1
+    WEBHOOK_CONCURRENCY = 10
 
     def __init__(
         self, context: InjectionContext, handle_not_delivered: Callable = None
@@ -79,9 +95,28 @@ class OutboundTransportManager:
         self.context = context
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
         self.outbound_event = asyncio.Event()
+        # newly enqueued messages, not yet examined by the process loop
         self.outbound_new = []
+        # delivery state per remote endpoint, holding messages awaiting delivery
+        self.endpoints = {}
+        # round-robin rotation of endpoints with messages awaiting delivery
+        self.endpoints_ready = deque()
+        self._prune_at = 0.0
+        # messages with encoding or delivery in progress
+        self.outbound_encoding = set()
+        self.outbound_delivering = set()
+        # min-heap of (retry_at, sequence, message) for failed deliveries
+        self.outbound_retry = []
+        # messages which reached the done state since the last loop iteration
+        self.outbound_done = []
+        self._retry_seq = count()
+        # durable log of messages awaiting delivery, if configured
+        self.persistent_queue: PersistentMessageQueue = None
+        # messages added to the persistent queue, awaiting the next sync
+        self.outbound_unsynced = []
+        self._restore = {}
+        self._sync_task: asyncio.Task = None
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
@@ -89,6 +124,36 @@ class OutboundTransportManager:
         self._process_task: asyncio.Task = None
         if self.context.settings.get("transport.max_outbound_retry"):
             self.MAX_RETRY_COUNT = self.context.settings["transport.max_outbound_retry"]
+        self.max_delivering = (
+            self.context.settings.get("transport.outbound_concurrency")
+            or self.MAX_DELIVERING
+        )
+        self.max_delivering_per_endpoint = (
+            self.context.settings.get("transport.outbound_endpoint_concurrency")
+            or self.MAX_DELIVERING_PER_ENDPOINT
+        )
+        self.endpoint_failure_threshold = (
+            self.context.settings.get("transport.outbound_failure_threshold")
+            or self.ENDPOINT_FAILURE_THRESHOLD
+        )
+        self.endpoint_backoff = (
+            self.context.settings.get("transport.outbound_backoff")
+            or self.ENDPOINT_BACKOFF
+        )
+        # batched delivery of webhooks on a separate queue, if configured
+        self.webhook_batcher: WebhookBatcher = None
+        batch_size = self.context.settings.get("admin.webhook_batch_size")
+        if batch_size:
+            self.webhook_batcher = WebhookBatcher(
+                self.deliver_webhook_batch,
+                max_size=batch_size,
+                max_delay=self.context.settings.get("admin.webhook_batch_delay")
+                or self.WEBHOOK_BATCH_DELAY,
+                coalesce=bool(self.context.settings.get("admin.webhook_coalesce")),
+                max_concurrent=self.context.settings.get("admin.webhook_concurrency")
+                or self.WEBHOOK_CONCURRENCY,
+                max_attempts=self.MAX_RETRY_COUNT + 1,
+            )
 
     async def setup(self):
         """Perform setup operations."""
@@ -97,6 +162,16 @@ class OutboundTransportManager:
         )
         for outbound_transport in outbound_transports:
             self.register(outbound_transport)
+        queue_path = self.context.settings.get("transport.outbound_queue_path")
+        if queue_path:
+            self.persistent_queue = PersistentMessageQueue(queue_path)
+            self.persistent_queue.open(requeue=False)
+            # recovered messages are restored once their transport is running
+            self._restore = dict(self.persistent_queue.pending)
+            if self._restore:
+                LOGGER.info(
+                    "Recovered %d undelivered outbound messages", len(self._restore)
+                )
 
     def register(self, module: str) -> str:
         """
@@ -171,8 +246,11 @@ class OutboundTransportManager:
         """Start a registered transport."""
         transport = self.registered_transports[transport_id]()
         transport.collector = await self.context.inject(Collector, required=False)
+        transport.connection_limit = self.max_delivering
+        transport.connection_limit_per_host = self.max_delivering_per_endpoint
         await transport.start()
         self.running_transports[transport_id] = transport
+        self.restore_queued(transport_id)
 
     async def start(self):
         """Start all transports and feed messages from the queue."""
@@ -183,10 +261,14 @@ class OutboundTransportManager:
         """Stop all running transports."""
         if self._process_task and not self._process_task.done():
             self._process_task.cancel()
+        if self.webhook_batcher:
+            await self.webhook_batcher.stop(wait)
         await self.task_queue.complete(None if wait else 0)
         for transport in self.running_transports.values():
             await transport.stop()
         self.running_transports = {}
+        if self.persistent_queue:
+            await self.persistent_queue.close()
 
     def get_registered_transport_for_scheme(self, scheme: str) -> str:
         """Find the registered transport ID for a given scheme."""
@@ -263,6 +345,9 @@ class OutboundTransportManager:
         """
         Add a webhook to the queue.
 
+        When batched webhooks are enabled, the webhook is passed to the webhook
+        batcher instead of the outbound message queue.
+
         Args:
             topic: The webhook topic
             payload: The webhook payload
@@ -274,6 +359,11 @@ class OutboundTransportManager:
 
         """
         transport_id = self.get_running_transport_for_endpoint(endpoint)
+        if self.webhook_batcher:
+            self.webhook_batcher.enqueue(
+                topic, payload, endpoint, transport_id, max_attempts
+            )
+            return
         queued = QueuedOutboundMessage(None, None, None, transport_id)
         queued.endpoint = f"{endpoint}/topic/{topic}/"
         queued.payload = json.dumps(payload)
@@ -282,6 +372,166 @@ class OutboundTransportManager:
         self.outbound_new.append(queued)
         self.process_queued()
 
+    async def deliver_webhook_batch(
+        self, transport_id: str, endpoint: str, payload: str
+    ):
+        """
+        Post a batch of webhook events.
+
+        Args:
+            transport_id: The running transport to post with
+            endpoint: The webhook endpoint
+            payload: The JSON list of webhook events
+
+        """
+        transport = self.get_transport_instance(transport_id)
+        await transport.handle_message(None, payload, f"{endpoint}/batch/")
+
+    @property
+    def queue_stats(self) -> dict:
+        """Accessor for the current depth of each outbound queue."""
+        stats = {
+            "out_new": len(self.outbound_new),
+            "out_encode": len(self.outbound_encoding),
+            "out_ready": sum(len(state.queue) for state in self.endpoints_ready),
+            "out_deliver": len(self.outbound_delivering),
+            "out_retry": len(self.outbound_retry),
+        }
+        if self.webhook_batcher:
+            stats["out_webhook"] = self.webhook_batcher.pending
+        return stats
+
+    @property
+    def has_queued(self) -> bool:
+        """Check whether any messages are waiting or in progress."""
+        return bool(
+            self.outbound_new
+            or self.endpoints_ready
+            or self.outbound_encoding
+            or self.outbound_delivering
+            or self.outbound_retry
+            or self.outbound_done
+            or self.outbound_unsynced
+            or self._sync_task
+        )
+
+    @property
+    def endpoint_stats(self) -> dict:
+        """Accessor for the delivery health statistics of each known endpoint."""
+        now = time.perf_counter()
+        return {key: state.stats(now) for key, state in self.endpoints.items()}
+
+    def get_endpoint_state(self, endpoint: str) -> EndpointState:
+        """Get or create the delivery state for an endpoint."""
+        key = endpoint_key(endpoint)
+        state = self.endpoints.get(key)
+        if not state:
+            state = EndpointState(
+                key,
+                max_active=self.max_delivering_per_endpoint,
+                failure_threshold=self.endpoint_failure_threshold,
+                backoff=self.endpoint_backoff,
+            )
+            self.endpoints[key] = state
+        state.last_used = time.perf_counter()
+        return state
+
+    def prune_endpoints(self, now: float):
+        """Discard the delivery state of endpoints which are no longer in use."""
+        if now < self._prune_at:
+            return
+        self._prune_at = now + self.ENDPOINT_PRUNE_INTERVAL
+        expired = [
+            key
+            for key, state in self.endpoints.items()
+            if not state.scheduled and state.expired(now, self.ENDPOINT_IDLE_TIMEOUT)
+        ]
+        for key in expired:
+            del self.endpoints[key]
+
+    def queue_ready(self, queued: QueuedOutboundMessage, first: bool = False):
+        """Add a message with an encoded payload to its endpoint's queue."""
+        if self.persistent_queue and not queued.queue_id:
+            # hold back delivery until the message has been written to disk
+            queued.queue_id = self.persistent_queue.put(self.persisted_entry(queued))
+            self.outbound_unsynced.append(queued)
+            return
+        state = self.get_endpoint_state(queued.endpoint)
+        if first:
+            state.queue.appendleft(queued)
+        else:
+            state.queue.append(queued)
+        if not state.scheduled:
+            state.scheduled = True
+            self.endpoints_ready.append(state)
+
+    @staticmethod
+    def persisted_entry(queued: QueuedOutboundMessage) -> dict:
+        """Get the persistent queue entry for a message ready for delivery."""
+        entry = {
+            "transport": queued.transport_id,
+            "endpoint": queued.endpoint,
+            "retries": queued.retries,
+        }
+        if isinstance(queued.payload, bytes):
+            entry["payload_b64"] = bytes_to_b64(queued.payload)
+        else:
+            entry["payload"] = queued.payload
+        return entry
+
+    def restore_queued(self, transport_id: str):
+        """Queue recovered messages for delivery by a transport which has started."""
+        restored = [
+            (queue_id, entry)
+            for (queue_id, entry) in self._restore.items()
+            if entry.get("transport") == transport_id
+        ]
+        for queue_id, entry in restored:
+            del self._restore[queue_id]
+            queued = QueuedOutboundMessage(None, None, None, transport_id)
+            queued.endpoint = entry["endpoint"]
+            if "payload_b64" in entry:
+                queued.payload = b64_to_bytes(entry["payload_b64"])
+            else:
+                queued.payload = entry["payload"]
+            queued.retries = entry["retries"]
+            queued.queue_id = queue_id
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.outbound_new.append(queued)
+        if restored:
+            self.process_queued()
+
+    def sync_persistent_queue(self):
+        """Start writing pending changes to the persistent queue, if necessary."""
+        if self._sync_task or not (
+            self.persistent_queue and self.persistent_queue.unsynced
+        ):
+            return
+        # messages added while this sync runs wait for the next one
+        synced = self.outbound_unsynced
+        self.outbound_unsynced = []
+        self._sync_task = self.task_queue.run(
+            self.persistent_queue.sync(),
+            lambda completed: self.finished_sync(synced, completed),
+        )
+
+    def finished_sync(self, synced: list, completed: CompletedTask):
+        """Handle completion of a persistent queue sync."""
+        self._sync_task = None
+        if completed.exc_info:
+            LOGGER.exception(
+                "Error writing to persistent outbound queue:",
+                exc_info=completed.exc_info,
+            )
+        for queued in synced:
+            self.queue_ready(queued)
+        self.process_queued()
+
+    def release_queued(self, queued: QueuedOutboundMessage):
+        """Remove a message which reached the done state from the persistent queue."""
+        if queued.queue_id and self.persistent_queue:
+            self.persistent_queue.ack(queued.queue_id)
+
     def process_queued(self) -> asyncio.Task:
         """
         Start the process to deliver queued messages if necessary.
@@ -291,7 +541,7 @@ class OutboundTransportManager:
         """
         if self._process_task and not self._process_task.done():
             self.outbound_event.set()
-        elif self.outbound_new or self.outbound_buffer:
+        elif self.has_queued:
             self._process_task = self.loop.create_task(self._process_loop())
             self._process_task.add_done_callback(lambda task: self._process_done(task))
         return self._process_task
@@ -307,70 +557,50 @@ class OutboundTransportManager:
             self._process_task = None
 
     async def _process_loop(self):
-        """Continually kick off encoding and delivery on outbound messages."""
+        """
+        Continually kick off encoding and delivery on outbound messages.
+
+        Each pass only examines messages whose state has changed since the last
+        pass: newly enqueued messages, completed messages, messages ready for
+        delivery and retries which have come due. Messages waiting on encoding,
+        delivery or a future retry are not visited.
+        """
         # Note: this method should not call async methods apart from
         # waiting for the updated event, to avoid yielding to other queue methods
 
         while True:
             self.outbound_event.clear()
-            loop_time = get_timer()
-            upd_buffer = []
-            retry_count = 0
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered:
-                            self.handle_not_delivered(queued.context, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
-                    else:
-                        retry_count += 1
 
-                if deliver:
-                    queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    p_time = trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.START."
-                        + queued.endpoint,
-                    )
-                    self.deliver_queued_message(queued)
-                    trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.END."
-                        + queued.endpoint,
-                        perf_counter=p_time,
+            done = self.outbound_done
+            self.outbound_done = []
+            for queued in done:
+                if queued.error:
+                    LOGGER.exception(
+                        "Outbound message could not be delivered to %s",
+                        queued.endpoint,
+                        exc_info=queued.error,
                     )
+                    if self.handle_not_delivered and queued.message:
+                        self.handle_not_delivered(queued.context, queued.message)
 
-                upd_buffer.append(queued)
+            loop_time = get_timer()
+            while self.outbound_retry and self.outbound_retry[0][0] <= loop_time:
+                queued = heapq.heappop(self.outbound_retry)[2]
+                queued.retry_at = None
+                queued.state = QueuedOutboundMessage.STATE_PENDING
+                self.queue_ready(queued)
 
-            new_pending = 0
             new_messages = self.outbound_new
             self.outbound_new = []
-
             for queued in new_messages:
                 if queued.state == QueuedOutboundMessage.STATE_NEW:
                     if queued.message and queued.message.enc_payload:
                         queued.payload = queued.message.enc_payload
                         queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
+                        self.queue_ready(queued)
                     else:
                         queued.state = QueuedOutboundMessage.STATE_ENCODE
+                        self.outbound_encoding.add(queued)
                         p_time = trace_event(
                             self.context.settings,
                             queued.message if queued.message else queued.payload,
@@ -384,20 +614,79 @@ class OutboundTransportManager:
                             perf_counter=p_time,
                         )
                 else:
-                    new_pending += 1
+                    self.queue_ready(queued)
 
-                upd_buffer.append(queued)
+            # write new messages and acknowledgements as a single batch
+            self.sync_persistent_queue()
+            self._dispatch_ready(loop_time)
+            self.prune_endpoints(loop_time)
 
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if (not new_pending) and (not retry_count):
-                    await self.outbound_event.wait()
-                elif retry_count:
-                    # only retries - yield here so we don't hog resources
-                    await asyncio.sleep(0.05)
+            if not self.has_queued:
+                break
+            if self.outbound_event.is_set():
+                continue
+            wake_at = self._next_wake_time()
+            if wake_at is not None:
+                # sleep until the next retry or endpoint probe is due,
+                # unless woken by a state change
+                timeout = max(wake_at - get_timer(), 0)
+                try:
+                    await asyncio.wait_for(self.outbound_event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
             else:
+                await self.outbound_event.wait()
+
+    def _dispatch_ready(self, now: float):
+        """
+        Start deliveries for queued messages, round-robin between endpoints.
+
+        Each endpoint with messages waiting is offered one delivery slot per turn,
+        so that a slow or busy endpoint cannot hold every slot. Endpoints which
+        are at their concurrency limit or parked by the circuit breaker keep
+        their place in the rotation.
+        """
+        rotation = self.endpoints_ready
+        while rotation:
+            started = False
+            for _ in range(len(rotation)):
+                if len(self.outbound_delivering) >= self.max_delivering:
+                    return
+                state = rotation.popleft()
+                if state.queue and state.ready(now):
+                    queued = state.queue.popleft()
+                    state.active += 1
+                    queued.state = QueuedOutboundMessage.STATE_DELIVER
+                    self.outbound_delivering.add(queued)
+                    p_time = trace_event(
+                        self.context.settings,
+                        queued.message if queued.message else queued.payload,
+                        outcome="OutboundTransportManager.DELIVER.START."
+                        + queued.endpoint,
+                    )
+                    self.deliver_queued_message(queued)
+                    trace_event(
+                        self.context.settings,
+                        queued.message if queued.message else queued.payload,
+                        outcome="OutboundTransportManager.DELIVER.END."
+                        + queued.endpoint,
+                        perf_counter=p_time,
+                    )
+                    started = True
+                if state.queue:
+                    rotation.append(state)
+                else:
+                    state.scheduled = False
+            if not started:
                 break
 
+    def _next_wake_time(self) -> float:
+        """Get the time of the next due retry or circuit breaker probe, if any."""
+        times = [state.open_until for state in self.endpoints_ready if state.parked]
+        if self.outbound_retry:
+            times.append(self.outbound_retry[0][0])
+        return min(times) if times else None
+
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
         queued.task = self.task_queue.run(
@@ -422,11 +711,14 @@ class OutboundTransportManager:
 
     def finished_encode(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message encoding."""
+        self.outbound_encoding.discard(queued)
         if completed.exc_info:
             queued.error = completed.exc_info
             queued.state = QueuedOutboundMessage.STATE_DONE
+            self.outbound_done.append(queued)
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.queue_ready(queued)
         queued.task = None
         self.process_queued()
 
@@ -441,8 +733,16 @@ class OutboundTransportManager:
 
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
+        self.outbound_delivering.discard(queued)
+        state = self.get_endpoint_state(queued.endpoint)
+        state.active -= 1
         if completed.exc_info:
             queued.error = completed.exc_info
+            exc_info = completed.exc_info
+            state.record_failure(
+                time.perf_counter(),
+                str(exc_info[1] if isinstance(exc_info, tuple) else exc_info),
+            )
 
             if queued.retries:
                 if LOGGER.isEnabledFor(logging.DEBUG):
@@ -466,17 +766,30 @@ class OutboundTransportManager:
                         queued.error,
                     )
                 queued.retries -= 1
-                queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
+                if state.parked:
+                    # wait for the endpoint to recover instead of retrying on a timer
+                    queued.state = QueuedOutboundMessage.STATE_PENDING
+                    self.queue_ready(queued, first=True)
+                else:
+                    queued.state = QueuedOutboundMessage.STATE_RETRY
+                    queued.retry_at = time.perf_counter() + 10
+                    heapq.heappush(
+                        self.outbound_retry,
+                        (queued.retry_at, next(self._retry_seq), queued),
+                    )
             else:
                 LOGGER.exception(
                     ">>> Outbound message failed to deliver, NOT Re-queued.",
                     exc_info=queued.error,
                 )
                 queued.state = QueuedOutboundMessage.STATE_DONE
+                self.outbound_done.append(queued)
+                self.release_queued(queued)
         else:
+            state.record_success()
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            self.release_queued(queued)
         queued.task = None
         self.process_queued()
 
@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from ..endpoint import EndpointState, endpoint_key
+
+
+class TestEndpointState(TestCase):
+    def test_endpoint_key(self):
+        assert endpoint_key("http://Host:8080/path?x=1") == "http://host:8080"
+        assert endpoint_key("ws://host/topic/a/") == "ws://host"
+        assert endpoint_key("no-scheme") == "no-scheme"
+        assert endpoint_key(None) == ""
+
+    def test_concurrency(self):
+        state = EndpointState("http://host", max_active=2)
+        assert state.ready(0)
+        state.active = 2
+        assert not state.ready(0)
+        assert not state.idle
+
+    def test_circuit_breaker(self):
+        state = EndpointState(
+            "http://host", failure_threshold=2, backoff=10, max_backoff=25
+        )
+        state.record_failure(0, "error")
+        assert state.circuit == EndpointState.CIRCUIT_CLOSED
+        state.record_failure(1, "error")
+        assert state.parked
+        assert state.open_until == 11
+        assert not state.ready(5)
+        assert state.stats(5)["retry_in"] == 6
+
+        # failures of deliveries already in progress do not extend the backoff
+        state.record_failure(2, "error")
+        assert state.open_until == 11
+
+        # a single probe delivery is allowed once the backoff has passed
+        assert state.ready(11)
+        assert state.circuit == EndpointState.CIRCUIT_HALF_OPEN
+        state.active = 1
+        assert not state.ready(11)
+        state.active = 0
+        state.record_failure(12, "error")
+        assert state.open_until == 32
+        assert state.ready(32)
+        state.record_failure(33, "error")
+        assert state.open_until == 33 + 25
+
+        state.record_success()
+        assert state.circuit == EndpointState.CIRCUIT_CLOSED
+        assert state.backoff == 10
+        stats = state.stats(60)
+        assert stats["sent"] == 1
+        assert stats["failed"] == 5
+        assert stats["consecutive_failures"] == 0
+        assert stats["last_error"] == "error"
+        assert stats["retry_in"] is None
+
+    def test_expired(self):
+        state = EndpointState("http://host", failure_threshold=1, backoff=10)
+        state.last_used = 100
+        assert not state.expired(150, 60)
+        assert state.expired(160, 60)
+        state.active = 1
+        assert not state.expired(160, 60)
+        state.active = 0
+
+        # the failure history is kept while the circuit is open
+        state.record_failure(150, "error")
+        assert state.parked
+        assert not state.expired(159, 0)
+        assert state.expired(160, 0)
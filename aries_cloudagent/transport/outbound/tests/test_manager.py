@@ -1,5 +1,8 @@
 import asyncio
 import json
+import os
+
+from tempfile import TemporaryDirectory
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
@@ -160,6 +163,48 @@ class TestOutboundTransportManager(AsyncTestCase):
             assert queued.retries == test_attempts - 1
             assert queued.state == QueuedOutboundMessage.STATE_PENDING
 
+    async def test_enqueue_webhook_batched(self):
+        context = InjectionContext()
+        context.update_settings(
+            {"admin.webhook_batch_size": 2, "admin.webhook_concurrency": 3}
+        )
+        mgr = OutboundTransportManager(context)
+        assert mgr.webhook_batcher.max_size == 2
+        assert mgr.webhook_batcher.max_delay == mgr.WEBHOOK_BATCH_DELAY
+        assert mgr.webhook_batcher.task_queue.max_active == 3
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport_cls.return_value = async_mock.MagicMock()
+        transport_cls.return_value.schemes = ["http"]
+        transport_cls.return_value.start = async_mock.CoroutineMock()
+        transport_cls.return_value.stop = async_mock.CoroutineMock()
+        transport_cls.return_value.handle_message = async_mock.CoroutineMock()
+        tid = mgr.register_class(transport_cls, "transport_cls")
+        await mgr.start_transport(tid)
+
+        mgr.enqueue_webhook("topic", {"test": 1}, "http://example")
+        mgr.enqueue_webhook("topic", {"test": 2}, "http://example")
+        mgr.enqueue_webhook("topic", {"test": 3}, "http://example")
+        assert not mgr.outbound_new
+        await asyncio.sleep(0)
+        transport_cls.return_value.handle_message.assert_awaited_once_with(
+            None,
+            json.dumps(
+                [
+                    {"topic": "topic", "payload": {"test": 1}},
+                    {"topic": "topic", "payload": {"test": 2}},
+                ]
+            ),
+            "http://example/batch/",
+        )
+        assert mgr.queue_stats["out_webhook"] == 1
+
+        # waiting events are sent on shutdown
+        await mgr.stop()
+        assert transport_cls.return_value.handle_message.await_count == 2
+        assert mgr.webhook_batcher.stats["batches"] == 2
+
     async def test_process_done_x(self):
         mock_task = async_mock.MagicMock(
             done=async_mock.MagicMock(return_value=True),
@@ -175,7 +220,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr._process_done(mock_task)
 
     async def test_process_finished_x(self):
-        mock_queued = async_mock.MagicMock(retries=1)
+        mock_queued = async_mock.MagicMock(retries=1, endpoint="http://localhost")
         mock_task = async_mock.MagicMock(
             exc_info=(KeyError, KeyError("nope"), None),
         )
@@ -186,19 +231,24 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr, "process_queued", async_mock.MagicMock()
         ) as mock_mgr_process:
             mgr.finished_encode(mock_queued, mock_task)
+            assert mgr.outbound_done == [mock_queued]
             mgr.finished_deliver(mock_queued, mock_task)
+            assert mgr.outbound_retry[0][2] is mock_queued
+            assert mgr.queue_stats["out_retry"] == 1
             mgr.finished_deliver(mock_queued, mock_task)
+            assert mgr.outbound_done == [mock_queued, mock_queued]
 
     async def test_process_loop_retry_now(self):
         mock_queued = async_mock.MagicMock(
             state=QueuedOutboundMessage.STATE_RETRY,
             retry_at=test_module.get_timer() - 1,
+            endpoint="http://localhost",
         )
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_retry.append((mock_queued.retry_at, 0, mock_queued))
 
         with async_mock.patch.object(
             test_module, "trace_event", async_mock.MagicMock()
@@ -217,15 +267,41 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_retry.append((mock_queued.retry_at, 0, mock_queued))
 
         with async_mock.patch.object(
-            test_module.asyncio, "sleep", async_mock.CoroutineMock()
-        ) as mock_sleep_x:
-            mock_sleep_x.side_effect = KeyError()
+            test_module.asyncio, "wait_for", async_mock.CoroutineMock()
+        ) as mock_wait_for_x:
+            mock_wait_for_x.side_effect = KeyError()
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is not None
+            assert 3590 < mock_wait_for_x.call_args[0][1] <= 3600
+            mock_wait_for_x.call_args[0][0].close()
+
+    async def test_process_loop_retry_wait(self):
+        mock_queued = async_mock.MagicMock(
+            state=QueuedOutboundMessage.STATE_RETRY,
+            retry_at=test_module.get_timer() + 0.01,
+            message=None,
+            payload="payload",
+            endpoint="http://localhost",
+        )
+
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        mgr.outbound_retry.append((mock_queued.retry_at, 0, mock_queued))
+
+        with async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver:
+            mock_deliver.side_effect = lambda queued: mgr.outbound_delivering.discard(
+                queued
+            )
+            await asyncio.wait_for(mgr._process_loop(), 1)
+            mock_deliver.assert_called_once_with(mock_queued)
+            assert mock_queued.retry_at is None
+            assert not mgr.has_queued
 
     async def test_process_loop_new(self):
         context = InjectionContext()
@@ -236,6 +312,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             async_mock.MagicMock(
                 state=test_module.QueuedOutboundMessage.STATE_NEW,
                 message=async_mock.MagicMock(enc_payload=b"encr"),
+                endpoint="http://localhost",
             )
         ]
         with async_mock.patch.object(
@@ -259,6 +336,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             async_mock.MagicMock(
                 state=test_module.QueuedOutboundMessage.STATE_DELIVER,
                 message=async_mock.MagicMock(enc_payload=b"encr"),
+                endpoint="http://localhost",
             )
         ]
         with async_mock.patch.object(
@@ -284,20 +362,26 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_done.append(mock_queued)
 
         await mgr._process_loop()
+        mock_handle_not_delivered.assert_called_once_with(
+            mock_queued.context, mock_queued.message
+        )
+        assert not mgr.has_queued
 
     async def test_finished_deliver_x_log_debug(self):
         mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_DONE, retries=1
+            state=QueuedOutboundMessage.STATE_DONE,
+            retries=1,
+            endpoint="http://localhost",
         )
         mock_completed_x = async_mock.MagicMock(exc_info=KeyError("an error occurred"))
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_delivering.add(mock_queued)
         with async_mock.patch.object(
             test_module.LOGGER, "exception", async_mock.MagicMock()
         ) as mock_logger_exception, async_mock.patch.object(
@@ -309,3 +393,143 @@ class TestOutboundTransportManager(AsyncTestCase):
         ) as mock_process:
             mock_logger_enabled.return_value = True  # cover debug logging
             mgr.finished_deliver(mock_queued, mock_completed_x)
+
+    async def test_dispatch_round_robin(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.outbound_concurrency": 4,
+                "transport.outbound_endpoint_concurrency": 2,
+            }
+        )
+        mgr = OutboundTransportManager(context)
+        for endpoint in ["http://slow/"] * 5 + ["http://fast/a", "http://fast/b"]:
+            mgr.queue_ready(
+                async_mock.MagicMock(endpoint=endpoint, message=None, payload="x")
+            )
+
+        with async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver:
+            mgr._dispatch_ready(test_module.get_timer())
+            delivered = [call[0][0].endpoint for call in mock_deliver.call_args_list]
+            assert delivered == [
+                "http://slow/",
+                "http://fast/a",
+                "http://slow/",
+                "http://fast/b",
+            ]
+            assert mgr.endpoints["http://slow"].active == 2
+            assert mgr.queue_stats["out_ready"] == 3
+
+            # the slow endpoint stays at its limit when global slots free up
+            mgr.outbound_delivering.clear()
+            mock_deliver.reset_mock()
+            mgr._dispatch_ready(test_module.get_timer())
+            mock_deliver.assert_not_called()
+            assert [state.key for state in mgr.endpoints_ready] == ["http://slow"]
+
+    async def test_finished_deliver_circuit_open(self):
+        context = InjectionContext()
+        context.update_settings({"transport.outbound_failure_threshold": 1})
+        mgr = OutboundTransportManager(context)
+        mock_queued = async_mock.MagicMock(endpoint="http://down/", retries=2)
+        mock_completed_x = async_mock.MagicMock(
+            exc_info=(KeyError, KeyError("refused"), None)
+        )
+        state = mgr.get_endpoint_state(mock_queued.endpoint)
+        state.active = 1
+
+        with async_mock.patch.object(
+            mgr, "process_queued", async_mock.MagicMock()
+        ), async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver:
+            mgr.finished_deliver(mock_queued, mock_completed_x)
+            # parked with the endpoint rather than scheduled for its own retry
+            assert not mgr.outbound_retry
+            assert list(state.queue) == [mock_queued]
+            assert mock_queued.retries == 1
+            assert mgr._next_wake_time() == state.open_until
+
+            mgr._dispatch_ready(test_module.get_timer())
+            mock_deliver.assert_not_called()
+
+            mgr._dispatch_ready(state.open_until)
+            mock_deliver.assert_called_once_with(mock_queued)
+            assert state.circuit == state.CIRCUIT_HALF_OPEN
+
+            mgr.finished_deliver(mock_queued, async_mock.MagicMock(exc_info=None))
+            stats = mgr.endpoint_stats["http://down"]
+            assert stats["circuit"] == state.CIRCUIT_CLOSED
+            assert stats["sent"] == 1
+            assert stats["failed"] == 1
+            assert stats["last_error"] == "'refused'"
+
+    async def test_prune_endpoints(self):
+        mgr = OutboundTransportManager(InjectionContext())
+        idle = mgr.get_endpoint_state("http://idle/")
+        busy = mgr.get_endpoint_state("http://busy/")
+        busy.active = 1
+        now = idle.last_used + mgr.ENDPOINT_IDLE_TIMEOUT
+
+        mgr.prune_endpoints(now)
+        assert set(mgr.endpoints) == {"http://busy"}
+
+        # pruning runs at most once per interval
+        busy.active = 0
+        mgr.prune_endpoints(now + 1)
+        assert set(mgr.endpoints) == {"http://busy"}
+        mgr.prune_endpoints(now + mgr.ENDPOINT_PRUNE_INTERVAL)
+        assert not mgr.endpoints
+        assert not mgr.endpoint_stats
+
+    async def test_persistent_queue_restore(self):
+        with TemporaryDirectory() as temp_dir:
+            context = InjectionContext()
+            context.update_settings(
+                {"transport.outbound_queue_path": os.path.join(temp_dir, "out.log")}
+            )
+
+            transport_cls = async_mock.MagicMock()
+            transport_cls.schemes = ["http"]
+            transport_cls.return_value = async_mock.MagicMock()
+            transport_cls.return_value.schemes = ["http"]
+            transport_cls.return_value.start = async_mock.CoroutineMock()
+            transport_cls.return_value.stop = async_mock.CoroutineMock()
+            transport_cls.return_value.handle_message = async_mock.CoroutineMock(
+                side_effect=OutboundDeliveryError()
+            )
+
+            mgr = OutboundTransportManager(context)
+            await mgr.setup()
+            tid = mgr.register_class(transport_cls, "transport_cls")
+            await mgr.start_transport(tid)
+            mgr.enqueue_webhook("topic", {"test": "payload"}, "http://example")
+            mgr.enqueue_webhook("topic", {"test": "delivered"}, "http://other")
+            transport_cls.return_value.handle_message.side_effect = [
+                OutboundDeliveryError(),
+                None,
+            ]
+            with async_mock.patch.object(test_module.asyncio, "wait_for") as wait:
+                # stop processing when the failed message waits for a retry
+                wait.side_effect = asyncio.CancelledError()
+                with self.assertRaises(asyncio.CancelledError):
+                    await mgr.process_queued()
+            assert transport_cls.return_value.handle_message.call_count == 2
+            await mgr.stop()
+
+            # the undelivered webhook is delivered again after a restart
+            transport_cls.return_value.handle_message.reset_mock(side_effect=True)
+            mgr = OutboundTransportManager(context)
+            await mgr.setup()
+            tid = mgr.register_class(transport_cls, "transport_cls")
+            await mgr.start_transport(tid)
+            await mgr.flush()
+            transport_cls.return_value.handle_message.assert_called_once()
+            assert transport_cls.return_value.handle_message.call_args[0][1:] == (
+                json.dumps({"test": "payload"}),
+                "http://example/topic/topic/",
+            )
+            await mgr.stop()
+            assert not mgr.persistent_queue.pending
@@ -0,0 +1,175 @@
+import asyncio
+import json
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from .. import webhook as test_module
+from ..webhook import WebhookBatcher
+
+
+class TestWebhookBatcher(AsyncTestCase):
+    def setUp(self):
+        self.posted = []
+
+        async def deliver(transport_id, endpoint, payload):
+            self.posted.append((endpoint, json.loads(payload)))
+
+        self.deliver = async_mock.CoroutineMock(side_effect=deliver)
+
+    def make_batcher(self, **kwargs):
+        args = {"max_size": 3, "max_delay": 0.05, "retry_delay": 0.001}
+        args.update(kwargs)
+        return WebhookBatcher(self.deliver, **args)
+
+    def events(self, endpoint: str = "http://example"):
+        return [
+            [(event["topic"], event["payload"]) for event in batch]
+            for (target, batch) in self.posted
+            if target == endpoint
+        ]
+
+    async def test_batch_size(self):
+        batcher = self.make_batcher()
+        for i in range(7):
+            batcher.enqueue("topic", {"i": i}, "http://example", "http")
+        await asyncio.sleep(0.01)
+        # only one batch in flight at a time for each target
+        assert self.events() == [
+            [("topic", {"i": 0}), ("topic", {"i": 1}), ("topic", {"i": 2})],
+            [("topic", {"i": 3}), ("topic", {"i": 4}), ("topic", {"i": 5})],
+        ]
+        assert batcher.pending == 1
+        self.deliver.assert_awaited_with("http", "http://example", async_mock.ANY)
+
+        await asyncio.sleep(0.1)
+        assert self.events()[2] == [("topic", {"i": 6})]
+        assert batcher.stats == {
+            "pending": 0,
+            "events": 7,
+            "coalesced": 0,
+            "batches": 3,
+            "failed": 0,
+        }
+
+    async def test_batch_delay(self):
+        batcher = self.make_batcher()
+        batcher.enqueue("topic", {"i": 0}, "http://example", "http")
+        batcher.enqueue("topic", {"i": 0}, "http://other", "http")
+        await asyncio.sleep(0.01)
+        assert not self.posted
+        batcher.enqueue("topic", {"i": 1}, "http://example", "http")
+        await asyncio.sleep(0.1)
+        assert self.events() == [[("topic", {"i": 0}), ("topic", {"i": 1})]]
+        assert self.events("http://other") == [[("topic", {"i": 0})]]
+
+    async def test_coalesce(self):
+        batcher = self.make_batcher(max_size=10, coalesce=True)
+        updates = [
+            ("connections", {"connection_id": "a", "state": "request"}),
+            ("connections", {"connection_id": "b", "state": "request"}),
+            ("basicmessages", {"connection_id": "a", "content": "hello"}),
+            ("connections", {"connection_id": "a", "state": "response"}),
+            ("connections", {"connection_id": "a", "state": "active"}),
+            ("connections", {"connection_id": "b"}),
+        ]
+        for topic, payload in updates:
+            batcher.enqueue(topic, payload, "http://example", "http")
+        await batcher.flush()
+        # the latest state for "a" follows every event received before it
+        assert self.events() == [[updates[1], updates[2], updates[4], updates[5]]]
+        assert batcher.stats["coalesced"] == 2
+
+    async def test_coalesce_in_flight(self):
+        batcher = self.make_batcher(max_size=1, coalesce=True)
+        first = {"connection_id": "a", "state": "request"}
+        batcher.enqueue("connections", first, "http://example", "http")
+        batcher.enqueue(
+            "connections",
+            {"connection_id": "a", "state": "response"},
+            "http://example",
+            "http",
+        )
+        last = {"connection_id": "a", "state": "active"}
+        batcher.enqueue("connections", last, "http://example", "http")
+        await batcher.flush()
+        # an update already being sent is not replaced
+        assert self.events() == [[("connections", first)], [("connections", last)]]
+        assert batcher.stats["coalesced"] == 1
+
+    async def test_retry(self):
+        self.deliver.side_effect = [ValueError("down"), ValueError("down"), None]
+        batcher = self.make_batcher(max_attempts=3)
+        batcher.enqueue("topic", {"i": 0}, "http://example", "http")
+        with async_mock.patch.object(
+            test_module.LOGGER, "warning", async_mock.MagicMock()
+        ) as mock_warn:
+            await batcher.flush()
+            assert mock_warn.call_count == 2
+        assert self.deliver.await_count == 3
+        assert batcher.stats["batches"] == 1
+
+    async def test_retry_order(self):
+        attempts = []
+
+        async def deliver(transport_id, endpoint, payload):
+            attempts.append(json.loads(payload))
+            if len(attempts) < 3:
+                raise ValueError("down")
+
+        self.deliver.side_effect = deliver
+        batcher = self.make_batcher(max_size=1)
+        with async_mock.patch.object(test_module.LOGGER, "warning"):
+            batcher.enqueue("topic", {"i": 0}, "http://example", "http")
+            batcher.enqueue("topic", {"i": 1}, "http://example", "http")
+            await batcher.flush()
+        assert [batch[0]["payload"]["i"] for batch in attempts] == [0, 0, 0, 1]
+
+    async def test_failed(self):
+        self.deliver.side_effect = ValueError("down")
+        batcher = self.make_batcher()
+        batcher.enqueue("topic", {"i": 0}, "http://example", "http", max_attempts=2)
+        with async_mock.patch.object(
+            test_module.LOGGER, "warning", async_mock.MagicMock()
+        ), async_mock.patch.object(
+            test_module.LOGGER, "exception", async_mock.MagicMock()
+        ) as mock_log_exc:
+            await batcher.flush()
+            mock_log_exc.assert_called_once()
+        assert self.deliver.await_count == 2
+        assert batcher.stats["failed"] == 1
+        assert batcher.stats["batches"] == 0
+
+    async def test_concurrency(self):
+        in_flight = []
+        most_in_flight = 0
+
+        async def deliver(transport_id, endpoint, payload):
+            nonlocal most_in_flight
+            in_flight.append(endpoint)
+            most_in_flight = max(most_in_flight, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(endpoint)
+
+        self.deliver.side_effect = deliver
+        batcher = self.make_batcher(max_concurrent=2)
+        for i in range(5):
+            batcher.enqueue("topic", {"i": i}, f"http://example{i}", "http")
+        await batcher.flush()
+        assert self.deliver.await_count == 5
+        assert most_in_flight == 2
+
+    async def test_stop(self):
+        batcher = self.make_batcher()
+        batcher.enqueue("topic", {"i": 0}, "http://example", "http")
+        await batcher.stop()
+        assert self.events() == [[("topic", {"i": 0})]]
+
+        batcher = self.make_batcher()
+        batcher.enqueue("topic", {"i": 0}, "http://example", "http")
+        with async_mock.patch.object(
+            test_module.LOGGER, "warning", async_mock.MagicMock()
+        ) as mock_warn:
+            await batcher.stop(wait=False)
+            mock_warn.assert_called_once()
+        await asyncio.sleep(0.1)
+        assert len(self.posted) == 1
@@ -0,0 +1,283 @@
+"""Batched delivery of webhooks to admin webhook targets."""
+
+import asyncio
+import json
+import logging
+
+from collections import OrderedDict
+from itertools import count
+from typing import Awaitable, Callable
+
+from ...utils.task_queue import CompletedTask, TaskQueue
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WebhookTargetQueue:
+    """Events waiting to be sent to one webhook target, in the order received."""
+
+    def __init__(self, endpoint: str, transport_id: str, max_attempts: int):
+        """
+        Initialize a `WebhookTargetQueue` instance.
+
+        Args:
+            endpoint: the webhook target endpoint
+            transport_id: the running transport used to post to the endpoint
+            max_attempts: the maximum number of attempts to deliver each batch
+
+        """
+        self.endpoint = endpoint
+        self.transport_id = transport_id
+        self.max_attempts = max_attempts
+        # (topic, payload) by record key, or by sequence number for events
+        # which are not coalesced
+        self.events = OrderedDict()
+        # loop time at which the oldest waiting event was received
+        self.opened_at: float = None
+        self.timer: asyncio.TimerHandle = None
+        self.sending = False
+
+    def cancel_timer(self):
+        """Cancel the pending batch window timer, if any."""
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+
+class WebhookBatcher:
+    """
+    Group webhook events for each target into JSON array posts.
+
+    Events for a target are collected until `max_size` events are waiting or
+    the oldest has waited `max_delay` seconds, then posted together as a list
+    of `{"topic": ..., "payload": ...}` objects. Each target has at most one
+    batch in flight, and failed batches are retried before later events are
+    sent, so the events for a target are delivered in the order received.
+    Batches for different targets are sent concurrently, up to `max_concurrent`
+    at a time, separately from the DIDComm outbound queue.
+
+    When `coalesce` is set, a state update for a record replaces any update for
+    the same record which is still waiting to be sent. The newer update takes
+    the place of the latest event, so it is never delivered ahead of events
+    which were received before it.
+    """
+
+    # the payload field identifying the record for each coalesced topic
+    RECORD_ID_FIELDS = {
+        "connections": "connection_id",
+        "issue_credential": "credential_exchange_id",
+        "present_proof": "presentation_exchange_id",
+        "oob-invitation": "invitation_id",
+        "issuer_cred_rev": "record_id",
+        "revocation_registry": "record_id",
+    }
+
+    def __init__(
+        self,
+        deliver: Callable[[str, str, str], Awaitable],
+        *,
+        max_size: int = 100,
+        max_delay: float = 0.1,
+        coalesce: bool = False,
+        max_concurrent: int = 10,
+        max_attempts: int = 5,
+        retry_delay: float = 1.0,
+    ):
+        """
+        Initialize a `WebhookBatcher` instance.
+
+        Args:
+            deliver: coroutine function posting a serialized batch, given the
+                transport ID, target endpoint and payload
+            max_size: the maximum number of events in a batch
+            max_delay: the maximum number of seconds an event waits for a batch
+            coalesce: merge waiting state updates for the same record
+            max_concurrent: the maximum number of batches in flight
+            max_attempts: the default maximum number of attempts for a batch
+            retry_delay: seconds before the first retry, doubling for each retry
+
+        """
+        self.deliver = deliver
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.coalesce = coalesce
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.targets = {}
+        self.task_queue = TaskQueue(max_active=max_concurrent)
+        self._seq = count()
+        self.total_events = 0
+        self.total_coalesced = 0
+        self.total_batches = 0
+        self.total_failed = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Accessor for the event loop."""
+        return self.task_queue.loop
+
+    @property
+    def pending(self) -> int:
+        """Accessor for the number of events waiting to be sent."""
+        return sum(len(target.events) for target in self.targets.values())
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the batching statistics."""
+        return {
+            "pending": self.pending,
+            "events": self.total_events,
+            "coalesced": self.total_coalesced,
+            "batches": self.total_batches,
+            "failed": self.total_failed,
+        }
+
+    def record_key(self, topic: str, payload: dict):
+        """Get the key for coalescing state updates to a record, if any."""
+        id_field = self.RECORD_ID_FIELDS.get(topic)
+        if id_field and isinstance(payload, dict) and "state" in payload:
+            record_id = payload.get(id_field)
+            if record_id:
+                return (topic, record_id)
+        return None
+
+    def enqueue(
+        self,
+        topic: str,
+        payload: dict,
+        endpoint: str,
+        transport_id: str,
+        max_attempts: int = None,
+    ):
+        """
+        Add a webhook event to the batch for a target.
+
+        The payload is serialized when the batch is sent, so it should not be
+        modified after it has been enqueued.
+
+        Args:
+            topic: the webhook topic
+            payload: the webhook payload
+            endpoint: the webhook target endpoint
+            transport_id: the running transport used to post to the endpoint
+            max_attempts: override the maximum number of attempts
+
+        """
+        attempts = max_attempts or self.max_attempts
+        target = self.targets.get(endpoint)
+        if not target:
+            target = WebhookTargetQueue(endpoint, transport_id, attempts)
+            self.targets[endpoint] = target
+        else:
+            target.transport_id = transport_id
+            target.max_attempts = attempts
+
+        self.total_events += 1
+        key = self.coalesce and self.record_key(topic, payload)
+        if key:
+            if target.events.pop(key, None):
+                self.total_coalesced += 1
+        else:
+            key = next(self._seq)
+        target.events[key] = (topic, payload)
+        if target.opened_at is None:
+            target.opened_at = self.loop.time()
+        self._schedule(target)
+
+    def _schedule(self, target: WebhookTargetQueue, force: bool = False):
+        """Send the next batch for a target if it is due, or set a timer."""
+        if target.sending or not target.events:
+            return
+        waited = self.loop.time() - target.opened_at
+        if force or len(target.events) >= self.max_size or waited >= self.max_delay:
+            self._send_batch(target)
+        elif not target.timer:
+            target.timer = self.loop.call_later(
+                self.max_delay - waited, self._window_closed, target
+            )
+
+    def _window_closed(self, target: WebhookTargetQueue):
+        """Handle expiry of the batch window for a target."""
+        target.timer = None
+        self._schedule(target, force=True)
+
+    def _send_batch(self, target: WebhookTargetQueue):
+        """Start delivery of the oldest waiting events for a target."""
+        target.cancel_timer()
+        events = target.events
+        batch = [
+            events.popitem(last=False)[1]
+            for _ in range(min(len(events), self.max_size))
+        ]
+        # the window for any events left behind starts with this batch
+        target.opened_at = self.loop.time() if events else None
+        target.sending = True
+        self.task_queue.put(
+            self._deliver_batch(target, batch),
+            lambda completed: self._finished_batch(target, completed),
+        )
+
+    async def _deliver_batch(self, target: WebhookTargetQueue, batch: list):
+        """Post a batch of events to a target, retrying on failure."""
+        payload = json.dumps(
+            [{"topic": topic, "payload": payload} for (topic, payload) in batch]
+        )
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await self.deliver(target.transport_id, target.endpoint, payload)
+                break
+            except Exception as err:
+                if attempt >= target.max_attempts:
+                    raise
+                LOGGER.warning(
+                    "Error posting %d webhook events to %s (attempt %d): %s",
+                    len(batch),
+                    target.endpoint,
+                    attempt,
+                    err,
+                )
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    def _finished_batch(self, target: WebhookTargetQueue, completed: CompletedTask):
+        """Handle completion of a batch and schedule the next one."""
+        target.sending = False
+        if completed.exc_info:
+            self.total_failed += 1
+            LOGGER.exception(
+                "Webhook batch could not be delivered to %s",
+                target.endpoint,
+                exc_info=completed.exc_info,
+            )
+        else:
+            self.total_batches += 1
+        if not self.task_queue.cancelled:
+            self._schedule(target)
+
+    async def flush(self):
+        """Send all waiting events and wait for the deliveries to complete."""
+        while True:
+            for target in self.targets.values():
+                self._schedule(target, force=True)
+            if not self.task_queue.current_size:
+                break
+            await self.task_queue.flush()
+
+    async def stop(self, wait: bool = True):
+        """
+        Stop delivering webhooks.
+
+        Args:
+            wait: send any waiting events before stopping, otherwise discard them
+
+        """
+        for target in self.targets.values():
+            target.cancel_timer()
+        if wait:
+            await self.flush()
+        await self.task_queue.complete(None if wait else 0)
+        dropped = self.pending
+        if dropped:
+            LOGGER.warning("Discarded %d webhook events on shutdown", dropped)
+        self.targets = {}
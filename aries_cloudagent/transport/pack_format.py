@@ -2,16 +2,21 @@
 
 import json
 import logging
+import re
+from functools import lru_cache
 from typing import Sequence, Tuple, Union
+from uuid import uuid4
 
 from ..config.base import InjectorError
 from ..config.injection_context import InjectionContext
 
-from ..protocols.routing.v1_0.messages.forward import Forward
+from ..protocols.didcomm_prefix import DIDCommPrefix
+from ..protocols.routing.v1_0.message_types import FORWARD
 
 from ..messaging.util import time_now
 from ..utils.task_queue import TaskQueue
 from ..wallet.base import BaseWallet
+from ..wallet.batch import WalletBatcher
 from ..wallet.error import WalletError
 
 from .error import MessageParseError, MessageEncodeError
@@ -20,6 +25,140 @@ from .wire_format import BaseWireFormat
 
 LOGGER = logging.getLogger(__name__)
 
+FORWARD_FIELDS = ("@type", "@id", "to", "msg")
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_STRUCTURE = re.compile(r'["{}\[\]]')
+
+
+@lru_cache(maxsize=1024)
+def _forward_prefix(message_type: str, to: str) -> str:
+    """Get the serialized leading fields of a forward message."""
+    return '{"@type": %s, "to": %s, "@id": "' % (
+        json.dumps(message_type),
+        json.dumps(to),
+    )
+
+
+def wrap_forward(packed: Union[str, bytes], to: str) -> str:
+    """
+    Serialize a forward message around an already packed message.
+
+    The result is equivalent to `Forward(to=to, msg=packed).to_json()`, but the
+    packed message is embedded as-is instead of being parsed and serialized
+    again, and the fields which depend only on the recipient are reused.
+
+    Args:
+        packed: the packed message, a serialized JSON object
+        to: the verkey of the forward recipient
+
+    Returns:
+        The serialized forward message
+
+    """
+    if isinstance(packed, bytes):
+        packed = packed.decode("utf-8")
+    return "".join(
+        (
+            _forward_prefix(DIDCommPrefix.qualify_current(FORWARD), to),
+            str(uuid4()),
+            '", "msg": ',
+            packed,
+            "}",
+        )
+    )
+
+
+def _skip_nested(text: str, pos: int) -> int:
+    """Find the end of the JSON object or array starting at a position."""
+    depth = 0
+    while True:
+        match = _JSON_STRUCTURE.search(text, pos)
+        if not match:
+            raise ValueError("Unterminated JSON value")
+        token = match.group()
+        pos = match.end()
+        if token == '"':
+            # skip to the closing quote, which is not preceded by an escape
+            while True:
+                end = text.index('"', pos)
+                start = end
+                while text[start - 1] == "\\":
+                    start -= 1
+                pos = end + 1
+                if not (end - start) % 2:
+                    break
+        elif token == "{" or token == "[":
+            depth += 1
+        else:
+            depth -= 1
+            if not depth:
+                return pos
+
+
+def unwrap_forward(message_json: Union[str, bytes]) -> dict:
+    """
+    Parse a forward message, leaving the forwarded message serialized.
+
+    Only the fields of the forward message itself are decoded: the packed message
+    in `msg` is located by scanning for its closing brace and returned as the
+    original JSON text, so that it can be relayed without being parsed and
+    serialized again. Parsing stops at the first field which is not expected in
+    a forward message.
+
+    Args:
+        message_json: the serialized message
+
+    Returns:
+        The fields of the forward message, with `msg` as a JSON string, or None
+        if the message is not a plain forward message
+
+    """
+    text = message_json
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+    fields = {}
+    try:
+        pos = _JSON_WHITESPACE.match(text).end()
+        if text[pos] != "{":
+            return None
+        while True:
+            pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+            if text[pos] != '"':
+                return None
+            key, pos = json.decoder.scanstring(text, pos + 1)
+            if key not in FORWARD_FIELDS or key in fields:
+                return None
+            pos = _JSON_WHITESPACE.match(text, pos).end()
+            if text[pos] != ":":
+                return None
+            pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+            if key == "msg":
+                if text[pos] != "{":
+                    return None
+                end = _skip_nested(text, pos)
+                fields[key] = text[pos:end]
+            else:
+                fields[key], end = _JSON_DECODER.raw_decode(text, pos)
+                if not isinstance(fields[key], str):
+                    return None
+                if key == "@type" and DIDCommPrefix.unqualify(fields[key]) != FORWARD:
+                    return None
+            pos = _JSON_WHITESPACE.match(text, end).end()
+            if text[pos] == "}":
+                break
+            if text[pos] != ",":
+                return None
+        if _JSON_WHITESPACE.match(text, pos + 1).end() != len(text):
+            return None
+    except (IndexError, ValueError):
+        return None
+
+    if "@type" not in fields or "to" not in fields or "msg" not in fields:
+        return None
+    return fields
+
 
 class PackWireFormat(BaseWireFormat):
     """Standard DIDComm message parser and serializer."""
@@ -27,8 +166,13 @@ class PackWireFormat(BaseWireFormat):
     def __init__(self):
         """Initialize the pack wire format instance."""
         super().__init__()
+        self.batcher = WalletBatcher()
         self.task_queue: TaskQueue = None
 
+    def close(self):
+        """Cancel any batched wallet calls in progress."""
+        self.batcher.close()
+
     async def parse_message(
         self,
         context: InjectionContext,
@@ -79,12 +223,17 @@ class PackWireFormat(BaseWireFormat):
                 LOGGER.debug("Message unpack failed, falling back to JSON")
             else:
                 receipt.raw_message = message_json
-                try:
-                    message_dict = json.loads(message_json)
-                except ValueError:
-                    raise MessageParseError("Message JSON parsing failed")
-                if not isinstance(message_dict, dict):
-                    raise MessageParseError("Message JSON result is not an object")
+                # forwarded messages are relayed without being parsed
+                message_dict = unwrap_forward(message_json)
+                if not message_dict:
+                    try:
+                        message_dict = json.loads(message_json)
+                    except ValueError:
+                        raise MessageParseError("Message JSON parsing failed")
+                    if not isinstance(message_dict, dict):
+                        raise MessageParseError(
+                            "Message JSON result is not an object"
+                        )
 
         # parse thread ID
         thread_dec = message_dict.get("~thread")
@@ -114,7 +263,7 @@ class PackWireFormat(BaseWireFormat):
             raise MessageParseError("Wallet not defined in request context")
 
         try:
-            unpacked = await wallet.unpack_message(message_body)
+            unpacked = await self.batcher.unpack_message(wallet, message_body)
             (
                 message_json,
                 receipt.sender_verkey,
@@ -176,8 +325,8 @@ class PackWireFormat(BaseWireFormat):
             raise MessageEncodeError("No wallet instance")
 
         try:
-            message = await wallet.pack_message(
-                message_json, recipient_keys, sender_key
+            message = await self.batcher.pack_message(
+                wallet, message_json, recipient_keys, sender_key
             )
         except WalletError as e:
             raise MessageEncodeError("Message pack failed") from e
@@ -185,12 +334,13 @@ class PackWireFormat(BaseWireFormat):
         if routing_keys:
             recip_keys = recipient_keys
             for router_key in routing_keys:
-                message = json.loads(message.decode("utf-8"))
-                fwd_msg = Forward(to=recip_keys[0], msg=message)
+                fwd_json = wrap_forward(message, recip_keys[0])
                 # Forwards are anon packed
                 recip_keys = [router_key]
                 try:
-                    message = await wallet.pack_message(fwd_msg.to_json(), recip_keys)
+                    message = await self.batcher.pack_message(
+                        wallet, fwd_json, recip_keys
+                    )
                 except WalletError as e:
                     raise MessageEncodeError("Forward message pack failed") from e
         return message
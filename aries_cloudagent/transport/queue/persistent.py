@@ -0,0 +1,205 @@
+"""Durable message queue backed by an append-only log file."""
+
+import asyncio
+import json
+import logging
+import os
+
+from collections import OrderedDict, deque
+from typing import Mapping
+from uuid import uuid4
+
+from .basic import BasicMessageQueue
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PersistentMessageQueue(BasicMessageQueue):
+    """
+    Message queue persisting its entries to a local append-only log.
+
+    Each entry is written to the log when it is added and an acknowledgement is
+    written once it has been processed, so that entries which were never
+    acknowledged are recovered when the log is reopened. Writes are collected
+    and flushed together with a single fsync (group commit), so the cost of
+    syncing is shared by every entry added while the previous sync was running.
+    Entries may be redelivered after a restart: processing is at-least-once.
+
+    Messages must be JSON serializable.
+    """
+
+    def __init__(self, path: str, *, compact_threshold: int = 10000):
+        """
+        Initialize a `PersistentMessageQueue` instance.
+
+        Args:
+            path: the path of the log file
+            compact_threshold: the number of acknowledgements after which the log
+                is rewritten to hold only the pending entries
+
+        """
+        super().__init__()
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self.pending = OrderedDict()
+        self._acked = 0
+        self._buffer = []
+        self._dequeued = deque()
+        self._fd: int = None
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def opened(self) -> bool:
+        """Accessor for whether the log file is open."""
+        return self._fd is not None
+
+    @property
+    def unsynced(self) -> bool:
+        """Accessor for whether there are log writes not yet synced to disk."""
+        return bool(self._buffer)
+
+    def open(self, requeue: bool = True):
+        """
+        Open the log file, recovering any entries which were not acknowledged.
+
+        Args:
+            requeue: add the recovered entries to the queue for `dequeue`
+
+        """
+        self.pending = OrderedDict()
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # a partial record from an interrupted write
+                        LOGGER.warning("Skipping unreadable record in %s", self.path)
+                        continue
+                    if "put" in record:
+                        self.pending[record["put"]] = record["msg"]
+                    elif "ack" in record:
+                        self.pending.pop(record["ack"], None)
+        # start from a log holding only the recovered entries
+        self._rewrite(self._pending_lines())
+        self._acked = 0
+        if requeue:
+            for entry_id, message in self.pending.items():
+                self.queue.put_nowait((entry_id, message))
+        LOGGER.debug("Recovered %d entries from %s", len(self.pending), self.path)
+
+    def put(self, message) -> str:
+        """
+        Add a new entry to the log without adding it to the queue.
+
+        The entry is durable once a following `sync` has completed.
+
+        Returns:
+            The identifier of the new entry
+
+        """
+        entry_id = uuid4().hex
+        self.pending[entry_id] = message
+        self._buffer.append(self._encode({"put": entry_id, "msg": message}))
+        return entry_id
+
+    def ack(self, entry_id: str):
+        """Mark an entry as processed, so that it is not recovered."""
+        if self.pending.pop(entry_id, None) is not None:
+            self._buffer.append(self._encode({"ack": entry_id}))
+            self._acked += 1
+
+    async def sync(self):
+        """Write and sync all buffered log records to disk."""
+        async with self._sync_lock:
+            if not self._buffer:
+                return
+            loop = asyncio.get_event_loop()
+            if self._acked >= self.compact_threshold:
+                self._buffer = []
+                self._acked = 0
+                await loop.run_in_executor(None, self._rewrite, self._pending_lines())
+            else:
+                data = b"".join(self._buffer)
+                self._buffer = []
+                await loop.run_in_executor(None, self._write, data)
+
+    async def close(self):
+        """Sync any remaining records and close the log file."""
+        if self.opened:
+            await self.sync()
+            os.close(self._fd)
+            self._fd = None
+
+    async def enqueue(self, message):
+        """
+        Enqueue a message, returning once it has been written to disk.
+
+        Args:
+            message: The message to add to the end of the queue
+
+        Raises:
+            asyncio.CancelledError if the queue has been stopped
+
+        """
+        if self.stop_event.is_set():
+            raise asyncio.CancelledError
+        entry_id = self.put(message)
+        await self.sync()
+        await self.queue.put((entry_id, message))
+
+    async def dequeue(self, *, timeout: int = None):
+        """
+        Dequeue a message.
+
+        The message is acknowledged by the matching call to `task_done`.
+
+        Returns:
+            The dequeued message, or None if a timeout occurs
+
+        Raises:
+            asyncio.CancelledError if the queue has been stopped
+            asyncio.TimeoutError if the timeout is reached
+
+        """
+        entry = await super().dequeue(timeout=timeout)
+        if entry is None:
+            return None
+        entry_id, message = entry
+        self._dequeued.append(entry_id)
+        return message
+
+    def task_done(self):
+        """Indicate that the earliest dequeued message has been processed."""
+        if self._dequeued:
+            self.ack(self._dequeued.popleft())
+        super().task_done()
+
+    def _pending_lines(self) -> list:
+        return [
+            self._encode({"put": entry_id, "msg": message})
+            for entry_id, message in self.pending.items()
+        ]
+
+    @staticmethod
+    def _encode(record: Mapping) -> bytes:
+        return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def _write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        os.fsync(self._fd)
+
+    def _rewrite(self, lines: list):
+        """Atomically replace the log with the given records."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as temp:
+            temp.writelines(lines)
+            temp.flush()
+            os.fsync(temp.fileno())
+        os.replace(temp_path, self.path)
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
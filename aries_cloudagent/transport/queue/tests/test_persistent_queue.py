@@ -0,0 +1,96 @@
+import asyncio
+import os
+
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..persistent import PersistentMessageQueue
+
+
+class TestPersistentQueue(AsyncTestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "queue.log")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_enqueue_dequeue(self):
+        queue = PersistentMessageQueue(self.path)
+        queue.open()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await queue.dequeue(timeout=0)
+
+        await queue.enqueue({"value": 1})
+        await queue.enqueue({"value": 2})
+        assert await queue.dequeue(timeout=0) == {"value": 1}
+        queue.task_done()
+        await queue.close()
+
+        # the unacknowledged message is recovered
+        queue = PersistentMessageQueue(self.path)
+        queue.open()
+        assert list(queue.pending.values()) == [{"value": 2}]
+        assert await queue.dequeue(timeout=0) == {"value": 2}
+        queue.task_done()
+        await queue.join()
+        await queue.close()
+
+        queue = PersistentMessageQueue(self.path)
+        queue.open()
+        assert not queue.pending
+        await queue.close()
+
+    async def test_enqueue_stopped(self):
+        queue = PersistentMessageQueue(self.path)
+        queue.open()
+        queue.stop()
+        with self.assertRaises(asyncio.CancelledError):
+            await queue.enqueue("value")
+        assert not queue.pending
+        await queue.close()
+
+    async def test_put_sync(self):
+        queue = PersistentMessageQueue(self.path)
+        queue.open(requeue=False)
+        entries = [queue.put(f"message {i}") for i in range(3)]
+        assert queue.unsynced
+        await queue.sync()
+        assert not queue.unsynced
+        queue.ack(entries[1])
+        queue.ack("unknown")
+        await queue.close()
+        assert not queue.opened
+
+        queue = PersistentMessageQueue(self.path)
+        queue.open(requeue=False)
+        assert list(queue.pending) == [entries[0], entries[2]]
+        assert queue.queue.empty()
+        await queue.close()
+
+    async def test_compact(self):
+        queue = PersistentMessageQueue(self.path, compact_threshold=2)
+        queue.open()
+        entries = [queue.put(f"message {i}") for i in range(3)]
+        await queue.sync()
+        queue.ack(entries[0])
+        queue.ack(entries[1])
+        await queue.sync()
+        with open(self.path, "rb") as log:
+            assert len(log.readlines()) == 1
+        await queue.close()
+
+    async def test_partial_record(self):
+        queue = PersistentMessageQueue(self.path)
+        queue.open()
+        queue.put("message")
+        await queue.close()
+        with open(self.path, "ab") as log:
+            log.write(b'{"put": "abc", "ms')
+
+        queue = PersistentMessageQueue(self.path)
+        queue.open()
+        assert list(queue.pending.values()) == ["message"]
+        await queue.close()
@@ -5,6 +5,7 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from ...config.injection_context import InjectionContext
 
 from ...protocols.routing.v1_0.message_types import FORWARD
+from ...protocols.routing.v1_0.messages.forward import Forward
 from ...protocols.didcomm_prefix import DIDCommPrefix
 from ...wallet.base import BaseWallet
 from ...wallet.basic import BasicWallet
@@ -84,28 +85,22 @@ class TestPackWireFormat(AsyncTestCase):
             await serializer.pack(InjectionContext(), None, ["key"], None, ["key"])
 
         mock_wallet = async_mock.MagicMock(
-            pack_message=async_mock.CoroutineMock(side_effect=WalletError())
+            pack_messages=async_mock.CoroutineMock(side_effect=WalletError())
         )
         context = InjectionContext(enforce_typing=False)
         context.injector.bind_instance(BaseWallet, mock_wallet)
         with self.assertRaises(MessageEncodeError):
-            await serializer.pack(context, None, ["key"], None, ["key"])
+            await serializer.pack(context, None, ["key"], None, "key")
 
         context.injector.clear_binding(BaseWallet)
         mock_wallet = async_mock.MagicMock(
-            pack_message=async_mock.CoroutineMock(
-                side_effect=[json.dumps("message").encode("utf-8"), WalletError()]
+            pack_messages=async_mock.CoroutineMock(
+                side_effect=[[json.dumps("message").encode("utf-8")], WalletError()]
             )
         )
         context.injector.bind_instance(BaseWallet, mock_wallet)
-        with async_mock.patch.object(
-            test_module, "Forward", async_mock.MagicMock()
-        ) as mock_forward:
-            mock_forward.return_value = async_mock.MagicMock(
-                to_json=async_mock.MagicMock()
-            )
-            with self.assertRaises(MessageEncodeError):
-                await serializer.pack(context, None, ["key"], ["key"], ["key"])
+        with self.assertRaises(MessageEncodeError):
+            await serializer.pack(context, None, ["key"], ["key"], "key")
 
     async def test_unpacked(self):
         serializer = PackWireFormat()
@@ -180,5 +175,48 @@ class TestPackWireFormat(AsyncTestCase):
             self.context, packed_json
         )
         assert message_dict["@type"] == DIDCommPrefix.qualify_current(FORWARD)
+        assert isinstance(message_dict["msg"], str)
         assert delivery.recipient_verkey == router_did.verkey
         assert delivery.sender_verkey is None
+
+        fwd_msg = Forward.deserialize(message_dict)
+        assert fwd_msg.to == local_did.verkey
+        inner_dict, inner_delivery = await serializer.parse_message(
+            self.context, json.dumps(fwd_msg.msg)
+        )
+        assert inner_dict == self.test_message
+        assert inner_delivery.sender_verkey == local_did.verkey
+
+    def test_wrap_forward(self):
+        packed = json.dumps({"protected": "abc", "iv": "def"}).encode("utf-8")
+        wrapped = json.loads(test_module.wrap_forward(packed, "recipient-key"))
+        expected = json.loads(
+            Forward(to="recipient-key", msg=json.loads(packed)).to_json()
+        )
+        assert wrapped.pop("@id")
+        del expected["@id"]
+        assert wrapped == expected
+
+    def test_unwrap_forward(self):
+        packed = {"protected": 'a"}{', "iv": "def", "nested": [{"x": "]"}]}
+        forward = json.loads(Forward(to="recipient-key", msg=packed).to_json())
+        for message_json in (json.dumps(forward), json.dumps(forward).encode()):
+            unwrapped = test_module.unwrap_forward(message_json)
+            assert unwrapped["@type"] == forward["@type"]
+            assert unwrapped["to"] == "recipient-key"
+            assert isinstance(unwrapped["msg"], str)
+            assert json.loads(unwrapped["msg"]) == packed
+
+        for message_json in (
+            "",
+            "[]",
+            "{}",
+            json.dumps(self.test_message),
+            json.dumps({**forward, "~thread": {}}),
+            json.dumps({**forward, "msg": json.dumps(packed)}),
+            json.dumps({**forward, "to": 1}),
+            json.dumps(forward)[:-1],
+            json.dumps(forward) + "{}",
+            json.dumps(forward)[:-1] + ",}",
+        ):
+            assert test_module.unwrap_forward(message_json) is None
@@ -21,6 +21,9 @@ class BaseWireFormat:
     def __init__(self):
         """Initialize the base wire format instance."""
 
+    def close(self):
+        """Release any resources held by the wire format."""
+
     @abstractmethod
     async def parse_message(
         self,
@@ -2,8 +2,91 @@
 
 import functools
 import inspect
+import logging
+import math
+import re
 import time
-from typing import Sequence, TextIO, Union
+from bisect import bisect_left
+from typing import Callable, Sequence, TextIO, Union
+
+LOGGER = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def bucket_limits(sub_buckets: int, min_exp: int, max_exp: int) -> Sequence[float]:
+    """Get the upper limits of histogram buckets dividing each power of two."""
+    return tuple(
+        math.ldexp(0.5 + (sub + 1) / (2 * sub_buckets), exp)
+        for exp in range(min_exp, max_exp)
+        for sub in range(sub_buckets)
+    )
+
+
+class Histogram:
+    """
+    A fixed-size histogram of durations.
+
+    Each power of two is divided into `SUB_BUCKETS` equal buckets, in the manner
+    of an HDR histogram, so a quantile is reported within 1 / `SUB_BUCKETS` of
+    the recorded value. Durations below about a microsecond are counted in the
+    first bucket, and durations above about an hour in a final overflow
+    bucket.
+    """
+
+    SUB_BUCKETS = 16
+    MIN_EXP = -19
+    MAX_EXP = 13
+
+    # upper limit of each bucket, shared by all instances
+    LIMITS = bucket_limits(SUB_BUCKETS, MIN_EXP, MAX_EXP)
+
+    def __init__(self):
+        """Initialize the Histogram instance."""
+        self.buckets = [0] * (len(self.LIMITS) + 1)
+        self.max_value = 0.0
+
+    @property
+    def count(self) -> int:
+        """Accessor for the number of values recorded."""
+        return sum(self.buckets)
+
+    def record(self, value: float):
+        """Record a value in the histogram."""
+        if value > self.max_value:
+            self.max_value = value
+        self.buckets[bisect_left(self.LIMITS, value)] += 1
+
+    def bucket_limit(self, idx: int) -> float:
+        """Get the upper limit of the values counted in a bucket."""
+        return self.LIMITS[idx] if idx < len(self.LIMITS) else self.max_value
+
+    def quantiles(self, quantiles: Sequence[float] = QUANTILES) -> Sequence[float]:
+        """
+        Estimate quantiles of the recorded values.
+
+        Args:
+            quantiles: increasing quantiles between 0 and 1
+
+        Returns: the estimated value for each quantile, never above the largest
+            value recorded
+
+        """
+        count = self.count
+        if not count:
+            return [0.0 for _ in quantiles]
+        results = []
+        ranks = iter(max(math.ceil(q * count), 1) for q in quantiles)
+        rank = next(ranks)
+        seen = 0
+        for idx, bucket in enumerate(self.buckets):
+            seen += bucket
+            while rank is not None and seen >= rank:
+                results.append(min(self.bucket_limit(idx), self.max_value))
+                rank = next(ranks, None)
+            if rank is None:
+                break
+        return results
 
 
 class Stats:
@@ -12,6 +95,7 @@ class Stats:
     def __init__(self):
         """Initialize the Stats instance."""
         self.counts = {}
+        self.histograms = {}
         self.max_time = {}
         self.min_time = {}
         self.total_time = {}
@@ -25,9 +109,11 @@ class Stats:
             self.total_time[name] += duration
         else:
             self.counts[name] = 1
+            self.histograms[name] = Histogram()
             self.max_time[name] = duration
             self.min_time[name] = duration
             self.total_time[name] = duration
+        self.histograms[name].record(duration)
 
     def extract(self, names: Sequence[str] = None) -> dict:
         """Summarize the stats in a dictionary."""
@@ -49,13 +135,21 @@ class Stats:
                 name: val for (name, val) in self.total_time.items() if name in names
             }
 
-        return {
+        quantiles = {
+            name: self.histograms[name].quantiles(QUANTILES) for name in names
+        }
+        results = {
             "avg": {name: totals[name] / counts[name] for name in names},
             "count": counts,
             "max": maxes,
             "min": mins,
             "total": totals,
         }
+        for idx, q in enumerate(QUANTILES):
+            results[f"p{round(q * 100)}"] = {
+                name: values[idx] for (name, values) in quantiles.items()
+            }
+        return results
 
 
 class Timer:
@@ -103,6 +197,7 @@ class Collector:
         self._log_file: TextIO = None
         self._log_path = log_path
         self._stats = None
+        self._gauges = {}
         self.reset()
 
     def reset(self):
@@ -208,3 +303,61 @@ class Collector:
     def extract(self, groups: Sequence[str] = None) -> dict:
         """Extract statistics for a specific set of groups."""
         return self._stats.extract(groups)
+
+    def add_gauges(self, name: str, gauges: Callable[[], dict]):
+        """
+        Register a source of gauge values, such as queue depths.
+
+        The values are only fetched when the gauges are read, so gauges add no
+        overhead between reads.
+
+        Args:
+            name: a name identifying the source
+            gauges: a callable returning a dictionary of current values
+
+        """
+        self._gauges[name] = gauges
+
+    def remove_gauges(self, name: str):
+        """Remove a registered source of gauge values."""
+        self._gauges.pop(name, None)
+
+    @property
+    def gauges(self) -> dict:
+        """Accessor for the current values of the registered gauges."""
+        values = {}
+        for name, gauges in self._gauges.items():
+            try:
+                values.update(gauges())
+            except Exception:
+                LOGGER.exception("Error reading gauges: %s", name)
+        return values
+
+    def render_metrics(self, prefix: str = "acapy") -> str:
+        """
+        Render the timing statistics and gauges in Prometheus text format.
+
+        Timings are reported as a summary with the 50th, 95th and 99th
+        percentiles, labelled by the name of the timed operation.
+        """
+        results = self._stats.extract()
+        lines = []
+        if results["count"]:
+            metric = f"{prefix}_duration_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for name in sorted(results["count"]):
+                label = 'name="{}"'.format(
+                    name.replace("\\", "\\\\")
+                    .replace('"', '\\"')
+                    .replace("\n", "\\n")
+                )
+                for q in QUANTILES:
+                    value = results[f"p{round(q * 100)}"][name]
+                    lines.append(f'{metric}{{{label},quantile="{q}"}} {value:.6g}')
+                lines.append(f"{metric}_sum{{{label}}} {results['total'][name]:.6g}")
+                lines.append(f"{metric}_count{{{label}}} {results['count'][name]}")
+        for name, value in sorted(self.gauges.items()):
+            metric = prefix + "_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
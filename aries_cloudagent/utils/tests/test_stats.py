@@ -3,7 +3,8 @@ from tempfile import NamedTemporaryFile
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
-from ..stats import Collector
+from .. import stats as test_module
+from ..stats import Collector, Histogram
 
 
 class TestStats(AsyncTestCase):
@@ -98,3 +99,57 @@ class TestStats(AsyncTestCase):
 
         stats.reset()
         assert not stats.results["avg"]
+
+    async def test_percentiles(self):
+        stats = Collector()
+        for i in range(1, 1001):
+            stats.log("test", i / 1000)
+        results = stats.extract()
+        for name, expected in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = results[name]["test"]
+            assert expected <= value <= expected * (1 + 1 / Histogram.SUB_BUCKETS)
+        assert results["p99"]["test"] <= results["max"]["test"]
+
+    async def test_histogram(self):
+        hist = Histogram()
+        assert hist.quantiles() == [0.0, 0.0, 0.0]
+        size = len(hist.buckets)
+        for value in (0.0, 1e-9, 1e6, 0.25, 0.25):
+            hist.record(value)
+        assert len(hist.buckets) == size
+        assert hist.buckets[0] == 2
+        assert hist.buckets[-1] == 1
+        assert hist.quantiles((0.1, 0.5, 1.0)) == [hist.bucket_limit(0), 0.25, 1e6]
+
+    async def test_gauges(self):
+        stats = Collector()
+        stats.add_gauges("queue", lambda: {"depth": 3, "active": 1})
+        stats.add_gauges("broken", async_mock.MagicMock(side_effect=KeyError()))
+        with async_mock.patch.object(
+            test_module.LOGGER, "exception", async_mock.MagicMock()
+        ) as mock_log_exc:
+            assert stats.gauges == {"depth": 3, "active": 1}
+            mock_log_exc.assert_called_once()
+        stats.remove_gauges("broken")
+        stats.reset()
+        assert stats.gauges == {"depth": 3, "active": 1}
+
+    async def test_render_metrics(self):
+        stats = Collector()
+        assert stats.render_metrics() == "\n"
+
+        stats.log('Test.method "x"', 0.5)
+        stats.log('Test.method "x"', 1.5)
+        stats.add_gauges("queue", lambda: {"out-new": 2})
+        lines = stats.render_metrics().splitlines()
+        label = 'name="Test.method \\"x\\""'
+        assert lines == [
+            "# TYPE acapy_duration_seconds summary",
+            f'acapy_duration_seconds{{{label},quantile="0.5"}} 0.5',
+            f'acapy_duration_seconds{{{label},quantile="0.95"}} 1.5',
+            f'acapy_duration_seconds{{{label},quantile="0.99"}} 1.5',
+            f"acapy_duration_seconds_sum{{{label}}} 2",
+            f"acapy_duration_seconds_count{{{label}}} 2",
+            "# TYPE acapy_out_new gauge",
+            "acapy_out_new 2",
+        ]
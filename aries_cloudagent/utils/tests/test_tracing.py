@@ -1,6 +1,6 @@
 import json
-import requests
 
+from aiohttp import web
 from asynctest import mock as async_mock, TestCase as AsyncTestCase
 
 from ...protocols.out_of_band.v1_0.messages.invitation import Invitation
@@ -142,34 +142,20 @@ class TestTracing(AsyncTestCase):
             "trace.target": "http://fluentd:8080/",
             "trace.tag": "acapy.trace",
         }
-        test_module.trace_event(
-            context,
-            message,
-            handler="message_handler",
-            perf_counter=None,
-            outcome="processed OK",
-        )
-
-    async def test_post_event_with_error(self):
-        message = Ping()
-        message._thread = {"thid": "dummy_thread_id_12345"}
-        context = {
-            "trace.enabled": True,
-            "trace.target": "http://fluentd-dummy:8080/",
-            "trace.tag": "acapy.trace",
-        }
-        try:
+        with async_mock.patch.object(
+            test_module.TRACE_EXPORTER, "export", async_mock.MagicMock()
+        ) as mock_export:
             test_module.trace_event(
                 context,
                 message,
                 handler="message_handler",
                 perf_counter=None,
                 outcome="processed OK",
-                raise_errors=True,
             )
-            assert False
-        except requests.exceptions.ConnectionError as e:
-            pass
+            target, event = mock_export.call_args[0]
+            assert target == "http://fluentd:8080/acapy.trace"
+            assert event["thread_id"] == "dummy_thread_id_12345"
+            assert event["outcome"] == "processed OK"
 
     def test_post_msg_decorator_event(self):
         message = Ping()
@@ -195,3 +181,47 @@ class TestTracing(AsyncTestCase):
         assert len(trace_reports) == 1
         trace_report = trace_reports[0]
         assert trace_report.thread_id == message._thread.thid
+
+
+class TestTraceExporter(AsyncTestCase):
+    async def setUp(self):
+        self.received = []
+
+        async def receive(request):
+            self.received.append(await request.json())
+            return web.Response()
+
+        app = web.Application()
+        app.add_routes([web.post("/trace", receive)])
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.target = f"http://127.0.0.1:{port}/trace"
+
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    async def test_export_batches(self):
+        exporter = test_module.TraceExporter(batch_size=2, flush_interval=0.01)
+        for i in range(3):
+            assert exporter.export(self.target, {"event": i})
+        await exporter.close()
+        assert self.received == [[{"event": 0}, {"event": 1}], [{"event": 2}]]
+        assert exporter.stats == {"queued": 0, "sent": 3, "dropped": 0, "failed": 0}
+
+    async def test_export_dropped(self):
+        exporter = test_module.TraceExporter(max_queued=1)
+        assert exporter.export(self.target, {"event": 0})
+        assert not exporter.export(self.target, {"event": 1})
+        await exporter.close()
+        assert self.received == [[{"event": 0}]]
+        assert exporter.total_dropped == 1
+
+    async def test_export_failed(self):
+        exporter = test_module.TraceExporter(flush_interval=0.01)
+        exporter.export(self.target + "/missing", {"event": 0})
+        await exporter.close()
+        assert exporter.total_failed == 1
+        assert exporter.total_sent == 0
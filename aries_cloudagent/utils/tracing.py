@@ -1,11 +1,14 @@
 """Event tracing."""
 
+import asyncio
 import json
 import logging
 import time
 import datetime
-import requests
 
+from collections import deque
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 from marshmallow import fields
 
 from ..transport.inbound.message import InboundMessage
@@ -39,6 +42,144 @@ class AdminAPIMessageTracingSchema(OpenAPISchema):
     )
 
 
+class TraceExporter:
+    """
+    Ship trace events to HTTP targets in the background.
+
+    Events are held in a bounded buffer and posted in batches, as JSON arrays,
+    over a pooled client session. When the buffer is full new events are dropped
+    and counted rather than delaying the caller.
+    """
+
+    def __init__(
+        self,
+        max_queued: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.1,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize a `TraceExporter` instance.
+
+        Args:
+            max_queued: the maximum number of events waiting to be sent
+            batch_size: the maximum number of events sent in one request
+            flush_interval: seconds to wait for a batch to fill before sending
+            timeout: the timeout in seconds for each request
+
+        """
+        self.max_queued = max_queued
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.queue = deque()
+        self.total_sent = 0
+        self.total_dropped = 0
+        self.total_failed = 0
+        self._session: ClientSession = None
+        self._task: asyncio.Task = None
+        self._batch_ready: asyncio.Event = None
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the exporter counters."""
+        return {
+            "queued": len(self.queue),
+            "sent": self.total_sent,
+            "dropped": self.total_dropped,
+            "failed": self.total_failed,
+        }
+
+    def export(self, target: str, event: dict) -> bool:
+        """
+        Add an event to the buffer for sending.
+
+        Args:
+            target: the URL to post the event to
+            event: the trace event
+
+        Returns:
+            False if the event was dropped because the buffer is full
+
+        """
+        if len(self.queue) >= self.max_queued:
+            self.total_dropped += 1
+            return False
+        self.queue.append((target, event))
+        if not self._task:
+            try:
+                loop = asyncio.get_event_loop()
+            except RuntimeError:
+                loop = None
+            if loop and loop.is_running():
+                self._batch_ready = asyncio.Event()
+                self._task = loop.create_task(self._run())
+        elif len(self.queue) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    async def _run(self):
+        """Send batches until the buffer is empty."""
+        try:
+            while self.queue:
+                if len(self.queue) < self.batch_size:
+                    try:
+                        await asyncio.wait_for(
+                            self._batch_ready.wait(), self.flush_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                self._batch_ready.clear()
+                await self._send_batch()
+        finally:
+            self._task = None
+
+    async def _send_batch(self):
+        """Post the next batch of events, grouped by target."""
+        batches = {}
+        for _ in range(min(len(self.queue), self.batch_size)):
+            target, event = self.queue.popleft()
+            batches.setdefault(target, []).append(event)
+        if not self._session:
+            self._session = ClientSession(
+                connector=TCPConnector(limit=8),
+                timeout=ClientTimeout(total=self.timeout),
+            )
+        for target, events in batches.items():
+            try:
+                async with self._session.post(
+                    target,
+                    data=json.dumps(events),
+                    headers={"Content-Type": "application/json"},
+                ) as response:
+                    if response.status >= 400:
+                        raise ClientError(f"Response status {response.status}")
+                self.total_sent += len(events)
+            except (ClientError, asyncio.TimeoutError, OSError) as e:
+                self.total_failed += len(events)
+                LOGGER.error(
+                    "Error sending %d trace events to %s: %s", len(events), target, e
+                )
+
+    async def flush(self):
+        """Send all buffered events."""
+        if self._task:
+            self._batch_ready.set()
+            await self._task
+        while self.queue:
+            await self._send_batch()
+
+    async def close(self):
+        """Send all buffered events and release the client session."""
+        await self.flush()
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+TRACE_EXPORTER = TraceExporter()
+
+
 def get_timer() -> float:
     """Return a timer."""
     return time.perf_counter()
@@ -200,7 +341,6 @@ def trace_event(
             "ellapsed_milli": int(1000 * (ret - perf_counter)) if perf_counter else 0,
             "outcome": str(outcome),
         }
-        event_str = json.dumps(event)
 
         try:
             # check our target - if we get this far we know we are logging the event
@@ -222,14 +362,13 @@ def trace_event(
             elif context["trace.target"] == TRACE_LOG_TARGET:
                 # write to standard log file
                 LOGGER.setLevel(logging.INFO)
-                LOGGER.info(" %s %s", context["trace.tag"], event_str)
+                LOGGER.info(" %s %s", context["trace.tag"], json.dumps(event))
             else:
-                # should be an http endpoint
-                _ = requests.post(
+                # should be an http endpoint, events are sent in the background
+                TRACE_EXPORTER.export(
                     context["trace.target"]
                     + (context["trace.tag"] if context["trace.tag"] else ""),
-                    data=event_str,
-                    headers={"Content-Type": "application/json"},
+                    event,
                 )
         except Exception as e:
             if raise_errors:
@@ -238,7 +377,7 @@ def trace_event(
                 "Error logging trace target: %s tag: %s event: %s",
                 context.get("trace.target"),
                 context.get("trace.tag"),
-                event_str,
+                json.dumps(event),
             )
             LOGGER.exception(e)
 
@@ -1,8 +1,10 @@
 """Wallet base class."""
 
+import asyncio
+
 from abc import ABC, abstractmethod
 from collections import namedtuple
-from typing import Sequence
+from typing import Sequence, Tuple, Union
 
 from ..ledger.base import BaseLedger
 from ..ledger.endpoint_type import EndpointType
@@ -373,6 +375,53 @@ class BaseWallet(ABC):
 
         """
 
+    async def pack_messages(
+        self, messages: Sequence[str], to_verkeys: Sequence[str], from_verkey: str = None
+    ) -> Sequence[bytes]:
+        """
+        Pack a batch of messages for the same recipients.
+
+        Implementations may share work between the messages of a batch. By default
+        each message is packed separately.
+
+        Args:
+            messages: The messages to pack
+            to_verkeys: The verkeys to pack the messages for
+            from_verkey: The sender verkey
+
+        Returns:
+            The packed messages, in order
+
+        """
+        return await asyncio.gather(
+            *(
+                self.pack_message(message, to_verkeys, from_verkey)
+                for message in messages
+            )
+        )
+
+    async def unpack_messages(
+        self, enc_messages: Sequence[bytes]
+    ) -> Sequence[Union[Tuple[str, str, str], Exception]]:
+        """
+        Unpack a batch of messages.
+
+        Implementations may share work between the messages of a batch. By default
+        each message is unpacked separately.
+
+        Args:
+            enc_messages: The encrypted messages
+
+        Returns:
+            For each message in order, a tuple of (message, from_verkey, to_verkey),
+            or the error raised when unpacking it
+
+        """
+        return await asyncio.gather(
+            *(self.unpack_message(enc_message) for enc_message in enc_messages),
+            return_exceptions=True,
+        )
+
     def __repr__(self) -> str:
         """Get a human readable string."""
         return "<{}(opened={})>".format(self.__class__.__name__, self.opened)
@@ -1,7 +1,9 @@
 """In-memory implementation of BaseWallet interface."""
 
 import asyncio
-from typing import Sequence
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Mapping, Sequence, Tuple, Union
 
 from .base import BaseWallet, KeyInfo, DIDInfo
 from .crypto import (
@@ -10,8 +12,10 @@ from .crypto import (
     validate_seed,
     sign_message,
     verify_signed_message,
-    encode_pack_message,
-    decode_pack_message,
+    encode_pack_messages,
+    decode_pack_messages,
+    pack_message_recipient_keys,
+    PackKeyCache,
 )
 from .error import WalletError, WalletDuplicateError, WalletNotFoundError
 from .util import b58_to_bytes, bytes_to_b58
@@ -22,12 +26,24 @@ class BasicWallet(BaseWallet):
 
     WALLET_TYPE = "basic"
 
+    EXECUTOR_PROCESS = "process"
+    EXECUTOR_THREAD = "thread"
+
     def __init__(self, config: dict = None):
         """
         Initialize a `BasicWallet` instance.
 
         Args:
-            config: {name, key, seed, did, auto-create, auto-remove}
+            config: {name, key, seed, did, auto-create, auto-remove,
+                crypto_workers, crypto_executor, pack_key_cache}
+
+        The message packing crypto runs in the default executor of the event loop,
+        unless `crypto_workers` is set to the size of a dedicated thread pool or,
+        if `crypto_executor` is "process", process pool.
+
+        Setting `pack_key_cache` to a number of entries enables a `PackKeyCache`
+        for the key material of repeated senders and recipients, except with a
+        process pool.
 
         """
         if not config:
@@ -37,6 +53,24 @@ class BasicWallet(BaseWallet):
         self._keys = {}
         self._local_dids = {}
         self._pair_dids = {}
+        self._crypto_workers = int(config.get("crypto_workers") or 0)
+        self._crypto_executor_type = config.get("crypto_executor") or (
+            self.EXECUTOR_THREAD
+        )
+        if self._crypto_executor_type not in (
+            self.EXECUTOR_PROCESS,
+            self.EXECUTOR_THREAD,
+        ):
+            raise WalletError(
+                f"Unsupported crypto executor type: {self._crypto_executor_type}"
+            )
+        self._crypto_executor: Executor = None
+        cache_size = int(config.get("pack_key_cache") or 0)
+        self._pack_key_cache = (
+            PackKeyCache(cache_size)
+            if cache_size and self._crypto_executor_type != self.EXECUTOR_PROCESS
+            else None
+        )
 
     @property
     def name(self) -> str:
@@ -69,8 +103,24 @@ class BasicWallet(BaseWallet):
         pass
 
     async def close(self):
-        """Not applicable to in-memory wallet."""
-        pass
+        """Shut down the crypto worker pool and discard cached key material."""
+        if self._pack_key_cache:
+            self._pack_key_cache.wipe()
+        if self._crypto_executor:
+            self._crypto_executor.shutdown(wait=False)
+            self._crypto_executor = None
+
+    @property
+    def crypto_executor(self) -> Executor:
+        """Accessor for the executor running the message packing crypto."""
+        if not self._crypto_executor and self._crypto_workers:
+            if self._crypto_executor_type == self.EXECUTOR_PROCESS:
+                self._crypto_executor = ProcessPoolExecutor(self._crypto_workers)
+            else:
+                self._crypto_executor = ThreadPoolExecutor(
+                    self._crypto_workers, thread_name_prefix="wallet-crypto"
+                )
+        return self._crypto_executor
 
     async def create_signing_key(
         self, seed: str = None, metadata: dict = None
@@ -178,6 +228,7 @@ class BasicWallet(BaseWallet):
         if not temp_keys:
             raise WalletError("Key rotation not in progress for DID: {}".format(did))
         verkey_enc = temp_keys[0]
+        old_verkey = self._local_dids[did]["verkey"]
 
         self._local_dids[did].update(
             {
@@ -187,6 +238,8 @@ class BasicWallet(BaseWallet):
             }
         )
         self._keys.pop(verkey_enc)
+        if self._pack_key_cache:
+            self._pack_key_cache.wipe(b58_to_bytes(old_verkey))
         return DIDInfo(did, verkey_enc, self._local_dids[did]["metadata"].copy())
 
     async def create_local_did(
@@ -376,6 +429,16 @@ class BasicWallet(BaseWallet):
         verified = verify_signed_message(signature + message, verkey_bytes)
         return verified
 
+    def _get_private_keys(self, verkeys: Iterable[str]) -> Mapping[str, bytes]:
+        """Map those of the given verkeys held by the wallet to their private keys."""
+        verkeys = set(verkeys)
+        keys_and_dids = list(self._local_dids.values()) + list(self._keys.values())
+        return {
+            info["verkey"]: info["secret"]
+            for info in keys_and_dids
+            if info["verkey"] in verkeys
+        }
+
     async def pack_message(
         self, message: str, to_verkeys: Sequence[str], from_verkey: str = None
     ) -> bytes:
@@ -396,13 +459,42 @@ class BasicWallet(BaseWallet):
         """
         if message is None:
             raise WalletError("Message not provided")
+        return (await self.pack_messages([message], to_verkeys, from_verkey))[0]
+
+    async def pack_messages(
+        self, messages: Sequence[str], to_verkeys: Sequence[str], from_verkey: str = None
+    ) -> Sequence[bytes]:
+        """
+        Pack a batch of messages for the same recipients.
+
+        The content encryption key is shared by the messages of the batch, so the
+        key exchange with each recipient is performed once per batch.
+
+        Args:
+            messages: The messages to pack
+            to_verkeys: List of verkeys for which to pack
+            from_verkey: Sender verkey from which to pack
+
+        Returns:
+            The resulting packed messages, in order
+
+        Raises:
+            WalletError: If a message is not provided
+
+        """
+        if any(message is None for message in messages):
+            raise WalletError("Message not provided")
 
         keys_bin = [b58_to_bytes(key) for key in to_verkeys]
         secret = self._get_private_key(from_verkey) if from_verkey else None
-        result = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: encode_pack_message(message, keys_bin, secret)
+        return await asyncio.get_event_loop().run_in_executor(
+            self.crypto_executor,
+            encode_pack_messages,
+            messages,
+            keys_bin,
+            secret,
+            self._pack_key_cache,
         )
-        return result
 
     async def unpack_message(self, enc_message: bytes) -> (str, str, str):
         """
@@ -421,14 +513,51 @@ class BasicWallet(BaseWallet):
         """
         if not enc_message:
             raise WalletError("Message not provided")
-        try:
-            (
-                message,
-                from_verkey,
-                to_verkey,
-            ) = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: decode_pack_message(enc_message, self._get_private_key)
+        result = (await self.unpack_messages([enc_message]))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def unpack_messages(
+        self, enc_messages: Sequence[bytes]
+    ) -> Sequence[Union[Tuple[str, str, str], Exception]]:
+        """
+        Unpack a batch of messages.
+
+        The payload key of messages packed together for the same recipients is
+        decrypted once per batch.
+
+        Args:
+            enc_messages: The packed message bytes
+
+        Returns:
+            For each message in order, a tuple of (message, from_verkey, to_verkey),
+            or the `WalletError` raised when unpacking it
+
+        """
+        results = [None] * len(enc_messages)
+        pending = []
+        for idx, enc_message in enumerate(enc_messages):
+            if enc_message:
+                pending.append(idx)
+            else:
+                results[idx] = WalletError("Message not provided")
+        if pending:
+            # only the private keys of the recipients are sent to the executor
+            recip_vks = set()
+            for idx in pending:
+                recip_vks.update(pack_message_recipient_keys(enc_messages[idx]))
+            decoded = await asyncio.get_event_loop().run_in_executor(
+                self.crypto_executor,
+                decode_pack_messages,
+                [enc_messages[idx] for idx in pending],
+                self._get_private_keys(recip_vks).get,
+                self._pack_key_cache,
             )
-        except ValueError as e:
-            raise WalletError("Message could not be unpacked: {}".format(str(e)))
-        return message, from_verkey, to_verkey
+            for idx, result in zip(pending, decoded):
+                if isinstance(result, Exception):
+                    result = WalletError(
+                        "Message could not be unpacked: {}".format(str(result))
+                    )
+                results[idx] = result
+        return results
@@ -0,0 +1,111 @@
+"""Coalescing of concurrent message packing requests."""
+
+import asyncio
+
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+from .base import BaseWallet
+
+
+class WalletBatcher:
+    """
+    Collect concurrent pack and unpack requests into batch wallet calls.
+
+    Requests made during one iteration of the event loop are submitted together
+    on the next, using `BaseWallet.pack_messages` and `BaseWallet.unpack_messages`
+    in batches of at most `max_batch` messages. Messages are only packed together
+    when they have the same recipients and sender.
+    """
+
+    PACK = "pack"
+    UNPACK = "unpack"
+
+    def __init__(self, max_batch: int = 64):
+        """
+        Initialize a `WalletBatcher` instance.
+
+        Args:
+            max_batch: the maximum number of messages in each batch
+
+        """
+        self.max_batch = max_batch
+        self._pending = OrderedDict()
+        self._flush_handle: asyncio.Handle = None
+        self._tasks = set()
+
+    async def pack_message(
+        self,
+        wallet: BaseWallet,
+        message: str,
+        to_verkeys: Sequence[str],
+        from_verkey: str = None,
+    ) -> bytes:
+        """Pack a message as part of a batch."""
+        return await self._submit(
+            (wallet, self.PACK, tuple(to_verkeys), from_verkey), message
+        )
+
+    async def unpack_message(
+        self, wallet: BaseWallet, enc_message: bytes
+    ) -> Tuple[str, str, str]:
+        """Unpack a message as part of a batch."""
+        return await self._submit((wallet, self.UNPACK), enc_message)
+
+    def _submit(self, key: tuple, arg) -> asyncio.Future:
+        """Queue a request for the next batch."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append((arg, future))
+        if not self._flush_handle:
+            self._flush_handle = loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        """Submit the queued requests in batches."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, OrderedDict()
+        for key, requests in pending.items():
+            for start in range(0, len(requests), self.max_batch):
+                end = start + self.max_batch
+                task = asyncio.ensure_future(self._run(key, requests[start:end]))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    def close(self):
+        """Cancel the queued requests and the batch wallet calls in progress."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, OrderedDict()
+        for requests in pending.values():
+            for (_, future) in requests:
+                future.cancel()
+        for task in self._tasks:
+            task.cancel()
+
+    async def _run(self, key: tuple, requests: Sequence[tuple]):
+        """Perform a batch wallet call and resolve the requests."""
+        requests = [(arg, future) for (arg, future) in requests if not future.done()]
+        if not requests:
+            return
+        wallet, operation = key[:2]
+        args = [arg for (arg, _) in requests]
+        try:
+            if operation == self.PACK:
+                results = await wallet.pack_messages(args, key[2], key[3])
+            else:
+                results = await wallet.unpack_messages(args)
+        except asyncio.CancelledError:
+            for (_, future) in requests:
+                future.cancel()
+            raise
+        except Exception as err:
+            results = [err] * len(requests)
+        for (_, future), result in zip(requests, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,14 +1,18 @@
 """Cryptography functions used by BasicWallet."""
 
 import json
+import threading
 
 from collections import OrderedDict
-from typing import Callable, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Callable, Optional, Sequence, Tuple, Union
 
 import nacl.bindings
 import nacl.exceptions
 import nacl.utils
 
+from nacl._sodium import ffi, lib
+
 from marshmallow import fields, Schema, ValidationError
 
 from .error import WalletError
@@ -160,8 +164,155 @@ def verify_signed_message(signed: bytes, verkey: bytes) -> bool:
     return True
 
 
+@lru_cache(maxsize=1024)
+def pack_recipient_key(target_vk: bytes) -> Tuple[bytes, str]:
+    """
+    Get the encryption key and key identifier for a pack recipient.
+
+    Results are cached, as messages are commonly packed repeatedly for the same
+    recipients (such as the routing keys of a mediator).
+
+    Args:
+        target_vk: Verkey of the recipient
+
+    Returns:
+        A tuple of (curve25519 public key, base58 verkey)
+
+    """
+    return (
+        nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk),
+        bytes_to_b58(target_vk),
+    )
+
+
+class PackSharedKey:
+    """
+    Key agreement result for a pair of pack keys, held in a libsodium buffer.
+
+    The buffer is zeroed once the instance is no longer referenced.
+    """
+
+    __slots__ = ("buffer",)
+
+    def __init__(self, public_key: bytes, secret_key: bytes):
+        """Compute the shared key for a curve25519 public key and secret key."""
+        self.buffer = ffi.new("unsigned char[]", nacl.bindings.crypto_box_BEFORENMBYTES)
+        if lib.crypto_box_beforenm(self.buffer, public_key, secret_key) != 0:
+            raise nacl.exceptions.CryptoError("Key agreement failed")
+
+    def __del__(self):
+        """Zero the shared key."""
+        lib.sodium_memzero(self.buffer, len(self.buffer))
+
+
+class PackKeyCache:
+    """
+    Bounded cache of the key material used to pack and unpack messages.
+
+    Holds the curve25519 keypairs converted from local signing keys, and the
+    shared keys agreed between pairs of sender and recipient verkeys, so that
+    messages exchanged repeatedly between the same keys do not repeat the key
+    conversions and key agreement. Least recently used entries are evicted
+    beyond `max_size` entries of each kind. The cache is safe to use from
+    multiple threads.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Initialize a `PackKeyCache` instance.
+
+        Args:
+            max_size: the maximum number of keypairs, and of shared keys, to keep
+
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._keypairs = OrderedDict()
+        self._shared_keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, entries: OrderedDict, key):
+        with self._lock:
+            found = entries.get(key)
+            if found:
+                entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return found
+
+    def _put(self, entries: OrderedDict, key, value):
+        with self._lock:
+            entries[key] = value
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def keypair(self, secret: bytes) -> Tuple[bytes, bytes]:
+        """
+        Get the curve25519 keypair for an ed25519 secret key.
+
+        Returns:
+            A tuple of (public key, secret key)
+
+        """
+        verkey = sign_pk_from_sk(secret)
+        found = self._get(self._keypairs, verkey)
+        if not found:
+            found = (
+                nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(verkey),
+                nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(secret),
+            )
+            self._put(self._keypairs, verkey, found)
+        return found
+
+    def shared_key(
+        self,
+        sender_vk: bytes,
+        recip_vk: bytes,
+        public_key: bytes,
+        secret_key: bytes,
+    ) -> PackSharedKey:
+        """
+        Get the shared key for a sender and recipient verkey.
+
+        Args:
+            sender_vk: The verkey of the sender
+            recip_vk: The verkey of the recipient
+            public_key: The curve25519 public key of the remote party
+            secret_key: The curve25519 secret key of the local party
+
+        """
+        found = self._get(self._shared_keys, (sender_vk, recip_vk))
+        if not found:
+            found = PackSharedKey(public_key, secret_key)
+            self._put(self._shared_keys, (sender_vk, recip_vk), found)
+        return found
+
+    def wipe(self, verkey: bytes = None):
+        """
+        Discard the key material involving a verkey, or all key material.
+
+        Discarded shared keys are zeroed as soon as they are no longer in use.
+
+        Args:
+            verkey: The verkey of a local or remote key which has been replaced
+
+        """
+        with self._lock:
+            if verkey is None:
+                self._keypairs.clear()
+                self._shared_keys.clear()
+                return
+            self._keypairs.pop(verkey, None)
+            for pair in [pair for pair in self._shared_keys if verkey in pair]:
+                del self._shared_keys[pair]
+
+
 def prepare_pack_recipient_keys(
-    to_verkeys: Sequence[bytes], from_secret: bytes = None
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
 ) -> Tuple[str, bytes]:
     """
     Assemble the recipients block of a packed message.
@@ -169,6 +320,7 @@ def prepare_pack_recipient_keys(
     Args:
         to_verkeys: Verkeys of recipients
         from_secret: Secret to use for signing keys
+        key_cache: Optional cache of key material for the sender and recipients
 
     Returns:
         A tuple of (json result, key)
@@ -177,16 +329,24 @@ def prepare_pack_recipient_keys(
     cek = nacl.bindings.crypto_secretstream_xchacha20poly1305_keygen()
     recips = []
 
+    if from_secret:
+        sender_pk = sign_pk_from_sk(from_secret)
+        sender_vk = bytes_to_b58(sender_pk).encode("ascii")
+        if key_cache:
+            sk = key_cache.keypair(from_secret)[1]
+        else:
+            sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
+
     for target_vk in to_verkeys:
-        target_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk)
+        target_pk, target_kid = pack_recipient_key(target_vk)
         if from_secret:
-            sender_pk = sign_pk_from_sk(from_secret)
-            sender_vk = bytes_to_b58(sender_pk).encode("ascii")
             enc_sender = nacl.bindings.crypto_box_seal(sender_vk, target_pk)
-            sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
-
             nonce = nacl.utils.random(nacl.bindings.crypto_box_NONCEBYTES)
-            enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sk)
+            if key_cache:
+                shared = key_cache.shared_key(sender_pk, target_vk, target_pk, sk)
+                enc_cek = nacl.bindings.crypto_box_afternm(cek, nonce, shared.buffer)
+            else:
+                enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sk)
         else:
             enc_sender = None
             nonce = None
@@ -200,7 +360,7 @@ def prepare_pack_recipient_keys(
                         "header",
                         OrderedDict(
                             [
-                                ("kid", bytes_to_b58(target_vk)),
+                                ("kid", target_kid),
                                 (
                                     "sender",
                                     bytes_to_b64(enc_sender, urlsafe=True)
@@ -335,7 +495,10 @@ def decrypt_plaintext(
 
 
 def encode_pack_message(
-    message: str, to_verkeys: Sequence[bytes], from_secret: bytes = None
+    message: str,
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
 ) -> bytes:
     """
     Assemble a packed message for a set of recipients, optionally including the sender.
@@ -344,29 +507,60 @@ def encode_pack_message(
         message: The message to pack
         to_verkeys: The verkeys to pack the message for
         from_secret: The sender secret
+        key_cache: Optional cache of key material for the sender and recipients
 
     Returns:
         The encoded message
 
     """
-    recips_json, cek = prepare_pack_recipient_keys(to_verkeys, from_secret)
-    recips_b64 = bytes_to_b64(recips_json.encode("ascii"), urlsafe=True)
+    return encode_pack_messages([message], to_verkeys, from_secret, key_cache)[0]
 
-    ciphertext, nonce, tag = encrypt_plaintext(message, recips_b64.encode("ascii"), cek)
 
-    data = OrderedDict(
-        [
-            ("protected", recips_b64),
-            ("iv", bytes_to_b64(nonce, urlsafe=True)),
-            ("ciphertext", bytes_to_b64(ciphertext, urlsafe=True)),
-            ("tag", bytes_to_b64(tag, urlsafe=True)),
-        ]
-    )
-    return json.dumps(data).encode("ascii")
+def encode_pack_messages(
+    messages: Sequence[str],
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
+) -> Sequence[bytes]:
+    """
+    Assemble packed messages for the same set of recipients.
+
+    The recipients block, and the content encryption key it carries, is prepared
+    once and shared by all of the messages, each of which is encrypted with its
+    own random nonce.
+
+    Args:
+        messages: The messages to pack
+        to_verkeys: The verkeys to pack the messages for
+        from_secret: The sender secret
+        key_cache: Optional cache of key material for the sender and recipients
+
+    Returns:
+        The encoded messages
+
+    """
+    recips_json, cek = prepare_pack_recipient_keys(to_verkeys, from_secret, key_cache)
+    recips_b64 = bytes_to_b64(recips_json.encode("ascii"), urlsafe=True)
+
+    results = []
+    for message in messages:
+        ciphertext, nonce, tag = encrypt_plaintext(
+            message, recips_b64.encode("ascii"), cek
+        )
+        data = OrderedDict(
+            [
+                ("protected", recips_b64),
+                ("iv", bytes_to_b64(nonce, urlsafe=True)),
+                ("ciphertext", bytes_to_b64(ciphertext, urlsafe=True)),
+                ("tag", bytes_to_b64(tag, urlsafe=True)),
+            ]
+        )
+        results.append(json.dumps(data).encode("ascii"))
+    return results
 
 
 def decode_pack_message(
-    enc_message: bytes, find_key: Callable
+    enc_message: bytes, find_key: Callable, key_cache: PackKeyCache = None
 ) -> Tuple[str, Optional[str], str]:
     """
     Decode a packed message.
@@ -378,6 +572,7 @@ def decode_pack_message(
     Args:
         enc_message: The encrypted message
         find_key: Function to retrieve private key
+        key_cache: Optional cache of key material for the sender and recipient
 
     Returns:
         A tuple of (message, sender_vk, recip_vk)
@@ -390,11 +585,77 @@ def decode_pack_message(
 
     """
     wrapper, recips, is_authcrypt = decode_pack_message_outer(enc_message)
+    payload_key, sender_vk, recip_vk = locate_pack_payload_key(
+        recips, is_authcrypt, find_key, key_cache
+    )
+    message = decode_pack_message_payload(wrapper, payload_key)
+    return message, sender_vk, recip_vk
+
+
+def decode_pack_messages(
+    enc_messages: Sequence[bytes], find_key: Callable, key_cache: PackKeyCache = None
+) -> Sequence[Union[Tuple[str, Optional[str], str], Exception]]:
+    """
+    Decode a batch of packed messages.
+
+    The payload key of each distinct recipients block is decrypted once, so
+    messages packed together for the same recipients share the key exchange.
+
+    Args:
+        enc_messages: The encrypted messages
+        find_key: Function to retrieve private key
+        key_cache: Optional cache of key material for the senders and recipients
+
+    Returns:
+        For each message, a tuple of (message, sender_vk, recip_vk), or the
+        `ValueError` or `CryptoError` raised when decoding it
+
+    """
+    payload_keys = {}
+    results = []
+    for enc_message in enc_messages:
+        try:
+            wrapper, recips, is_authcrypt = decode_pack_message_outer(enc_message)
+            protected = wrapper["protected"]
+            if protected not in payload_keys:
+                payload_keys[protected] = locate_pack_payload_key(
+                    recips, is_authcrypt, find_key, key_cache
+                )
+            payload_key, sender_vk, recip_vk = payload_keys[protected]
+            message = decode_pack_message_payload(wrapper, payload_key)
+            results.append((message, sender_vk, recip_vk))
+        except (ValueError, nacl.exceptions.CryptoError) as err:
+            results.append(err)
+    return results
+
+
+def locate_pack_payload_key(
+    recips: dict,
+    is_authcrypt: bool,
+    find_key: Callable,
+    key_cache: PackKeyCache = None,
+) -> Tuple[bytes, Optional[str], str]:
+    """
+    Decrypt the payload key of a packed message for the first known recipient.
+
+    Args:
+        recips: The recipients of the message, as returned by
+            `extract_pack_recipients`
+        is_authcrypt: Whether the message is expected to name the sender
+        find_key: Function to retrieve private key
+        key_cache: Optional cache of key material for the sender and recipient
+
+    Returns:
+        A tuple of (payload_key, sender_vk, recip_vk)
+
+    """
     payload_key, sender_vk = None, None
     for recip_vk in recips:
         recip_secret = find_key(recip_vk)
         if recip_secret:
-            payload_key, sender_vk = extract_payload_key(recips[recip_vk], recip_secret)
+            payload_key, sender_vk = extract_payload_key(
+                recips[recip_vk], recip_secret, key_cache
+            )
             break
 
     if not payload_key:
@@ -403,9 +664,7 @@ def decode_pack_message(
         )
     if not sender_vk and is_authcrypt:
         raise ValueError("Sender public key not provided for Authcrypt message")
-
-    message = decode_pack_message_payload(wrapper, payload_key)
-    return message, sender_vk, recip_vk
+    return payload_key, sender_vk, recip_vk
 
 
 def decode_pack_message_outer(enc_message: bytes) -> Tuple[dict, dict, bool]:
@@ -438,6 +697,27 @@ def decode_pack_message_outer(enc_message: bytes) -> Tuple[dict, dict, bool]:
     return wrapper, recips, is_authcrypt
 
 
+def pack_message_recipient_keys(enc_message: bytes) -> Sequence[str]:
+    """
+    List the recipient verkeys named in the outer wrapper of a packed message.
+
+    This only reads the recipient headers, without validating the message, so
+    the private keys needed to decode it can be looked up ahead of time. A
+    malformed message has no recipient keys.
+
+    Args:
+        enc_message: The encrypted message
+
+    """
+    try:
+        protected = json.loads(enc_message)["protected"]
+        recips_json = b64_to_bytes(protected, urlsafe=True)
+        recipients = json.loads(recips_json)["recipients"]
+        return [recip["header"]["kid"] for recip in recipients]
+    except (ValueError, TypeError, KeyError):
+        return []
+
+
 def decode_pack_message_payload(wrapper: dict, payload_key: bytes) -> str:
     """
     Decode the payload of a packed message once the CEK is known.
@@ -499,27 +779,37 @@ def extract_pack_recipients(recipients: Sequence[dict]) -> dict:
     return result
 
 
-def extract_payload_key(sender_cek: dict, recip_secret: bytes) -> Tuple[bytes, str]:
+def extract_payload_key(
+    sender_cek: dict, recip_secret: bytes, key_cache: PackKeyCache = None
+) -> Tuple[bytes, str]:
     """
     Extract the payload key from pack recipient details.
 
     Returns: A tuple of the CEK and sender verkey
     """
     recip_vk = sign_pk_from_sk(recip_secret)
-    recip_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(recip_vk)
-    recip_sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(recip_secret)
+    if key_cache:
+        recip_pk, recip_sk = key_cache.keypair(recip_secret)
+    else:
+        recip_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(recip_vk)
+        recip_sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(recip_secret)
 
     if sender_cek["nonce"] and sender_cek["sender"]:
         sender_vk_bin = nacl.bindings.crypto_box_seal_open(
             sender_cek["sender"], recip_pk, recip_sk
         )
         sender_vk = sender_vk_bin.decode("ascii")
-        sender_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(
-            b58_to_bytes(sender_vk_bin)
-        )
-        cek = nacl.bindings.crypto_box_open(
-            sender_cek["key"], sender_cek["nonce"], sender_pk, recip_sk
-        )
+        sender_ed_pk = b58_to_bytes(sender_vk_bin)
+        sender_pk = pack_recipient_key(sender_ed_pk)[0]
+        if key_cache:
+            shared = key_cache.shared_key(sender_ed_pk, recip_vk, sender_pk, recip_sk)
+            cek = nacl.bindings.crypto_box_open_afternm(
+                sender_cek["key"], sender_cek["nonce"], shared.buffer
+            )
+        else:
+            cek = nacl.bindings.crypto_box_open(
+                sender_cek["key"], sender_cek["nonce"], sender_pk, recip_sk
+            )
     else:
         sender_vk = None
         cek = nacl.bindings.crypto_box_seal_open(sender_cek["key"], recip_pk, recip_sk)
@@ -38,6 +38,12 @@ class WalletProvider(BaseProvider):
             wallet_cfg["storage_config"] = settings["wallet.storage_config"]
         if "wallet.storage_creds" in settings:
             wallet_cfg["storage_creds"] = settings["wallet.storage_creds"]
+        if "wallet.crypto_workers" in settings:
+            wallet_cfg["crypto_workers"] = settings["wallet.crypto_workers"]
+        if "wallet.crypto_executor" in settings:
+            wallet_cfg["crypto_executor"] = settings["wallet.crypto_executor"]
+        if "wallet.pack_key_cache" in settings:
+            wallet_cfg["pack_key_cache"] = settings["wallet.pack_key_cache"]
         wallet = ClassLoader.load_class(wallet_class)(wallet_cfg)
         await wallet.open()
 
@@ -1,6 +1,9 @@
 import pytest
 import time
 
+from unittest import mock
+
+from aries_cloudagent.wallet import basic as test_module
 from aries_cloudagent.wallet.basic import BasicWallet
 from aries_cloudagent.wallet.error import (
     WalletError,
@@ -301,6 +304,92 @@ class TestBasicWallet:
         with pytest.raises(WalletError):
             await wallet.unpack_message(None)
 
+    @pytest.mark.asyncio
+    async def test_pack_unpack_batch(self, wallet):
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+        messages = [f"{self.test_message} {idx}" for idx in range(3)]
+
+        packed = await wallet.pack_messages(
+            messages, [self.test_target_verkey], self.test_verkey
+        )
+        assert len(packed) == 3
+        unpacked = await wallet.unpack_messages([packed[2], b"bad", None, packed[0]])
+        assert unpacked[0] == (messages[2], self.test_verkey, self.test_target_verkey)
+        assert isinstance(unpacked[1], WalletError)
+        assert "Message not provided" in str(unpacked[2])
+        assert unpacked[3] == (messages[0], self.test_verkey, self.test_target_verkey)
+
+        with pytest.raises(WalletError) as excinfo:
+            await wallet.pack_messages([self.test_message, None], [self.test_verkey])
+        assert "Message not provided" in str(excinfo.value)
+
+    @pytest.mark.asyncio
+    async def test_unpack_recipient_keys_only(self, wallet):
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+        packed = await wallet.pack_message(
+            self.test_message, [self.test_target_verkey], self.test_verkey
+        )
+
+        with mock.patch.object(
+            test_module, "decode_pack_messages", wraps=test_module.decode_pack_messages
+        ) as mock_decode:
+            assert await wallet.unpack_message(packed) == (
+                self.test_message,
+                self.test_verkey,
+                self.test_target_verkey,
+            )
+        find_key = mock_decode.call_args[0][1]
+        assert find_key(self.test_target_verkey)
+        assert find_key(self.test_verkey) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    async def test_pack_unpack_executor(self, executor):
+        wallet = BasicWallet({"crypto_workers": 2, "crypto_executor": executor})
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        assert wallet.crypto_executor is wallet.crypto_executor
+
+        packed = await wallet.pack_message(self.test_message, [self.test_verkey])
+        unpacked, from_verkey, to_verkey = await wallet.unpack_message(packed)
+        assert unpacked == self.test_message
+        assert to_verkey == self.test_verkey
+
+        await wallet.close()
+        assert wallet._crypto_executor is None
+
+    @pytest.mark.asyncio
+    async def test_pack_unpack_key_cache(self):
+        wallet = BasicWallet({"pack_key_cache": 10})
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+        cache = wallet._pack_key_cache
+
+        for _ in range(2):
+            packed = await wallet.pack_message(
+                self.test_message, [self.test_target_verkey], self.test_verkey
+            )
+            assert await wallet.unpack_message(packed) == (
+                self.test_message,
+                self.test_verkey,
+                self.test_target_verkey,
+            )
+        assert cache.hits and cache.misses
+        assert cache._shared_keys
+
+        # rotating a key discards the key material derived from it
+        await wallet.rotate_did_keypair_start(self.test_did)
+        await wallet.rotate_did_keypair_apply(self.test_did)
+        assert not cache._shared_keys
+
+        await wallet.close()
+        assert not cache._keypairs
+
+    def test_executor_x(self):
+        with pytest.raises(WalletError):
+            BasicWallet({"crypto_workers": 2, "crypto_executor": "fiber"})
+
     @pytest.mark.asyncio
     async def test_signature_round_trip(self, wallet):
         key_info = await wallet.create_signing_key()
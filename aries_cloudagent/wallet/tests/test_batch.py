@@ -0,0 +1,103 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ..basic import BasicWallet
+from ..batch import WalletBatcher
+from ..error import WalletError
+
+
+class TestWalletBatcher(AsyncTestCase):
+    test_message = "test message"
+
+    async def setUp(self):
+        self.wallet = BasicWallet()
+        self.sender = await self.wallet.create_local_did()
+        self.recipient = await self.wallet.create_local_did()
+
+    async def test_pack_unpack(self):
+        batcher = WalletBatcher(max_batch=2)
+        with async_mock.patch.object(
+            self.wallet, "pack_messages", wraps=self.wallet.pack_messages
+        ) as mock_pack:
+            packed = await asyncio.gather(
+                *(
+                    batcher.pack_message(
+                        self.wallet,
+                        f"{self.test_message} {idx}",
+                        [self.recipient.verkey],
+                        self.sender.verkey,
+                    )
+                    for idx in range(3)
+                ),
+                batcher.pack_message(
+                    self.wallet, self.test_message, [self.recipient.verkey]
+                ),
+            )
+            assert [len(call[0][0]) for call in mock_pack.call_args_list] == [2, 1, 1]
+
+        with async_mock.patch.object(
+            self.wallet, "unpack_messages", wraps=self.wallet.unpack_messages
+        ) as mock_unpack:
+            unpacked = await asyncio.gather(
+                *(batcher.unpack_message(self.wallet, message) for message in packed)
+            )
+            assert mock_unpack.call_count == 2
+        assert unpacked == [
+            (f"{self.test_message} {idx}", self.sender.verkey, self.recipient.verkey)
+            for idx in range(3)
+        ] + [(self.test_message, None, self.recipient.verkey)]
+
+    async def test_unpack_x(self):
+        batcher = WalletBatcher()
+        packed = await batcher.pack_message(
+            self.wallet, self.test_message, [self.recipient.verkey]
+        )
+        results = await asyncio.gather(
+            batcher.unpack_message(self.wallet, packed),
+            batcher.unpack_message(self.wallet, b"bad"),
+            return_exceptions=True,
+        )
+        assert results[0] == (self.test_message, None, self.recipient.verkey)
+        assert isinstance(results[1], WalletError)
+
+    async def test_pack_x(self):
+        batcher = WalletBatcher()
+        with self.assertRaises(WalletError):
+            await batcher.pack_message(
+                self.wallet, self.test_message, [self.recipient.verkey], "unknown"
+            )
+
+    async def test_close(self):
+        batcher = WalletBatcher()
+        queued = asyncio.ensure_future(
+            batcher.pack_message(self.wallet, self.test_message, [self.recipient.verkey])
+        )
+        await asyncio.sleep(0)
+        batcher.close()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        assert not batcher._pending
+
+        started = asyncio.Event()
+        with async_mock.patch.object(
+            self.wallet, "pack_messages", async_mock.CoroutineMock()
+        ) as mock_pack:
+
+            async def pack_messages(*args):
+                started.set()
+                await asyncio.sleep(10)
+
+            mock_pack.side_effect = pack_messages
+            running = asyncio.ensure_future(
+                batcher.pack_message(
+                    self.wallet, self.test_message, [self.recipient.verkey]
+                )
+            )
+            await started.wait()
+            assert len(batcher._tasks) == 1
+            batcher.close()
+            with self.assertRaises(asyncio.CancelledError):
+                await running
+        await asyncio.sleep(0)
+        assert not batcher._tasks
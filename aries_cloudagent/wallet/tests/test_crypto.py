@@ -139,3 +139,79 @@ class TestUtil(TestCase):
                 ]
             )
         assert "Unexpected iv" in str(excinfo.value)
+
+    def test_pack_messages(self):
+        (recip_vk, recip_sk) = test_module.create_keypair()
+        (sender_vk, sender_sk) = test_module.create_keypair()
+        sender_vk_b58 = test_module.bytes_to_b58(sender_vk)
+        messages = ["one", "two", "three"]
+        packed = test_module.encode_pack_messages(messages, [recip_vk], sender_sk)
+        wrappers = [json.loads(message) for message in packed]
+        assert len({wrapper["protected"] for wrapper in wrappers}) == 1
+        assert test_module.pack_message_recipient_keys(packed[0]) == [
+            test_module.bytes_to_b58(recip_vk)
+        ]
+        assert test_module.pack_message_recipient_keys(b"bad") == []
+        assert test_module.pack_message_recipient_keys(b'{"protected": 1}') == []
+        assert len({wrapper["iv"] for wrapper in wrappers}) == 3
+
+        find_key = mock.MagicMock(return_value=recip_sk)
+        with mock.patch.object(
+            test_module, "extract_payload_key", wraps=test_module.extract_payload_key
+        ) as mock_extract:
+            results = test_module.decode_pack_messages(
+                packed + [b"bad", packed[0][:-20]], find_key
+            )
+            assert mock_extract.call_count == 1
+        assert results[:3] == [
+            (message, sender_vk_b58, test_module.bytes_to_b58(recip_vk))
+            for message in messages
+        ]
+        assert isinstance(results[3], ValueError)
+        assert isinstance(results[4], ValueError)
+
+    def test_pack_key_cache(self):
+        (recip_vk, recip_sk) = test_module.create_keypair()
+        (sender_vk, sender_sk) = test_module.create_keypair()
+        sender_cache = test_module.PackKeyCache()
+        recip_cache = test_module.PackKeyCache()
+
+        for _ in range(3):
+            packed = test_module.encode_pack_message(
+                "message", [recip_vk], sender_sk, sender_cache
+            )
+            for cache in (recip_cache, None):
+                assert test_module.decode_pack_message(
+                    packed, lambda _: recip_sk, cache
+                ) == (
+                    "message",
+                    test_module.bytes_to_b58(sender_vk),
+                    test_module.bytes_to_b58(recip_vk),
+                )
+        assert (sender_cache.hits, sender_cache.misses) == (4, 2)
+        assert (recip_cache.hits, recip_cache.misses) == (4, 2)
+
+        # the same shared key is agreed from either side
+        shared = sender_cache.shared_key(sender_vk, recip_vk, None, None)
+        assert test_module.ffi.buffer(shared.buffer)[:] == test_module.ffi.buffer(
+            recip_cache.shared_key(sender_vk, recip_vk, None, None).buffer
+        )[:]
+
+        # shared keys are zeroed once wiped and no longer in use
+        buffer = shared.buffer
+        del shared
+        sender_cache.wipe(recip_vk)
+        assert test_module.ffi.buffer(buffer)[:] == bytes(len(buffer))
+        assert len(sender_cache._keypairs) == 1
+        assert not sender_cache._shared_keys
+        sender_cache.wipe()
+        assert not sender_cache._keypairs
+
+    def test_pack_key_cache_evict(self):
+        cache = test_module.PackKeyCache(max_size=2)
+        secrets = [test_module.create_keypair()[1] for _ in range(3)]
+        for secret in secrets:
+            cache.keypair(secret)
+        assert list(cache._keypairs) == [
+            test_module.sign_pk_from_sk(secret) for secret in secrets[1:]
+        ]
@@ -17,12 +17,15 @@ class TestProvider(AsyncTestCase):
                 "wallet.storage_type": "storage_type",
                 "wallet.storage_config": "storage_config",
                 "wallet.storage_creds": "storage_creds",
+                "wallet.crypto_workers": 2,
+                "wallet.crypto_executor": "thread",
             }
         )
         wallet = await provider.provide(settings, None)
 
         assert wallet.opened
         assert wallet.name == "name"
+        assert wallet.crypto_executor
         await wallet.close()
 
     @pytest.mark.indy
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for fanning out admin events to websocket clients.
+
+Compares the event bus, which serializes each event once and adds it to a
+bounded buffer for each client, against the previous approach of awaiting an
+unbounded queue for each client in turn and serializing the event again as it
+is sent to each client. One client in each run never reads its events.
+
+Usage: python scripts/bench_admin_events.py [--events N] [--clients N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.admin.event_bus import AdminEventBus  # noqa: E402
+from aries_cloudagent.transport.queue.basic import BasicMessageQueue  # noqa: E402
+
+PAYLOAD = {
+    "connection_id": "f2d4b0c0-5ea2-4b0f-a5c8-1c7b9f0ad2d6",
+    "state": "active",
+    "their_label": "Bench",
+    "routing_state": "none",
+    "created_at": "2020-01-01 00:00:00Z",
+    "updated_at": "2020-01-01 00:00:00Z",
+}
+
+
+async def run_queues(events: int, clients: int):
+    """Publish events to a queue per client, serializing as each is sent."""
+    queues = [BasicMessageQueue() for _ in range(clients)]
+    for queue in queues:
+        queue.authenticated = True
+    start = time.perf_counter()
+    for i in range(events):
+        for queue in queues:
+            if queue.authenticated:
+                await queue.enqueue({"topic": "connections", "payload": PAYLOAD})
+        # the readers, except for the last
+        for queue in queues[:-1]:
+            while not queue.queue.empty():
+                json.dumps(queue.queue.get_nowait())
+    elapsed = time.perf_counter() - start
+    held = queues[-1].queue.qsize()
+    return elapsed, held
+
+
+async def run_bus(events: int, clients: int):
+    """Publish events through the event bus."""
+    bus = AdminEventBus(max_size=1000)
+    subscribers = [bus.subscribe(authenticated=True) for _ in range(clients)]
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish("connections", PAYLOAD)
+        for subscriber in subscribers[:-1]:
+            await subscriber.get()
+    elapsed = time.perf_counter() - start
+    held = subscribers[-1].lag
+    return elapsed, held
+
+
+async def run(events: int, clients: int):
+    """Run the benchmark."""
+    print(f"{events} events to {clients} clients, one of which is not reading")
+    for name, method in (("queues", run_queues), ("event bus", run_bus)):
+        elapsed, held = await method(events, clients)
+        print(
+            f"{name:>10}: {elapsed:.2f}s, {events / elapsed:.0f} events/s, "
+            f"{held} events held for the idle client"
+        )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.events, args.clients))
+
+
+if __name__ == "__main__":
+    main()
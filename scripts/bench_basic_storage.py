@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Benchmark for the indexed in-memory storage.
+
+Compares BasicStorage against a store which, like the previous implementation,
+keeps all records in one ordered dictionary and matches every record of every
+type against each search. Reports the time to add the records, the memory they
+use and the time taken by several kinds of search.
+
+Usage: python scripts/bench_basic_storage.py [--sizes N,N,...] [--queries N]
+    [--types N]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.storage.basic import (  # noqa: E402
+    BasicStorage,
+    basic_tag_query_match,
+)
+from aries_cloudagent.storage.record import StorageRecord  # noqa: E402
+
+STATES = ("invitation", "request", "response", "active", "completed")
+
+
+class ScanStorage(BasicStorage):
+    """In-memory storage matching every stored record on each search."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._all = OrderedDict()
+
+    async def add_record(self, record: StorageRecord):
+        """Add a record to the store."""
+        self._all[record.id] = record
+
+    async def search(self, type_filter: str, tag_query: dict):
+        """Find all records of a type matching a tag query."""
+        return [
+            record
+            for record in self._all.values()
+            if record.type == type_filter
+            and basic_tag_query_match(record.tags, tag_query)
+        ]
+
+
+async def indexed_search(store: BasicStorage, type_filter: str, tag_query: dict):
+    """Find all records of a type matching a tag query."""
+    return await store.search_records(type_filter, tag_query).fetch_all()
+
+
+def make_records(size: int, types: int):
+    """Create records with a mix of types and tags."""
+    rand = random.Random(size)
+    return [
+        StorageRecord(
+            type=f"record_type_{i % types}",
+            value='{"created_at": "2020-01-01 00:00:00Z"}',
+            tags={
+                "state": rand.choice(STATES),
+                "their_did": f"did:{i}",
+                "thread_id": f"thread-{i}",
+                "count": str(i % 100),
+            },
+            id=f"record-{i}",
+        )
+        for i in range(size)
+    ]
+
+
+async def run_store(name: str, make_store, search, size: int, queries: int, types: int):
+    """Run the benchmark against one store."""
+    # measure the memory held by the store, including the records
+    gc.collect()
+    tracemalloc.start()
+    store = make_store()
+    for record in make_records(size, types):
+        await store.add_record(record)
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+
+    records = make_records(size, types)
+    store = make_store()
+    start = time.perf_counter()
+    for record in records:
+        await store.add_record(record)
+    add_time = time.perf_counter() - start
+    del records
+
+    rand = random.Random(queries)
+    searches = {
+        "unique tag": lambda i: {"their_did": f"did:{i}"},
+        "tag and tag": lambda i: {"state": "active", "count": str(i % 100)},
+        "$in": lambda i: {"thread_id": {"$in": [f"thread-{i}", f"thread-{i + 1}"]}},
+        "$or/$not": lambda i: {
+            "$or": [{"count": "1"}, {"count": "2"}],
+            "$not": {"state": "active"},
+        },
+        "unindexed": lambda i: {"count": {"$gte": "99"}, "state": "completed"},
+    }
+    results = []
+    for search_name, make_query in searches.items():
+        start = time.perf_counter()
+        for _ in range(queries):
+            i = rand.randrange(size)
+            await search(store, f"record_type_{i % types}", make_query(i))
+        elapsed = time.perf_counter() - start
+        results.append(f"{search_name} {elapsed / queries * 1e3:.3f}ms")
+    print(
+        f"{name:>8}: add {add_time / size * 1e6:.1f}us/record, "
+        f"{memory / size:.0f} bytes/record; search " + ", ".join(results)
+    )
+
+
+async def run(sizes, queries: int, types: int):
+    """Run the benchmark."""
+    for size in sizes:
+        print(f"{size} records of {types} types, {queries} searches of each kind")
+        await run_store(
+            "scan",
+            ScanStorage,
+            lambda store, type_filter, query: store.search(type_filter, query),
+            size,
+            queries,
+            types,
+        )
+        await run_store("indexed", BasicStorage, indexed_search, size, queries, types)
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--types", type=int, default=10)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    asyncio.get_event_loop().run_until_complete(run(sizes, args.queries, args.types))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for packing messages with forward wrapping.
+
+Compares PackWireFormat.pack against the previous forward wrapping path, which
+parsed each packed message and serialized it again through a Forward message.
+
+Usage: python scripts/bench_forward_pack.py [--count N] [--hops N] [--size BYTES]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.config.injection_context import InjectionContext  # noqa: E402
+from aries_cloudagent.protocols.routing.v1_0.messages.forward import (  # noqa: E402
+    Forward,
+)
+from aries_cloudagent.transport.pack_format import PackWireFormat  # noqa: E402
+from aries_cloudagent.wallet.base import BaseWallet  # noqa: E402
+from aries_cloudagent.wallet.basic import BasicWallet  # noqa: E402
+
+
+async def pack_previous(wallet, message_json, recipient_keys, routing_keys, sender):
+    """Pack a message using the parse and serialize forward path."""
+    message = await wallet.pack_message(message_json, recipient_keys, sender)
+    recip_keys = recipient_keys
+    for router_key in routing_keys:
+        message = json.loads(message.decode("utf-8"))
+        fwd_msg = Forward(to=recip_keys[0], msg=message)
+        recip_keys = [router_key]
+        message = await wallet.pack_message(fwd_msg.to_json(), recip_keys)
+    return message
+
+
+async def run(count: int, hops: int, size: int):
+    """Run the benchmark."""
+    wallet = BasicWallet()
+    context = InjectionContext(enforce_typing=False)
+    context.injector.bind_instance(BaseWallet, wallet)
+    sender = await wallet.create_local_did()
+    recipient = await wallet.create_local_did()
+    routers = [await wallet.create_local_did() for _ in range(hops)]
+    recipient_keys = [recipient.verkey]
+    routing_keys = [router.verkey for router in routers]
+    message_json = json.dumps(
+        {
+            "@type": "https://didcomm.org/basicmessage/1.0/message",
+            "@id": "d6f1c2a3-55b1-4c2f-8dd1-4b2e0f6c2c11",
+            "content": "x" * size,
+        }
+    )
+    wire_format = PackWireFormat()
+
+    async def current():
+        return await wire_format.pack(
+            context, message_json, recipient_keys, routing_keys, sender.verkey
+        )
+
+    async def previous():
+        return await pack_previous(
+            wallet, message_json, recipient_keys, routing_keys, sender.verkey
+        )
+
+    print(f"{count} messages, {hops} routing hops, {size} byte content")
+    for name, method in (("previous", previous), ("current", current)):
+        await method()  # warm up
+        start = time.perf_counter()
+        for _ in range(count):
+            await method()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10}: {elapsed:.3f}s, {elapsed / count * 1e6:.1f}us per message")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.count, args.hops, args.size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for relaying forward messages through a mediator.
+
+Compares the conductor relay path, which leaves the forwarded message serialized,
+against the previous path, which parsed the forward message completely and
+dispatched it to the forward message handler.
+
+Usage: python scripts/bench_forward_relay.py [--count N] [--size BYTES]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.cache.base import BaseCache  # noqa: E402
+from aries_cloudagent.cache.basic import BasicCache  # noqa: E402
+from aries_cloudagent.config.injection_context import InjectionContext  # noqa: E402
+from aries_cloudagent.connections.models.connection_record import (  # noqa: E402
+    ConnectionRecord,
+)
+from aries_cloudagent.connections.models.diddoc import (  # noqa: E402
+    DIDDoc,
+    PublicKey,
+    PublicKeyType,
+    Service,
+)
+from aries_cloudagent.core.conductor import Conductor  # noqa: E402
+from aries_cloudagent.core.dispatcher import Dispatcher  # noqa: E402
+from aries_cloudagent.core.protocol_registry import ProtocolRegistry  # noqa: E402
+from aries_cloudagent.protocols.connections.v1_0.manager import (  # noqa: E402
+    ConnectionManager,
+)
+from aries_cloudagent.protocols.routing.v1_0.manager import (  # noqa: E402
+    RoutingManager,
+)
+from aries_cloudagent.protocols.routing.v1_0.message_types import (  # noqa: E402
+    MESSAGE_TYPES,
+)
+from aries_cloudagent.protocols.routing.v1_0.routing_table import (  # noqa: E402
+    RoutingTable,
+)
+from aries_cloudagent.storage.base import BaseStorage  # noqa: E402
+from aries_cloudagent.storage.basic import BasicStorage  # noqa: E402
+from aries_cloudagent.transport.inbound.message import InboundMessage  # noqa: E402
+from aries_cloudagent.transport.inbound.receipt import MessageReceipt  # noqa: E402
+from aries_cloudagent.transport.pack_format import PackWireFormat  # noqa: E402
+from aries_cloudagent.wallet.base import BaseWallet  # noqa: E402
+from aries_cloudagent.wallet.basic import BasicWallet  # noqa: E402
+
+
+async def setup_mediator(wallet: BaseWallet, context: InjectionContext, size: int):
+    """Register a mediated recipient and pack a forward message for it."""
+    mediator = await wallet.create_local_did()
+    recipient = await wallet.create_local_did()
+    client = await wallet.create_local_did()
+
+    # the connection from the mediator to the mediated client
+    doc = DIDDoc(did=client.did)
+    key = PublicKey(
+        client.did, "1", client.verkey, PublicKeyType.ED25519_SIG_2018, client.did
+    )
+    doc.set(key)
+    doc.set(Service(client.did, "indy", "IndyAgent", [key], [], "http://localhost"))
+    await ConnectionManager(context).store_did_document(doc)
+    connection = ConnectionRecord(
+        my_did=mediator.did, their_did=client.did, state=ConnectionRecord.STATE_ACTIVE
+    )
+    await connection.save(context)
+    await RoutingManager(context).create_route_record(
+        connection.connection_id, recipient.verkey
+    )
+
+    message_json = json.dumps(
+        {
+            "@type": "https://didcomm.org/basicmessage/1.0/message",
+            "@id": "d6f1c2a3-55b1-4c2f-8dd1-4b2e0f6c2c11",
+            "content": "x" * size,
+        }
+    )
+    return await PackWireFormat().pack(
+        context, message_json, [recipient.verkey], [mediator.verkey], client.verkey
+    )
+
+
+async def run(count: int, size: int):
+    """Run the benchmark."""
+    wallet = BasicWallet()
+    context = InjectionContext(enforce_typing=False)
+    context.injector.bind_instance(BaseCache, BasicCache())
+    context.injector.bind_instance(BaseStorage, BasicStorage())
+    context.injector.bind_instance(BaseWallet, wallet)
+    context.injector.bind_instance(RoutingTable, RoutingTable())
+    registry = ProtocolRegistry()
+    registry.register_message_types(MESSAGE_TYPES)
+    context.injector.bind_instance(ProtocolRegistry, registry)
+    packed = await setup_mediator(wallet, context, size)
+
+    wire_format = PackWireFormat()
+    dispatcher = Dispatcher(context)
+    await dispatcher.setup()
+    conductor = Conductor(None)
+    conductor.context = context
+    relayed = []
+
+    async def send_outbound(context, outbound, inbound=None):
+        relayed.append(outbound.enc_payload)
+
+    conductor.outbound_message_router = send_outbound
+
+    async def current():
+        payload, receipt = await wire_format.parse_message(context, packed)
+        message = InboundMessage(payload, receipt)
+        assert conductor.is_relay_forward(message)
+        await conductor.relay_forward(message)
+
+    async def previous():
+        receipt = MessageReceipt()
+        message_json = await wire_format.unpack(context, packed, receipt)
+        message = InboundMessage(json.loads(message_json), receipt)
+        await dispatcher.handle_message(message, send_outbound)
+
+    print(f"{count} forward messages, {size} byte content")
+    for name, method in (("previous", previous), ("current", current)):
+        await method()  # warm up
+        relayed.clear()
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(count):
+            started = time.perf_counter()
+            await method()
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - start
+        assert len(relayed) == count
+        latencies.sort()
+        print(
+            f"{name:>10}: {count / elapsed:.0f} msg/s, "
+            f"{elapsed / count * 1e6:.1f}us mean, "
+            f"{latencies[int(count * 0.95)] * 1e6:.1f}us p95 per message"
+        )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.count, args.size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark for dispatching inbound messages in worker processes.
+
+Sends plain JSON trust ping messages through an inbound session, and reports the
+rate at which they are parsed and dispatched in the main process, and by pools
+of inbound worker processes. Any gain from the workers is limited by the number
+of CPU cores available, and by the cost of the handlers compared to passing the
+messages between processes.
+
+Usage: python scripts/bench_inbound_workers.py [--count N] [--workers N [N ...]]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.config.default_context import (  # noqa: E402
+    DefaultContextBuilder,
+)
+from aries_cloudagent.core.dispatcher import Dispatcher  # noqa: E402
+from aries_cloudagent.core.worker_pool import InboundWorkerPool  # noqa: E402
+from aries_cloudagent.transport.inbound.session import InboundSession  # noqa: E402
+from aries_cloudagent.transport.wire_format import BaseWireFormat  # noqa: E402
+
+SETTINGS = {"wallet.type": "basic", "log.level": "error"}
+
+
+def make_payloads(count: int):
+    """Create the message payloads."""
+    return [
+        json.dumps(
+            {
+                "@type": "https://didcomm.org/trust_ping/1.0/ping",
+                "@id": str(i),
+                "comment": "x" * 200,
+                "response_requested": True,
+            }
+        )
+        for i in range(count)
+    ]
+
+
+async def send_all(session: InboundSession, payloads, done: list):
+    """Send every payload and wait for dispatch to complete."""
+    start = time.perf_counter()
+    await asyncio.gather(*(session.receive(payload) for payload in payloads))
+    while len(done) < len(payloads):
+        await asyncio.sleep(0.001)
+    return time.perf_counter() - start
+
+
+async def run_main(payloads):
+    """Parse and dispatch the messages in the main process."""
+    context = await DefaultContextBuilder(SETTINGS).build()
+    dispatcher = Dispatcher(context)
+    await dispatcher.setup()
+    done = []
+
+    async def send_outbound(*args):
+        pass
+
+    def inbound_handler(message, can_respond=False):
+        dispatcher.queue_message(
+            message, send_outbound, None, lambda completed: done.append(completed)
+        )
+
+    session = InboundSession(
+        context=context,
+        inbound_handler=inbound_handler,
+        session_id="bench",
+        wire_format=await context.inject(BaseWireFormat),
+    )
+    return await send_all(session, payloads, done)
+
+
+async def run_workers(payloads, workers: int):
+    """Parse and dispatch the messages in worker processes."""
+    done = []
+
+    async def send_outbound(*args):
+        pass
+
+    pool = InboundWorkerPool(
+        SETTINGS,
+        workers,
+        send_outbound,
+        dispatch_complete=lambda message, fatal: done.append(message),
+    )
+    pool.start()
+    session = InboundSession(
+        context=None,
+        inbound_handler=None,
+        session_id="bench",
+        wire_format=None,
+        remote_handler=pool.receive,
+    )
+    # wait for the workers to start up
+    await send_all(session, payloads[:1], done)
+    done.clear()
+    try:
+        return await send_all(session, payloads, done)
+    finally:
+        await pool.stop(5.0)
+
+
+async def run(count: int, workers):
+    """Run the benchmark."""
+    logging.disable(logging.WARNING)
+    payloads = make_payloads(count)
+    print(f"{count} messages, {os.cpu_count()} CPU cores")
+    elapsed = await run_main(payloads)
+    print(f"main process: {elapsed:.2f}s, {count / elapsed:.0f} messages/s")
+    for worker_count in workers:
+        elapsed = await run_workers(payloads, worker_count)
+        print(
+            f"  {worker_count:>2} workers: {elapsed:.2f}s, "
+            f"{count / elapsed:.0f} messages/s"
+        )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.count, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for Dispatcher.make_message throughput.
+
+Compares message class resolution through the ProtocolRegistry cache with
+uncached resolution, for directly registered and version-matched types.
+
+Usage: python scripts/bench_make_message.py [--count N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.config.injection_context import InjectionContext  # noqa: E402
+from aries_cloudagent.core.dispatcher import Dispatcher  # noqa: E402
+from aries_cloudagent.core.protocol_registry import ProtocolRegistry  # noqa: E402
+from aries_cloudagent.protocols.basicmessage.v1_0 import (  # noqa: E402
+    message_types as basicmessage_types,
+)
+from aries_cloudagent.protocols.didcomm_prefix import DIDCommPrefix  # noqa: E402
+from aries_cloudagent.protocols.trustping.v1_0 import (  # noqa: E402
+    message_types as trustping_types,
+)
+
+VERSION_DEFINITION = {
+    "major_version": 1,
+    "minimum_minor_version": 0,
+    "current_minor_version": 0,
+    "path": "v1_0",
+}
+
+
+async def run(count: int):
+    """Run the benchmark."""
+    registry = ProtocolRegistry()
+    for module in (trustping_types, basicmessage_types):
+        registry.register_message_types(
+            module.MESSAGE_TYPES, version_definition=VERSION_DEFINITION
+        )
+    context = InjectionContext(enforce_typing=False)
+    context.injector.bind_instance(ProtocolRegistry, registry)
+    dispatcher = Dispatcher(context)
+
+    messages = {
+        "direct": {
+            "@type": DIDCommPrefix.qualify_current(trustping_types.PING),
+            "@id": "6a2c4c3e-3b1f-4f5c-9b7a-7f0f7f0f7f0f",
+            "response_requested": True,
+        },
+        "by version": {
+            "@type": DIDCommPrefix.qualify_current("trust_ping/1.3/ping"),
+            "@id": "6a2c4c3e-3b1f-4f5c-9b7a-7f0f7f0f7f0f",
+            "response_requested": True,
+        },
+    }
+    cached = registry.resolve_message_class
+
+    print(f"{count} messages per run")
+    for name, message in messages.items():
+        for mode in ("uncached", "cached"):
+            registry.resolve_message_class = (
+                cached if mode == "cached" else registry._resolve_message_class
+            )
+            await dispatcher.make_message(message)  # warm up
+            start = time.perf_counter()
+            for _ in range(count):
+                await dispatcher.make_message(message)
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(count):
+                registry.resolve_message_class(message["@type"])
+            resolve = time.perf_counter() - start
+            print(
+                f"{name:>10} {mode:>8}: {count / elapsed:,.0f} messages/s, "
+                f"{elapsed / count * 1e6:.1f}us per message, "
+                f"{resolve / count * 1e6:.2f}us in class resolution"
+            )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.count))
+
+
+if __name__ == "__main__":
+    main()
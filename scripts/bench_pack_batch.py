@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for batch packing and unpacking with the basic wallet.
+
+Compares concurrent single-message pack and unpack calls against batch calls,
+with the crypto running in the default executor or a dedicated worker pool.
+
+Usage: python scripts/bench_pack_batch.py [--count N] [--batch N] [--size BYTES]
+    [--workers N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.wallet.basic import BasicWallet  # noqa: E402
+
+
+async def run_wallet(name: str, wallet: BasicWallet, count: int, batch: int, size: int):
+    """Run the benchmark against one wallet configuration."""
+    sender = await wallet.create_local_did()
+    recipient = await wallet.create_local_did()
+    message_json = json.dumps(
+        {
+            "@type": "https://didcomm.org/basicmessage/1.0/message",
+            "@id": "d6f1c2a3-55b1-4c2f-8dd1-4b2e0f6c2c11",
+            "content": "x" * size,
+        }
+    )
+    messages = [message_json] * batch
+    keys = ([recipient.verkey], sender.verkey)
+
+    async def single():
+        packed = await asyncio.gather(
+            *(wallet.pack_message(message, *keys) for message in messages)
+        )
+        await asyncio.gather(*(wallet.unpack_message(message) for message in packed))
+
+    async def batched():
+        packed = await wallet.pack_messages(messages, *keys)
+        await wallet.unpack_messages(packed)
+
+    for method_name, method in (("single", single), ("batch", batched)):
+        await method()  # warm up
+        start = time.perf_counter()
+        for _ in range(count // batch):
+            await method()
+        elapsed = time.perf_counter() - start
+        total = count // batch * batch
+        print(
+            f"{name:>10} {method_name:>6}: {total / elapsed:.0f} msg/s, "
+            f"{elapsed / total * 1e6:.1f}us per pack and unpack"
+        )
+    await wallet.close()
+
+
+async def run(count: int, batch: int, size: int, workers: int):
+    """Run the benchmark."""
+    print(f"{count} messages in batches of {batch}, {size} byte content")
+    await run_wallet("default", BasicWallet(), count, batch, size)
+    for executor in (BasicWallet.EXECUTOR_THREAD, BasicWallet.EXECUTOR_PROCESS):
+        wallet = BasicWallet({"crypto_workers": workers, "crypto_executor": executor})
+        await run_wallet(executor, wallet, count, batch, size)
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        run(args.count, args.batch, args.size, args.workers)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for the pack key cache.
+
+Measures the CPU time spent packing and unpacking authcrypted messages between
+the same sender and recipients, with and without a PackKeyCache.
+
+Usage: python scripts/bench_pack_key_cache.py [--count N] [--recipients N]
+    [--size BYTES]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.wallet.crypto import (  # noqa: E402
+    PackKeyCache,
+    create_keypair,
+    decode_pack_message,
+    encode_pack_message,
+)
+
+
+def run(count: int, recipients: int, size: int):
+    """Run the benchmark."""
+    sender_vk, sender_sk = create_keypair()
+    recip_keys = [create_keypair() for _ in range(recipients)]
+    to_verkeys = [verkey for (verkey, _) in recip_keys]
+    recip_secret = recip_keys[0][1]
+    message_json = json.dumps(
+        {
+            "@type": "https://didcomm.org/basicmessage/1.0/message",
+            "@id": "d6f1c2a3-55b1-4c2f-8dd1-4b2e0f6c2c11",
+            "content": "x" * size,
+        }
+    )
+
+    print(f"{count} messages, {recipients} recipients, {size} byte content")
+    for name, sender_cache, recip_cache in (
+        ("uncached", None, None),
+        ("cached", PackKeyCache(), PackKeyCache()),
+    ):
+        pack_time = unpack_time = 0.0
+        for _ in range(count):
+            start = time.process_time()
+            packed = encode_pack_message(
+                message_json, to_verkeys, sender_sk, sender_cache
+            )
+            packed_at = time.process_time()
+            decode_pack_message(packed, lambda _: recip_secret, recip_cache)
+            end = time.process_time()
+            pack_time += packed_at - start
+            unpack_time += end - packed_at
+        print(
+            f"{name:>10}: {pack_time / count * 1e6:.1f}us pack, "
+            f"{unpack_time / count * 1e6:.1f}us unpack CPU per message"
+        )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--recipients", type=int, default=1)
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+    run(args.count, args.recipients, args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for timing statistics and the metrics endpoint.
+
+Reports the cost of logging a timing entry with and without the latency
+histograms, the cost of a timer when no collector is configured, and the time
+taken to render the metrics text for a number of timed operations.
+
+Usage: python scripts/bench_stats.py [--count N] [--names N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.utils.stats import Collector, Stats  # noqa: E402
+
+
+class CountOnlyStats(Stats):
+    """Statistics without latency histograms, as before."""
+
+    def log(self, name: str, duration: float):
+        """Log an entry in the stats."""
+        if name in self.counts:
+            self.counts[name] += 1
+            self.max_time[name] = max(self.max_time[name], duration)
+            self.min_time[name] = min(self.min_time[name], duration)
+            self.total_time[name] += duration
+        else:
+            self.counts[name] = 1
+            self.max_time[name] = duration
+            self.min_time[name] = duration
+            self.total_time[name] = duration
+
+
+def time_logging(collector: Collector, names, durations) -> float:
+    """Log each duration and return the time per entry."""
+    start = time.perf_counter()
+    for name, duration in zip(names, durations):
+        collector.log(name, duration)
+    return (time.perf_counter() - start) / len(durations)
+
+
+def run(count: int, name_count: int):
+    """Run the benchmark."""
+    rand = random.Random(count)
+    all_names = [f"Handler{i}.handle" for i in range(name_count)]
+    names = [rand.choice(all_names) for _ in range(count)]
+    durations = [rand.lognormvariate(-6, 1.5) for _ in range(count)]
+
+    baseline = Collector()
+    baseline._stats = CountOnlyStats()
+    per_entry = time_logging(baseline, names, durations)
+    print(f"count only: {per_entry * 1e9:.0f}ns per entry")
+
+    collector = Collector()
+    per_entry = time_logging(collector, names, durations)
+    print(f"histograms: {per_entry * 1e9:.0f}ns per entry")
+
+    disabled = Collector(enabled=False)
+    per_entry = time_logging(disabled, names, durations)
+    print(f"  disabled: {per_entry * 1e9:.0f}ns per entry")
+
+    collector.add_gauges("queues", lambda: {"out_new": 0, "task_active": 1})
+    start = time.perf_counter()
+    text = collector.render_metrics()
+    elapsed = time.perf_counter() - start
+    print(
+        f"    render: {elapsed * 1e3:.2f}ms for {name_count} operations, "
+        f"{len(text)} bytes"
+    )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--names", type=int, default=50)
+    args = parser.parse_args()
+    run(args.count, args.names)
+
+
+if __name__ == "__main__":
+    main()
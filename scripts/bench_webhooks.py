@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark for webhook delivery to a local webhook target.
+
+Sends a series of connection state updates through the outbound transport
+manager to an HTTP server on localhost, posting each webhook separately and
+then in batches, with and without coalescing of state updates. Reports the
+time until every webhook has been delivered and the number of HTTP requests
+and events received by the target.
+
+Usage: python scripts/bench_webhooks.py [--count N] [--records N]
+    [--batch-size N] [--batch-delay SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aries_cloudagent.config.injection_context import InjectionContext  # noqa: E402
+from aries_cloudagent.transport.outbound.manager import (  # noqa: E402
+    OutboundTransportManager,
+)
+
+STATES = ("invitation", "request", "response", "active")
+
+
+class WebhookTarget:
+    """Local webhook target counting the requests and events received."""
+
+    def __init__(self):
+        """Initialize the target."""
+        self.requests = 0
+        self.events = 0
+        self.runner = None
+        self.url = None
+
+    async def receive_single(self, request: web.Request):
+        """Receive a single webhook event."""
+        await request.json()
+        self.requests += 1
+        self.events += 1
+        return web.Response()
+
+    async def receive_batch(self, request: web.Request):
+        """Receive a batch of webhook events."""
+        events = await request.json()
+        self.requests += 1
+        self.events += len(events)
+        return web.Response()
+
+    async def start(self):
+        """Start the HTTP server on a free port."""
+        app = web.Application()
+        app.add_routes(
+            [
+                web.post("/webhooks/topic/{topic}/", self.receive_single),
+                web.post("/webhooks/batch/", self.receive_batch),
+            ]
+        )
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/webhooks"
+
+    async def stop(self):
+        """Stop the HTTP server."""
+        await self.runner.cleanup()
+
+
+async def run_mode(name: str, settings: dict, count: int, records: int):
+    """Send the webhooks with the given settings and report the results."""
+    target = WebhookTarget()
+    await target.start()
+    context = InjectionContext(settings=settings)
+    mgr = OutboundTransportManager(context)
+    await mgr.start_transport(mgr.register("http"))
+
+    start = time.perf_counter()
+    for i in range(count):
+        record = i % records
+        payload = {
+            "connection_id": f"conn-{record}",
+            "state": STATES[(i // records) % len(STATES)],
+            "their_label": "Bench",
+            "updated_at": "2020-01-01 00:00:00Z",
+        }
+        mgr.enqueue_webhook("connections", payload, target.url)
+        if i % 1000 == 999:
+            # let delivery proceed as events are produced
+            await asyncio.sleep(0)
+    await mgr.flush()
+    if mgr.webhook_batcher:
+        await mgr.webhook_batcher.flush()
+    elapsed = time.perf_counter() - start
+
+    await mgr.stop()
+    await target.stop()
+    print(
+        f"{name:>10}: {elapsed:.2f}s, {count / elapsed:.0f} events/s, "
+        f"{target.requests} requests, {target.events} events received"
+    )
+
+
+async def run(count: int, records: int, batch_size: int, batch_delay: float):
+    """Run the benchmark."""
+    print(f"{count} webhooks for {records} records")
+    batched = {
+        "admin.webhook_batch_size": batch_size,
+        "admin.webhook_batch_delay": batch_delay,
+    }
+    await run_mode("single", {}, count, records)
+    await run_mode("batched", batched, count, records)
+    await run_mode(
+        "coalesced", dict(batched, **{"admin.webhook_coalesce": True}), count, records
+    )
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--batch-delay", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        run(args.count, args.records, args.batch_size, args.batch_delay)
+    )
+
+
+if __name__ == "__main__":
+    main()